@@ -0,0 +1,59 @@
+"""Compare the binary heap of ``dijkstra_distances`` with a linear search for the closest node.
+
+Usage::
+
+    python scripts/benchmarks/dijkstra_distances.py [n]
+
+The graph is a grid of ``n`` by ``n`` nodes (default ``n = 100``) with varying edge weights.
+
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+
+from compas.topology import dijkstra_distances
+
+
+def dijkstra_distances_quadratic(adjacency, weight, target):
+    # the implementation before the binary heap, for comparison
+    adjacency = {key: set(nbrs) for key, nbrs in adjacency.items()}
+    distance = {key: (0 if key == target else 1e+17) for key in adjacency}
+    tovisit = set(adjacency.keys())
+    visited = set()
+    while tovisit:
+        u = min(tovisit, key=lambda k: distance[k])
+        tovisit.remove(u)
+        visited.add(u)
+        for v in adjacency[u] - visited:
+            d = distance[u] + weight[(u, v)]
+            if d < distance[v]:
+                distance[v] = d
+    return distance
+
+
+def grid(n):
+    adjacency = {}
+    for i in range(n):
+        for j in range(n):
+            nbrs = [(i + di, j + dj) for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))]
+            adjacency[i * n + j] = [a * n + b for a, b in nbrs if 0 <= a < n and 0 <= b < n]
+    weight = {(u, v): 1.0 + ((u * 31 + v * 17) % 7) for u in adjacency for v in adjacency[u]}
+    return adjacency, weight
+
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    adjacency, weight = grid(n)
+
+    assert dijkstra_distances(adjacency, weight, 0) == dijkstra_distances_quadratic(adjacency, weight, 0)
+
+    cases = [
+        ('linear search', lambda: dijkstra_distances_quadratic(adjacency, weight, 0)),
+        ('binary heap', lambda: dijkstra_distances(adjacency, weight, 0)),
+    ]
+
+    print('{} nodes'.format(len(adjacency)))
+    for name, func in cases:
+        print('{:<30} {:.3f} s'.format(name, min(timeit.repeat(func, repeat=3, number=1))))
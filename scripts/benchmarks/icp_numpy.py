@@ -0,0 +1,38 @@
+"""Time the registration of large point clouds with ``icp_numpy``.
+
+Usage::
+
+    python scripts/benchmarks/icp_numpy.py [n]
+
+The source is a random sample of ``n`` points (default ``n = 1000000``) on an ellipsoid,
+and the target is the source after a rigid transformation and with some noise.
+
+"""
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+
+from compas.geometry import icp_numpy
+from compas.geometry import matrix_from_axis_and_angle
+from compas.geometry import transform_points_numpy
+
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    u = np.random.rand(n) * 2 * np.pi
+    v = np.random.rand(n) * np.pi
+    source = np.column_stack((3 * np.cos(u) * np.sin(v), 2 * np.sin(u) * np.sin(v), np.cos(v)))
+
+    T = np.asarray(matrix_from_axis_and_angle([1, 1, 0], 0.2))
+    T[:3, 3] = [0.5, -0.2, 0.1]
+    target = transform_points_numpy(source, T) + np.random.normal(0, 0.001, source.shape)
+
+    print('{} points'.format(n))
+    for kwargs in (dict(subsample=10000), dict(voxel=0.05), dict(subsample=10000, method='plane')):
+        t0 = time.time()
+        points, X, errors = icp_numpy(source, target, tol=1e-6, history=True, **kwargs)
+        print('{:<40} {:.3f} s, {} iterations, error {:.6f}'.format(str(kwargs), time.time() - t0, len(errors), errors[-1]))
@@ -0,0 +1,56 @@
+"""Compare the construction of a mesh face by face with the bulk constructor.
+
+Usage::
+
+    python scripts/benchmarks/mesh_from_vertices_and_faces.py [n]
+
+The mesh is a grid of ``n`` by ``n`` quads (default ``n = 1000``).
+
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+
+from numpy import arange
+from numpy import column_stack
+from numpy import meshgrid
+from numpy import zeros
+
+from compas.datastructures import Mesh
+
+
+def grid(n):
+    x, y = meshgrid(arange(n + 1, dtype=float), arange(n + 1, dtype=float))
+    vertices = column_stack((x.ravel(), y.ravel(), zeros(x.size)))
+    i, j = meshgrid(arange(n), arange(n))
+    a = (i * (n + 1) + j).ravel()
+    faces = column_stack((a, a + 1, a + n + 2, a + n + 1))
+    return vertices, faces
+
+
+def incremental(vertices, faces):
+    mesh = Mesh()
+    for x, y, z in vertices:
+        mesh.add_vertex(x=x, y=y, z=z)
+    for face in faces:
+        mesh.add_face(face)
+    return mesh
+
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    vertices, faces = grid(n)
+    vertices_list, faces_list = vertices.tolist(), faces.tolist()
+
+    cases = [
+        ('face by face', lambda: incremental(vertices_list, faces_list)),
+        ('bulk, lists', lambda: Mesh.from_vertices_and_faces(vertices_list, faces_list)),
+        ('bulk, arrays', lambda: Mesh.from_vertices_and_faces(vertices, faces)),
+        ('bulk, arrays, array storage', lambda: Mesh.from_vertices_and_faces(vertices, faces, storage='array')),
+    ]
+
+    print('{} vertices, {} faces'.format(len(vertices), len(faces)))
+    for name, func in cases:
+        print('{:<30} {:.3f} s'.format(name, min(timeit.repeat(func, repeat=3, number=1))))
@@ -32,6 +32,16 @@ Data structures
 
     Mesh
 
+Spatial queries
+---------------
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    MeshBVH
+    mesh_pull_points_numpy
+
 Algorithms
 ----------
 
@@ -8,6 +8,7 @@ from .core import *  # noqa: F401 F403
 from ._mesh import *  # noqa: F401 F403
 
 from .bbox import *  # noqa: F401 F403
+from .bvh import *  # noqa: F401 F403
 if not IPY:
     from .bbox_numpy import *  # noqa: F401 F403
 from .combinatorics import *  # noqa: F401 F403
@@ -0,0 +1,499 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from math import sqrt
+
+
+__all__ = [
+    'MeshBVH',
+]
+
+
+INF = float('inf')
+
+# the direction of the rays that are used to classify points as inside or outside.
+# it is chosen such that rays are unlikely to hit edges or vertices of regular meshes exactly.
+PROBE = (0.5773502691896258, 0.5773502691896258 * 1.0000061, 0.5773502691896258 * 0.9999927)
+
+
+class MeshBVH(object):
+    """A bounding volume hierarchy of the faces of a mesh, for ray casting and closest point queries.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        The mesh.
+    leafsize : int, optional
+        The maximum number of triangles in a leaf of the hierarchy.
+        Default is ``4``.
+
+    Attributes
+    ----------
+    mesh : compas.datastructures.Mesh
+        The mesh.
+
+    Notes
+    -----
+    The hierarchy is a binary tree of axis-aligned bounding boxes, stored in flat lists.
+    The faces of the mesh are triangulated as fans around their first vertex,
+    which is exact for triangles and for planar, convex polygons.
+    Every node is split at the median of the centroids of its triangles,
+    along the axis in which the centroids have the largest extent.
+
+    The hierarchy describes the geometry of the mesh at the time of construction.
+    It should be rebuilt if the mesh changes.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> bvh = MeshBVH(mesh)
+    >>> xyz, fkey, t = bvh.intersect_rays([([0.0, 0.0, 0.0], [0.0, 0.0, 1.0])])[0]
+    >>> round(t, 6)
+    1.154701
+    >>> bvh.contains_points([[0.0, 0.0, 0.0], [2.0, 0.0, 0.0]])
+    [True, False]
+
+    """
+
+    def __init__(self, mesh, leafsize=4):
+        self.mesh = mesh
+        self.leafsize = leafsize
+        self._triangles = []
+        self._faces = []
+        self._boxes = []
+        self._children = []
+        self._ranges = []
+        self.build()
+
+    def build(self):
+        """Build the hierarchy from the current geometry of the mesh."""
+        mesh = self.mesh
+        xyz = {key: tuple(mesh.vertex_coordinates(key)) for key in mesh.vertices()}
+        triangles = []
+        faces = []
+        for fkey in mesh.faces():
+            points = [xyz[key] for key in mesh.face_vertices(fkey)]
+            a = points[0]
+            for b, c in zip(points[1:-1], points[2:]):
+                triangles.append((a, b, c))
+                faces.append(fkey)
+        try:
+            order, children, ranges, boxes = _build_numpy(triangles, self.leafsize)
+        except ImportError:
+            order, children, ranges, boxes = _build(triangles, self.leafsize)
+        self._triangles = [triangles[i] for i in order]
+        self._faces = [faces[i] for i in order]
+        self._boxes = boxes
+        self._children = children
+        self._ranges = ranges
+
+    # --------------------------------------------------------------------------
+    # rays
+    # --------------------------------------------------------------------------
+
+    def _ray_hits(self, origin, direction, tmin, tmax, first=True):
+        # the parameters and indices of the triangles hit by the ray in [tmin, tmax].
+        # if first is True, only the closest hit is returned,
+        # and the nodes of the tree are visited front to back.
+        ox, oy, oz = origin
+        dx, dy, dz = direction
+        ix = 1.0 / dx if dx else INF
+        iy = 1.0 / dy if dy else INF
+        iz = 1.0 / dz if dz else INF
+        boxes = self._boxes
+        children = self._children
+        ranges = self._ranges
+        triangles = self._triangles
+        hits = []
+        if not boxes:
+            return hits
+
+        def entry(node, tmax):
+            # slab test, returns the parameter at which the ray enters the box, or None
+            xmin, ymin, zmin, xmax, ymax, zmax = boxes[node]
+            t0, t1 = tmin, tmax
+            for o, i, lo, hi in ((ox, ix, xmin, xmax), (oy, iy, ymin, ymax), (oz, iz, zmin, zmax)):
+                if i == INF:
+                    if o < lo or o > hi:
+                        return None
+                    continue
+                a = (lo - o) * i
+                b = (hi - o) * i
+                if a > b:
+                    a, b = b, a
+                if a > t0:
+                    t0 = a
+                if b < t1:
+                    t1 = b
+                if t0 > t1:
+                    return None
+            return t0
+
+        start = entry(0, tmax)
+        stack = [] if start is None else [(start, 0)]
+        while stack:
+            t0, node = stack.pop()
+            if first and t0 > tmax:
+                continue
+            left, right = children[node]
+            if left == -1:
+                for index in range(*ranges[node]):
+                    t = _ray_triangle(ox, oy, oz, dx, dy, dz, triangles[index])
+                    if t is None or t < tmin or t > tmax:
+                        continue
+                    if first:
+                        tmax = t
+                        hits[:] = [(t, index)]
+                    else:
+                        hits.append((t, index))
+                continue
+            a = entry(left, tmax)
+            b = entry(right, tmax)
+            if a is not None and b is not None:
+                if a < b:
+                    stack.append((b, right))
+                    stack.append((a, left))
+                else:
+                    stack.append((a, left))
+                    stack.append((b, right))
+            elif a is not None:
+                stack.append((a, left))
+            elif b is not None:
+                stack.append((b, right))
+        return hits
+
+    def intersect_rays(self, rays):
+        """Compute the first intersection of rays with the mesh.
+
+        Parameters
+        ----------
+        rays : list
+            The rays, as pairs of a start point and a direction vector.
+
+        Returns
+        -------
+        list
+            For every ray, the XYZ coordinates of the intersection, the key of the intersected face,
+            and the ray parameter of the intersection (``point = start + t * direction``),
+            or ``None`` if the ray does not hit the mesh.
+
+        """
+        results = []
+        for origin, direction in rays:
+            hits = self._ray_hits(origin, direction, 0.0, INF)
+            results.append(self._hit(origin, direction, hits[0]) if hits else None)
+        return results
+
+    def intersect_segments(self, segments):
+        """Compute the first intersection of line segments with the mesh.
+
+        Parameters
+        ----------
+        segments : list
+            The segments, as pairs of a start and an end point.
+
+        Returns
+        -------
+        list
+            For every segment, the XYZ coordinates of the intersection closest to the start point,
+            the key of the intersected face,
+            and the segment parameter of the intersection, between ``0`` (start) and ``1`` (end),
+            or ``None`` if the segment does not intersect the mesh.
+
+        """
+        results = []
+        for a, b in segments:
+            direction = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+            hits = self._ray_hits(a, direction, 0.0, 1.0)
+            results.append(self._hit(a, direction, hits[0]) if hits else None)
+        return results
+
+    def _hit(self, origin, direction, hit):
+        t, index = hit
+        xyz = [origin[0] + t * direction[0], origin[1] + t * direction[1], origin[2] + t * direction[2]]
+        return [xyz, self._faces[index], t]
+
+    def contains_points(self, points):
+        """Verify if points are inside the mesh.
+
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the points.
+
+        Returns
+        -------
+        list of bool
+            For every point, ``True`` if it is inside the mesh, ``False`` otherwise.
+
+        Notes
+        -----
+        The mesh should be closed.
+        A point is inside if a ray starting at the point crosses the faces of the mesh an odd number of times.
+
+        """
+        return [len(self._ray_hits(point, PROBE, 0.0, INF, first=False)) % 2 == 1 for point in points]
+
+    # --------------------------------------------------------------------------
+    # closest points
+    # --------------------------------------------------------------------------
+
+    def _closest(self, point):
+        px, py, pz = point[0], point[1], point[2]
+        boxes = self._boxes
+        children = self._children
+        ranges = self._ranges
+        triangles = self._triangles
+        best = [INF, None, None]
+        if not boxes:
+            return best
+
+        def bound(node):
+            # squared distance from the point to the box
+            xmin, ymin, zmin, xmax, ymax, zmax = boxes[node]
+            dx = xmin - px if px < xmin else px - xmax if px > xmax else 0.0
+            dy = ymin - py if py < ymin else py - ymax if py > ymax else 0.0
+            dz = zmin - pz if pz < zmin else pz - zmax if pz > zmax else 0.0
+            return dx * dx + dy * dy + dz * dz
+
+        stack = [(bound(0), 0)]
+        while stack:
+            d2, node = stack.pop()
+            if d2 >= best[0]:
+                continue
+            left, right = children[node]
+            if left == -1:
+                for index in range(*ranges[node]):
+                    xyz = _closest_point_triangle(px, py, pz, triangles[index])
+                    d2 = (xyz[0] - px) ** 2 + (xyz[1] - py) ** 2 + (xyz[2] - pz) ** 2
+                    if d2 < best[0]:
+                        best = [d2, xyz, index]
+                continue
+            a = bound(left)
+            b = bound(right)
+            if a < b:
+                stack.append((b, right))
+                stack.append((a, left))
+            else:
+                stack.append((a, left))
+                stack.append((b, right))
+        return best
+
+    def closest_points(self, points):
+        """Compute the closest points on the mesh.
+
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the points.
+
+        Returns
+        -------
+        list
+            For every point, the XYZ coordinates of the closest point on the mesh,
+            the key of the face of the closest point,
+            and the distance to the closest point.
+
+        """
+        results = []
+        for point in points:
+            d2, xyz, index = self._closest(point)
+            if xyz is None:
+                results.append([None, None, INF])
+            else:
+                results.append([list(xyz), self._faces[index], sqrt(d2)])
+        return results
+
+
+# ==============================================================================
+# Construction
+# ==============================================================================
+
+
+def _build(triangles, leafsize):
+    # the order of the triangles in the leaves, the children and the range of the triangles of every node,
+    # and the bounding box of every node.
+    # the children of a node are always created after the node.
+    centroids = [((a[0] + b[0] + c[0]) / 3.0, (a[1] + b[1] + c[1]) / 3.0, (a[2] + b[2] + c[2]) / 3.0) for a, b, c in triangles]
+    order = list(range(len(triangles)))
+    children = []
+    ranges = []
+    stack = [(0, len(order), None)] if triangles else []
+    while stack:
+        start, end, parent = stack.pop()
+        node = len(ranges)
+        if parent is not None:
+            children[parent[0]][parent[1]] = node
+        ranges.append((start, end))
+        children.append([-1, -1])
+        if end - start <= leafsize:
+            continue
+        indices = order[start:end]
+        extents = []
+        for axis in range(3):
+            values = [centroids[i][axis] for i in indices]
+            extents.append(max(values) - min(values))
+        axis = extents.index(max(extents))
+        indices.sort(key=lambda i: centroids[i][axis])
+        order[start:end] = indices
+        mid = (start + end) // 2
+        stack.append((mid, end, (node, 1)))
+        stack.append((start, mid, (node, 0)))
+    boxes = [None] * len(ranges)
+    for node in range(len(ranges) - 1, -1, -1):
+        left, right = children[node]
+        if left == -1:
+            points = [point for i in order[ranges[node][0]:ranges[node][1]] for point in triangles[i]]
+            xs, ys, zs = zip(*points)
+            boxes[node] = min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)
+        else:
+            a = boxes[left]
+            b = boxes[right]
+            boxes[node] = tuple(min(a[i], b[i]) for i in range(3)) + tuple(max(a[i], b[i]) for i in range(3, 6))
+    return order, children, ranges, boxes
+
+
+def _build_numpy(triangles, leafsize):
+    # the same hierarchy, constructed one level at a time for all nodes of the level.
+    # the ranges of the nodes of a level, and of the leaves of the previous levels,
+    # partition the list of triangles.
+    from numpy import arange
+    from numpy import array
+    from numpy import concatenate
+    from numpy import diff
+    from numpy import full
+    from numpy import lexsort
+    from numpy import maximum
+    from numpy import minimum
+    from numpy import repeat
+    n = len(triangles)
+    if not n:
+        return [], [], [], []
+    triangles = array(triangles, dtype=float).reshape((-1, 3, 3))
+    lower = triangles.min(axis=1)
+    upper = triangles.max(axis=1)
+    centroids = triangles.mean(axis=1)
+    order = arange(n)
+    children = [[-1, -1]]
+    ranges = [(0, n)]
+    boxes = [None]
+    starts = array([0])
+    nodes = array([0])
+    while len(nodes):
+        sizes = diff(concatenate((starts, [n])))
+        low = minimum.reduceat(lower[order], starts)
+        high = maximum.reduceat(upper[order], starts)
+        for node, a, b in zip(nodes.tolist(), low.tolist(), high.tolist()):
+            if node != -1:
+                boxes[node] = tuple(a + b)
+        split = (nodes != -1) & (sizes > leafsize)
+        if not split.any():
+            break
+        points = centroids[order]
+        extents = maximum.reduceat(points, starts) - minimum.reduceat(points, starts)
+        axis = extents.argmax(axis=1)
+        segment = repeat(arange(len(starts)), sizes)
+        order = order[lexsort((points[arange(n), axis[segment]], segment))]
+        mids = starts[split] + sizes[split] // 2
+        first = len(ranges)
+        for k, (node, start, mid, end) in enumerate(zip(nodes[split].tolist(), starts[split].tolist(), mids.tolist(), (starts + sizes)[split].tolist())):
+            children[node] = [first + 2 * k, first + 2 * k + 1]
+            children.append([-1, -1])
+            children.append([-1, -1])
+            ranges.append((start, mid))
+            ranges.append((mid, end))
+            boxes.append(None)
+            boxes.append(None)
+        count = split.sum()
+        # the leaves of this and previous levels are kept as segments without a node
+        starts = concatenate((starts[~split], starts[split], mids))
+        nodes = concatenate((full((~split).sum(), -1), first + 2 * arange(count), first + 2 * arange(count) + 1))
+        index = starts.argsort(kind='mergesort')
+        starts = starts[index]
+        nodes = nodes[index]
+    return order.tolist(), children, ranges, boxes
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _ray_triangle(ox, oy, oz, dx, dy, dz, triangle, epsilon=1e-12):
+    # Moller-Trumbore ray-triangle intersection, returns the ray parameter or None
+    a, b, c = triangle
+    e1x, e1y, e1z = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    e2x, e2y, e2z = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    px = dy * e2z - dz * e2y
+    py = dz * e2x - dx * e2z
+    pz = dx * e2y - dy * e2x
+    det = e1x * px + e1y * py + e1z * pz
+    if -epsilon < det < epsilon:
+        return None
+    inv = 1.0 / det
+    tx, ty, tz = ox - a[0], oy - a[1], oz - a[2]
+    u = (tx * px + ty * py + tz * pz) * inv
+    if u < 0.0 or u > 1.0:
+        return None
+    qx = ty * e1z - tz * e1y
+    qy = tz * e1x - tx * e1z
+    qz = tx * e1y - ty * e1x
+    v = (dx * qx + dy * qy + dz * qz) * inv
+    if v < 0.0 or u + v > 1.0:
+        return None
+    return (e2x * qx + e2y * qy + e2z * qz) * inv
+
+
+def _closest_point_triangle(px, py, pz, triangle):
+    # closest point on a triangle, by classification of the point
+    # with respect to the Voronoi regions of the vertices, edges and face of the triangle.
+    # see Ericson, C. Real-Time Collision Detection. 2005, section 5.1.5.
+    a, b, c = triangle
+    abx, aby, abz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    acx, acy, acz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    apx, apy, apz = px - a[0], py - a[1], pz - a[2]
+    d1 = abx * apx + aby * apy + abz * apz
+    d2 = acx * apx + acy * apy + acz * apz
+    if d1 <= 0.0 and d2 <= 0.0:
+        return a
+    bpx, bpy, bpz = px - b[0], py - b[1], pz - b[2]
+    d3 = abx * bpx + aby * bpy + abz * bpz
+    d4 = acx * bpx + acy * bpy + acz * bpz
+    if d3 >= 0.0 and d4 <= d3:
+        return b
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+        v = d1 / (d1 - d3)
+        return a[0] + v * abx, a[1] + v * aby, a[2] + v * abz
+    cpx, cpy, cpz = px - c[0], py - c[1], pz - c[2]
+    d5 = abx * cpx + aby * cpy + abz * cpz
+    d6 = acx * cpx + acy * cpy + acz * cpz
+    if d6 >= 0.0 and d5 <= d6:
+        return c
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+        w = d2 / (d2 - d6)
+        return a[0] + w * acx, a[1] + w * acy, a[2] + w * acz
+    va = d3 * d6 - d5 * d4
+    if va <= 0.0 and d4 - d3 >= 0.0 and d5 - d6 >= 0.0:
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        return b[0] + w * (c[0] - b[0]), b[1] + w * (c[1] - b[1]), b[2] + w * (c[2] - b[2])
+    denom = va + vb + vc
+    if not denom:
+        return a
+    v = vb / denom
+    w = vc / denom
+    return a[0] + abx * v + acx * w, a[1] + aby * v + acy * w, a[2] + abz * v + acz * w
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+
+    doctest.testmod(globs=globals())
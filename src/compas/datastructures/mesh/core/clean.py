@@ -72,6 +72,8 @@ def mesh_delete_duplicate_vertices(mesh, precision=None):
             if u not in mesh.halfedge[v]:
                 mesh.halfedge[v][u] = None
 
+    mesh._clear_edge_index()
+
 
 # ==============================================================================
 # Main
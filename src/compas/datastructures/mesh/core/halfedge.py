@@ -3,15 +3,30 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import gc
 import json
 import pickle
 from collections import OrderedDict
 from copy import deepcopy
-from ast import literal_eval
+from itertools import islice
 from random import sample
 from random import choice
 
 from compas.datastructures import Datastructure
+from compas.datastructures.mesh.core.storage import AttributeArrayStore
+from compas.datastructures.mesh.core.storage import FaceArrayStore
+from compas.datastructures.mesh.core.storage import HalfEdgeArrayStore
+from compas.datastructures.mesh.core.storage import VertexArrayStore
+from compas.datastructures.mesh.core.storage import faces_to_flat_numpy
+from compas.datastructures.mesh.core.storage import halfedges_from_faces_numpy
+from compas.datastructures.mesh.core.storage import get_attributes_array
+from compas.datastructures.mesh.core.storage import set_attributes_array
+from compas.datastructures.mesh.core.storage import typecode_of
+from compas.files import CBFReader
+from compas.files import CBFWriter
+from compas.files.cbf import INT
+from compas.utilities import json_load_stream
+from compas.utilities import literal_keys
 from compas.utilities import pairwise
 from compas.utilities import window
 
@@ -121,6 +136,21 @@ class EdgeAttributeView(AttributeView, collections.MutableMapping):
 class HalfEdge(Datastructure):
     """Base half-edge data structure for representing meshes.
 
+    Parameters
+    ----------
+    storage : {'dict', 'array'}, optional
+        The storage engine for vertices, faces and halfedges.
+        With ``'dict'``, every element is stored in its own dictionary.
+        With ``'array'``, vertex coordinates are stored in a contiguous buffer of doubles,
+        and faces and halfedges in flat integer arrays,
+        which uses considerably less memory for large meshes.
+        Array storage requires vertex and face keys to be non-negative integers.
+        Element-wise access is slower with array storage,
+        because every lookup constructs a new list or attribute view from the arrays
+        (e.g. about three times slower for ``face_vertices`` and ``vertex_neighbors``).
+        Bulk access with ``vertices_attributes`` and ``vertices_array`` is as fast or faster.
+        Default is ``'dict'``.
+
     Attributes
     ----------
     attributes : dict
@@ -157,19 +187,21 @@ class HalfEdge(Datastructure):
 
     __module__ = 'compas.datastructures'
 
-    def __init__(self):
+    _bulk_threshold = 1000
+
+    def __init__(self, storage=None):
         super(HalfEdge, self).__init__()
+        storage = storage or 'dict'
+        if storage not in ('dict', 'array'):
+            raise ValueError("The storage engine should be one of 'dict' or 'array': {}".format(storage))
+        self._storage = storage
         self._max_int_key = -1
         self._max_int_fkey = -1
-        self.vertex = {}
-        self.halfedge = {}
-        self.face = {}
-        self.facedata = {}
-        self.edgedata = {}
         self.attributes = {'name': 'Mesh'}
         self.default_vertex_attributes = {'x': 0.0, 'y': 0.0, 'z': 0.0}
         self.default_edge_attributes = {}
         self.default_face_attributes = {}
+        self._init_storage()
 
     # --------------------------------------------------------------------------
     # customisation
@@ -213,6 +245,11 @@ class HalfEdge(Datastructure):
     def adjacency(self):
         return self.halfedge
 
+    @property
+    def storage(self):
+        """str : The storage engine of the data structure (``'dict'`` or ``'array'``)."""
+        return self._storage
+
     @property
     def data(self):
         """dict : A data dict representing the mesh data structure for serialisation.
@@ -243,13 +280,13 @@ class HalfEdge(Datastructure):
         edgedata = {}
 
         for key in self.vertex:
-            vertex[repr(key)] = self.vertex[key]
+            vertex[repr(key)] = dict(self.vertex[key])
 
         for key in self.face:
             face[repr(key)] = [repr(k) for k in self.face[key]]
 
         for key in self.facedata:
-            facedata[repr(key)] = self.facedata[key]
+            facedata[repr(key)] = dict(self.facedata[key])
 
         for key in self.edgedata:
             edgedata[repr(key)] = self.edgedata[key]
@@ -285,22 +322,40 @@ class HalfEdge(Datastructure):
         self.default_face_attributes.update(dfa)
         self.default_edge_attributes.update(dea)
 
-        self.vertex = {}
-        self.face = {}
-        self.halfedge = {}
-        self.facedata = {}
-        self.edgedata = {}
-
-        for key, attr in iter(vertex.items()):
-            self.add_vertex(literal_eval(key), attr_dict=attr)
+        self._init_storage()
 
-        for fkey, vertices in iter(face.items()):
-            attr = facedata.get(fkey) or {}
-            vertices = [literal_eval(k) for k in vertices]
-            self.add_face(vertices, fkey=literal_eval(fkey), attr_dict=attr)
+        # the keys are decoded in bulk, and every key only once
+        keys = literal_keys(vertex)
+        fkeys = literal_keys(face)
+        key_index = dict(zip(vertex, keys))
+        try:
+            faces = [[key_index[k] for k in vertices] for vertices in face.values()]
+        except KeyError:
+            faces = [literal_keys(vertices) for vertices in face.values()]
+
+        if keys == list(range(len(keys))) and fkeys == list(range(len(fkeys))) and all(len(vertices) >= 3 for vertices in faces):
+            # rebuild the halfedges directly from the list of faces
+            x, y, z = [self.default_vertex_attributes.get(axis, 0.0) for axis in 'xyz']
+            xyz = [[attr.get('x', x), attr.get('y', y), attr.get('z', z)] for attr in vertex.values()]
+            self._add_vertices_and_faces(xyz, faces)
+            if self._storage == 'dict':
+                self.vertex = {key: dict(attr) for key, attr in zip(keys, vertex.values())}
+            else:
+                for key, attr in zip(keys, vertex.values()):
+                    self.vertex[key].update(attr)
+            for fkey, rfkey in zip(fkeys, face):
+                attr = facedata.get(rfkey)
+                if attr:
+                    self.facedata[fkey] = attr
+        else:
+            for key, attr in zip(keys, vertex.values()):
+                self.add_vertex(key, attr_dict=attr)
+            for fkey, rfkey, vertices in zip(fkeys, face, faces):
+                attr = facedata.get(rfkey) or {}
+                self.add_face(vertices, fkey=fkey, attr_dict=attr)
 
-        for uv, attr in iter(edgedata.items()):
-            self.edgedata[literal_eval(uv)] = attr or {}
+        for uv, attr in zip(literal_keys(edgedata), edgedata.values()):
+            self.edgedata[uv] = attr or {}
 
         self._max_int_key = max_int_key
         self._max_int_fkey = max_int_fkey
@@ -349,13 +404,16 @@ class HalfEdge(Datastructure):
         return self.data
 
     @classmethod
-    def from_json(cls, filepath):
+    def from_json(cls, filepath, stream=False):
         """Construct a datastructure from structured data contained in a json file.
 
         Parameters
         ----------
         filepath : str
             The path to the json file.
+        stream : bool, optional
+            Decode the file incrementally, without reading the entire text into memory.
+            Default is ``False``.
 
         Returns
         -------
@@ -368,7 +426,7 @@ class HalfEdge(Datastructure):
         corresponding *to_json* method.
         """
         with open(filepath, 'r') as fp:
-            data = json.load(fp)
+            data = json_load_stream(fp) if stream else json.load(fp)
         mesh = cls()
         mesh.data = data
         return mesh
@@ -423,6 +481,131 @@ class HalfEdge(Datastructure):
         with open(filepath, 'wb+') as f:
             pickle.dump(self.data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
+    @classmethod
+    def from_binary(cls, filepath, attributes=None, mmap=False, storage=None):
+        """Construct a mesh from the data contained in a binary file.
+
+        Parameters
+        ----------
+        filepath : str or file
+            The path to the binary file, or a file object opened in binary mode.
+        attributes : list of str, optional
+            The names of the vertex, edge, and face attributes to load.
+            The coordinates of the vertices are always loaded.
+            Default is all attributes.
+        mmap : bool, optional
+            Memory-map the file instead of reading the arrays with regular file reads.
+            The data structure is still built from lists of values,
+            so the loaded data is copied into memory anyway,
+            and memory-mapping only avoids reading the file up front.
+            Default is ``False``.
+        storage : {'dict', 'array'}, optional
+            The storage engine of the mesh.
+            Default is ``'dict'``.
+
+        Returns
+        -------
+        object
+            An object of the type of ``cls``.
+
+        Note
+        ----
+        This constructor method is meant to be used in conjuction with the
+        corresponding *to_binary* method.
+
+        Examples
+        --------
+        >>> mesh = Mesh.from_polyhedron(6)
+        >>> mesh.vertex_attribute(0, 'is_fixed', True)
+        >>> import os
+        >>> import tempfile
+        >>> filepath = os.path.join(tempfile.gettempdir(), 'cube.cbf')
+        >>> mesh.to_binary(filepath)
+        >>> other = Mesh.from_binary(filepath, attributes=[])
+        >>> other.number_of_faces()
+        6
+        >>> other.vertex_attribute(0, 'is_fixed') is None
+        True
+
+        """
+        reader = CBFReader(filepath, mmap=mmap)
+        if reader.schema != 'halfedge':
+            raise ValueError('The file does not contain a halfedge data structure: {}'.format(reader.schema))
+        mesh = cls() if storage is None else cls(storage=storage)
+        mesh._read_binary(reader, attributes)
+        return mesh
+
+    def to_binary(self, filepath):
+        """Serialise the mesh to a binary file.
+
+        Parameters
+        ----------
+        filepath : str or file
+            The path to the binary file, or a file object opened in binary mode.
+
+        Notes
+        -----
+        The file is written in COMPAS Binary Format (see :class:`compas.files.CBFWriter`).
+        The topology of the mesh is stored as flat integer arrays,
+        and the vertex, edge, and face attributes as typed columns,
+        such that the mesh can be reconstructed in bulk,
+        and individual attributes can be loaded selectively.
+
+        """
+        meta = {'attributes': self.attributes,
+                'dva': self.default_vertex_attributes,
+                'dea': self.default_edge_attributes,
+                'dfa': self.default_face_attributes,
+                'max_int_key': self._max_int_key,
+                'max_int_fkey': self._max_int_fkey}
+        writer = CBFWriter(filepath, 'halfedge', meta)
+        keys = list(self.vertex)
+        index = {key: i for i, key in enumerate(keys)}
+        fkeys = list(self.face)
+        writer.add_table('vertex', keys, [self.vertex[key] for key in keys])
+        writer.add_table('face', fkeys, [self.facedata.get(fkey) or {} for fkey in fkeys])
+        writer.add_table('edge', list(self.edgedata), list(self.edgedata.values()))
+        writer.add_array('face/sizes', [len(self.face[fkey]) for fkey in fkeys], INT)
+        writer.add_array('face/vertices', [index[key] for fkey in fkeys for key in self.face[fkey]], INT)
+        writer.write()
+
+    def _read_binary(self, reader, attributes=None):
+        meta = reader.meta
+        self.attributes.update(meta['attributes'])
+        self.default_vertex_attributes.update(meta['dva'])
+        self.default_edge_attributes.update(meta['dea'])
+        self.default_face_attributes.update(meta['dfa'])
+        self._init_storage()
+        if attributes is not None:
+            attributes = set(attributes)
+        keys = reader.read_keys('vertex')
+        fkeys = reader.read_keys('face')
+        sizes = reader.read_list('face/sizes')
+        _, vattrs = reader.read_table('vertex', None if attributes is None else attributes | set('xyz'))
+        _, fattrs = reader.read_table('face', attributes)
+        if keys == list(range(len(keys))) and fkeys == list(range(len(fkeys))) and min(sizes or [3]) >= 3:
+            # construct the topology in bulk from the flat arrays
+            xyz = [[attr.get(axis, 0.0) for axis in 'xyz'] for attr in vattrs]
+            offsets = [0]
+            for size in sizes:
+                offsets.append(offsets[-1] + size)
+            self._add_vertices_and_faces(xyz, reader.read_array('face/vertices'), offsets)
+            for key, attr in zip(keys, vattrs):
+                self.vertex[key].update(attr)
+            for fkey, attr in zip(fkeys, fattrs):
+                if attr:
+                    self.facedata[fkey].update(attr)
+        else:
+            vertices = iter(reader.read_list('face/vertices'))
+            for key, attr in zip(keys, vattrs):
+                self.add_vertex(key, attr_dict=attr)
+            for fkey, size, attr in zip(fkeys, sizes, fattrs):
+                self.add_face([keys[i] for i in islice(vertices, size)], fkey=fkey, attr_dict=attr)
+        for uv, attr in zip(*reader.read_table('edge', attributes)):
+            self.edgedata[uv] = attr
+        self._max_int_key = meta['max_int_key']
+        self._max_int_fkey = meta['max_int_fkey']
+
     # --------------------------------------------------------------------------
     # helpers
     # --------------------------------------------------------------------------
@@ -443,7 +626,11 @@ class HalfEdge(Datastructure):
         """
         if not cls:
             cls = type(self)
-        return cls.from_data(deepcopy(self.data))
+        if self._storage == 'dict':
+            return cls.from_data(deepcopy(self.data))
+        mesh = cls(storage=self._storage)
+        mesh.data = deepcopy(self.data)
+        return mesh
 
     def clear(self):
         """Clear all the mesh data."""
@@ -452,14 +639,36 @@ class HalfEdge(Datastructure):
         del self.halfedge
         del self.face
         del self.facedata
-        self.vertex = {}
-        self.edgedata = {}
-        self.halfedge = {}
-        self.face = {}
-        self.facedata = {}
+        self._init_storage()
         self._max_int_key = -1
         self._max_int_fkey = -1
 
+    def _init_storage(self):
+        self.edgedata = {}
+        self._edge_index = None
+        self._edge_count = 0
+        self._vertex_order = None
+        if self._storage == 'array':
+            self.vertex = VertexArrayStore()
+            self.halfedge = HalfEdgeArrayStore()
+            self.face = FaceArrayStore()
+            self.facedata = AttributeArrayStore()
+            self._init_columns(self.vertex, self.default_vertex_attributes)
+            self._init_columns(self.facedata, self.default_face_attributes)
+        else:
+            self.vertex = {}
+            self.halfedge = {}
+            self.face = {}
+            self.facedata = {}
+
+    def _init_columns(self, store, attr):
+        if self._storage != 'array':
+            return
+        for name, value in attr.items():
+            typecode = typecode_of(value)
+            if typecode:
+                store.add_column(name, typecode)
+
     def get_any_vertex(self):
         """Get the identifier of a random vertex.
 
@@ -545,6 +754,128 @@ class HalfEdge(Datastructure):
         """
         return dict(enumerate(self.vertices()))
 
+    def edge_index(self, key=None):
+        """Returns the index of an edge in the edge list,
+        or a dictionary that maps all edges to their index.
+
+        Parameters
+        ----------
+        key : tuple of int, optional
+            The identifier of an edge, in either orientation.
+            If no edge is provided, the index of all edges is returned.
+
+        Returns
+        -------
+        int or dict
+            The index of the edge, if a key is provided.
+            A dictionary of edge-index pairs, otherwise.
+
+        Raises
+        ------
+        KeyError
+            If the edge does not exist.
+
+        Notes
+        -----
+        When the index is first needed, the edges are numbered in the order of :meth:`edges`.
+        Afterwards, the index is updated by the modifiers of the mesh
+        (:meth:`add_face`, :meth:`delete_face`, :meth:`delete_vertex`)
+        and by the operations that split, collapse, or swap edges,
+        without renumbering the other edges:
+        new edges get the next free number, and the numbers of removed edges are not reused.
+        Operations that rebuild the halfedges of the entire mesh,
+        such as unifying the cycles of the faces, number the edges again.
+        Looking up the index of an edge is a constant time operation.
+
+        Examples
+        --------
+        >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0]], [[0, 1, 2]])
+        >>> mesh.edge_index((2, 0))
+        1
+        >>> mesh.edge_index()
+        {(0, 1): 0, (0, 2): 1, (1, 2): 2}
+
+        """
+        index = self._get_edge_index()
+        if key is None:
+            return dict(index)
+        u, v = key
+        if u not in self.halfedge or v not in self.halfedge[u]:
+            raise KeyError(key)
+        if key in index:
+            return index[key]
+        return index[v, u]
+
+    def index_edge(self):
+        """Returns a dictionary that maps edge indices to edge identifiers.
+
+        Returns
+        -------
+        dict
+            A dictionary of index-edge pairs.
+            The indices are the ones of :meth:`edge_index`.
+
+        """
+        return {index: key for key, index in self._get_edge_index().items()}
+
+    def _get_edge_index(self):
+        if self._edge_index is None:
+            self._edge_index = {key: index for index, key in enumerate(self.edges())}
+            self._edge_count = len(self._edge_index)
+        return self._edge_index
+
+    def _clear_edge_index(self):
+        # for operations that rebuild all halfedges,
+        # the edges are numbered again when the index is needed
+        self._edge_index = None
+
+    def _add_edge_to_index(self, u, v):
+        if self._edge_index is not None:
+            self._edge_index[u, v] = self._edge_count
+            self._edge_count += 1
+
+    def _remove_edge_from_index(self, u, v):
+        if self._edge_index is not None:
+            if self._edge_index.pop((u, v), None) is None:
+                self._edge_index.pop((v, u), None)
+
+    def _attached_edges(self, keys):
+        # the edges attached to a set of vertices, in both orientations,
+        # or None if there is no index to update
+        if self._edge_index is None:
+            return None
+        halfedge = self.halfedge
+        edges = set()
+        for u in keys:
+            if u in halfedge:
+                for v in halfedge[u]:
+                    edges.add((u, v))
+                    edges.add((v, u))
+        return edges
+
+    def _update_edge_index(self, keys, before):
+        # update the index for a local modification of the halfedges
+        # of which all removed and added edges are attached to the given vertices.
+        # before are the attached edges before the modification
+        if before is None or self._edge_index is None:
+            return
+        after = self._attached_edges(keys)
+        index = self._edge_index
+        for u, v in before - after:
+            index.pop((u, v), None)
+        for u, v in after - before:
+            if (u, v) not in index and (v, u) not in index:
+                self._add_edge_to_index(u, v)
+
+    def _vertex_position(self, key):
+        # position of a vertex in the iteration order of the halfedges,
+        # which determines the orientation of the edges
+        if self._storage == 'array':
+            return key
+        if self._vertex_order is None or key not in self._vertex_order:
+            self._vertex_order = {key: index for index, key in enumerate(self.halfedge)}
+        return self._vertex_order[key]
+
     # --------------------------------------------------------------------------
     # builders
     # --------------------------------------------------------------------------
@@ -596,6 +927,7 @@ class HalfEdge(Datastructure):
         if key not in self.vertex:
             self.vertex[key] = {}
             self.halfedge[key] = {}
+            self._vertex_order = None
         attr = attr_dict or {}
         attr.update(kwattr)
         self.vertex[key].update(attr)
@@ -657,8 +989,75 @@ class HalfEdge(Datastructure):
             self.halfedge[u][v] = fkey
             if u not in self.halfedge[v]:
                 self.halfedge[v][u] = None
+                self._add_edge_to_index(u, v)
         return fkey
 
+    def _add_vertices_and_faces(self, vertices, faces, offsets=None):
+        # construct the vertices and faces of an empty mesh in bulk.
+        # the vertex keys are the indices of the vertices in the list,
+        # and the face keys the indices of the faces,
+        # skipping faces with less than three vertices.
+        try:
+            from numpy import asarray
+        except ImportError:
+            asarray = None
+        if not hasattr(faces, '__len__'):
+            faces = list(faces)
+        if asarray is None or (offsets is None and not hasattr(faces, 'dtype') and len(faces) < self._bulk_threshold):
+            if offsets is not None:
+                offsets = list(offsets)
+                if not offsets or offsets[-1] != len(faces):
+                    offsets.append(len(faces))
+                faces = [faces[start:end] for start, end in pairwise(offsets)]
+            for x, y, z in iter(vertices):
+                self.add_vertex(x=x, y=y, z=z)
+            for face in iter(faces):
+                self.add_face(face)
+            return
+        # the cyclic garbage collector is triggered repeatedly by the creation
+        # of millions of containers, without anything to collect
+        if not hasattr(vertices, 'dtype'):
+            vertices = list(vertices)
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._add_vertices_and_faces_numpy(asarray(vertices), faces, offsets)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _add_vertices_and_faces_numpy(self, xyz, faces, offsets):
+        if xyz.dtype.kind not in 'iuf':
+            xyz = xyz.astype(float)
+        xyz = xyz.reshape((-1, 3))
+        n = len(xyz)
+        flat, sizes = faces_to_flat_numpy(faces, offsets)
+        if len(flat) and (flat.min() < 0 or flat.max() >= n):
+            raise KeyError(flat.min() if flat.min() < 0 else flat.max())
+        counts, nbrs, halfedges, _ = halfedges_from_faces_numpy(flat, sizes, n)
+        if self._storage == 'array':
+            self.vertex.load(n, xyz.reshape(-1))
+            self.halfedge.load(counts, nbrs, halfedges)
+            self.face.load(sizes, flat)
+            self.facedata.load(len(sizes))
+        else:
+            # the keys are shared by all containers, as when the faces are added one by one,
+            # instead of creating a new integer object for every reference
+            # (a missing face, stored as -1, maps to the trailing None)
+            keys = list(range(n))
+            fkeys = list(range(len(sizes)))
+            fkeys.append(None)
+            items = zip([keys[v] for v in nbrs.tolist()], [fkeys[f] for f in halfedges.tolist()])
+            self.halfedge = {key: dict(islice(items, count)) for key, count in zip(keys, counts.tolist())}
+            self.vertex = {key: {'x': x, 'y': y, 'z': z} for key, (x, y, z) in zip(keys, xyz.tolist())}
+            vertices = iter([keys[v] for v in flat.tolist()])
+            self.face = {fkey: list(islice(vertices, size)) for fkey, size in zip(fkeys, sizes.tolist())}
+            self.facedata = {fkey: {} for fkey in fkeys[:-1]}
+        self._edge_index = None
+        self._vertex_order = None
+        self._max_int_key = n - 1
+        self._max_int_fkey = len(sizes) - 1
+
     # --------------------------------------------------------------------------
     # modifiers
     # --------------------------------------------------------------------------
@@ -682,6 +1081,7 @@ class HalfEdge(Datastructure):
         >>>
         """
         nbrs = self.vertex_neighbors(key)
+        edges = self._attached_edges([key] + nbrs)
         for nbr in nbrs:
             fkey = self.halfedge[key][nbr]
             if fkey is None:
@@ -708,6 +1108,8 @@ class HalfEdge(Datastructure):
                         del self.edgedata[n, nbr]
         del self.halfedge[key]
         del self.vertex[key]
+        self._update_edge_index(nbrs, edges)
+        self._vertex_order = None
 
     def delete_face(self, fkey):
         """Delete a face from the mesh object.
@@ -732,6 +1134,7 @@ class HalfEdge(Datastructure):
             if self.halfedge[v][u] is None:
                 del self.halfedge[u][v]
                 del self.halfedge[v][u]
+                self._remove_edge_from_index(u, v)
                 if (u, v) in self.edgedata:
                     del self.edgedata[u, v]
                 if (v, u) in self.edgedata:
@@ -825,19 +1228,26 @@ class HalfEdge(Datastructure):
         -------
         >>>
         """
+        if isinstance(self.halfedge, HalfEdgeArrayStore):
+            edges = self.halfedge.edges()
+        else:
+            edges = self._edges()
+        for key in edges:
+            if not data:
+                yield key
+            else:
+                yield key, self.edge_attributes(key)
+
+    def _edges(self):
+        halfedge = self.halfedge
         seen = set()
-        for u in self.halfedge:
-            for v in self.halfedge[u]:
-                key = u, v
-                ikey = v, u
-                if key in seen or ikey in seen:
+        for u in halfedge:
+            for v in halfedge[u]:
+                # the edge was yielded already from the other vertex
+                if v in seen and u in halfedge[v]:
                     continue
-                seen.add(key)
-                seen.add(ikey)
-                if not data:
-                    yield key
-                else:
-                    yield key, self.edge_attributes(key)
+                yield u, v
+            seen.add(u)
 
     def vertices_where(self, conditions, data=False):
         """Get vertices for which a certain condition or set of conditions is true.
@@ -1132,11 +1542,15 @@ class HalfEdge(Datastructure):
         ----
         Named arguments overwrite correpsonding key-value pairs in the attribute dictionary,
         if they exist.
+
+        With array storage, attributes with a numerical or boolean default value
+        are stored in typed columns.
         """
         if not attr_dict:
             attr_dict = {}
         attr_dict.update(kwattr)
         self.default_vertex_attributes.update(attr_dict)
+        self._init_columns(self.vertex, attr_dict)
 
     def vertex_attribute(self, key, name, value=None):
         """Get or set an attribute of a vertex.
@@ -1233,10 +1647,11 @@ class HalfEdge(Datastructure):
         if not names:
             # return all vertex attributes as a dict
             return VertexAttributeView(self.default_vertex_attributes, self.vertex[key])
+        attr = self.vertex[key]
         values = []
         for name in names:
-            if name in self.vertex[key]:
-                values.append(self.vertex[key][name])
+            if name in attr:
+                values.append(attr[name])
             elif name in self.default_vertex_attributes:
                 values.append(self.default_vertex_attributes[name])
             else:
@@ -1271,9 +1686,10 @@ class HalfEdge(Datastructure):
             keys = self.vertices()
         if value is not None:
             for key in keys:
-                self.vertex_attribute(key, name, value)
+                self.vertex[key][name] = value
             return
-        return [self.vertex_attribute(key, name) for key in keys]
+        default = self.default_vertex_attributes.get(name)
+        return [self.vertex[key].get(name, default) for key in keys]
 
     def vertices_attributes(self, names=None, values=None, keys=None):
         """Get or set multiple attributes of multiple vertices.
@@ -1303,13 +1719,23 @@ class HalfEdge(Datastructure):
         KeyError
             If any of the vertices does not exist.
         """
-        if not keys:
+        all_keys = not keys
+        if all_keys:
             keys = self.vertices()
         if values is not None:
             for key in keys:
                 self.vertex_attributes(key, names, values)
             return
-        return [self.vertex_attributes(key, names) for key in keys]
+        if not names:
+            return [self.vertex_attributes(key) for key in keys]
+        defaults = [self.default_vertex_attributes.get(name) for name in names]
+        if isinstance(self.vertex, AttributeArrayStore):
+            return self.vertex.get_values(names, defaults, None if all_keys else keys)
+        rows = []
+        for key in keys:
+            attr = self.vertex[key]
+            rows.append([attr.get(name, default) for name, default in zip(names, defaults)])
+        return rows
 
     def update_default_face_attributes(self, attr_dict=None, **kwattr):
         """Update the default face attributes.
@@ -1326,11 +1752,15 @@ class HalfEdge(Datastructure):
         ----
         Named arguments overwrite correpsonding key-value pairs in the attribute dictionary,
         if they exist.
+
+        With array storage, attributes with a numerical or boolean default value
+        are stored in typed columns.
         """
         if not attr_dict:
             attr_dict = {}
         attr_dict.update(kwattr)
         self.default_face_attributes.update(attr_dict)
+        self._init_columns(self.facedata, attr_dict)
 
     def face_attribute(self, key, name, value=None):
         """Get or set an attribute of a face.
@@ -1466,7 +1896,14 @@ class HalfEdge(Datastructure):
             for key in keys:
                 self.face_attribute(key, name, value)
             return
-        return [self.face_attribute(key, name) for key in keys]
+        default = self.default_face_attributes.get(name)
+        values = []
+        for key in keys:
+            if key not in self.face:
+                raise KeyError(key)
+            attr = self.facedata.get(key)
+            values.append(default if attr is None else attr.get(name, default))
+        return values
 
     def faces_attributes(self, names=None, values=None, keys=None):
         """Get or set multiple attributes of multiple faces.
@@ -1710,6 +2147,151 @@ class HalfEdge(Datastructure):
             return
         return [self.edge_attributes(key, names) for key in keys]
 
+    def vertices_array(self, names='xyz', values=None, keys=None):
+        """Get or set multiple attributes of multiple vertices as a NumPy array.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            The names of the attributes.
+            Default is ``'xyz'``.
+        values : array-like, optional
+            The values of the attributes,
+            with one row per vertex and one column per attribute.
+            Default is ``None``.
+        keys : list of int, optional
+            A list of vertex identifiers.
+            Default is all vertices.
+
+        Returns
+        -------
+        array or None
+            A new array of shape ``(len(keys), len(names))`` with the attribute values,
+            or ``None`` if the function is used as a "setter".
+
+        Raises
+        ------
+        KeyError
+            If any of the vertices does not exist.
+
+        Notes
+        -----
+        With array storage, the attributes are read and written as entire columns.
+        The returned array is always a copy of the data of the mesh, and not a view,
+        because a view of the underlying buffers would prevent vertices from being added
+        for as long as the view exists.
+        Modifications of the array have to be written back to the mesh
+        by using the function as a "setter".
+        With array storage, ``mesh.vertex.view_xyz()`` is a view of the coordinates without a copy,
+        but no vertices can be added as long as it exists.
+
+        Examples
+        --------
+        >>> mesh = Mesh(storage='array')
+        >>> mesh.update_default_vertex_attributes(q=1.0)
+        >>> a = mesh.add_vertex(x=0.0, y=0.0, z=0.0)
+        >>> b = mesh.add_vertex(x=1.0, y=0.0, z=0.0)
+        >>> xyz = mesh.vertices_array('xyz')
+        >>> xyz[:, 2] += 1.0
+        >>> mesh.vertices_array('xyz', xyz)
+        >>> mesh.vertex_coordinates(b)
+        [1.0, 0.0, 1.0]
+        >>> mesh.vertices_array(['q'], [[2.0], [3.0]])
+        >>> mesh.vertex_attribute(b, 'q')
+        3.0
+
+        """
+        if keys is None and self._storage == 'dict':
+            keys = list(self.vertices())
+        if values is not None:
+            set_attributes_array(self.vertex, names, values, keys)
+            return
+        return get_attributes_array(self.vertex, names, self.default_vertex_attributes, keys)
+
+    def faces_array(self, names, values=None, keys=None):
+        """Get or set multiple attributes of multiple faces as a NumPy array.
+
+        Parameters
+        ----------
+        names : list of str
+            The names of the attributes.
+        values : array-like, optional
+            The values of the attributes,
+            with one row per face and one column per attribute.
+            Default is ``None``.
+        keys : list of int, optional
+            A list of face identifiers.
+            Default is all faces.
+
+        Returns
+        -------
+        array or None
+            A new array of shape ``(len(keys), len(names))`` with the attribute values,
+            or ``None`` if the function is used as a "setter".
+
+        Raises
+        ------
+        KeyError
+            If any of the faces does not exist.
+
+        Notes
+        -----
+        With array storage, the attributes are read and written as entire columns.
+        The returned array is always a copy of the data of the mesh, and not a view.
+        Modifications of the array have to be written back to the mesh
+        by using the function as a "setter".
+
+        """
+        if keys is None and (self._storage == 'dict' or len(self.facedata) != len(self.face)):
+            keys = list(self.faces())
+        if values is not None:
+            set_attributes_array(self.facedata, names, values, keys)
+            return
+        return get_attributes_array(self.facedata, names, self.default_face_attributes, keys)
+
+    def edges_array(self, names, values=None, keys=None):
+        """Get or set multiple attributes of multiple edges as a NumPy array.
+
+        Parameters
+        ----------
+        names : list of str
+            The names of the attributes.
+        values : array-like, optional
+            The values of the attributes,
+            with one row per edge and one column per attribute.
+            Default is ``None``.
+        keys : list of 2-tuple of int, optional
+            A list of edge identifiers.
+            Default is all edges.
+
+        Returns
+        -------
+        array or None
+            A new array of shape ``(len(keys), len(names))`` with the attribute values,
+            or ``None`` if the function is used as a "setter".
+
+        Raises
+        ------
+        KeyError
+            If any of the edges does not exist.
+
+        Notes
+        -----
+        The attributes of the edges are collected edge by edge,
+        and the returned array is a copy of the data of the mesh.
+
+        """
+        from numpy import asarray
+        from numpy import broadcast_to
+        names = list(names)
+        if keys is None:
+            keys = list(self.edges())
+        if values is None:
+            return asarray(self.edges_attributes(names, keys=keys)).reshape((-1, len(names)))
+        values = broadcast_to(asarray(values).reshape((-1, len(names))), (len(keys), len(names)))
+        for key, row in zip(keys, values.tolist()):
+            self.edge_attributes(key, names, row)
+
     # --------------------------------------------------------------------------
     # mesh info
     # --------------------------------------------------------------------------
@@ -1720,7 +2302,9 @@ class HalfEdge(Datastructure):
 
     def number_of_edges(self):
         """Count the number of edges in the mesh."""
-        return len(list(self.edges()))
+        if self._edge_index is not None:
+            return len(self._edge_index)
+        return sum(1 for _ in self.edges())
 
     def number_of_faces(self):
         """Count the number of faces in the mesh."""
@@ -2178,25 +2762,35 @@ class HalfEdge(Datastructure):
     # edge topology
     # --------------------------------------------------------------------------
 
-    def has_edge(self, key):
+    def has_edge(self, key, directed=True):
         """Verify that the mesh contains a specific edge.
 
-        Warning
-        -------
-        This method may produce unexpected results.
-
         Parameters
         ----------
         key : tuple of int
             The identifier of the edge.
+        directed : bool, optional
+            Take into account the direction of the edge.
+            If ``True``, the key has to match the orientation of the edge
+            as it is returned by :meth:`edges`.
+            Default is ``True``.
 
         Returns
         -------
         bool
             True if the edge exists.
             False otherwise.
+
+        Notes
+        -----
+        This is a constant time operation.
         """
-        return key in set(self.edges())
+        u, v = key
+        if u not in self.halfedge or v not in self.halfedge[u]:
+            return False
+        if not directed or u not in self.halfedge[v]:
+            return True
+        return self._vertex_position(u) <= self._vertex_position(v)
 
     def has_halfedge(self, key):
         """Verify that a halfedge is part of the mesh.
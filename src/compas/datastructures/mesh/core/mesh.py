@@ -5,6 +5,7 @@ from __future__ import print_function
 import collections
 import sys
 from collections import OrderedDict
+from itertools import islice
 from math import pi
 
 from compas.datastructures.mesh.core.halfedge import HalfEdge
@@ -12,7 +13,9 @@ from compas.datastructures.mesh.core.halfedge import HalfEdge
 from compas.files import OBJ
 from compas.files import OFF
 from compas.files import PLY
+from compas.files import PLYWriter
 from compas.files import STL
+from compas.files import STLWriter
 
 from compas.geometry import Polyhedron
 from compas.geometry import angle_points
@@ -45,6 +48,13 @@ __all__ = ['BaseMesh']
 class BaseMesh(HalfEdge):
     """Geometric implementation of a half edge data structure for polygon meshses.
 
+    Parameters
+    ----------
+    storage : {'dict', 'array'}, optional
+        The storage engine for vertices, faces and halfedges.
+        Use ``'array'`` for compact, array-backed storage of large meshes.
+        Default is ``'dict'``.
+
     Attributes
     ----------
     attributes : dict
@@ -96,8 +106,8 @@ class BaseMesh(HalfEdge):
 
     __module__ = 'compas.datastructures'
 
-    def __init__(self):
-        super(BaseMesh, self).__init__()
+    def __init__(self, storage=None):
+        super(BaseMesh, self).__init__(storage=storage)
         self.attributes.update({'name': 'Mesh'})
         self.default_vertex_attributes.update({'x': 0.0, 'y': 0.0, 'z': 0.0})
 
@@ -114,7 +124,7 @@ class BaseMesh(HalfEdge):
     # --------------------------------------------------------------------------
 
     @classmethod
-    def from_obj(cls, filepath, precision=None):
+    def from_obj(cls, filepath, precision=None, weld=True, low_memory=False):
         """Construct a mesh object from the data described in an OBJ file.
 
         Parameters
@@ -123,6 +133,12 @@ class BaseMesh(HalfEdge):
             The path to the file.
         precision: str, optional
             The precision of the geometric map that is used to connect the lines.
+        weld : bool, optional
+            If ``False``, the vertices are not welded.
+            Default is ``True``.
+        low_memory : bool, optional
+            If ``True``, the file is read into flat arrays instead of lists (see :class:`compas.files.OBJReader`).
+            Default is ``False``.
 
         Returns
         -------
@@ -144,13 +160,13 @@ class BaseMesh(HalfEdge):
         --------
         >>>
         """
-        obj = OBJ(filepath, precision)
+        obj = OBJ(filepath, precision, weld=weld, low_memory=low_memory)
         obj.read()
         vertices = obj.vertices
         faces = obj.faces
         edges = obj.lines
-        if faces:
-            return cls.from_vertices_and_faces(vertices, faces)
+        if len(faces):
+            return cls.from_vertices_and_faces(vertices, faces, offsets=obj.parser.face_offsets)
         if edges:
             lines = [(vertices[u], vertices[v], 0) for u, v in edges]
             return cls.from_lines(lines)
@@ -198,8 +214,11 @@ class BaseMesh(HalfEdge):
         Mesh :
             A mesh object.
 
-        Note
-        ----
+        Notes
+        -----
+        Properties of the vertices other than the coordinates,
+        and scalar properties of the faces, are added as vertex and face attributes.
+
         There are a few sample files available for testing and debugging:
 
         * bunny.ply
@@ -215,22 +234,104 @@ class BaseMesh(HalfEdge):
 
         """
         ply = PLY(filepath)
-        vertices = ply.parser.vertices
-        faces = ply.parser.faces
-        mesh = cls.from_vertices_and_faces(vertices, faces)
+        parser = ply.parser
+        if parser.vertices_array is not None and parser.faces_array is not None:
+            mesh = cls.from_vertices_and_faces(parser.vertices_array, parser.faces_array)
+        else:
+            mesh = cls.from_vertices_and_faces(parser.vertices, parser.faces)
+        for name, values in parser.vertex_attributes.items():
+            if hasattr(values, 'tolist'):
+                values = values.tolist()
+            for key, value in zip(mesh.vertices(), values):
+                mesh.vertex_attribute(key, name, value)
+        if mesh.number_of_faces() == len(parser.faces):
+            for name, values in parser.face_attributes.items():
+                if hasattr(values, 'tolist'):
+                    values = values.tolist()
+                for fkey, value in zip(mesh.faces(), values):
+                    mesh.face_attribute(fkey, name, value)
         return mesh
 
-    def to_ply(self, filepath):
-        raise NotImplementedError
+    def to_ply(self, filepath, format='binary_little_endian', vertex_attributes=None, face_attributes=None):
+        """Write the mesh to a PLY file.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        format : {'binary_little_endian', 'binary_big_endian', 'ascii'}, optional
+            The format of the file.
+            Default is ``'binary_little_endian'``.
+        vertex_attributes : list of str, optional
+            The vertex attributes that are written as properties of the vertices, in addition to the coordinates.
+            Default is ``None``, in which case all default vertex attributes with numerical or boolean values are written.
+        face_attributes : list of str, optional
+            The face attributes that are written as properties of the faces.
+            Default is ``None``, in which case all default face attributes with numerical or boolean values are written.
+
+        Raises
+        ------
+        ValueError
+            If the values of a requested attribute are not all numbers or booleans.
+
+        Notes
+        -----
+        Boolean attributes are written as ``uchar``, integer attributes as ``int``, and other numbers as ``double``.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            import compas
+            from compas.datastructures import Mesh
+
+            mesh = Mesh.from_obj(compas.get('faces.obj'))
+            mesh.update_default_vertex_attributes(is_fixed=False)
+            mesh.to_ply('faces.ply')
+
+        """
+        key_index = self.key_index()
+        xyz = self.vertices_attributes('xyz')
+        properties = [(name, 'double', [point[i] for point in xyz]) for i, name in enumerate('xyz')]
+        names = vertex_attributes
+        if names is None:
+            names = [name for name in self.default_vertex_attributes if name not in ('x', 'y', 'z')]
+        for name in names:
+            values = self.vertices_attribute(name)
+            ptype = PLYWriter.property_type(values)
+            if ptype is None and vertex_attributes is None:
+                continue
+            properties.append((name, ptype, values))
+        writer = PLYWriter(filepath, format=format)
+        writer.add_element('vertex', properties)
+
+        faces = [[key_index[key] for key in self.face_vertices(fkey)] for fkey in self.faces()]
+        count = 'uchar' if max([len(face) for face in faces] or [0]) < 256 else 'int'
+        properties = [('vertex_indices', 'list {} int'.format(count), faces)]
+        names = face_attributes
+        if names is None:
+            names = list(self.default_face_attributes)
+        for name in names:
+            values = self.faces_attribute(name)
+            ptype = PLYWriter.property_type(values)
+            if ptype is None and face_attributes is None:
+                continue
+            properties.append((name, ptype, values))
+        writer.add_element('face', properties)
+        writer.write()
 
     @classmethod
-    def from_stl(cls, filepath):
+    def from_stl(cls, filepath, precision=None):
         """Construct a mesh object from the data described in a STL file.
 
         Parameters
         ----------
         filepath : str
             The path to the file.
+        precision : str, optional
+            The precision with which the vertices of the facets are welded.
+            Default is ``None``, in which case the vertices of binary files are welded
+            if their coordinates are identical (see :class:`compas.files.STLParser`).
 
         Returns
         -------
@@ -248,14 +349,72 @@ class BaseMesh(HalfEdge):
         --------
         >>>
         """
-        stl = STL(filepath)
+        stl = STL(filepath, precision)
+        if stl.parser.vertices_array is not None:
+            return cls.from_vertices_and_faces(stl.parser.vertices_array, stl.parser.faces_array)
         vertices = stl.parser.vertices
         faces = stl.parser.faces
         mesh = cls.from_vertices_and_faces(vertices, faces)
         return mesh
 
-    def to_stl(self, filepath):
-        raise NotImplementedError
+    def to_stl(self, filepath, binary=True, precision=None, chunk_size=100000):
+        """Write the mesh to an STL file.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        binary : bool, optional
+            If ``True``, the file is written in the binary format.
+            Default is ``True``.
+        precision : str, optional
+            The precision of the coordinates in an ASCII file.
+            Default is ``None``, in which case the default of :class:`compas.files.STLWriter` is used.
+        chunk_size : int, optional
+            The number of faces that are written at once.
+            Default is ``100000``.
+
+        Notes
+        -----
+        Faces with more than three vertices are split into triangles around their first vertex,
+        which is only correct for convex faces.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            import compas
+            from compas.datastructures import Mesh
+
+            mesh = Mesh.from_obj(compas.get('faces.obj'))
+            mesh.to_stl('faces.stl')
+
+        """
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        key_index = self.key_index()
+        if numpy is not None:
+            xyz = self.vertices_array('xyz')
+            lookup = numpy.zeros(max(key_index or [0]) + 1, dtype=int)
+            lookup[list(key_index.keys())] = list(key_index.values())
+        else:
+            xyz = self.vertices_attributes('xyz')
+
+        fkeys = iter(self.faces())
+        with STLWriter(filepath, binary=binary, precision=precision) as writer:
+            while True:
+                faces = [self.face_vertices(fkey) for fkey in islice(fkeys, chunk_size)]
+                if not faces:
+                    break
+                triangles = faces
+                if set(map(len, faces)) != {3}:
+                    triangles = [(face[0], face[i], face[i + 1]) for face in faces for i in range(1, len(face) - 1)]
+                if numpy is not None:
+                    writer.write_triangles(xyz[lookup[numpy.asarray(triangles, dtype=int).reshape((-1, 3))]])
+                else:
+                    writer.write_triangles([[xyz[key_index[key]] for key in triangle] for triangle in triangles])
 
     @classmethod
     def from_off(cls, filepath):
@@ -363,32 +522,55 @@ class BaseMesh(HalfEdge):
         raise NotImplementedError
 
     @classmethod
-    def from_vertices_and_faces(cls, vertices, faces):
+    def from_vertices_and_faces(cls, vertices, faces, offsets=None, storage=None):
         """Construct a mesh object from a list of vertices and faces.
 
         Parameters
         ----------
-        vertices : list, dict
+        vertices : list, dict, array
             A list of vertices, represented by their XYZ coordinates,
-            or a dictionary of vertex keys pointing to their XYZ coordinates.
-        faces : list, dict
+            or a dictionary of vertex keys pointing to their XYZ coordinates,
+            or an array of XYZ coordinates.
+        faces : list, dict, array
             A list of faces, represented by a list of indices referencing the list of vertex coordinates,
-            or a dictionary of face keys pointing to a list of indices referencing the list of vertex coordinates.
+            or a dictionary of face keys pointing to a list of indices referencing the list of vertex coordinates,
+            or an array of faces with the same number of vertices.
+            If ``offsets`` is provided, a flat list or array with the vertex indices of all faces.
+        offsets : list, array, optional
+            The start of every face in the flat list of vertex indices,
+            optionally followed by the total number of vertex indices.
+            Use this to provide faces with different numbers of vertices in one flat list.
+        storage : {'dict', 'array'}, optional
+            The storage engine of the mesh.
+            Default is ``'dict'``.
 
         Returns
         -------
         Mesh
             A mesh object.
 
+        Notes
+        -----
+        If the vertices and faces are not provided as dictionaries, the mesh is
+        constructed in bulk, which is significantly faster for large meshes if NumPy is available.
+        The result is the same as adding the vertices and faces one by one.
+
         Examples
         --------
-        >>>
+        >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0], [2.0, 0.0, 0.0]]
+        >>> mesh = Mesh.from_vertices_and_faces(vertices, [0, 1, 2, 3, 1, 4, 2], offsets=[0, 4])
+        >>> mesh.face_vertices(1)
+        [1, 4, 2]
+
         """
-        mesh = cls()
+        mesh = cls() if storage is None else cls(storage=storage)
         if sys.version_info[0] < 3:
             mapping = collections.Mapping
         else:
             mapping = collections.abc.Mapping
+        if not isinstance(vertices, mapping) and not isinstance(faces, mapping):
+            mesh._add_vertices_and_faces(vertices, faces, offsets)
+            return mesh
         if isinstance(vertices, mapping):
             for key, xyz in vertices.items():
                 mesh.add_vertex(key=key, attr_dict={i: j for i, j in zip(['x', 'y', 'z'], xyz)})
@@ -494,6 +676,53 @@ class BaseMesh(HalfEdge):
         faces = delaunay_from_points(points, boundary=boundary, holes=holes)
         return cls.from_vertices_and_faces(points, faces)
 
+    @classmethod
+    def from_convex_hull(cls, points):
+        """Construct a mesh from the convex hull of a set of points.
+
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the points.
+
+        Returns
+        -------
+        Mesh
+            A mesh object.
+            The vertices of the mesh are the points on the hull,
+            with the index of the point in the list as key.
+
+        Notes
+        -----
+        If the points are coplanar, the mesh is the (triangulated) convex polygon of the points,
+        with every face added in only one of the orientations returned by
+        :func:`compas.geometry.convex_hull`.
+
+        Examples
+        --------
+        >>> points = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [0.1, 0.1, 0.1]]
+        >>> mesh = Mesh.from_convex_hull(points)
+        >>> sorted(mesh.vertices())
+        [0, 1, 2, 3]
+        >>> mesh.number_of_faces()
+        4
+        """
+        from compas.geometry import convex_hull
+        faces = convex_hull(points)
+        mesh = cls()
+        for key in sorted(set(key for face in faces for key in face)):
+            x, y, z = points[key][:3]
+            mesh.add_vertex(key, x=x, y=y, z=z)
+        seen = set()
+        for face in faces:
+            # the hull of coplanar points contains every face with both orientations
+            key = frozenset(face)
+            if key in seen:
+                continue
+            seen.add(key)
+            mesh.add_face(face)
+        return mesh
+
     def to_points(self):
         raise NotImplementedError
 
@@ -731,7 +960,8 @@ class BaseMesh(HalfEdge):
         list
             Coordinates of the vertex.
         """
-        return [self.vertex[key][axis] for axis in axes]
+        attr = self.vertex[key]
+        return [attr[axis] for axis in axes]
 
     def vertex_area(self, key):
         """Compute the tributary area of a vertex.
@@ -52,7 +52,9 @@ def mesh_add_vertex_to_face_edge(mesh, key, fkey, v):
     vertices = mesh.face_vertices(fkey)
     i = vertices.index(v)
     u = vertices[i - 1]
+    edges = mesh._attached_edges([key, u, v])
     vertices.insert(key, i - 1)
+    mesh.face[fkey] = vertices
     mesh.halfedge[u][key] = fkey
     mesh.halfedge[key][v] = fkey
     if u not in mesh.halfedge[key]:
@@ -66,6 +68,7 @@ def mesh_add_vertex_to_face_edge(mesh, key, fkey, v):
         del mesh.edgedata[u, v]
     if (v, u) in mesh.edgedata:
         del mesh.edgedata[v, u]
+    mesh._update_edge_index([key, u, v], edges)
 
 
 def mesh_insert_vertex_on_edge(mesh, u, v, vkey=None):
@@ -52,6 +52,8 @@ def mesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
         if fkey_uv is None or fkey_vu is None:
             return
 
+    edges = mesh._attached_edges([u, v])
+
     # coordinates
     x, y, z = mesh.edge_point(u, v, t)
 
@@ -65,8 +67,9 @@ def mesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
 
     # update the UV face if it is not the `None` face
     if fkey_uv is not None:
-        j = mesh.face[fkey_uv].index(v)
-        mesh.face[fkey_uv].insert(j, w)
+        vertices = mesh.face[fkey_uv]
+        vertices.insert(vertices.index(v), w)
+        mesh.face[fkey_uv] = vertices
 
     # split half-edge VU
     mesh.halfedge[v][w] = fkey_vu
@@ -75,8 +78,11 @@ def mesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
 
     # update the VU face if it is not the `None` face
     if fkey_vu is not None:
-        i = mesh.face[fkey_vu].index(u)
-        mesh.face[fkey_vu].insert(i, w)
+        vertices = mesh.face[fkey_vu]
+        vertices.insert(vertices.index(u), w)
+        mesh.face[fkey_vu] = vertices
+
+    mesh._update_edge_index([u, v, w], edges)
 
     return w
 
@@ -121,6 +127,8 @@ def trimesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
         if fkey_uv is None or fkey_vu is None:
             return
 
+    edges = mesh._attached_edges([u, v])
+
     # coordinates
     x, y, z = mesh.edge_point(u, v, t)
 
@@ -153,6 +161,8 @@ def trimesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
         del mesh.halfedge[v][u]
         del mesh.face[fkey_vu]
 
+    mesh._update_edge_index([u, v, w], edges)
+
     # return the key of the split vertex
     return w
 
@@ -54,6 +54,7 @@ def trimesh_swap_edge(mesh, u, v, allow_boundary=True):
     # delete the current half-edge
     del mesh.halfedge[u][v]
     del mesh.halfedge[v][u]
+    mesh._remove_edge_from_index(u, v)
 
     # delete the adjacent faces
     del mesh.face[fkey_uv]
@@ -39,6 +39,8 @@ def mesh_unweld_vertices(mesh, fkey, where=None):
     if not where:
         where = vertices
 
+    edges = mesh._attached_edges(vertices)
+
     for u, v in pairwise(vertices + vertices[0:1]):
         if u in where:
             x, y, z = mesh.vertex_coordinates(u)
@@ -48,6 +50,7 @@ def mesh_unweld_vertices(mesh, fkey, where=None):
         face.append(u)
 
     mesh.add_face(face, fkey=fkey)
+    mesh._update_edge_index(vertices + face, edges)
 
     return face
 
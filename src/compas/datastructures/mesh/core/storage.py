@@ -0,0 +1,1169 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+from array import array
+from math import isnan
+
+
+__all__ = [
+    'AttributeArrayStore',
+    'VertexArrayStore',
+    'FaceArrayStore',
+    'HalfEdgeArrayStore',
+]
+
+
+NONE = -1
+NAN = float('nan')
+XYZ = {'x': 0, 'y': 1, 'z': 2}
+
+
+class BlockArray(object):
+    """Variable-length integer blocks stored in flat arrays.
+
+    Every row of the block array owns a contiguous block of slots in one or more
+    parallel integer arrays (a CSR-style layout with some slack per row).
+    The row identifiers are used directly as indices into the offset, count and
+    capacity arrays.
+
+    Parameters
+    ----------
+    width : int, optional
+        The number of parallel data arrays.
+        Default is ``1``.
+
+    Notes
+    -----
+    When a block runs out of capacity, it is relocated to the end of the data arrays.
+    The space left behind is reclaimed by :meth:`compact`, which is triggered
+    automatically when more than half of the data arrays is unused.
+
+    """
+
+    def __init__(self, width=1):
+        self.offset = array('l')
+        self.count = array('l')
+        self.capacity = array('l')
+        self.data = [array('l') for _ in range(width)]
+        self.size = 0
+        self.garbage = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (row for row, start in enumerate(self.offset) if start != NONE)
+
+    def has(self, row):
+        try:
+            return row >= 0 and self.offset[row] != NONE
+        except (IndexError, TypeError):
+            return False
+
+    def reserve(self, row):
+        n = row + 1 - len(self.offset)
+        if n > 0:
+            n = max(n, len(self.offset) // 8)
+            self.offset.extend(array('l', [NONE]) * n)
+            self.count.extend(array('l', [0]) * n)
+            self.capacity.extend(array('l', [0]) * n)
+
+    def add(self, row, capacity=0):
+        if row < 0:
+            raise ValueError('Only non-negative integer keys are supported: {}'.format(row))
+        if row >= len(self.offset):
+            self.reserve(row)
+        if self.offset[row] != NONE:
+            self.count[row] = 0
+            return
+        self.offset[row] = len(self.data[0])
+        self.count[row] = 0
+        self.capacity[row] = capacity
+        if capacity:
+            padding = array('l', [0]) * capacity
+            for column in self.data:
+                column.extend(padding)
+        self.size += 1
+
+    def remove(self, row):
+        if not self.has(row):
+            raise KeyError(row)
+        self.garbage += self.capacity[row]
+        self.offset[row] = NONE
+        self.count[row] = 0
+        self.capacity[row] = 0
+        self.size -= 1
+        self._maybe_compact()
+
+    def block(self, row, column=0):
+        start = self.offset[row]
+        return self.data[column][start:start + self.count[row]]
+
+    def find(self, row, value):
+        start = self.offset[row]
+        column = self.data[0]
+        for i in range(start, start + self.count[row]):
+            if column[i] == value:
+                return i
+        return NONE
+
+    def append(self, row, *values):
+        n = self.count[row]
+        if n == self.capacity[row]:
+            self._relocate(row, max(4, 2 * n))
+        i = self.offset[row] + n
+        for column, value in zip(self.data, values):
+            column[i] = value
+        self.count[row] = n + 1
+
+    def pop(self, row, i):
+        start = self.offset[row]
+        end = start + self.count[row]
+        for column in self.data:
+            column[i:end - 1] = column[i + 1:end]
+        self.count[row] -= 1
+
+    def assign(self, row, *blocks):
+        n = len(blocks[0])
+        if n > self.capacity[row]:
+            self._relocate(row, n)
+        start = self.offset[row]
+        for column, block in zip(self.data, blocks):
+            column[start:start + n] = array('l', block)
+        self.count[row] = n
+
+    def clear(self):
+        self.__init__(len(self.data))
+
+    def load(self, counts, *columns):
+        """Replace the contents by consecutive rows ``0, 1, ..., n - 1``.
+
+        Parameters
+        ----------
+        counts : sequence of int
+            The number of values in every row.
+        columns : sequence of int
+            The values of all rows, one sequence per data array.
+
+        """
+        self.count = to_array('l', counts)
+        self.capacity = array('l', self.count)
+        if hasattr(counts, 'cumsum'):
+            self.offset = to_array('l', counts.cumsum() - counts)
+        else:
+            self.offset = array('l', [0]) * len(self.count)
+            total = 0
+            for row, n in enumerate(self.count):
+                self.offset[row] = total
+                total += n
+        self.data = [to_array('l', column) for column in columns]
+        self.size = len(self.count)
+        self.garbage = 0
+
+    def compact(self):
+        """Remove the unused slots from the data arrays."""
+        data = [array('l') for _ in self.data]
+        offset = self.offset
+        count = self.count
+        for row in range(len(offset)):
+            start = offset[row]
+            if start == NONE:
+                continue
+            n = count[row]
+            offset[row] = len(data[0])
+            for new, old in zip(data, self.data):
+                new.extend(old[start:start + n])
+            self.capacity[row] = n
+        self.data = data
+        self.garbage = 0
+
+    def _relocate(self, row, capacity):
+        # compaction resets the capacity of every row to its count,
+        # therefore it has to happen before the row is moved, and not after
+        self._maybe_compact(self.capacity[row])
+        start = self.offset[row]
+        n = self.count[row]
+        self.garbage += self.capacity[row]
+        self.offset[row] = len(self.data[0])
+        self.capacity[row] = capacity
+        padding = array('l', [0]) * (capacity - n)
+        for column in self.data:
+            column.extend(column[start:start + n])
+            column.extend(padding)
+
+    def _maybe_compact(self, pending=0):
+        garbage = self.garbage + pending
+        if garbage > 1024 and 2 * garbage > len(self.data[0]):
+            self.compact()
+
+
+def to_array(typecode, values):
+    """Convert a sequence of numbers, or a NumPy array, to a typed array.
+
+    Parameters
+    ----------
+    typecode : {'d', 'l'}
+        The typecode of the array.
+    values : sequence
+        The values.
+
+    Returns
+    -------
+    array.array
+        The typed array.
+
+    """
+    data = array(typecode)
+    if hasattr(values, 'dtype'):
+        dtype = '{}{}'.format('f' if typecode == 'd' else 'i', data.itemsize)
+        data.frombytes(values.astype(dtype).tobytes())
+    else:
+        data.extend(values)
+    return data
+
+
+def typecode_of(value):
+    """Find the typecode of the column that can hold a value.
+
+    Parameters
+    ----------
+    value : object
+        The value.
+
+    Returns
+    -------
+    str or None
+        ``'b'`` for booleans, ``'l'`` for integers, ``'d'`` for floats,
+        or ``None`` if the value cannot be stored in a typed column.
+
+    """
+    if isinstance(value, bool):
+        return 'b'
+    if isinstance(value, int):
+        return 'l'
+    if isinstance(value, float):
+        return 'd'
+    return None
+
+
+class Column(object):
+    """Typed array of attribute values with a mask of the values that were set.
+
+    Parameters
+    ----------
+    typecode : {'d', 'l', 'b'}
+        The typecode of the values.
+    size : int
+        The number of rows.
+
+    """
+
+    __slots__ = ('typecode', 'values', 'mask')
+
+    def __init__(self, typecode, size=0):
+        self.typecode = typecode
+        self.values = array(typecode, [0]) * size
+        self.mask = bytearray(size)
+
+    def __len__(self):
+        return len(self.mask)
+
+    def grow(self, n):
+        self.values.extend(array(self.typecode, [0]) * n)
+        self.mask.extend(bytearray(n))
+
+    def get(self, row):
+        if not self.mask[row]:
+            raise KeyError(row)
+        if self.typecode == 'b':
+            return bool(self.values[row])
+        return self.values[row]
+
+    def set(self, row, value):
+        if self.typecode == 'b' and not isinstance(value, bool):
+            raise TypeError('Only booleans can be stored in a boolean column.')
+        self.values[row] = value
+        self.mask[row] = 1
+
+    def unset(self, row):
+        if not self.mask[row]:
+            raise KeyError(row)
+        self.mask[row] = 0
+
+
+class AttributeArrayRow(collections.MutableMapping):
+    """Mutable mapping view of the attributes of one row of an attribute array store."""
+
+    __slots__ = ('store', 'key')
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+
+    def __getitem__(self, name):
+        column = self.store.columns.get(name)
+        if column is not None:
+            try:
+                return column.get(self.key)
+            except KeyError:
+                raise KeyError(name)
+        return self.store.attr[self.key][name]
+
+    def get(self, name, default=None):
+        column = self.store.columns.get(name)
+        if column is not None:
+            if not column.mask[self.key]:
+                return default
+            return column.get(self.key)
+        attr = self.store.attr.get(self.key)
+        if attr is None:
+            return default
+        return attr.get(name, default)
+
+    def __contains__(self, name):
+        column = self.store.columns.get(name)
+        if column is not None:
+            return column.mask[self.key] == 1
+        return name in self.store.attr.get(self.key, ())
+
+    def __setitem__(self, name, value):
+        self.store.set_value(self.key, name, value)
+
+    def __delitem__(self, name):
+        column = self.store.columns.get(name)
+        if column is not None:
+            try:
+                column.unset(self.key)
+            except KeyError:
+                raise KeyError(name)
+        else:
+            del self.store.attr[self.key][name]
+
+    def __iter__(self):
+        for name, column in list(self.store.columns.items()):
+            if column.mask[self.key]:
+                yield name
+        for name in list(self.store.attr.get(self.key, ())):
+            yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AttributeArrayStore(collections.MutableMapping):
+    """Columnar storage of the attributes of the elements of a data structure.
+
+    Every element is a row of the store, identified by a non-negative integer key.
+    Attributes with a column are stored in a typed array (see :class:`Column`).
+    All other attributes are stored sparsely, per row.
+
+    Notes
+    -----
+    Values that do not fit the type of their column,
+    cause the column to be converted back to sparse storage.
+
+    """
+
+    row_type = AttributeArrayRow
+
+    def __init__(self):
+        self.alive = bytearray()
+        self.columns = {}
+        self.attr = {}
+        self.size = 0
+
+    def __getitem__(self, key):
+        if not self.has(key):
+            raise KeyError(key)
+        return self.row_type(self, key)
+
+    def __setitem__(self, key, attr):
+        attr = dict(attr)
+        if key < 0:
+            raise ValueError('Only non-negative integer keys are supported: {}'.format(key))
+        n = key + 1 - len(self.alive)
+        if n > 0:
+            self.grow(n)
+        if self.alive[key]:
+            self.reset(key)
+        else:
+            self.alive[key] = 1
+            self.size += 1
+        for name, value in attr.items():
+            self.set_value(key, name, value)
+
+    def __delitem__(self, key):
+        if not self.has(key):
+            raise KeyError(key)
+        self.alive[key] = 0
+        self.reset(key)
+        self.size -= 1
+
+    def __contains__(self, key):
+        return self.has(key)
+
+    def __iter__(self):
+        return (key for key, alive in enumerate(self.alive) if alive)
+
+    def __len__(self):
+        return self.size
+
+    def has(self, key):
+        try:
+            return key >= 0 and self.alive[key] == 1
+        except (IndexError, TypeError):
+            return False
+
+    def is_dense(self):
+        """Verify that the keys of the rows are ``0, 1, ..., n - 1``."""
+        return self.size == len(self.alive)
+
+    def get_values(self, names, defaults, keys=None):
+        """Collect the values of named attributes of multiple rows, column by column.
+
+        Parameters
+        ----------
+        names : list of str
+            The names of the attributes.
+        defaults : list
+            The default value of every attribute.
+        keys : list of int, optional
+            The identifiers of the rows.
+            Default is all rows.
+
+        Returns
+        -------
+        list
+            A list of attribute values per row.
+
+        Raises
+        ------
+        KeyError
+            If any of the rows does not exist.
+
+        """
+        if keys is None:
+            keys = list(self)
+        else:
+            keys = list(keys)
+            for key in keys:
+                if not self.has(key):
+                    raise KeyError(key)
+        columns = [self.column_values(name, default, keys) for name, default in zip(names, defaults)]
+        return [list(row) for row in zip(*columns)]
+
+    def column_values(self, name, default, keys):
+        column = self.columns.get(name)
+        if column is not None:
+            values = column.values.tolist()
+            if column.typecode == 'b':
+                values = [bool(value) for value in values]
+            mask = column.mask
+            return [values[key] if mask[key] else default for key in keys]
+        attr = self.attr
+        return [attr[key].get(name, default) if key in attr else default for key in keys]
+
+    def grow(self, n):
+        self.alive.extend(bytearray(n))
+        for column in self.columns.values():
+            column.grow(n)
+
+    def reset(self, key):
+        for column in self.columns.values():
+            column.mask[key] = 0
+        self.attr.pop(key, None)
+
+    def clear(self):
+        self.__init__()
+
+    def load(self, n):
+        """Replace the contents by ``n`` rows without attributes, with keys ``0, 1, ..., n - 1``."""
+        columns = self.columns
+        self.clear()
+        self.grow(n)
+        self.alive = bytearray(b'\x01') * n
+        self.size = n
+        for name, column in columns.items():
+            self.columns[name] = Column(column.typecode, n)
+
+    def set_value(self, key, name, value):
+        column = self.columns.get(name)
+        if column is not None:
+            try:
+                column.set(key, value)
+                return
+            except (TypeError, OverflowError):
+                self.remove_column(name)
+        self.attr.setdefault(key, {})[name] = value
+
+    def add_column(self, name, typecode):
+        """Store an attribute in a typed column.
+
+        Parameters
+        ----------
+        name : str
+            The name of the attribute.
+        typecode : {'d', 'l', 'b'}
+            The type of the values of the attribute.
+
+        Returns
+        -------
+        bool
+            ``True`` if the column was created or already exists.
+            ``False`` if the existing values of the attribute don't fit the type of the column.
+
+        """
+        if name in self.columns:
+            return True
+        column = Column(typecode, len(self.alive))
+        try:
+            for key, attr in self.attr.items():
+                if name in attr:
+                    column.set(key, attr[name])
+        except (TypeError, OverflowError):
+            return False
+        for attr in self.attr.values():
+            attr.pop(name, None)
+        self.columns[name] = column
+        return True
+
+    def remove_column(self, name):
+        """Convert the values of a column back to sparse storage.
+
+        Parameters
+        ----------
+        name : str
+            The name of the attribute.
+
+        """
+        column = self.columns.pop(name)
+        for key in range(len(column)):
+            if column.mask[key]:
+                self.attr.setdefault(key, {})[name] = column.get(key)
+
+    def view(self, name):
+        """Construct a NumPy view of the values and the mask of a column.
+
+        Parameters
+        ----------
+        name : str
+            The name of the attribute.
+
+        Returns
+        -------
+        tuple
+            The values and the mask, with one entry per row, including deleted rows.
+
+        Notes
+        -----
+        The store cannot grow as long as the views exist.
+
+        """
+        from numpy import frombuffer
+        from numpy import uint8
+        column = self.columns[name]
+        values = frombuffer(memoryview(column.values), dtype=column.typecode)
+        if column.typecode == 'b':
+            values = values.view(bool)
+        return values, frombuffer(memoryview(column.mask), dtype=uint8)
+
+
+class VertexArrayRow(AttributeArrayRow):
+    """Mutable mapping view of the attributes of one vertex in a vertex array store."""
+
+    __slots__ = ()
+
+    def __getitem__(self, name):
+        if name in XYZ:
+            value = self.store.xyz[3 * self.key + XYZ[name]]
+            if isnan(value):
+                raise KeyError(name)
+            return value
+        return super(VertexArrayRow, self).__getitem__(name)
+
+    def get(self, name, default=None):
+        if name in XYZ:
+            value = self.store.xyz[3 * self.key + XYZ[name]]
+            return default if isnan(value) else value
+        return super(VertexArrayRow, self).get(name, default)
+
+    def __contains__(self, name):
+        if name in XYZ:
+            return not isnan(self.store.xyz[3 * self.key + XYZ[name]])
+        return super(VertexArrayRow, self).__contains__(name)
+
+    def __delitem__(self, name):
+        if name in XYZ:
+            i = 3 * self.key + XYZ[name]
+            if isnan(self.store.xyz[i]):
+                raise KeyError(name)
+            self.store.xyz[i] = NAN
+        else:
+            super(VertexArrayRow, self).__delitem__(name)
+
+    def __iter__(self):
+        xyz = self.store.xyz
+        i = 3 * self.key
+        for name in 'xyz':
+            if not isnan(xyz[i + XYZ[name]]):
+                yield name
+        for name in super(VertexArrayRow, self).__iter__():
+            yield name
+
+
+class VertexArrayStore(AttributeArrayStore):
+    """Array-backed storage of the vertices of a half-edge data structure.
+
+    The vertex coordinates are stored in one contiguous buffer of doubles,
+    with three consecutive values per vertex.
+    Other attributes are stored in typed columns, or sparsely, per vertex.
+    The vertex keys are used directly as row indices into the buffer,
+    and should therefore be non-negative integers.
+
+    Notes
+    -----
+    Coordinates that were never set are stored as ``NaN``,
+    such that lookups fall back on the default vertex attributes.
+    The vertices are iterated in order of increasing key.
+
+    """
+
+    row_type = VertexArrayRow
+
+    def __init__(self):
+        super(VertexArrayStore, self).__init__()
+        self.xyz = array('d')
+
+    def grow(self, n):
+        super(VertexArrayStore, self).grow(n)
+        self.xyz.extend(array('d', [NAN]) * (3 * n))
+
+    def reset(self, key):
+        super(VertexArrayStore, self).reset(key)
+        self.xyz[3 * key:3 * key + 3] = array('d', [NAN, NAN, NAN])
+
+    def load(self, n, xyz=None):
+        """Replace the contents by ``n`` vertices with keys ``0, 1, ..., n - 1``.
+
+        Parameters
+        ----------
+        n : int
+            The number of vertices.
+        xyz : sequence of float, optional
+            The flat list of coordinates, with three values per vertex.
+
+        """
+        super(VertexArrayStore, self).load(n)
+        if xyz is not None:
+            self.xyz = to_array('d', xyz)
+
+    def set_value(self, key, name, value):
+        if name in XYZ:
+            self.xyz[3 * key + XYZ[name]] = value
+        else:
+            super(VertexArrayStore, self).set_value(key, name, value)
+
+    def add_column(self, name, typecode):
+        if name in XYZ:
+            return True
+        return super(VertexArrayStore, self).add_column(name, typecode)
+
+    def column_values(self, name, default, keys):
+        if name in XYZ:
+            values = self.xyz.tolist()
+            i = XYZ[name]
+            values = [values[3 * key + i] for key in keys]
+            # NaN marks coordinates that were never set
+            return [default if value != value else value for value in values]
+        return super(VertexArrayStore, self).column_values(name, default, keys)
+
+    def view(self, name):
+        from numpy import frombuffer
+        from numpy import isnan as isnan_
+        if name in XYZ:
+            values = frombuffer(memoryview(self.xyz))[XYZ[name]::3]
+            return values, ~isnan_(values)
+        return super(VertexArrayStore, self).view(name)
+
+    def view_xyz(self):
+        """Construct a NumPy view of the vertex coordinates.
+
+        Returns
+        -------
+        array
+            The coordinates with one row per vertex, including deleted vertices.
+
+        Notes
+        -----
+        The store cannot grow as long as the view exists.
+
+        """
+        from numpy import frombuffer
+        return frombuffer(memoryview(self.xyz)).reshape((-1, 3))
+
+
+class FaceArrayStore(collections.MutableMapping):
+    """Array-backed storage of the faces of a half-edge data structure.
+
+    The vertex lists of all faces are stored in a flat integer array
+    with per-face offsets and counts (CSR layout).
+    The face keys are used directly as row indices,
+    and should therefore be non-negative integers.
+
+    Notes
+    -----
+    Looking up a face returns a new list of vertex keys.
+    Modifications of the face should therefore be made by assigning
+    a new vertex list to the face, rather than by modifying the list in place.
+
+    """
+
+    def __init__(self):
+        self.blocks = BlockArray(1)
+
+    def __getitem__(self, fkey):
+        blocks = self.blocks
+        try:
+            start = blocks.offset[fkey]
+        except (IndexError, TypeError):
+            raise KeyError(fkey)
+        if start == NONE or fkey < 0:
+            raise KeyError(fkey)
+        return blocks.data[0][start:start + blocks.count[fkey]].tolist()
+
+    def __setitem__(self, fkey, vertices):
+        vertices = list(vertices)
+        self.blocks.add(fkey, len(vertices))
+        self.blocks.assign(fkey, vertices)
+
+    def __delitem__(self, fkey):
+        if not self.has(fkey):
+            raise KeyError(fkey)
+        self.blocks.remove(fkey)
+
+    def __contains__(self, fkey):
+        return self.blocks.has(fkey)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def has(self, fkey):
+        return self.blocks.has(fkey)
+
+    def clear(self):
+        self.blocks.clear()
+
+    def load(self, sizes, vertices):
+        """Replace the contents by faces with keys ``0, 1, ..., n - 1``.
+
+        Parameters
+        ----------
+        sizes : sequence of int
+            The number of vertices of every face.
+        vertices : sequence of int
+            The vertices of all faces.
+
+        """
+        self.blocks.load(sizes, vertices)
+
+    def compact(self):
+        """Remove the unused slots from the underlying arrays."""
+        self.blocks.compact()
+
+
+class HalfEdgeArrayRow(collections.MutableMapping):
+    """Mutable mapping view of the outgoing halfedges of one vertex."""
+
+    __slots__ = ('blocks', 'u')
+
+    def __init__(self, blocks, u):
+        self.blocks = blocks
+        self.u = u
+
+    def __getitem__(self, v):
+        blocks = self.blocks
+        start = blocks.offset[self.u]
+        nbrs = blocks.data[0]
+        for i in range(start, start + blocks.count[self.u]):
+            if nbrs[i] == v:
+                fkey = blocks.data[1][i]
+                return None if fkey == NONE else fkey
+        raise KeyError(v)
+
+    def __setitem__(self, v, fkey):
+        if fkey is None:
+            fkey = NONE
+        i = self.blocks.find(self.u, v)
+        if i == NONE:
+            self.blocks.append(self.u, v, fkey)
+        else:
+            self.blocks.data[1][i] = fkey
+
+    def __delitem__(self, v):
+        i = self.blocks.find(self.u, v)
+        if i == NONE:
+            raise KeyError(v)
+        self.blocks.pop(self.u, i)
+
+    def __contains__(self, v):
+        return self.blocks.find(self.u, v) != NONE
+
+    def __iter__(self):
+        return iter(self.blocks.block(self.u).tolist())
+
+    def __len__(self):
+        return self.blocks.count[self.u]
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class HalfEdgeArrayStore(collections.MutableMapping):
+    """Array-backed storage of the halfedges of a half-edge data structure.
+
+    For every vertex, the neighbors and the faces of the corresponding halfedges
+    are stored in a block of two parallel integer arrays.
+    The outside face (``None``) is stored as ``-1``.
+
+    """
+
+    def __init__(self):
+        self.blocks = BlockArray(2)
+
+    def __getitem__(self, u):
+        if not self.blocks.has(u):
+            raise KeyError(u)
+        return HalfEdgeArrayRow(self.blocks, u)
+
+    def __setitem__(self, u, nbrs):
+        items = list(nbrs.items())
+        self.blocks.add(u, len(items))
+        self.blocks.assign(u, [v for v, _ in items], [NONE if fkey is None else fkey for _, fkey in items])
+
+    def __delitem__(self, u):
+        if not self.has(u):
+            raise KeyError(u)
+        self.blocks.remove(u)
+
+    def __contains__(self, u):
+        return self.blocks.has(u)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def has(self, u):
+        return self.blocks.has(u)
+
+    def clear(self):
+        self.blocks.clear()
+
+    def load(self, counts, nbrs, faces):
+        """Replace the contents by the halfedges of the vertices with keys ``0, 1, ..., n - 1``.
+
+        Parameters
+        ----------
+        counts : sequence of int
+            The number of outgoing halfedges of every vertex.
+        nbrs : sequence of int
+            The neighbors of all vertices.
+        faces : sequence of int
+            The faces of the corresponding halfedges, with ``-1`` for the outside face.
+
+        """
+        self.blocks.load(counts, nbrs, faces)
+
+    def edges(self):
+        """Iterate over the edges, in the same order and orientation as :meth:`compas.datastructures.HalfEdge.edges`.
+
+        Yields
+        ------
+        tuple
+            The next edge as a (u, v) tuple.
+
+        """
+        blocks = self.blocks
+        nbrs = blocks.data[0]
+        count = blocks.count
+        for u, start in enumerate(blocks.offset):
+            if start == NONE:
+                continue
+            for v in nbrs[start:start + count[u]].tolist():
+                # the edge was yielded already from the other vertex
+                if v < u and blocks.find(v, u) != NONE:
+                    continue
+                yield u, v
+
+    def compact(self):
+        """Remove the unused slots from the underlying arrays."""
+        self.blocks.compact()
+
+
+# ==============================================================================
+# NumPy access
+# ==============================================================================
+
+
+def _rows_index(store, keys):
+    from numpy import asarray
+    from numpy import flatnonzero
+    from numpy import frombuffer
+    from numpy import uint8
+    alive = frombuffer(store.alive, dtype=uint8)
+    if keys is None:
+        if store.is_dense():
+            return None
+        return flatnonzero(alive)
+    index = asarray(keys, dtype=int).reshape(-1)
+    if len(index) and (index.min() < 0 or index.max() >= len(alive) or not alive[index].all()):
+        for key in keys:
+            if key not in store:
+                raise KeyError(key)
+    return index
+
+
+def get_attributes_array(store, names, defaults, keys=None):
+    """Collect the values of named attributes of multiple elements in a NumPy array.
+
+    Parameters
+    ----------
+    store : dict or :class:`AttributeArrayStore`
+        The attribute store.
+    names : list of str
+        The names of the attributes.
+    defaults : dict
+        The default values of the attributes.
+    keys : list, optional
+        The identifiers of the elements.
+        Default is all elements in the store.
+
+    Returns
+    -------
+    array
+        An array of shape ``(len(keys), len(names))``.
+        The array is always a copy of the data of the store.
+
+    """
+    from numpy import asarray
+    from numpy import column_stack
+    from numpy import isnan as isnan_
+    from numpy import where
+    names = list(names)
+    if not isinstance(store, AttributeArrayStore):
+        if keys is None:
+            keys = list(store)
+        return asarray([[store[key].get(name, defaults.get(name)) for name in names] for key in keys])
+    index = _rows_index(store, keys)
+    if isinstance(store, VertexArrayStore) and names == ['x', 'y', 'z']:
+        xyz = store.view_xyz()
+        xyz = xyz.copy() if index is None else xyz[index]
+        if not isnan_(xyz).any():
+            return xyz
+    columns = []
+    for name in names:
+        if name in XYZ or name in store.columns:
+            values, mask = store.view(name)
+            if index is not None:
+                values = values[index]
+                mask = mask[index]
+            if not mask.all():
+                values = where(mask, values, defaults.get(name))
+        else:
+            rows = (store[key] for key in (store if keys is None else keys))
+            values = asarray([row.get(name, defaults.get(name)) for row in rows])
+        columns.append(values)
+    if len(columns) == 1:
+        return columns[0].reshape((-1, 1)).copy()
+    return column_stack(columns)
+
+
+def set_attributes_array(store, names, values, keys=None):
+    """Assign the values of named attributes of multiple elements from an array.
+
+    Parameters
+    ----------
+    store : dict or :class:`AttributeArrayStore`
+        The attribute store.
+    names : list of str
+        The names of the attributes.
+    values : array-like
+        The values, with one row per element and one column per attribute.
+    keys : list, optional
+        The identifiers of the elements.
+        Default is all elements in the store.
+
+    """
+    from numpy import asarray
+    from numpy import broadcast_to
+    from numpy import can_cast
+    names = list(names)
+    values = asarray(values)
+    if values.ndim < 2:
+        values = values.reshape((-1, len(names)))
+    if not isinstance(store, AttributeArrayStore):
+        if keys is None:
+            keys = list(store)
+        values = broadcast_to(values, (len(keys), len(names)))
+        for key, row in zip(keys, values.tolist()):
+            attr = store.setdefault(key, {})
+            for name, value in zip(names, row):
+                attr[name] = value
+        return
+    index = _rows_index(store, keys)
+    n = store.size if index is None else len(index)
+    values = broadcast_to(values, (n, len(names)))
+    for name, column in zip(names, values.T):
+        if name not in XYZ:
+            typecode = {'f': 'd', 'i': 'l', 'u': 'l', 'b': 'b'}.get(column.dtype.kind)
+            if typecode is None or not store.add_column(name, typecode):
+                for key, value in zip(store if keys is None else keys, column.tolist()):
+                    store.set_value(key, name, value)
+                continue
+        data, mask = store.view(name)
+        if not can_cast(column.dtype, data.dtype, 'same_kind'):
+            del data, mask
+            store.remove_column(name)
+            for key, value in zip(store if keys is None else keys, column.tolist()):
+                store.set_value(key, name, value)
+            continue
+        if index is None:
+            data[:] = column
+        else:
+            data[index] = column
+        if name not in XYZ:
+            if index is None:
+                mask[:] = 1
+            else:
+                mask[index] = 1
+
+
+# ==============================================================================
+# Bulk construction
+# ==============================================================================
+
+
+def faces_to_flat_numpy(faces, offsets=None):
+    """Convert a collection of faces to a flat array of vertex indices and an array of face sizes.
+
+    Parameters
+    ----------
+    faces : list or array
+        A list of faces, a 2D array of faces with the same number of vertices,
+        or a flat list or array of vertex indices if ``offsets`` is provided.
+    offsets : list or array, optional
+        The start of every face in the flat list of vertex indices,
+        optionally followed by the length of the flat list.
+
+    Returns
+    -------
+    tuple
+        The flat array of vertex indices and the array of face sizes.
+
+    Notes
+    -----
+    Faces with less than three vertices are removed,
+    and so is the last vertex of faces of which the first and last vertex are the same.
+
+    """
+    from itertools import chain
+    from numpy import asarray
+    from numpy import cumsum
+    from numpy import diff
+    from numpy import fromiter
+    from numpy import full
+    from numpy import repeat
+    if offsets is not None:
+        flat = asarray(faces, dtype=int).reshape(-1)
+        offsets = asarray(offsets, dtype=int).reshape(-1)
+        if not len(offsets) or offsets[-1] != len(flat):
+            offsets = list(offsets) + [len(flat)]
+        sizes = diff(offsets)
+    elif hasattr(faces, 'dtype') and len(faces.shape) == 2:
+        flat = faces.astype(int).reshape(-1)
+        sizes = full(faces.shape[0], faces.shape[1], dtype=int)
+    else:
+        faces = list(faces)
+        sizes = fromiter((len(face) for face in faces), dtype=int, count=len(faces))
+        flat = fromiter(chain.from_iterable(faces), dtype=int, count=sizes.sum())
+    valid = sizes >= 3
+    ends = cumsum(sizes)
+    closed = valid.copy()
+    closed[valid] = flat[(ends - sizes)[valid]] == flat[ends[valid] - 1]
+    keep = repeat(valid, sizes)
+    keep[ends[closed] - 1] = False
+    return flat[keep], (sizes - closed)[valid]
+
+
+def halfedges_from_faces_numpy(flat, sizes, n):
+    """Compute the halfedges of a collection of faces.
+
+    The result is identical to adding the faces one by one
+    with :meth:`compas.datastructures.HalfEdge.add_face`.
+
+    Parameters
+    ----------
+    flat : array
+        The flat array of vertex indices of the faces.
+    sizes : array
+        The number of vertices of every face.
+    n : int
+        The number of vertices.
+
+    Returns
+    -------
+    tuple
+        * The number of outgoing halfedges of every vertex.
+        * The neighbors of all vertices, sorted per vertex in order of creation.
+        * The corresponding faces, with ``-1`` for the outside face.
+        * The edges, as an array of shape ``(number of edges, 2)``, in order of creation.
+
+    """
+    from numpy import arange
+    from numpy import bincount
+    from numpy import concatenate
+    from numpy import cumsum
+    from numpy import full
+    from numpy import lexsort
+    from numpy import maximum
+    from numpy import minimum
+    from numpy import repeat
+    from numpy import searchsorted
+    from numpy import unique
+    from numpy import vstack
+    from numpy import where
+    ends = cumsum(sizes)
+    following = arange(1, len(flat) + 1)
+    following[ends - 1] = ends - sizes
+    u = flat
+    v = flat[following]
+    f = repeat(arange(len(sizes)), sizes)
+    directed = u != v
+    u, v, f = u[directed], v[directed], f[directed]
+    # both halfedges of an edge are created by the first face that contains it
+    _, first = unique(minimum(u, v) * n + maximum(u, v), return_index=True)
+    first.sort()
+    edges = vstack((u[first], v[first])).T
+    m = len(first)
+    rows = concatenate((edges[:, 0], edges[:, 1]))
+    nbrs = concatenate((edges[:, 1], edges[:, 0]))
+    order = lexsort((concatenate((arange(m), arange(m))), rows))
+    rows = rows[order]
+    nbrs = nbrs[order]
+    # the face of a halfedge is the last face that contains it
+    keys, last = unique((u * n + v)[::-1], return_index=True)
+    faces = full(len(rows), -1, dtype=int)
+    if len(keys):
+        query = rows * n + nbrs
+        index = minimum(searchsorted(keys, query), len(keys) - 1)
+        faces = where(keys[index] == query, f[::-1][last][index], -1)
+    return bincount(rows, minlength=n), nbrs, faces, edges
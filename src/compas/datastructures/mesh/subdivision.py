@@ -29,7 +29,7 @@ __all__ = [
 
 
 def mesh_fast_copy(other):
-    subd = SubdMesh()
+    subd = SubdMesh(storage=other.storage)
     # subd.attributes = deepcopy(other.attributes)
     # subd.default_vertex_attributes = deepcopy(other.default_vertex_attributes)
     # subd.default_face_attributes = deepcopy(other.default_face_attributes)
@@ -71,6 +71,7 @@ class SubdMesh(Mesh):
             self.halfedge[u][v] = fkey
             if u not in self.halfedge[v]:
                 self.halfedge[v][u] = None
+                self._add_edge_to_index(u, v)
 
         return fkey
 
@@ -24,21 +24,19 @@ def mesh_transform_numpy(mesh, transformation):
     Notes
     -----
     The mesh is modified in-place.
+    The coordinates of all vertices are read and written in bulk,
+    and transformed with one vectorized call.
 
     Examples
     --------
     >>> mesh = Mesh.from_obj(compas.get('cube.obj'))
     >>> T = matrix_from_axis_and_angle([0, 0, 1], pi / 4)
     >>> tmesh = mesh.copy()
-    >>> mesh_transform(tmesh, T)
+    >>> mesh_transform_numpy(tmesh, T)
 
     """
-    vertices = [mesh.vertex_coordinates(key) for key in mesh.vertices()]
-    xyz = transform_points_numpy(vertices, transformation)
-    for index, (_, attr) in enumerate(mesh.vertices(True)):
-        attr['x'] = xyz[index][0]
-        attr['y'] = xyz[index][1]
-        attr['z'] = xyz[index][2]
+    xyz = transform_points_numpy(mesh.vertices_array('xyz'), transformation)
+    mesh.vertices_array('xyz', xyz)
 
 
 def mesh_transformed_numpy(mesh, transformation):
@@ -65,7 +63,7 @@ def mesh_transformed_numpy(mesh, transformation):
     --------
     >>> mesh = Mesh.from_obj(compas.get('cube.obj'))
     >>> T = matrix_from_axis_and_angle([0, 0, 1], pi / 4)
-    >>> tmesh = mesh_transformed(mesh, T)
+    >>> tmesh = mesh_transformed_numpy(mesh, T)
 
     """
     mesh_copy = mesh.copy()
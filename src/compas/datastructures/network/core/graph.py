@@ -7,9 +7,14 @@ import collections
 from random import sample
 from random import choice
 from copy import deepcopy
-from ast import literal_eval
+from itertools import islice
 
+from compas.files import CBFReader
+from compas.files import CBFWriter
+from compas.files.cbf import INT
 from compas.utilities import geometric_key
+from compas.utilities import json_load_stream
+from compas.utilities import literal_keys
 from compas.datastructures import Datastructure
 
 
@@ -193,8 +198,8 @@ class Graph(Datastructure):
     @data.setter
     def data(self, data):
         attributes = data.get('attributes') or {}
-        default_node_attributes = data.get('dna') or {}
-        default_edge_attributes = data.get('dea') or {}
+        default_node_attributes = data.get('dna') or data.get('node_attributes') or {}
+        default_edge_attributes = data.get('dea') or data.get('edge_attributes') or {}
         node = data.get('node') or {}
         edge = data.get('edge') or {}
         adjacency = data.get('adjacency') or {}
@@ -204,29 +209,28 @@ class Graph(Datastructure):
         self.default_node_attributes.update(default_node_attributes)
         self.default_edge_attributes.update(default_edge_attributes)
 
+        # decode every key only once
+        key_index = dict(zip(node, literal_keys(node)))
+
+        def keys(rkeys):
+            try:
+                return [key_index[rkey] for rkey in rkeys]
+            except KeyError:
+                return literal_keys(rkeys)
+
         # add the nodes
-        self.node = {literal_eval(key): attr for key, attr in iter(node.items())}
+        self.node = dict(zip(key_index.values(), node.values()))
 
         # add the edges
         self.edge = {}
-        for u, nbrs in iter(edge.items()):
+        for u, nbrs in zip(keys(edge), edge.values()):
             nbrs = nbrs or {}
-            u = literal_eval(u)
-            self.edge[u] = {}
-            for v, attr in iter(nbrs.items()):
-                attr = attr or {}
-                v = literal_eval(v)
-                self.edge[u][v] = attr
+            self.edge[u] = {v: attr or {} for v, attr in zip(keys(nbrs), nbrs.values())}
 
         # add the adjacency
         self.adjacency = {}
-        for u, nbrs in iter(adjacency.items()):
-            nbrs = nbrs or {}
-            u = literal_eval(u)
-            self.adjacency[u] = {}
-            for v, _ in iter(nbrs.items()):
-                v = literal_eval(v)
-                self.adjacency[u][v] = None
+        for u, nbrs in zip(keys(adjacency), adjacency.values()):
+            self.adjacency[u] = dict.fromkeys(keys(nbrs or {}))
 
     # --------------------------------------------------------------------------
     # constructors
@@ -272,13 +276,16 @@ class Graph(Datastructure):
         return self.data
 
     @classmethod
-    def from_json(cls, filepath):
+    def from_json(cls, filepath, stream=False):
         """Construct a datastructure from structured data contained in a json file.
 
         Parameters
         ----------
         filepath : str
             The path to the json file.
+        stream : bool, optional
+            Decode the file incrementally, without reading the entire text into memory.
+            Default is ``False``.
 
         Returns
         -------
@@ -291,7 +298,7 @@ class Graph(Datastructure):
         corresponding *to_json* method.
         """
         with open(filepath, 'r') as fp:
-            data = json.load(fp)
+            data = json_load_stream(fp) if stream else json.load(fp)
         graph = cls()
         graph.data = data
         return graph
@@ -310,6 +317,82 @@ class Graph(Datastructure):
             else:
                 json.dump(self.data, f)
 
+    @classmethod
+    def from_binary(cls, filepath, attributes=None, mmap=False):
+        """Construct a graph from the data contained in a binary file.
+
+        Parameters
+        ----------
+        filepath : str or file
+            The path to the binary file, or a file object opened in binary mode.
+        attributes : list of str, optional
+            The names of the node and edge attributes to load.
+            Default is all attributes.
+        mmap : bool, optional
+            Memory-map the file instead of reading the arrays with regular file reads.
+            The data structure is still built from lists of values,
+            so the loaded data is copied into memory anyway,
+            and memory-mapping only avoids reading the file up front.
+            Default is ``False``.
+
+        Returns
+        -------
+        object
+            An object of the type of ``cls``.
+
+        Note
+        ----
+        This constructor method is meant to be used in conjuction with the
+        corresponding *to_binary* method.
+        """
+        reader = CBFReader(filepath, mmap=mmap)
+        if reader.schema != 'graph':
+            raise ValueError('The file does not contain a graph: {}'.format(reader.schema))
+        meta = reader.meta
+        graph = cls()
+        graph.attributes.update(meta['attributes'])
+        graph.default_node_attributes.update(meta['dna'])
+        graph.default_edge_attributes.update(meta['dea'])
+        graph._max_int_key = meta['max_int_key']
+        keys, attrs = reader.read_table('node', attributes)
+        graph.node = dict(zip(keys, attrs))
+        graph.edge = {key: {} for key in keys}
+        for (i, j), attr in zip(*reader.read_table('edge', attributes)):
+            graph.edge[keys[i]][keys[j]] = attr
+        nbrs = iter(reader.read_list('adjacency/nodes'))
+        graph.adjacency = {}
+        for key, count in zip(keys, reader.read_list('adjacency/counts')):
+            graph.adjacency[key] = {keys[i]: None for i in islice(nbrs, count)}
+        return graph
+
+    def to_binary(self, filepath):
+        """Serialise the graph to a binary file.
+
+        Parameters
+        ----------
+        filepath : str or file
+            The path to the binary file, or a file object opened in binary mode.
+
+        Notes
+        -----
+        The file is written in COMPAS Binary Format (see :class:`compas.files.CBFWriter`).
+        The edges and the adjacency of the graph are stored as integer arrays of node indices,
+        and the node and edge attributes as typed columns.
+        """
+        meta = {'attributes': self.attributes,
+                'dna': self.default_node_attributes,
+                'dea': self.default_edge_attributes,
+                'max_int_key': self._max_int_key}
+        writer = CBFWriter(filepath, 'graph', meta)
+        keys = list(self.node)
+        index = {key: i for i, key in enumerate(keys)}
+        edges = [(u, v) for u in self.edge for v in self.edge[u]]
+        writer.add_table('node', keys, [self.node[key] for key in keys])
+        writer.add_table('edge', [(index[u], index[v]) for u, v in edges], [self.edge[u][v] for u, v in edges])
+        writer.add_array('adjacency/counts', [len(self.adjacency[key]) for key in keys], INT)
+        writer.add_array('adjacency/nodes', [index[nbr] for key in keys for nbr in self.adjacency[key]], INT)
+        writer.write()
+
     @classmethod
     def from_edges(cls, edges):
         graph = cls()
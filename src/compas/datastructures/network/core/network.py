@@ -3,6 +3,8 @@ from __future__ import absolute_import
 from __future__ import division
 
 from compas.files import OBJ
+from compas.files import PLY
+from compas.files import PLYWriter
 
 from compas.utilities import geometric_key
 from compas.geometry import centroid_points
@@ -86,6 +88,43 @@ class BaseNetwork(Graph):
             network.add_edge(u, v)
         return network
 
+    @classmethod
+    def from_ply(cls, filepath):
+        """Construct a network from the vertices and edges of a PLY file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the PLY file.
+
+        Returns
+        -------
+        Network
+            A network object.
+
+        Notes
+        -----
+        Properties of the vertices other than the coordinates,
+        and properties of the edges other than their vertices,
+        are added as node and edge attributes.
+
+        """
+        network = cls()
+        parser = PLY(filepath).parser
+        for i, (x, y, z) in enumerate(parser.vertices):
+            network.add_node(i, x=x, y=y, z=z)
+        for name, values in parser.vertex_attributes.items():
+            if hasattr(values, 'tolist'):
+                values = values.tolist()
+            for key, value in enumerate(values):
+                network.node_attribute(key, name, value)
+        edge_attributes = {}
+        for name, values in parser.edge_attributes.items():
+            edge_attributes[name] = values.tolist() if hasattr(values, 'tolist') else values
+        for i, (u, v) in enumerate(parser.edges):
+            network.add_edge(u, v, {name: values[i] for name, values in edge_attributes.items()})
+        return network
+
     @classmethod
     def from_lines(cls, lines, precision=None):
         """Construct a network from a set of lines represented by their start and end point coordinates.
@@ -171,6 +210,64 @@ class BaseNetwork(Graph):
         """
         raise NotImplementedError
 
+    def to_ply(self, filepath, format='binary_little_endian', node_attributes=None, edge_attributes=None):
+        """Write the nodes and edges of the network to a PLY file.
+
+        Parameters
+        ----------
+        filepath : str
+            Full path of the file.
+        format : {'binary_little_endian', 'binary_big_endian', 'ascii'}, optional
+            The format of the file.
+            Default is ``'binary_little_endian'``.
+        node_attributes : list of str, optional
+            The node attributes that are written as properties of the vertices, in addition to the coordinates.
+            Default is ``None``, in which case all default node attributes with numerical or boolean values are written.
+        edge_attributes : list of str, optional
+            The edge attributes that are written as properties of the edges.
+            Default is ``None``, in which case all default edge attributes with numerical or boolean values are written.
+
+        Raises
+        ------
+        ValueError
+            If the values of a requested attribute are not all numbers or booleans.
+
+        Notes
+        -----
+        The nodes are written as ``vertex`` elements,
+        and the edges as ``edge`` elements with the properties ``vertex1`` and ``vertex2``.
+
+        """
+        key_index = self.key_index()
+        xyz = self.nodes_attributes('xyz')
+        properties = [(name, 'double', [point[i] for point in xyz]) for i, name in enumerate('xyz')]
+        names = node_attributes
+        if names is None:
+            names = [name for name in self.default_node_attributes if name not in ('x', 'y', 'z')]
+        for name in names:
+            values = self.nodes_attribute(name)
+            ptype = PLYWriter.property_type(values)
+            if ptype is None and node_attributes is None:
+                continue
+            properties.append((name, ptype, values))
+        writer = PLYWriter(filepath, format=format)
+        writer.add_element('vertex', properties)
+
+        edges = list(self.edges())
+        properties = [('vertex1', 'int', [key_index[u] for u, v in edges]),
+                      ('vertex2', 'int', [key_index[v] for u, v in edges])]
+        names = edge_attributes
+        if names is None:
+            names = list(self.default_edge_attributes)
+        for name in names:
+            values = self.edges_attribute(name, keys=edges)
+            ptype = PLYWriter.property_type(values)
+            if ptype is None and edge_attributes is None:
+                continue
+            properties.append((name, ptype, values))
+        writer.add_element('edge', properties)
+        writer.write()
+
     def to_points(self):
         """Return the coordinates of the network.
 
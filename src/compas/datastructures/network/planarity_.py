@@ -25,6 +25,91 @@ __all__ = [
 ]
 
 
+def _edge_crossings(edges, vertices):
+    """Find the pairs of crossing edges in a set of edges in the XY plane.
+
+    Parameters
+    ----------
+    edges : list
+        The edges as pairs of vertex keys.
+    vertices : dict
+        The XY(Z) coordinates of the vertices.
+
+    Yields
+    ------
+    tuple
+        The indices ``i < j`` of a pair of crossing edges, in no particular order.
+
+    Notes
+    -----
+    The edges are registered in the cells of a uniform grid that they pass through,
+    with the size of the cells equal to the average size of the edges.
+    Only edges that share a cell and have overlapping bounding boxes are tested for intersection,
+    with ``is_intersection_segment_segment_xy``.
+    For edges of comparable size, this takes O(n + k) time for n edges with k crossings.
+
+    """
+    lines = [(vertices[u], vertices[v]) for u, v in edges]
+    if len(lines) < 2:
+        return
+
+    boxes = []
+    size = 0
+    for a, b in lines:
+        box = (min(a[0], b[0]), max(a[0], b[0]), min(a[1], b[1]), max(a[1], b[1]))
+        boxes.append(box)
+        size += max(box[1] - box[0], box[3] - box[2])
+    size = size / len(lines) or 1.0
+    # the grid coordinates of an edge are padded to be robust against round-off on cell boundaries
+    eps = 1e-6 * size
+
+    cells = {}
+    for index, ((a, b), (xmin, xmax, ymin, ymax)) in enumerate(zip(lines, boxes)):
+        dx = b[0] - a[0]
+        dy = b[1] - a[1]
+        for i in range(int((xmin - eps) // size), int((xmax + eps) // size) + 1):
+            if dx == 0:
+                y0, y1 = ymin, ymax
+            else:
+                x0 = max(xmin, i * size)
+                x1 = min(xmax, (i + 1) * size)
+                y0 = a[1] + (x0 - a[0]) / dx * dy
+                y1 = a[1] + (x1 - a[0]) / dx * dy
+                y0, y1 = max(min(y0, y1), ymin), min(max(y0, y1), ymax)
+            for j in range(int((y0 - eps) // size), int((y1 + eps) // size) + 1):
+                cells.setdefault((i, j), []).append(index)
+
+    seen = set()
+    for cell in cells.values():
+        for n, i in enumerate(cell):
+            u1, v1 = edges[i]
+            xmin1, xmax1, ymin1, ymax1 = boxes[i]
+            for j in cell[n + 1:]:
+                pair = (i, j) if i < j else (j, i)
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                u2, v2 = edges[j]
+                if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
+                    continue
+                xmin2, xmax2, ymin2, ymax2 = boxes[j]
+                if xmax1 < xmin2 or xmax2 < xmin1 or ymax1 < ymin2 or ymax2 < ymin1:
+                    continue
+                if is_intersection_segment_segment_xy(lines[i], lines[j]) or is_intersection_segment_segment_xy(lines[j], lines[i]):
+                    yield pair
+
+
+def _crossing_point(ab, cd):
+    a, b = ab
+    c, d = cd
+    abx = b[0] - a[0]
+    aby = b[1] - a[1]
+    cdx = d[0] - c[0]
+    cdy = d[1] - c[1]
+    t = ((c[0] - a[0]) * cdy - (c[1] - a[1]) * cdx) / (abx * cdy - aby * cdx)
+    return [a[0] + t * abx, a[1] + t * aby, 0.0]
+
+
 def network_is_crossed(network):
     """Verify if a network has crossing edges.
 
@@ -44,32 +129,13 @@ def network_is_crossed(network):
     This algorithm assumes that the network lies in the XY plane.
 
     """
-    for u1, v1 in network.edges():
-        for u2, v2 in network.edges():
-            if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-                continue
-            else:
-                a = network.node_attributes(u1, 'xy')
-                b = network.node_attributes(v1, 'xy')
-                c = network.node_attributes(u2, 'xy')
-                d = network.node_attributes(v2, 'xy')
-                if is_intersection_segment_segment_xy((a, b), (c, d)):
-                    return True
-    return False
+    vertices = {key: network.node_attributes(key, 'xy') for key in network.nodes()}
+    return _are_edges_crossed(list(network.edges()), vertices)
 
 
 def _are_edges_crossed(edges, vertices):
-    for u1, v1 in edges:
-        for u2, v2 in edges:
-            if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-                continue
-            else:
-                a = vertices[u1]
-                b = vertices[v1]
-                c = vertices[u2]
-                d = vertices[v2]
-                if is_intersection_segment_segment_xy((a, b), (c, d)):
-                    return True
+    for _ in _edge_crossings(edges, vertices):
+        return True
     return False
 
 
@@ -94,41 +160,54 @@ def network_count_crossings(network):
     return len(network_find_crossings(network))
 
 
-def network_find_crossings(network):
+def network_find_crossings(network, points=False):
     """Identify all pairs of crossing edges in a network.
 
     Parameters
     ----------
     network : Network
         A network object.
+    points : bool, optional
+        If ``True``, also return the intersection points of the crossing edges.
+        Default is ``False``.
 
     Returns
     -------
     list
         A list of edge pairs, with each edge represented by two vertex keys.
+        The pairs are sorted in the order of the edges of the network.
+    list
+        The XYZ coordinates of the intersection point of every pair (Z = 0).
+        Only if ``points`` is ``True``.
 
     Notes
     -----
     This algorithm assumes that the network lies in the XY plane.
 
+    Candidate pairs of edges are found with a uniform grid,
+    instead of testing every edge against every other edge.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Network
+    >>> network = Network.from_lines([([0, 0, 0], [2, 2, 0]), ([0, 2, 0], [2, 0, 0]), ([3, 0, 0], [3, 2, 0])])
+    >>> crossings, points = network_find_crossings(network, points=True)
+    >>> len(crossings)
+    1
+    >>> points[0]
+    [1.0, 1.0, 0.0]
+
     """
-    crossings = set()
-    for u1, v1 in network.edges():
-        for u2, v2 in network.edges():
-            if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-                continue
-            else:
-                if ((u1, v1), (u2, v2)) in crossings:
-                    continue
-                if ((u2, v2), (u1, v1)) in crossings:
-                    continue
-                a = network.node_attributes(u1, 'xy')
-                b = network.node_attributes(v1, 'xy')
-                c = network.node_attributes(u2, 'xy')
-                d = network.node_attributes(v2, 'xy')
-                if is_intersection_segment_segment_xy((a, b), (c, d)):
-                    crossings.add(((u1, v1), (u2, v2)))
-    return list(crossings)
+    edges = list(network.edges())
+    vertices = {key: network.node_attributes(key, 'xy') for key in network.nodes()}
+    pairs = sorted(_edge_crossings(edges, vertices))
+    crossings = [(edges[i], edges[j]) for i, j in pairs]
+    if not points:
+        return crossings
+    xyz = []
+    for (u1, v1), (u2, v2) in crossings:
+        xyz.append(_crossing_point((vertices[u1], vertices[v1]), (vertices[u2], vertices[v2])))
+    return crossings, xyz
 
 
 def network_is_xy(network):
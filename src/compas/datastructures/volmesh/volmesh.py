@@ -6,13 +6,18 @@ import pickle
 import json
 import collections
 from copy import deepcopy
-from ast import literal_eval
 from random import sample
 from random import choice
+from itertools import islice
 
+from compas.files import CBFReader
+from compas.files import CBFWriter
 from compas.files import OBJ
+from compas.files.cbf import INT
 
 from compas.utilities import geometric_key
+from compas.utilities import json_load_stream
+from compas.utilities import literal_keys
 from compas.utilities import pairwise
 
 from compas.geometry import normalize_vector
@@ -256,15 +261,15 @@ class VolMesh(Datastructure):
         * 'dva'          => dict
         * 'dea'          => dict
         * 'dfa'          => dict
+        * 'dca'          => dict
         * 'vertex'       => dict
-        * 'edge'         => dict
         * 'halfface'     => dict
         * 'cell'         => dict
         * 'plane'        => dict
         * 'edgedata'     => dict
         * 'facedata'     => dict
         * 'celldata'     => dict
-        * 'max_int_key'  => int
+        * 'max_int_vkey' => int
         * 'max_int_fkey' => int
         * 'max_int_ckey' => int
 
@@ -282,7 +287,6 @@ class VolMesh(Datastructure):
             'dfa': self.default_face_attributes,
             'dca': self.default_cell_attributes,
             'vertex': {},
-            'edge': {},
             'halfface': {},
             'cell': {},
             'plane': {},
@@ -293,51 +297,26 @@ class VolMesh(Datastructure):
             'max_int_fkey': self._max_int_fkey,
             'max_int_ckey': self._max_int_ckey, }
 
-        key_rkey = {}
+        key_rkey = {None: repr(None)}
 
         for vkey in self.vertex:
-            rkey = repr(vkey)
-            key_rkey[vkey] = rkey
+            rkey = key_rkey[vkey] = repr(vkey)
             data['vertex'][rkey] = self.vertex[vkey]
-            data['plane'][rkey] = {}
-            data['edge'][rkey] = {}
-
-        for u in self.edge:
-            ru = key_rkey[u]
-            for v in self.edge[u]:
-                rv = key_rkey[v]
-                data['edge'][ru][rv] = self.edge[u][v]
 
         for f in self.halfface:
-            _f = repr(f)
-            data['halfface'][_f] = {}
-            for u, v in self.halfface[f].iteritems():
-                _u = repr(u)  # use the map?
-                _v = repr(v)  # use the map?
-                data['halfface'][_f][_u] = _v
+            data['halfface'][repr(f)] = [key_rkey[u] for u in self.halfface[f]]
 
         for c in self.cell:
             _c = repr(c)
             data['cell'][_c] = {}
             for u in self.cell[c]:
-                _u = repr(u)
-                if _u not in data['cell'][_c]:
-                    data['cell'][_c][_u] = {}
-                for v, f in self.cell[c][u].iteritems():
-                    _v = repr(v)
-                    _f = repr(f)
-                    data['cell'][_c][_u][_v] = _f
+                data['cell'][_c][key_rkey[u]] = {key_rkey[v]: repr(f) for v, f in self.cell[c][u].items()}
 
         for u in self.plane:
-            _u = repr(u)
+            _u = key_rkey[u]
+            data['plane'][_u] = {}
             for v in self.plane[u]:
-                _v = repr(v)
-                if _v not in data['plane'][_u]:
-                    data['plane'][_u][_v] = {}
-                for w, c in self.plane[u][v].iteritems():
-                    _w = repr(w)
-                    _c = repr(c)
-                    data['plane'][_u][_v][_w] = _c
+                data['plane'][_u][key_rkey[v]] = {key_rkey[w]: repr(c) for w, c in self.plane[u][v].items()}
 
         for uv in self.edgedata:
             data['edgedata'][repr(uv)] = self.edgedata[uv]
@@ -358,7 +337,6 @@ class VolMesh(Datastructure):
         dfa = data.get('dfa') or {}
         dca = data.get('dca') or {}
         vertex = data.get('vertex') or {}
-        edge = data.get('edge') or {}
         halfface = data.get('halfface') or {}
         cell = data.get('cell') or {}
         plane = data.get('plane') or {}
@@ -369,73 +347,49 @@ class VolMesh(Datastructure):
         max_int_fkey = data.get('max_int_fkey', - 1)
         max_int_ckey = data.get('max_int_ckey', - 1)
 
-        if not vertex or not edge or not plane or not halfface or not cell:
-            return
-
-        self.clear()
-
         self.attributes.update(attributes)
         self.default_vertex_attributes.update(dva)
         self.default_edge_attributes.update(dea)
         self.default_face_attributes.update(dfa)
         self.default_cell_attributes.update(dca)
 
-        for _k, attr in vertex.iteritems():
-            k = literal_eval(_k)
+        # decode every key only once
+        vkeys = dict(zip(vertex, literal_keys(vertex)))
+        fkeys = dict(zip(halfface, literal_keys(halfface)))
+        ckeys = dict(zip(cell, literal_keys(cell)))
+        ckeys[repr(None)] = None
+
+        def keys(rkeys, key_index):
+            try:
+                return [key_index[rkey] for rkey in rkeys]
+            except KeyError:
+                return literal_keys(rkeys)
+
+        self.vertex = {}
+        self.plane = {}
+        for k, attr in zip(vkeys.values(), vertex.values()):
             self.vertex[k] = self.default_vertex_attributes.copy()
             if attr:
                 self.vertex[k].update(attr)
             self.plane[k] = {}
-            self.edge[k] = {}
-
-        for _u, nbrs in edge.iteritems():
-            nbrs = nbrs or {}
-            u = literal_eval(_u)
-            for _v, attr in nbrs.iteritems():
-                v = literal_eval(_v)
-                self.edge[u][v] = self.default_edge_attributes.copy()
-                if attr:
-                    self.edge[u][v].update(attr)
-
-        for _f in halfface:
-            f = literal_eval(_f)
-            self.halfface[f] = {}
-            for _u, _v in halfface[_f].iteritems():
-                u = literal_eval(_u)
-                v = literal_eval(_v)
-                self.halfface[f][u] = v
-
-        for _c in cell:
-            c = literal_eval(_c)
+
+        self.halfface = {}
+        for f, vertices in zip(fkeys.values(), halfface.values()):
+            self.halfface[f] = keys(vertices, vkeys)
+
+        self.cell = {}
+        for c, nbrs in zip(ckeys.values(), cell.values()):
             self.cell[c] = {}
-            for _u in cell[_c]:
-                u = literal_eval(_u)
-                if u not in self.cell[c]:
-                    self.cell[c][u] = {}
-                for _v, _f in cell[_c][_u].iteritems():
-                    v = literal_eval(_v)
-                    f = literal_eval(_f)
-                    self.cell[c][u][v] = f
-
-        for _u in plane:
-            u = literal_eval(_u)
-            for _v in plane[_u]:
-                v = literal_eval(_v)
-                if v not in self.plane[u]:
-                    self.plane[u][v] = {}
-                for _w, _c in plane[_u][_v].iteritems():
-                    w = literal_eval(_w)
-                    c = literal_eval(_c)
-                    self.plane[u][v][w] = c
-
-        for uv, attr in iter(edgedata.items()):
-            self.edgedata[literal_eval(uv)] = attr or {}
-
-        for fkey, attr in iter(facedata.items()):
-            self.facedata[literal_eval(fkey)] = attr or {}
-
-        for ckey, attr in iter(celldata.items()):
-            self.celldata[literal_eval(ckey)] = attr or {}
+            for u, halffaces in zip(keys(nbrs, vkeys), nbrs.values()):
+                self.cell[c][u] = dict(zip(keys(halffaces, vkeys), keys(halffaces.values(), fkeys)))
+
+        for u, nbrs in zip(keys(plane, vkeys), plane.values()):
+            for v, cells in zip(keys(nbrs, vkeys), nbrs.values()):
+                self.plane[u][v] = dict(zip(keys(cells, vkeys), keys(cells.values(), ckeys)))
+
+        self.edgedata = {uv: attr or {} for uv, attr in zip(literal_keys(edgedata), edgedata.values())}
+        self.facedata = {f: attr or {} for f, attr in zip(keys(facedata, fkeys), facedata.values())}
+        self.celldata = {c: attr or {} for c, attr in zip(keys(celldata, ckeys), celldata.values())}
 
         self._max_int_vkey = max_int_vkey
         self._max_int_fkey = max_int_fkey
@@ -489,13 +443,16 @@ class VolMesh(Datastructure):
         return self.data
 
     @classmethod
-    def from_json(cls, filepath):
+    def from_json(cls, filepath, stream=False):
         """Construct a datastructure from structured data contained in a json file.
 
         Parameters
         ----------
         filepath : str
             The path to the json file.
+        stream : bool, optional
+            Decode the file incrementally, without reading the entire text into memory.
+            Default is ``False``.
 
         Returns
         -------
@@ -508,7 +465,7 @@ class VolMesh(Datastructure):
         corresponding *to_json* method.
         """
         with open(filepath, 'r') as fp:
-            data = json.load(fp)
+            data = json_load_stream(fp) if stream else json.load(fp)
         mesh = cls()
         mesh.data = data
         return mesh
@@ -527,6 +484,116 @@ class VolMesh(Datastructure):
             else:
                 json.dump(self.data, f)
 
+    @classmethod
+    def from_binary(cls, filepath, attributes=None, mmap=False):
+        """Construct a volmesh from the data contained in a binary file.
+
+        Parameters
+        ----------
+        filepath : str or file
+            The path to the binary file, or a file object opened in binary mode.
+        attributes : list of str, optional
+            The names of the vertex, edge, face, and cell attributes to load.
+            The coordinates of the vertices are always loaded.
+            Default is all attributes.
+        mmap : bool, optional
+            Memory-map the file instead of reading the arrays with regular file reads.
+            The data structure is still built from lists of values,
+            so the loaded data is copied into memory anyway,
+            and memory-mapping only avoids reading the file up front.
+            Default is ``False``.
+
+        Returns
+        -------
+        object
+            An object of the type of ``cls``.
+
+        Note
+        ----
+        This constructor method is meant to be used in conjuction with the
+        corresponding *to_binary* method.
+        """
+        reader = CBFReader(filepath, mmap=mmap)
+        if reader.schema != 'volmesh':
+            raise ValueError('The file does not contain a volmesh: {}'.format(reader.schema))
+        meta = reader.meta
+        volmesh = cls()
+        volmesh.attributes.update(meta['attributes'])
+        volmesh.default_vertex_attributes.update(meta['dva'])
+        volmesh.default_edge_attributes.update(meta['dea'])
+        volmesh.default_face_attributes.update(meta['dfa'])
+        volmesh.default_cell_attributes.update(meta['dca'])
+        names = None if attributes is None else set(attributes)
+        for key, attr in zip(*reader.read_table('vertex', None if names is None else names | set('xyz'))):
+            volmesh.add_vertex(key, attr_dict=attr)
+        vertices = iter(reader.read_list('halfface/vertices'))
+        sizes = reader.read_list('halfface/sizes')
+        for fkey, attr, size in zip(*(reader.read_table('face', names) + (sizes, ))):
+            volmesh.add_halfface(list(islice(vertices, size)), fkey=fkey, attr_dict=attr)
+        halffaces = iter(reader.read_list('cell/halffaces'))
+        counts = reader.read_list('cell/sizes')
+        for ckey, attr, count in zip(*(reader.read_table('cell', names) + (counts, ))):
+            volmesh.cell[ckey] = {}
+            volmesh.celldata[ckey] = attr
+            for fkey in islice(halffaces, count):
+                vertices = volmesh.halfface[fkey]
+                for i in range(-2, len(vertices) - 2):
+                    u = vertices[i]
+                    v = vertices[i + 1]
+                    w = vertices[i + 2]
+                    if u not in volmesh.cell[ckey]:
+                        volmesh.cell[ckey][u] = {}
+                    volmesh.cell[ckey][u][v] = fkey
+                    volmesh.plane[u][v][w] = ckey
+        for uv, attr in zip(*reader.read_table('edge', names)):
+            volmesh.edgedata[uv] = attr
+        volmesh._max_int_vkey = meta['max_int_vkey']
+        volmesh._max_int_fkey = meta['max_int_fkey']
+        volmesh._max_int_ckey = meta['max_int_ckey']
+        return volmesh
+
+    def to_binary(self, filepath):
+        """Serialise the volmesh to a binary file.
+
+        Parameters
+        ----------
+        filepath : str or file
+            The path to the binary file, or a file object opened in binary mode.
+
+        Notes
+        -----
+        The file is written in COMPAS Binary Format (see :class:`compas.files.CBFWriter`).
+        The halffaces and the halffaces of the cells are stored as flat integer arrays,
+        and the vertex, edge, face, and cell attributes as typed columns.
+        """
+        meta = {'attributes': self.attributes,
+                'dva': self.default_vertex_attributes,
+                'dea': self.default_edge_attributes,
+                'dfa': self.default_face_attributes,
+                'dca': self.default_cell_attributes,
+                'max_int_vkey': self._max_int_vkey,
+                'max_int_fkey': self._max_int_fkey,
+                'max_int_ckey': self._max_int_ckey}
+        writer = CBFWriter(filepath, 'volmesh', meta)
+        fkeys = list(self.halfface)
+        ckeys = list(self.cell)
+        cells = []
+        for ckey in ckeys:
+            halffaces = {}
+            for u in self.cell[ckey]:
+                for v in self.cell[ckey][u]:
+                    halffaces[self.cell[ckey][u][v]] = None
+            cells.append(list(halffaces))
+        writer.add_table('vertex', list(self.vertex), list(self.vertex.values()))
+        writer.add_table('face', fkeys, [self.facedata.get(fkey) or {} for fkey in fkeys])
+        writer.add_table('cell', ckeys, [self.celldata.get(ckey) or {} for ckey in ckeys])
+        writer.add_table('edge', list(self.edgedata), list(self.edgedata.values()))
+        writer.add_array('halfface/sizes', [len(self.halfface[fkey]) for fkey in fkeys], INT)
+        writer.add_array('halfface/vertices', [key for fkey in fkeys for key in self.halfface[fkey]], INT)
+        writer.add_array('cell/sizes', [len(halffaces) for halffaces in cells], INT)
+        writer.add_array('cell/halffaces', [fkey for halffaces in cells for fkey in halffaces], INT)
+        writer.write()
+
     @classmethod
     def from_pickle(cls, filepath):
         """Construct a mesh from serialised data contained in a pickle file.
@@ -6,6 +6,39 @@ files
 .. currentmodule:: compas.files
 
 
+CBF
+===
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    CBFReader
+    CBFWriter
+
+GLTF
+====
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    GLTF
+    GLTFReader
+    GLTFParser
+    GLTFExporter
+
+LAS
+===
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    LAS
+    LASReader
+    LASParser
+
 OBJ
 ===
 
@@ -27,6 +60,7 @@ PLY
     PLY
     PLYReader
     PLYParser
+    PLYWriter
 
 STL
 ===
@@ -38,6 +72,7 @@ STL
     STL
     STLReader
     STLParser
+    STLWriter
 
 URDF
 ====
@@ -66,6 +101,7 @@ from __future__ import division
 from __future__ import print_function
 
 from .amf import *  # noqa: F401 F403
+from .cbf import *  # noqa: F401 F403
 from .dxf import *  # noqa: F401 F403
 from .gltf import *  # noqa: F401 F403
 from .las import *  # noqa: F401 F403
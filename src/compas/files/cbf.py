@@ -0,0 +1,493 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import json
+import struct
+import sys
+from array import array
+from ast import literal_eval
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+
+
+__all__ = [
+    'CBFReader',
+    'CBFWriter',
+]
+
+
+MAGIC = b'\x89CBF\r\n\x1a\n'
+VERSION = 1
+ALIGNMENT = 64
+
+FLOAT = '<f8'
+INT = '<i8'
+BYTE = '|u1'
+
+MISSING = object()
+
+
+@contextmanager
+def _open(filepath, mode):
+    # file objects are used as they are, and are not closed
+    if hasattr(filepath, 'read') or hasattr(filepath, 'write'):
+        yield filepath
+    else:
+        with open(filepath, mode) as f:
+            yield f
+
+
+def _typecode(dtype):
+    if dtype == FLOAT:
+        return 'd'
+    if dtype == BYTE:
+        return 'B'
+    for typecode in ('q', 'l', 'i'):
+        try:
+            if array(typecode).itemsize == 8:
+                return typecode
+        except ValueError:
+            pass
+    raise ValueError('No 8-byte integer type available.')
+
+
+def _padding(n):
+    return (ALIGNMENT - n % ALIGNMENT) % ALIGNMENT
+
+
+def _to_bytes(values, dtype):
+    if isinstance(values, bytes):
+        return values
+    if hasattr(values, 'dtype'):
+        from numpy import ascontiguousarray
+        return ascontiguousarray(values, dtype=dtype).tobytes()
+    data = array(_typecode(dtype), values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes() if hasattr(data, 'tobytes') else data.tostring()
+
+
+def _from_bytes(data, dtype):
+    values = array(_typecode(dtype))
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _column_kind(values):
+    kind = None
+    for value in values:
+        if value is MISSING:
+            continue
+        if isinstance(value, bool):
+            current = 'bool'
+        elif isinstance(value, int) or type(value).__name__ == 'long':
+            current = 'int' if -2 ** 63 <= value < 2 ** 63 else 'json'
+        elif isinstance(value, float):
+            current = 'float'
+        else:
+            return 'json'
+        if kind is None:
+            kind = current
+        elif kind != current:
+            return 'json'
+    return kind or 'json'
+
+
+class CBFWriter(object):
+    """Write data structures to a file in COMPAS Binary Format (CBF).
+
+    A CBF file consists of a header and a sequence of typed arrays.
+    The header contains a schema identifier, free-form metadata, the layout of
+    all arrays (type, shape, and location in the file), and the definition of
+    attribute tables, which map the attributes of the elements of a data structure
+    to one typed array (column) per attribute.
+
+    Parameters
+    ----------
+    filepath : str or file
+        Path to the file, or a file object opened in binary mode, such as ``io.BytesIO``.
+    schema : str
+        Identifier of the type of data in the file.
+    meta : dict, optional
+        Metadata. The metadata is stored as JSON in the header of the file.
+
+    Notes
+    -----
+    The file has the following layout:
+
+    * 8 bytes: the signature ``b'\\x89CBF\\r\\n\\x1a\\n'``.
+    * 4 bytes: the version of the format (unsigned little endian integer).
+    * 4 bytes: reserved.
+    * 8 bytes: the length of the header (unsigned little endian integer).
+    * The header, as UTF-8 encoded JSON.
+    * The data of the arrays, every array aligned to 64 bytes from the start of the data section.
+
+    Arrays are stored as little endian doubles (``'<f8'``), 8-byte integers (``'<i8'``),
+    or bytes (``'|u1'``), such that they can be memory-mapped directly with NumPy.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'example.cbf')
+    >>> writer = CBFWriter(filepath, 'example')
+    >>> writer.add_array('points', [0.0, 0.0, 0.0, 1.0, 0.0, 0.0], FLOAT, shape=(2, 3))
+    >>> writer.add_table('point', [0, 1], [{'weight': 1.0}, {'weight': 2.0, 'fixed': True}])
+    >>> writer.write()
+
+    """
+
+    def __init__(self, filepath, schema, meta=None):
+        self.filepath = filepath
+        self.schema = schema
+        self.meta = meta or {}
+        self.arrays = OrderedDict()
+        self.tables = OrderedDict()
+
+    def add_array(self, name, values, dtype, shape=None):
+        """Add an array to the file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the array.
+        values : list or array
+            The values of the array. Multi-dimensional arrays should be provided
+            as NumPy arrays or as flat lists, in combination with a shape.
+            Arrays of type ``'|u1'`` can also be provided as a byte string.
+        dtype : {'<f8', '<i8', '|u1'}
+            The type of the values.
+        shape : tuple, optional
+            The shape of the array.
+            Default is the shape of the values, or the number of values.
+
+        """
+        data = _to_bytes(values, dtype)
+        if shape is None:
+            shape = values.shape if hasattr(values, 'shape') else (len(data) // (1 if dtype == BYTE else 8), )
+        self.arrays[name] = (dtype, [int(n) for n in shape], data)
+
+    def add_table(self, name, keys, attrs):
+        """Add an attribute table to the file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the table.
+        keys : list
+            The identifiers of the elements.
+        attrs : list of dict
+            The attributes of the elements.
+
+        Notes
+        -----
+        Integer keys, and tuples of integer keys of equal length, are stored as integer arrays.
+        Other keys are stored as a JSON list of their representations.
+
+        Attributes of which all values are booleans, integers, or floats, are stored as typed arrays.
+        All other attributes are stored as JSON.
+        If an attribute is missing for some of the elements,
+        a mask marking the elements that have the attribute is stored as well.
+
+        """
+        table = OrderedDict()
+        table['size'] = len(keys)
+        table['keys'] = self._add_keys(name, keys)
+        table['columns'] = OrderedDict()
+        names = OrderedDict()
+        for attr in attrs:
+            for attribute in attr:
+                names[attribute] = None
+        for attribute in names:
+            values = [attr.get(attribute, MISSING) for attr in attrs]
+            kind = _column_kind(values)
+            prefix = '{}/{}'.format(name, attribute)
+            mask = [0 if value is MISSING else 1 for value in values]
+            if kind == 'json':
+                text = json.dumps([None if value is MISSING else value for value in values], cls=DataEncoder)
+                self.add_array(prefix, text.encode('utf-8'), BYTE)
+            else:
+                default = False if kind == 'bool' else 0
+                values = [default if value is MISSING else value for value in values]
+                self.add_array(prefix, values, FLOAT if kind == 'float' else INT if kind == 'int' else BYTE)
+            masked = not all(mask)
+            if masked:
+                self.add_array(prefix + '.mask', mask, BYTE)
+            table['columns'][attribute] = {'kind': kind, 'masked': masked}
+        self.tables[name] = table
+
+    def _add_keys(self, name, keys):
+        if all(isinstance(key, int) and not isinstance(key, bool) for key in keys):
+            self.add_array(name + '/keys', keys, INT)
+            return 'int'
+        if keys and all(isinstance(key, tuple) for key in keys):
+            n = len(keys[0])
+            if all(len(key) == n and all(isinstance(k, int) and not isinstance(k, bool) for k in key) for key in keys):
+                self.add_array(name + '/keys', [k for key in keys for k in key], INT, shape=(len(keys), n))
+                return 'tuple'
+        self.add_array(name + '/keys', json.dumps([repr(key) for key in keys]).encode('utf-8'), BYTE)
+        return 'repr'
+
+    def write(self):
+        """Write the file."""
+        layout = OrderedDict()
+        offset = 0
+        for name, (dtype, shape, data) in self.arrays.items():
+            layout[name] = {'dtype': dtype, 'shape': shape, 'offset': offset, 'nbytes': len(data)}
+            offset += len(data) + _padding(len(data))
+        header = OrderedDict()
+        header['schema'] = self.schema
+        header['meta'] = self.meta
+        header['tables'] = self.tables
+        header['arrays'] = layout
+        header = json.dumps(header, cls=DataEncoder).encode('utf-8')
+        start = len(MAGIC) + 16 + len(header)
+        with _open(self.filepath, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<IIQ', VERSION, 0, len(header)))
+            f.write(header)
+            f.write(b'\x00' * _padding(start))
+            for dtype, shape, data in self.arrays.values():
+                f.write(data)
+                f.write(b'\x00' * _padding(len(data)))
+
+
+class CBFReader(object):
+    """Read files in COMPAS Binary Format (CBF).
+
+    Parameters
+    ----------
+    filepath : str or file
+        Path to the file, or a file object opened in binary mode, such as ``io.BytesIO``.
+        The data is read from the start of the file object.
+    mmap : bool, optional
+        Memory-map the arrays instead of reading them into memory.
+        This requires NumPy, and is ignored for file objects.
+        Only :meth:`read_array` returns memory-mapped views;
+        the other read methods copy the values into lists.
+        Default is ``False``.
+
+    Attributes
+    ----------
+    version : int
+        The version of the format of the file.
+    schema : str
+        Identifier of the type of data in the file.
+    meta : dict
+        The metadata.
+    tables : dict
+        The definition of the attribute tables.
+    arrays : dict
+        The type, shape and location of the arrays.
+
+    Notes
+    -----
+    Only the header is read when the reader is created.
+    Arrays are read when they are requested.
+
+    If NumPy is available, arrays are returned as NumPy arrays.
+    Otherwise, they are returned as flat typed arrays (``array.array``).
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'example.cbf')
+    >>> writer = CBFWriter(filepath, 'example')
+    >>> writer.add_array('points', [0.0, 0.0, 0.0, 1.0, 0.0, 0.0], FLOAT, shape=(2, 3))
+    >>> writer.add_table('point', [0, 1], [{'weight': 1.0}, {'weight': 2.0, 'fixed': True}])
+    >>> writer.write()
+    >>> reader = CBFReader(filepath, mmap=True)
+    >>> reader.read_array('points').shape
+    (2, 3)
+    >>> keys, attrs = reader.read_table('point')
+    >>> attrs
+    [{'weight': 1.0}, {'weight': 2.0, 'fixed': True}]
+
+    """
+
+    def __init__(self, filepath, mmap=False):
+        self.filepath = filepath
+        self.mmap = mmap and not hasattr(filepath, 'read')
+        with _open(filepath, 'rb') as f:
+            f.seek(0)
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError('Not a CBF file: {}'.format(filepath))
+            self.version, _, n = struct.unpack('<IIQ', f.read(16))
+            if self.version > VERSION:
+                raise ValueError('Unsupported CBF version: {}'.format(self.version))
+            header = json.loads(f.read(n).decode('utf-8'), object_pairs_hook=OrderedDict)
+        start = len(MAGIC) + 16 + n
+        self.start = start + _padding(start)
+        self.schema = header['schema']
+        self.meta = header['meta']
+        self.tables = header['tables']
+        self.arrays = header['arrays']
+
+    def read_array(self, name):
+        """Read an array.
+
+        Parameters
+        ----------
+        name : str
+            The name of the array.
+
+        Returns
+        -------
+        array
+            A NumPy array, or a flat ``array.array`` if NumPy is not available.
+
+        """
+        info = self.arrays[name]
+        dtype = info['dtype']
+        offset = self.start + info['offset']
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None and self.mmap and info['nbytes']:
+            return numpy.memmap(self.filepath, dtype=dtype, mode='r', offset=offset, shape=tuple(info['shape']))
+        with _open(self.filepath, 'rb') as f:
+            f.seek(offset)
+            data = f.read(info['nbytes'])
+        if numpy is not None:
+            return numpy.frombuffer(data, dtype=dtype).reshape(info['shape'])
+        return _from_bytes(data, dtype)
+
+    def read_list(self, name):
+        """Read an array as a flat list.
+
+        Parameters
+        ----------
+        name : str
+            The name of the array.
+
+        Returns
+        -------
+        list
+            The values of the array.
+
+        """
+        values = self.read_array(name)
+        if hasattr(values, 'ravel'):
+            values = values.ravel()
+        return values.tolist()
+
+    def read_json(self, name):
+        """Read an array of JSON encoded data.
+
+        Parameters
+        ----------
+        name : str
+            The name of the array.
+
+        Returns
+        -------
+        object
+            The decoded data.
+
+        """
+        data = self.read_array(name)
+        data = data.tobytes() if hasattr(data, 'tobytes') else data.tostring()
+        return json.loads(data.decode('utf-8'), cls=DataDecoder)
+
+    def read_keys(self, name):
+        """Read the keys of an attribute table.
+
+        Parameters
+        ----------
+        name : str
+            The name of the table.
+
+        Returns
+        -------
+        list
+            The keys.
+
+        """
+        kind = self.tables[name]['keys']
+        if kind == 'int':
+            return self.read_list(name + '/keys')
+        if kind == 'tuple':
+            values = self.read_list(name + '/keys')
+            n = self.arrays[name + '/keys']['shape'][1]
+            return list(zip(*[iter(values)] * n))
+        return [literal_eval(key) for key in self.read_json(name + '/keys')]
+
+    def read_columns(self, name, attributes=None):
+        """Read the attribute columns of an attribute table.
+
+        Parameters
+        ----------
+        name : str
+            The name of the table.
+        attributes : list of str, optional
+            The names of the attributes to read.
+            Default is all attributes.
+
+        Returns
+        -------
+        dict
+            For every attribute, the list of values and the mask (or ``None``).
+
+        """
+        columns = OrderedDict()
+        for attribute, column in self.tables[name]['columns'].items():
+            if attributes is not None and attribute not in attributes:
+                continue
+            prefix = '{}/{}'.format(name, attribute)
+            if column['kind'] == 'json':
+                values = self.read_json(prefix)
+            else:
+                values = self.read_list(prefix)
+                if column['kind'] == 'bool':
+                    values = [bool(value) for value in values]
+            mask = self.read_list(prefix + '.mask') if column['masked'] else None
+            columns[attribute] = values, mask
+        return columns
+
+    def read_table(self, name, attributes=None):
+        """Read an attribute table.
+
+        Parameters
+        ----------
+        name : str
+            The name of the table.
+        attributes : list of str, optional
+            The names of the attributes to read.
+            Default is all attributes.
+
+        Returns
+        -------
+        tuple
+            The list of keys, and the list of attribute dicts.
+
+        """
+        keys = self.read_keys(name)
+        attrs = [{} for _ in range(len(keys))]
+        for attribute, (values, mask) in self.read_columns(name, attributes).items():
+            if mask is None:
+                for attr, value in zip(attrs, values):
+                    attr[attribute] = value
+            else:
+                for attr, value, present in zip(attrs, values, mask):
+                    if present:
+                        attr[attribute] = value
+        return keys, attrs
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+    pass
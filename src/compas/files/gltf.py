@@ -6,6 +6,7 @@ __all__ = [
     'GLTF',
     'GLTFReader',
     'GLTFParser',
+    'GLTFExporter',
 ]
 
 import base64
@@ -28,6 +29,9 @@ COMPONENT_TYPE_UNSIGNED_SHORT = 5123
 COMPONENT_TYPE_UNSIGNED_INT = 5125
 COMPONENT_TYPE_FLOAT = 5126
 
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
 COMPONENT_TYPE_ENUM = {
     COMPONENT_TYPE_BYTE: 'b',
     COMPONENT_TYPE_UNSIGNED_BYTE: 'B',
@@ -123,20 +127,29 @@ class GLTFNode(object):
 class GLTF(object):
     """Read files in glTF format.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    arrays : bool, optional
+        If ``True``, the data of the accessors are NumPy arrays instead of lists (see :class:`GLTFReader`).
+        Default is ``False``.
+
     See Also
     --------
     * https://github.com/KhronosGroup/glTF/blob/master/specification/2.0/figures/gltfOverview-2.0.0b.png
 
     """
-    def __init__(self, filepath):
+    def __init__(self, filepath, arrays=False):
         self.filepath = filepath
+        self.arrays = arrays
 
         self._is_parsed = False
         self._reader = None
         self._parser = None
 
     def read(self):
-        self._reader = GLTFReader(self.filepath)
+        self._reader = GLTFReader(self.filepath, arrays=self.arrays)
         self._parser = GLTFParser(self._reader)
         self._is_parsed = True
 
@@ -165,6 +178,12 @@ class GLTFReader(object):
     filepath: str
         Path to the file.
         Binary files containing the mesh data are assumed to be in the same directory.
+    arrays : bool, optional
+        If ``True``, the file and its binary buffers are memory-mapped,
+        and the data of every accessor is a NumPy array that is a view of the buffer,
+        with a row per element, or a 1D array for scalar accessors.
+        Only sparse accessors are copied.
+        Default is ``False``.
 
     Attributes
     ----------
@@ -173,12 +192,14 @@ class GLTFReader(object):
     json : dict
         Dictionary object containing the contents of the glTF.
     data : list
-        List of lists containing data read from binary files.
+        List of lists containing data read from binary files,
+        or list of arrays if ``arrays`` is ``True``.
     image_data : list
         List containing binary image data.
     """
-    def __init__(self, filepath):
+    def __init__(self, filepath, arrays=False):
         self.filepath = filepath
+        self.arrays = arrays
 
         self.json = None
         self.data = []
@@ -191,8 +212,7 @@ class GLTFReader(object):
         self.read()
 
     def read(self):
-        with open(self.filepath, 'rb') as f:
-            self._content = memoryview(f.read())
+        self._content = self.read_file(self.filepath)
 
         is_glb = self._content[:4] == b'glTF'
 
@@ -203,21 +223,38 @@ class GLTFReader(object):
         else:
             self.load_from_glb()
 
-        self.release_buffer(self._content)
+        if not self.arrays:
+            self.release_buffer(self._content)
         self._content = None
 
         self.check_version()
 
         if self.json:
             for accessor in self.json.get('accessors', []):
-                accessor_data = self.access_data(accessor)
+                if self.arrays:
+                    accessor_data = self.access_array(accessor)
+                else:
+                    accessor_data = self.access_data(accessor)
                 self.data.append(accessor_data)
 
             for image in self.json.get('images', []):
                 image_data = self.get_image_data(image)
                 self.image_data.append(image_data)
 
-        self.release_buffers()
+        if self.arrays:
+            # the arrays are views of the buffers
+            self._glb_buffer = None
+            self._buffers = {}
+        else:
+            self.release_buffers()
+
+    def read_file(self, filepath):
+        if self.arrays:
+            import numpy as np
+            if os.path.getsize(filepath):
+                return memoryview(np.memmap(filepath, dtype=np.uint8, mode='r'))
+        with open(filepath, 'rb') as f:
+            return memoryview(f.read())
 
     def load_from_glb(self):
         header = struct.unpack_from('<4sII', self._content)
@@ -333,6 +370,85 @@ class GLTFReader(object):
 
         return data
 
+    def access_array(self, accessor):
+        """The data of an accessor as a NumPy array.
+
+        Parameters
+        ----------
+        accessor : dict
+            The accessor.
+
+        Returns
+        -------
+        array or None
+            An array of shape ``(count, num_components)``, or ``(count, )`` for scalars,
+            that is a view of the buffer, unless the accessor is sparse.
+
+        """
+        import numpy as np
+
+        count = accessor['count']
+        component_type = accessor['componentType']
+        num_components = NUM_COMPONENTS_BY_TYPE_ENUM[accessor['type']]
+
+        # This situation indicates use of an extension.
+        if 'sparse' not in accessor and 'bufferView' not in accessor:
+            return None
+
+        if 'bufferView' in accessor:
+            data = self.read_array_from_buffer_view(accessor['bufferView'], count, component_type, accessor.get('byteOffset', 0), num_components)
+        else:
+            data = np.zeros((count, num_components), dtype=COMPONENT_TYPE_ENUM[component_type])
+
+        if 'sparse' in accessor:
+            sparse_data = accessor['sparse']
+            sparse_count = sparse_data['count']
+            sparse_indices_data = sparse_data['indices']
+            sparse_indices = self.read_array_from_buffer_view(
+                sparse_indices_data['bufferView'],
+                sparse_count,
+                sparse_indices_data['componentType'],
+                sparse_indices_data.get('byteOffset', 0),
+                1
+            )
+            sparse_values_data = sparse_data['values']
+            sparse_values = self.read_array_from_buffer_view(
+                sparse_values_data['bufferView'],
+                sparse_count,
+                component_type,
+                sparse_values_data.get('byteOffset', 0),
+                num_components
+            )
+            data = np.array(data)
+            data[sparse_indices[:, 0]] = sparse_values
+
+            if accessor.get('normalized', False):
+                if component_type == COMPONENT_TYPE_BYTE:
+                    data = np.maximum(data / 127.0, -1.0)
+                elif component_type == COMPONENT_TYPE_UNSIGNED_BYTE:
+                    data = data / 255.0
+                elif component_type == COMPONENT_TYPE_SHORT:
+                    data = np.maximum(data / 32767.0, -1.0)
+                elif component_type == COMPONENT_TYPE_UNSIGNED_SHORT:
+                    data = data / 65535.0
+                else:
+                    data = data.astype(float)
+
+        if num_components == 1:
+            data = data[:, 0]
+
+        return data
+
+    def read_array_from_buffer_view(self, buffer_view_index, count, component_type, accessor_offset, num_components):
+        import numpy as np
+
+        buffer_view = self.json['bufferViews'][buffer_view_index]
+        offset = accessor_offset + buffer_view.get('byteOffset', 0)
+        dtype = np.dtype('<' + COMPONENT_TYPE_ENUM[component_type])
+        byte_stride = buffer_view.get('byteStride', dtype.itemsize * num_components)
+        buffer = self.get_buffer(buffer_view['buffer'])
+        return np.ndarray((count, num_components), dtype=dtype, buffer=buffer, offset=offset, strides=(byte_stride, dtype.itemsize))
+
     def get_generic_data(self, num_components, count):
         return [(0, ) * num_components for _ in range(count)]
 
@@ -388,8 +504,7 @@ class GLTFReader(object):
             buffer = memoryview(base64.b64decode(string))
         else:
             filepath = self.get_filepath(uri)
-            with open(filepath, 'rb') as f:
-                buffer = memoryview(f.read())
+            buffer = self.read_file(filepath)
 
         self._buffers[buffer_index] = buffer
 
@@ -529,6 +644,8 @@ class GLTFParser(object):
         return vector[:3]
 
     def get_mesh_data(self, gltf_node):
+        if self.reader.arrays:
+            return self.get_mesh_data_arrays(gltf_node)
         faces = []
         vertices = []
         mesh = self.reader.json['meshes'][gltf_node.mesh_index]
@@ -562,6 +679,36 @@ class GLTFParser(object):
             shift += len(primitive_vertices)
         return MeshData(faces, vertices, mesh_name)
 
+    def get_mesh_data_arrays(self, gltf_node):
+        # the vertices and faces of the mesh as arrays
+        import numpy as np
+
+        faces = []
+        vertices = []
+        mesh = self.reader.json['meshes'][gltf_node.mesh_index]
+        shift = 0
+        weights = self.get_weights(mesh, gltf_node)
+        for primitive in mesh['primitives']:
+            face_side_count = self.get_face_side_count(primitive)
+            if 'POSITION' not in primitive['attributes']:
+                continue
+            primitive_vertices = self.reader.data[primitive['attributes']['POSITION']]
+            if weights and 'targets' in primitive and primitive['targets'] and 'POSITION' in primitive['targets'][0]:
+                primitive_vertices = primitive_vertices.astype(float)
+                for weight, target in zip(weights, primitive['targets']):
+                    primitive_vertices += weight * self.reader.data[target['POSITION']]
+            vertices.append(primitive_vertices)
+            if 'indices' in primitive:
+                indices = self.reader.data[primitive['indices']].astype(int)
+            else:
+                indices = np.arange(len(primitive_vertices))
+            count = len(indices) // face_side_count * face_side_count
+            faces.append(indices[:count].reshape((-1, face_side_count)) + shift)
+            shift += len(primitive_vertices)
+        if not vertices:
+            return MeshData(np.empty((0, 3), dtype=int), np.empty((0, 3)), mesh.get('name'))
+        return MeshData(np.concatenate(faces), np.concatenate(vertices), mesh.get('name'))
+
     def get_weights(self, mesh, gltf_node):
         weights = mesh.get('weights', None)
         weights = gltf_node.weights or weights
@@ -609,6 +756,231 @@ class GLTFParser(object):
         return list(zip(*it))
 
 
+class GLTFExporter(object):
+    """Export meshes to a glTF file, with all mesh data packed in a single binary buffer.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+        If the extension is ``.glb``, the JSON and the buffer are written to one binary file.
+        Otherwise, the buffer is written to a ``.bin`` file next to the glTF file.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> import compas
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'faces.glb')
+    >>> exporter = GLTFExporter(filepath)
+    >>> exporter.add_mesh(mesh, name='faces')
+    0
+    >>> exporter.export()
+    >>> GLTF(filepath, arrays=True).parser.scenes[0].nodes[0].mesh_data.faces.shape
+    (50, 3)
+
+    Notes
+    -----
+    Every mesh is a node of the default scene, with a primitive of triangles.
+    Faces with more than three vertices are triangulated as fans around their first vertex.
+    The vertex data are stored as ``float32``, and the indices as ``uint16``,
+    or ``uint32`` for meshes with more than 65535 vertices.
+    The mesh data are converted to arrays with NumPy.
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.nodes = []
+        self.meshes = []
+        self.accessors = []
+        self.buffer_views = []
+        self._arrays = []
+        self._byte_length = 0
+
+    def add_mesh(self, mesh, name=None, matrix=None, normals=True, colors=None):
+        """Add a mesh to the scene.
+
+        Parameters
+        ----------
+        mesh : :class:`compas.datastructures.Mesh`
+            The mesh.
+        name : str, optional
+            The name of the mesh.
+            Default is the name of the mesh data structure.
+        matrix : list, optional
+            The transformation matrix of the node of the mesh, as a list of rows.
+        normals : bool, optional
+            If ``True``, the area-weighted vertex normals are included.
+            Default is ``True``.
+        colors : str, optional
+            The name of a vertex attribute with an RGB color,
+            with components in the range 0-255, or 0-1.
+            Default is ``None``, in which case no colors are included.
+
+        Returns
+        -------
+        int
+            The index of the node of the mesh.
+
+        """
+        import numpy as np
+
+        key_index = mesh.key_index()
+        vertices = np.asarray(mesh.vertices_array('xyz'), dtype=np.float32).reshape((-1, 3))
+        triangles = self.triangles(mesh, key_index)
+
+        attributes = {'POSITION': self.add_accessor(vertices, TARGET_ARRAY_BUFFER, bounds=True)}
+        if normals and len(triangles):
+            attributes['NORMAL'] = self.add_accessor(self.vertex_normals(vertices, triangles), TARGET_ARRAY_BUFFER)
+        if colors:
+            rgb = np.array([mesh.vertex_attribute(key, colors) or (0, 0, 0) for key in mesh.vertices()], dtype=np.float32)
+            if len(rgb) and rgb.max() > 1.0:
+                rgb /= 255.0
+            attributes['COLOR_0'] = self.add_accessor(rgb, TARGET_ARRAY_BUFFER)
+
+        primitive = {'attributes': attributes}
+        if len(triangles):
+            dtype = np.uint16 if len(vertices) <= 65535 else np.uint32
+            primitive['indices'] = self.add_accessor(triangles.astype(dtype).ravel(), TARGET_ELEMENT_ARRAY_BUFFER)
+            primitive['mode'] = 4
+        else:
+            primitive['mode'] = 0
+
+        self.meshes.append({'name': name or mesh.name, 'primitives': [primitive]})
+        node = {'mesh': len(self.meshes) - 1, 'name': name or mesh.name}
+        if matrix is not None:
+            node['matrix'] = [float(value) for column in zip(*matrix) for value in column]
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+
+    @staticmethod
+    def triangles(mesh, key_index):
+        # fan triangulation of the faces, in the order of the faces
+        import numpy as np
+        from itertools import chain
+
+        faces = [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+        sizes = np.array([len(face) for face in faces], dtype=int)
+        if not len(faces) or sizes.max() < 3:
+            return np.empty((0, 3), dtype=int)
+        keys = list(key_index)
+        lookup = np.zeros(max(keys) + 1, dtype=int)
+        lookup[keys] = list(key_index.values())
+        indices = lookup[np.fromiter(chain.from_iterable(faces), dtype=int, count=sizes.sum())]
+        starts = np.cumsum(sizes) - sizes
+        counts = np.maximum(sizes - 2, 0)
+        first = np.repeat(starts, counts)
+        j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.stack([indices[first], indices[first + j + 1], indices[first + j + 2]], axis=1)
+
+    @staticmethod
+    def vertex_normals(vertices, triangles):
+        # the sum of the area vectors of the triangles around the vertices
+        import numpy as np
+
+        xyz = vertices.astype(float)
+        a, b, c = xyz[triangles[:, 0]], xyz[triangles[:, 1]], xyz[triangles[:, 2]]
+        cross = np.cross(b - a, c - a)
+        indices = triangles.ravel()
+        normals = np.empty_like(xyz)
+        for i in range(3):
+            normals[:, i] = np.bincount(indices, weights=np.repeat(cross[:, i], 3), minlength=len(xyz))
+        lengths = np.linalg.norm(normals, axis=1)
+        lengths[lengths == 0] = 1.0
+        return (normals / lengths[:, None]).astype(np.float32)
+
+    def add_accessor(self, array, target, bounds=False):
+        """Add an array to the buffer, with a buffer view and an accessor.
+
+        Parameters
+        ----------
+        array : array
+            A 1D array of scalars or a 2D array of ``VEC2``, ``VEC3``, or ``VEC4`` elements,
+            with a dtype that corresponds to a glTF component type.
+        target : int
+            The target of the buffer view.
+        bounds : bool, optional
+            If ``True``, the minimum and maximum of the components are included.
+
+        Returns
+        -------
+        int
+            The index of the accessor.
+
+        """
+        import numpy as np
+
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+        component_types = {value: key for key, value in COMPONENT_TYPE_ENUM.items()}
+        component_type = component_types[array.dtype.char]
+        type_ = 'SCALAR' if array.ndim == 1 else 'VEC{}'.format(array.shape[1])
+
+        self.buffer_views.append({'buffer': 0,
+                                  'byteOffset': self._byte_length,
+                                  'byteLength': array.nbytes,
+                                  'target': target})
+        self._arrays.append(array)
+        self._byte_length += array.nbytes + (-array.nbytes % 4)
+
+        accessor = {'bufferView': len(self.buffer_views) - 1,
+                    'componentType': component_type,
+                    'count': len(array),
+                    'type': type_}
+        if bounds and len(array):
+            accessor['min'] = np.atleast_1d(array.min(axis=0)).tolist()
+            accessor['max'] = np.atleast_1d(array.max(axis=0)).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+    def export(self):
+        """Write the scene to the file."""
+        is_glb = os.path.splitext(self.filepath)[1].lower() == '.glb'
+
+        buffer = {'byteLength': self._byte_length}
+        if not is_glb:
+            bin_filepath = os.path.splitext(self.filepath)[0] + '.bin'
+            buffer['uri'] = os.path.basename(bin_filepath)
+        data = {'asset': {'version': '2.0', 'generator': 'COMPAS'},
+                'scene': 0,
+                'scenes': [{'nodes': list(range(len(self.nodes)))}],
+                'nodes': self.nodes,
+                'meshes': self.meshes,
+                'accessors': self.accessors,
+                'bufferViews': self.buffer_views,
+                'buffers': [buffer] if self._byte_length else []}
+        if not self._byte_length:
+            del data['bufferViews']
+
+        if not is_glb:
+            with open(self.filepath, 'w') as f:
+                json.dump(data, f)
+            if self._byte_length:
+                with open(bin_filepath, 'wb') as f:
+                    self.write_buffer(f)
+            return
+
+        json_bytes = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        json_bytes += b' ' * (-len(json_bytes) % 4)
+        length = 12 + 8 + len(json_bytes)
+        if self._byte_length:
+            length += 8 + self._byte_length
+        with open(self.filepath, 'wb') as f:
+            f.write(struct.pack('<4sII', b'glTF', 2, length))
+            f.write(struct.pack('<I4s', len(json_bytes), b'JSON'))
+            f.write(json_bytes)
+            if self._byte_length:
+                f.write(struct.pack('<I4s', self._byte_length, b'BIN\0'))
+                self.write_buffer(f)
+
+    def write_buffer(self, f):
+        for array in self._arrays:
+            f.write(array.tobytes())
+            f.write(b'\0' * (-array.nbytes % 4))
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
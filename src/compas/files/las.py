@@ -2,17 +2,162 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import os
+import struct
 
-__all__ = []
+
+__all__ = [
+    'LAS',
+    'LASReader',
+    'LASParser',
+]
+
+
+# the number of points that are read at once
+CHUNK_SIZE = 1000000
+
+# the fields of the public header block, per version, with their struct format
+HEADER_12 = [
+    ('file_signature', '4s'),
+    ('file_source_id', 'H'),
+    ('global_encoding', 'H'),
+    ('guid_1', 'I'),
+    ('guid_2', 'H'),
+    ('guid_3', 'H'),
+    ('guid_4', '8s'),
+    ('version_major', 'B'),
+    ('version_minor', 'B'),
+    ('system_identifier', '32s'),
+    ('generating_software', '32s'),
+    ('creation_day', 'H'),
+    ('creation_year', 'H'),
+    ('header_size', 'H'),
+    ('offset_to_points', 'I'),
+    ('number_of_vlrs', 'I'),
+    ('point_format', 'B'),
+    ('point_record_length', 'H'),
+    ('legacy_point_count', 'I'),
+    ('legacy_points_by_return', '5I'),
+    ('scale', '3d'),
+    ('offset', '3d'),
+    ('max_x', 'd'),
+    ('min_x', 'd'),
+    ('max_y', 'd'),
+    ('min_y', 'd'),
+    ('max_z', 'd'),
+    ('min_z', 'd'),
+]
+
+HEADER_13 = HEADER_12 + [
+    ('waveform_offset', 'Q'),
+]
+
+HEADER_14 = HEADER_13 + [
+    ('evlr_offset', 'Q'),
+    ('number_of_evlrs', 'I'),
+    ('point_count', 'Q'),
+    ('points_by_return', '15Q'),
+]
+
+# the fields of a variable length record header
+VLR = struct.Struct('<H16sHH32s')
+
+# the fields of the point data record formats
+POINT_0 = [
+    ('X', '<i4'),
+    ('Y', '<i4'),
+    ('Z', '<i4'),
+    ('intensity', '<u2'),
+    ('return_bits', 'u1'),
+    ('classification_bits', 'u1'),
+    ('scan_angle_rank', 'i1'),
+    ('user_data', 'u1'),
+    ('point_source_id', '<u2'),
+]
+
+POINT_6 = [
+    ('X', '<i4'),
+    ('Y', '<i4'),
+    ('Z', '<i4'),
+    ('intensity', '<u2'),
+    ('return_bits', 'u1'),
+    ('flag_bits', 'u1'),
+    ('classification', 'u1'),
+    ('user_data', 'u1'),
+    ('scan_angle', '<i2'),
+    ('point_source_id', '<u2'),
+    ('gps_time', '<f8'),
+]
+
+GPS_TIME = [('gps_time', '<f8')]
+RGB = [('red', '<u2'), ('green', '<u2'), ('blue', '<u2')]
+NIR = [('nir', '<u2')]
+WAVE_PACKET = [
+    ('wave_packet_descriptor_index', 'u1'),
+    ('wave_packet_offset', '<u8'),
+    ('wave_packet_size', '<u4'),
+    ('wave_return_point_location', '<f4'),
+    ('wave_x_t', '<f4'),
+    ('wave_y_t', '<f4'),
+    ('wave_z_t', '<f4'),
+]
+
+POINT_FORMATS = {
+    0: POINT_0,
+    1: POINT_0 + GPS_TIME,
+    2: POINT_0 + RGB,
+    3: POINT_0 + GPS_TIME + RGB,
+    4: POINT_0 + GPS_TIME + WAVE_PACKET,
+    5: POINT_0 + GPS_TIME + RGB + WAVE_PACKET,
+    6: POINT_6,
+    7: POINT_6 + RGB,
+    8: POINT_6 + RGB + NIR,
+    9: POINT_6 + WAVE_PACKET,
+    10: POINT_6 + RGB + NIR + WAVE_PACKET,
+}
+
+
+def _point_dtype(point_format, record_length):
+    # the structured type of the point records
+    # with the extra bytes at the end of every record, if any
+    from numpy import dtype
+    fields = POINT_FORMATS[point_format]
+    names = [name for name, _ in fields]
+    formats = [fmt for _, fmt in fields]
+    offsets = []
+    offset = 0
+    for fmt in formats:
+        offsets.append(offset)
+        offset += dtype(fmt).itemsize
+    if record_length < offset:
+        raise ValueError('The point records of format {} should have at least {} bytes.'.format(point_format, offset))
+    return dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': record_length})
 
 
 class LAS(object):
     """LASer file format.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    precision : str, optional
+        Not used.
+
     See Also
     --------
     * http://www.asprs.org/wp-content/uploads/2010/12/LAS_1_4_r13.pdf
 
+    Examples
+    --------
+    .. code-block:: python
+
+        from compas.files import LAS
+        from compas.geometry import bestfit_plane_numpy
+
+        las = LAS('scan.las')
+        for points in las.reader.iter_points(bbox=[[0, 0, 0], [10, 10, 3]], classification=[2]):
+            plane = bestfit_plane_numpy(points)
 
     """
 
@@ -43,26 +188,315 @@ class LAS(object):
 
 
 class LASReader(object):
-    """"""
+    """Reader of the header and the point records of an uncompressed LAS file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    mmap : bool, optional
+        If ``True``, the point records are memory-mapped.
+        Otherwise, they are read from the file every time they are needed.
+        Default is ``True``.
 
-    def __init__(self, filepath):
+    Attributes
+    ----------
+    header : dict
+        The fields of the public header block.
+    version : tuple
+        The major and minor version of the format.
+    point_format : int
+        The point data record format.
+    point_count : int
+        The number of point records.
+    scale : list
+        The scale factors of the X, Y, and Z coordinates.
+    offset : list
+        The offsets of the X, Y, and Z coordinates.
+    bounds : list
+        The minimum and maximum coordinates of the points, according to the header.
+    vlrs : list of dict
+        The variable length records,
+        with their ``'user_id'``, ``'record_id'``, ``'description'``, and ``'data'``.
+
+    Notes
+    -----
+    LAS versions 1.0 to 1.4, and point data record formats 0 to 10, are supported.
+    Compressed files (LAZ) are not.
+
+    The header is read when the reader is created.
+    The point records are decoded with NumPy, as structured arrays
+    with a field per property of the point data record format (see :meth:`records`),
+    and the coordinates are scaled and offset in chunks (see :meth:`iter_points`),
+    such that clouds that do not fit in memory can be processed.
+
+    """
+
+    def __init__(self, filepath, mmap=True):
         self.filepath = filepath
+        self.mmap = mmap
+        self.header = None
+        self.version = None
+        self.point_format = None
+        self.point_count = None
+        self.scale = None
+        self.offset = None
+        self.bounds = None
+        self.vlrs = []
+        self._records = None
         self.read()
 
     def read(self):
-        pass
+        """Read the public header block and the variable length records."""
+        with open(self.filepath, 'rb') as f:
+            data = f.read(375)
+            if data[:4] != b'LASF':
+                raise ValueError('Not a LAS file: {}'.format(self.filepath))
+            version = struct.unpack_from('<BB', data, 24)
+            if version >= (1, 4):
+                fields = HEADER_14
+            elif version == (1, 3):
+                fields = HEADER_13
+            else:
+                fields = HEADER_12
+            fmt = '<' + ''.join(fmt for _, fmt in fields)
+            if len(data) < struct.calcsize(fmt):
+                raise ValueError('The header of the file is truncated.')
+            values = list(struct.unpack_from(fmt, data))
+            header = {}
+            for name, fmt in fields:
+                count = int(fmt[:-1] or 1)
+                if fmt[-1] == 's':
+                    header[name] = values.pop(0).rstrip(b'\0').decode('ascii', 'replace')
+                elif count > 1:
+                    header[name] = [values.pop(0) for i in range(count)]
+                else:
+                    header[name] = values.pop(0)
+            f.seek(header['header_size'])
+            self.vlrs = []
+            for i in range(header['number_of_vlrs']):
+                data = f.read(VLR.size)
+                if len(data) < VLR.size:
+                    raise ValueError('The variable length records are truncated.')
+                _, user_id, record_id, length, description = VLR.unpack(data)
+                self.vlrs.append({
+                    'user_id': user_id.rstrip(b'\0').decode('ascii', 'replace'),
+                    'record_id': record_id,
+                    'description': description.rstrip(b'\0').decode('ascii', 'replace'),
+                    'data': f.read(length),
+                })
+
+        self.header = header
+        self.version = version
+        if header['point_format'] & 0xC0:
+            raise NotImplementedError('Compressed (LAZ) point records are not supported.')
+        self.point_format = header['point_format']
+        if self.point_format not in POINT_FORMATS:
+            raise ValueError('Unsupported point data record format: {}'.format(self.point_format))
+        self.point_count = header.get('point_count') or header['legacy_point_count']
+        self.scale = header['scale']
+        self.offset = header['offset']
+        self.bounds = [[header['min_x'], header['min_y'], header['min_z']],
+                       [header['max_x'], header['max_y'], header['max_z']]]
+        size = header['offset_to_points'] + self.point_count * header['point_record_length']
+        if os.path.getsize(self.filepath) < size:
+            raise ValueError('The file is truncated: expected {} point records.'.format(self.point_count))
+        self._records = None
+
+    # ==========================================================================
+    # point records
+    # ==========================================================================
+
+    def records(self, start=0, stop=None):
+        """The raw point records.
+
+        Parameters
+        ----------
+        start : int, optional
+            The index of the first record.
+            Default is ``0``.
+        stop : int, optional
+            The index after the last record.
+            Default is the number of records.
+
+        Returns
+        -------
+        array
+            A structured array with a field per property of the point data record format,
+            for example ``'X'``, ``'Y'``, ``'Z'``, ``'intensity'``, ``'gps_time'``, ``'red'``.
+            The coordinates are the unscaled integers stored in the file.
+            If the records are memory-mapped, the array is a view of the file.
+
+        """
+        import numpy as np
+        stop = self.point_count if stop is None else min(stop, self.point_count)
+        start = min(start, stop)
+        dtype = _point_dtype(self.point_format, self.header['point_record_length'])
+        if self.mmap:
+            if self._records is None:
+                if not self.point_count:
+                    return np.empty(0, dtype=dtype)
+                self._records = np.memmap(self.filepath, dtype=dtype, mode='r',
+                                          offset=self.header['offset_to_points'], shape=(self.point_count, ))
+            return self._records[start:stop]
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.header['offset_to_points'] + start * dtype.itemsize)
+            return np.fromfile(f, dtype=dtype, count=stop - start)
+
+    def coordinates(self, records):
+        """The scaled and offset XYZ coordinates of point records.
+
+        Parameters
+        ----------
+        records : array
+            Point records (see :meth:`records`).
+
+        Returns
+        -------
+        array
+            An array of shape ``(n, 3)``.
+
+        """
+        import numpy as np
+        xyz = np.empty((len(records), 3))
+        for i, name in enumerate('XYZ'):
+            xyz[:, i] = records[name]
+            xyz[:, i] *= self.scale[i]
+            xyz[:, i] += self.offset[i]
+        return xyz
+
+    def attribute(self, records, name):
+        """The values of a property of point records.
+
+        Parameters
+        ----------
+        records : array
+            Point records (see :meth:`records`).
+        name : str
+            The name of a field of the records,
+            or one of ``'classification'``, ``'return_number'``, and ``'number_of_returns'``,
+            which are decoded from the bit fields of the records.
+
+        Returns
+        -------
+        array
+            The values.
+
+        """
+        if self.point_format < 6:
+            if name == 'classification':
+                return records['classification_bits'] & 0x1F
+            if name == 'return_number':
+                return records['return_bits'] & 0x07
+            if name == 'number_of_returns':
+                return (records['return_bits'] >> 3) & 0x07
+        else:
+            if name == 'return_number':
+                return records['return_bits'] & 0x0F
+            if name == 'number_of_returns':
+                return records['return_bits'] >> 4
+        return records[name]
+
+    def iter_points(self, chunk_size=CHUNK_SIZE, bbox=None, classification=None, attributes=None):
+        """Iterate over the points in chunks.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The number of point records that are read at once.
+            Default is ``1000000``.
+        bbox : list, optional
+            The minimum and maximum XYZ coordinates of a box.
+            Only points inside the box are returned.
+        classification : list of int, optional
+            Only points with one of these classes are returned.
+        attributes : list of str, optional
+            The names of properties of the points to return with the coordinates (see :meth:`attribute`).
+
+        Yields
+        ------
+        array or tuple
+            The coordinates of the points of a chunk that pass the filters, as an array of shape ``(n, 3)``,
+            or, if ``attributes`` are provided, the coordinates and a dictionary with the values of the attributes.
+
+        Notes
+        -----
+        Only one chunk of records is in memory at any time.
+        The coordinate arrays can be used directly with, for example,
+        :class:`compas.geometry.KDTree`, :func:`compas.geometry.icp_numpy`,
+        and :func:`compas.geometry.bestfit_plane_numpy`.
+
+        """
+        import numpy as np
+        if bbox is not None:
+            bbox = np.asarray(bbox, dtype=float)
+        if classification is not None:
+            classification = np.asarray(classification)
+        for start in range(0, self.point_count, chunk_size):
+            records = self.records(start, start + chunk_size)
+            mask = None
+            if classification is not None:
+                mask = np.isin(self.attribute(records, 'classification'), classification)
+                records = records[mask]
+            xyz = self.coordinates(records)
+            if bbox is not None:
+                mask = ((xyz >= bbox[0]) & (xyz <= bbox[1])).all(axis=1)
+                xyz = xyz[mask]
+                records = records[mask]
+            if not len(xyz):
+                continue
+            if attributes is None:
+                yield xyz
+            else:
+                yield xyz, {name: np.array(self.attribute(records, name)) for name in attributes}
 
 
 class LASParser(object):
-    """"""
+    """Parser of the points of a LAS file.
+
+    Parameters
+    ----------
+    reader : :class:`LASReader`
+        The reader of the file.
+    precision : str, optional
+        Not used.
+
+    Attributes
+    ----------
+    points : array
+        The XYZ coordinates of all points, as an array of shape ``(n, 3)``.
+    intensity : array
+        The intensity of every point.
+    classification : array
+        The class of every point.
+    colors : array or None
+        The RGB colors of the points, as an array of shape ``(n, 3)``,
+        if the point data record format has colors.
+
+    Notes
+    -----
+    All points are loaded into memory.
+    Use :meth:`LASReader.iter_points` to process large clouds in chunks.
+
+    """
 
     def __init__(self, reader, precision):
         self.reader = reader
         self.precision = precision
+        self.points = None
+        self.intensity = None
+        self.classification = None
+        self.colors = None
         self.parse()
 
     def parse(self):
-        pass
+        import numpy as np
+        records = self.reader.records()
+        self.points = self.reader.coordinates(records)
+        self.intensity = np.array(records['intensity'])
+        self.classification = np.array(self.reader.attribute(records, 'classification'))
+        if 'red' in records.dtype.names:
+            self.colors = np.column_stack([records[name] for name in ('red', 'green', 'blue')])
 
 
 # ==============================================================================
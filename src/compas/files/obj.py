@@ -2,13 +2,22 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import re
+from array import array
 from collections import OrderedDict
+from itertools import groupby
+from itertools import islice
+from operator import itemgetter
 
 try:
     from urllib.request import urlopen
 except ImportError:
     from urllib2 import urlopen
 
+import compas
+
+from compas.files.stl import _decimals
+from compas.files.stl import _weld_numpy
 from compas.utilities import geometric_key
 
 
@@ -19,26 +28,113 @@ __all__ = [
 ]
 
 
+# the number of lines that are parsed at once
+CHUNK_SIZE = 10000
+
+# the texture and normal indices of the vertices of a face
+TEXTURE_NORMAL = re.compile(r'/[^\s]*')
+
+
+class _Rows(object):
+    """Rows of numbers of fixed width, stored in one flat array."""
+
+    def __init__(self, typecode, width):
+        self.width = width
+        self.data = array(typecode)
+
+    def __len__(self):
+        return len(self.data) // self.width
+
+    def append(self, row):
+        if self.width == 1:
+            self.data.append(row)
+        else:
+            self.data.extend(row)
+
+    def extend(self, rows):
+        from numpy import ascontiguousarray
+        self.data.frombytes(ascontiguousarray(rows, dtype=self.data.typecode).tobytes())
+
+    def to_numpy(self):
+        from numpy import frombuffer
+        values = frombuffer(self.data, dtype=self.data.typecode)
+        return values.reshape((-1, self.width)) if self.width > 1 else values
+
+
+class _Polygons(object):
+    """Polygons with any number of vertices, stored in one flat array of indices."""
+
+    def __init__(self):
+        self.indices = array('i')
+        self.offsets = array('i')
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, polygon):
+        self.offsets.append(len(self.indices))
+        self.indices.extend(polygon)
+
+    def extend(self, polygons):
+        from numpy import arange
+        from numpy import ascontiguousarray
+        n, k = polygons.shape
+        start = len(self.indices)
+        self.offsets.frombytes(arange(start, start + n * k, k, dtype='i').tobytes())
+        self.indices.frombytes(ascontiguousarray(polygons, dtype='i').tobytes())
+
+    def to_numpy(self):
+        """The polygons as a 2D array if they have the same number of vertices,
+        or else as a flat array of indices and the offsets of the polygons."""
+        from numpy import append
+        from numpy import diff
+        from numpy import frombuffer
+        indices = frombuffer(self.indices, dtype='i')
+        offsets = append(frombuffer(self.offsets, dtype='i'), len(indices))
+        sizes = diff(offsets)
+        if len(sizes) and (sizes == sizes[0]).all():
+            return indices.reshape((-1, sizes[0])), None
+        return indices, offsets
+
+
 class OBJ(object):
     """Read and write files in OBJ format.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    precision : str, optional
+        The precision with which the vertices are welded.
+        Default is ``None``, in which case the global precision setting is used (``compas.PRECISION``).
+    weld : bool, optional
+        If ``False``, the vertices are not welded,
+        and the faces reference the vertices as they are listed in the file.
+        Default is ``True``.
+    low_memory : bool, optional
+        If ``True``, the vertices and faces are stored in flat arrays while the file is read,
+        and returned as NumPy arrays (see :class:`OBJReader`).
+        Default is ``False``.
+
     See Also
     --------
     * http://paulbourke.net/dataformats/obj/
 
     """
 
-    def __init__(self, filepath, precision=None):
+    def __init__(self, filepath, precision=None, weld=True, low_memory=False):
         self.filepath = filepath
         self.precision = precision
+        self.weld = weld
+        self.low_memory = low_memory
 
         self._is_parsed = False
         self._reader = None
         self._parser = None
 
     def read(self):
-        self._reader = OBJReader(self.filepath)
-        self._parser = OBJParser(self._reader, precision=self.precision)
+        self._reader = OBJReader(self.filepath, low_memory=self.low_memory)
+        self._parser = OBJParser(self._reader, precision=self.precision, weld=self.weld)
         self._is_parsed = True
 
         self._reader.open()
@@ -71,6 +167,22 @@ class OBJ(object):
     def faces(self):
         return self.parser.faces
 
+    def iter_groups(self):
+        """Read the file and yield its objects and groups one at a time.
+
+        Yields
+        ------
+        tuple
+            The name of the object or group,
+            its vertices, and its faces, referencing its vertices.
+
+        Notes
+        -----
+        See :meth:`OBJReader.iter_groups`.
+
+        """
+        return OBJReader(self.filepath, low_memory=self.low_memory).iter_groups()
+
 
 class OBJReader(object):
     """Read the contents of an *obj* file.
@@ -79,6 +191,16 @@ class OBJReader(object):
     ----------
     filepath : str
         Path to the file.
+    chunk_size : int, optional
+        The number of lines that are parsed at once.
+        Default is ``10000``.
+    low_memory : bool, optional
+        If ``True``, the vertex coordinates, weights, and faces are stored in flat arrays while the file is read.
+        After :meth:`post`, the vertices are a NumPy array of shape ``(n, 3)``,
+        and the faces an array of shape ``(m, k)`` if they all have ``k`` vertices,
+        or else a flat array of vertex indices, with the start of every face in :attr:`face_offsets`.
+        Requires NumPy.
+        Default is ``False``.
 
     Attributes
     ----------
@@ -102,9 +224,17 @@ class OBJReader(object):
         Curves
     surfaces : list
         Surfaces
+    face_offsets : array or None
+        The start of every face in the flat array of faces, followed by the total number of vertex indices,
+        if the faces are stored in low-memory mode and do not all have the same number of vertices.
 
     Notes
     -----
+    The file is read and parsed in chunks of lines, such that it is never held in memory as a whole.
+    The records of a chunk are dispatched per run of records of the same type
+    through a table of handlers (see :meth:`read`).
+    If NumPy is available, runs of vertex (``v``) and face (``f``) records are converted all at once.
+
     For more info, see [1]_.
 
     References
@@ -114,18 +244,25 @@ class OBJReader(object):
 
     """
 
-    def __init__(self, filepath):
+    def __init__(self, filepath, chunk_size=CHUNK_SIZE, low_memory=False):
         self.filepath = filepath
+        self.chunk_size = chunk_size
         self.content = None
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            numpy = None
+        self.low_memory = low_memory and numpy is not None
         # vertex data
-        self.vertices = []
-        self.weights = []
+        self.vertices = _Rows('d', 3) if self.low_memory else []
+        self.weights = _Rows('d', 1) if self.low_memory else []
         self.textures = []
         self.normals = []
         # polygonal geometry
         self.points = []
         self.lines = []
-        self.faces = []
+        self.faces = _Polygons() if self.low_memory else []
+        self.face_offsets = None
         # free-form geometry
         self.curves = []
         self.curves2 = []
@@ -141,39 +278,109 @@ class OBJReader(object):
         self.groups = {}
         self.objects = {}
         self.group = None
+        # the handlers of the records, per type
+        self.handlers = {
+            '#': self._read_comment,
+            'v': self._read_vertex_coordinates,
+            'vt': self._read_vertex_texture,
+            'vn': self._read_vertex_normal,
+            'vp': self._read_parameter_vertex,
+        }
+        for name in ('p', 'l', 'f'):
+            self.handlers[name] = self._handler(self._read_polygonal_geometry, name)
+        for name in ('deg', 'bmat', 'step', 'cstype'):
+            self.handlers[name] = self._handler(self._read_freeform_attribute, name)
+        for name in ('curv', 'curv2', 'surf'):
+            self.handlers[name] = self._handler(self._read_freeform_geometry, name)
+        for name in ('parm', 'trim', 'hole', 'scrv', 'sp', 'end'):
+            self.handlers[name] = self._handler(self._read_freeform_statement, name)
+        for name in ('g', 's', 'mg', 'o'):
+            self.handlers[name] = self._handler(self._read_grouping, name)
+        # the handlers of runs of records that are converted at once
+        self.bulk_handlers = {}
+        if numpy is not None:
+            self.bulk_handlers['v'] = self._read_vertices_bulk
+            self.bulk_handlers['f'] = self._read_faces_bulk
         # open file path and read
         # self.open()
         # self.pre()
         # self.read()
         # self.post()
 
+    @staticmethod
+    def _handler(method, name):
+        return lambda data: method(name, data)
+
     def open(self):
+        self.content = self._lines()
+
+    def _lines(self):
         if self.filepath.startswith('http'):
             resp = urlopen(self.filepath)
-            self.content = iter(resp.read().decode('utf-8').split('\n'))
+            try:
+                for line in resp:
+                    yield line.decode('utf-8')
+            finally:
+                resp.close()
         else:
             with open(self.filepath, 'r') as fh:
-                self.content = iter(fh.readlines())
+                for line in fh:
+                    yield line
 
     def pre(self):
-        lines = []
-        is_continuation = False
-        for line in self.content:
+        self.content = self._join_continuations(self.content)
+
+    @staticmethod
+    def _join_continuations(lines):
+        continued = None
+        for line in lines:
             line = line.rstrip()
             if not line:
                 continue
-            if is_continuation:
-                lines[-1] = lines[-1][:-2] + line
-            else:
-                lines.append(line)
+            if continued is not None:
+                line = continued[:-2] + line
             if line[-1] == '\\':
-                is_continuation = True
-            else:
-                is_continuation = False
-        self.content = iter(lines)
+                continued = line
+                continue
+            continued = None
+            yield line
+        if continued is not None:
+            yield continued
 
     def post(self):
-        pass
+        if not self.low_memory:
+            return
+        if isinstance(self.vertices, _Rows):
+            self.vertices = self.vertices.to_numpy()
+            self.weights = self.weights.to_numpy()
+        if isinstance(self.faces, _Polygons):
+            self.faces, self.face_offsets = self.faces.to_numpy()
+
+    def _chunks(self):
+        content = iter(self.content)
+        while True:
+            chunk = list(islice(content, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _runs(chunk):
+        # runs of records of the same type
+        # with the type and the unparsed data of every record
+        records = [line.split(None, 1) for line in chunk]
+        for head, run in groupby(records, itemgetter(0)):
+            yield head, [record[1] if len(record) > 1 else '' for record in run]
+
+    def _read_run(self, head, tails):
+        bulk = self.bulk_handlers.get(head)
+        if bulk is not None and bulk(tails):
+            return
+        handler = self.handlers.get(head)
+        if handler is None:
+            return
+        for tail in tails:
+            handler(tail.split())
 
     def read(self):
         """Read the contents of the file, line by line.
@@ -194,45 +401,81 @@ class OBJReader(object):
         * ``step``: freeform attribute *step size*
         * ``cstype``: freeform attribute *curve or surface type*
 
+        The lines are read in chunks of :attr:`chunk_size` lines.
+        Runs of records of the same type are dispatched to the handler of their *head*
+        in :attr:`handlers`, or to the handler in :attr:`bulk_handlers`,
+        which converts all records of the run at once.
+
         """
         if not self.content:
             return
-        for line in self.content:
-            parts = line.split()
-            if not parts:
-                continue
-            head = parts[0]
-            tail = parts[1:]
-            if head == '#':
-                self._read_comment(tail)
-                continue
-            if head == 'v':
-                self._read_vertex_coordinates(tail)
-                continue
-            if head == 'vt':
-                self._read_vertex_texture(tail)
-                continue
-            if head == 'vn':
-                self._read_vertex_normal(tail)
-                continue
-            if head == 'vp':
-                self._read_parameter_vertex(tail)
-                continue
-            if head in ('p', 'l', 'f'):
-                self._read_polygonal_geometry(head, tail)
-                continue
-            if head in ('deg', 'bmat', 'step', 'cstype'):
-                self._read_freeform_attribute(head, tail)
-                continue
-            if head in ('curv', 'curv2', 'surf'):
-                self._read_freeform_geometry(head, tail)
-                continue
-            if head in ('parm', 'trim', 'hole', 'scrv', 'sp', 'end'):
-                self._read_freeform_statement(head, tail)
-                continue
-            if head in ('g', 's', 'mg', 'o'):
-                self._read_grouping(head, tail)
-                continue
+        for chunk in self._chunks():
+            for head, tails in self._runs(chunk):
+                self._read_run(head, tails)
+
+    def iter_groups(self):
+        """Read the file and yield its objects and groups one at a time.
+
+        Yields
+        ------
+        tuple
+            The name of the object (``o``) or group (``g``), or ``None`` for faces before the first object or group,
+            the vertices referenced by its faces,
+            and its faces, referencing its vertices.
+
+        Notes
+        -----
+        The faces of an object or group are released when the next one is read,
+        but the vertices of all objects and groups are kept,
+        because faces can reference any vertex that is listed before them.
+        Use this with ``low_memory=True`` to keep the memory use as low as possible.
+
+        The vertices are not welded, and are listed in the order of the file.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            reader = OBJReader('scan.obj', low_memory=True)
+            for name, vertices, faces in reader.iter_groups():
+                mesh = Mesh.from_vertices_and_faces(vertices, faces)
+
+        """
+        self.open()
+        self.pre()
+        name = None
+        for chunk in self._chunks():
+            for head, tails in self._runs(chunk):
+                if head in ('o', 'g'):
+                    if len(self.faces):
+                        yield self._group(name)
+                    name = tails[-1].strip() or None
+                    continue
+                self._read_run(head, tails)
+        if len(self.faces):
+            yield self._group(name)
+
+    def _group(self, name):
+        # the faces read since the previous object or group,
+        # with their vertices
+        faces = self.faces
+        self.faces = _Polygons() if self.low_memory else []
+        if not self.low_memory:
+            used = sorted(set(index for face in faces for index in face))
+            index_index = {index: i for i, index in enumerate(used)}
+            vertices = [self.vertices[index] for index in used]
+            return name, vertices, [[index_index[index] for index in face] for face in faces]
+        from numpy import split
+        from numpy import unique
+        indices, offsets = faces.to_numpy()
+        used, inverse = unique(indices, return_inverse=True)
+        xyz = self.vertices.to_numpy()
+        vertices = xyz[used]
+        del xyz
+        inverse = inverse.reshape(indices.shape)
+        if offsets is None:
+            return name, vertices, inverse
+        return name, vertices, [face.tolist() for face in split(inverse, offsets[1:-1])]
 
     def _read_comment(self, data):
         """Read a comment.
@@ -257,6 +500,52 @@ class OBJReader(object):
             self.vertices.append([float(x) for x in data[:3]])
             self.weights.append(float(data[3]))
 
+    def _read_vertices_bulk(self, tails):
+        """Read a run of vertex records at once.
+
+        Returns ``False`` if not all vertices have three coordinates.
+        """
+        from numpy import fromstring
+        xyz = fromstring(' '.join(tails), sep=' ')
+        if xyz.size != 3 * len(tails):
+            return False
+        xyz = xyz.reshape((-1, 3))
+        if self.low_memory:
+            self.vertices.extend(xyz)
+            self.weights.extend([1.0] * len(tails))
+        else:
+            self.vertices.extend(xyz.tolist())
+            self.weights.extend([1.0] * len(tails))
+        return True
+
+    def _read_faces_bulk(self, tails):
+        """Read a run of face records at once.
+
+        Returns ``False`` if not all faces have the same number of vertices, or less than three.
+        """
+        from numpy import fromstring
+        text = ' '.join(tails)
+        if '\t' in text or '  ' in text:
+            return False
+        n = len(tails)
+        k = tails[0].count(' ') + 1
+        if k < 3 or text.count(' ') + 1 != n * k or any(tail.count(' ') + 1 != k for tail in tails):
+            return False
+        if '/' in text:
+            text = TEXTURE_NORMAL.sub('', text)
+        faces = fromstring(text, dtype=int, sep=' ')
+        if faces.size != n * k:
+            return False
+        faces = faces.reshape((n, k)) - 1
+        start = len(self.faces)
+        if self.low_memory:
+            self.faces.extend(faces)
+        else:
+            self.faces.extend(faces.tolist())
+        if self.group:
+            self.groups[self.group].extend(('f', index) for index in range(start, start + n))
+        return True
+
     def _read_vertex_texture(self, data):
         pass
 
@@ -335,10 +624,31 @@ class OBJReader(object):
 
 
 class OBJParser(object):
-    """"""
+    """Parse the data read from an OBJ file.
+
+    Parameters
+    ----------
+    reader : :class:`OBJReader`
+        The reader.
+    precision : str, optional
+        The precision with which the vertices are welded.
+        Default is ``None``, in which case the global precision setting is used (``compas.PRECISION``).
+    weld : bool, optional
+        If ``False``, the vertices are not welded.
+        Default is ``True``.
+
+    Notes
+    -----
+    If the reader stores the data in low-memory mode,
+    the vertices are welded with NumPy, and the vertices and faces remain NumPy arrays.
+    The coordinates are then rounded with :func:`numpy.round`,
+    which can differ from the rounding of :func:`compas.utilities.geometric_key` for coordinates halfway between two values.
 
-    def __init__(self, reader, precision=None):
+    """
+
+    def __init__(self, reader, precision=None, weld=True):
         self.precision = precision
+        self.weld = weld
         self.reader = reader
         self.vertices = None
         self.weights = None
@@ -353,9 +663,22 @@ class OBJParser(object):
         self.surfaces = None
         self.groups = None
         self.objects = None
+        self.face_offsets = None
         # self.parse()
 
     def parse(self):
+        self.face_offsets = self.reader.face_offsets
+        self.groups = self.reader.groups
+        if not self.weld:
+            self.vertices = self.reader.vertices
+            self.points = self.reader.points
+            self.lines = [line for line in self.reader.lines if len(line) == 2]
+            self.polylines = [line for line in self.reader.lines if len(line) > 2]
+            self.faces = self.reader.faces
+            return
+        if self.reader.low_memory:
+            self._parse_numpy()
+            return
         index_key = OrderedDict()
         vertex = OrderedDict()
 
@@ -372,7 +695,30 @@ class OBJParser(object):
         self.lines = [[index_index[index] for index in line] for line in self.reader.lines if len(line) == 2]
         self.polylines = [[index_index[index] for index in line] for line in self.reader.lines if len(line) > 2]
         self.faces = [[index_index[index] for index in face] for face in self.reader.faces]
-        self.groups = self.reader.groups
+
+    def _parse_numpy(self):
+        vertices = self.reader.vertices
+        precision = self.precision or compas.PRECISION
+        if precision == 'd' or _decimals(precision) is not None:
+            first, inverse = _weld_numpy(vertices, precision)
+        else:
+            index_key = [geometric_key(xyz, precision) for xyz in vertices.tolist()]
+            key_index = {}
+            first = []
+            for index, key in enumerate(index_key):
+                if key not in key_index:
+                    key_index[key] = len(first)
+                    first.append(index)
+            inverse = [key_index[key] for key in index_key]
+        from numpy import asarray
+        inverse = asarray(inverse, dtype=int)
+        index_index = inverse.tolist()
+
+        self.vertices = vertices[first]
+        self.points = [index_index[index] for index in self.reader.points]
+        self.lines = [[index_index[index] for index in line] for line in self.reader.lines if len(line) == 2]
+        self.polylines = [[index_index[index] for index in line] for line in self.reader.lines if len(line) > 2]
+        self.faces = inverse[self.reader.faces]
 
 
 # ==============================================================================
@@ -381,8 +727,6 @@ class OBJParser(object):
 
 if __name__ == '__main__':
 
-    import compas
-
     obj = OBJ(compas.get('faces.obj'))
 
     print(obj.parser.vertices)
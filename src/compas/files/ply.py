@@ -2,16 +2,57 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import re
 import struct
+from itertools import islice
+from numbers import Integral
+from numbers import Real
 
 
 __all__ = [
     'PLY',
     'PLYReader',
     'PLYParser',
+    'PLYWriter',
 ]
 
 
+# the number of elements that are read or written at once
+CHUNK_SIZE = 10000
+
+# the last line of the header
+END_HEADER = re.compile(b'(?:^|[\r\n])end_header(?:\r\n|\r|\n|$)')
+
+
+class _Chunks(object):
+    """Values unpacked one after the other from a binary file that is read in chunks."""
+
+    def __init__(self, file, byteorder):
+        self.file = file
+        self.byteorder = byteorder
+        self.buffer = b''
+        self.offset = 0
+        self.structs = {}
+
+    def unpack(self, fmt, n=1):
+        try:
+            record = self.structs[fmt, n]
+        except KeyError:
+            record = self.structs[fmt, n] = struct.Struct(self.byteorder + fmt * n)
+        if len(self.buffer) - self.offset < record.size:
+            self.buffer = self.buffer[self.offset:] + self.file.read(max(CHUNK_SIZE * 16, record.size))
+            self.offset = 0
+            if len(self.buffer) < record.size:
+                raise ValueError('The file is truncated.')
+        values = record.unpack_from(self.buffer, self.offset)
+        self.offset += record.size
+        return values
+
+    def rewind(self):
+        # move the file back to the first value that was not unpacked
+        self.file.seek(self.offset - len(self.buffer), 1)
+
+
 class PLY(object):
     """Polygon file format, or Stanford triangle format.
 
@@ -48,11 +89,51 @@ class PLY(object):
 
 
 class PLYReader(object):
-    """"""
+    """Reader of the vertex, edge, and face elements of an ASCII or binary PLY file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Attributes
+    ----------
+    vertices : list of dict
+        The properties of every vertex.
+    edges : list of dict
+        The properties of every edge.
+    faces : list of dict
+        The properties of every face.
+    vertex_data : array or None
+        The vertices of a binary file as a structured array, with a field per property,
+        if the file was read with NumPy.
+    edge_data : array or None
+        The edges of a binary file as a structured array, if the file was read with NumPy.
+    face_data : array or None
+        The faces of a binary file as a structured array, if the file was read with NumPy
+        and all faces have the same number of vertices.
+        The list of vertex indices of the faces is a field with a subarray per face.
+
+    Notes
+    -----
+    If NumPy is available, the vertices and edges of binary files are decoded all at once,
+    and the faces as well, if they have the same number of vertices.
+    Otherwise, the elements are decoded in chunks, or one by one if their size varies.
+    The dictionaries of the elements of a file read with NumPy are only created when they are accessed.
+
+    """
 
     keywords = ['ply', 'format', 'comment', 'element', 'property', 'end_header']
 
     property_types = {
+        'int8': int,
+        'uint8': int,
+        'int16': int,
+        'uint16': int,
+        'int32': int,
+        'uint32': int,
+        'float32': float,
+        'float64': float,
         'char': int,
         'uchar': int,
         'short': int,
@@ -83,6 +164,14 @@ class PLYReader(object):
     }
 
     number_of_bytes_per_type = {
+        'int8': 1,
+        'uint8': 1,
+        'int16': 2,
+        'uint16': 2,
+        'int32': 4,
+        'uint32': 4,
+        'float32': 4,
+        'float64': 8,
         'char': 1,
         'uchar': 1,
         'short': 2,
@@ -94,7 +183,15 @@ class PLYReader(object):
     }
 
     struct_format_per_type = {
-        'char': 'c',
+        'int8': 'b',
+        'uint8': 'B',
+        'int16': 'h',
+        'uint16': 'H',
+        'int32': 'i',
+        'uint32': 'I',
+        'float32': 'f',
+        'float64': 'd',
+        'char': 'b',
         'uchar': 'B',
         'short': 'h',
         'ushort': 'H',
@@ -121,9 +218,12 @@ class PLYReader(object):
         self.edge_properties = []
         self.face_properties = []
         self.sections = []
-        self.vertices = []
-        self.edges = []
-        self.faces = []
+        self.vertex_data = None
+        self.edge_data = None
+        self.face_data = None
+        self._vertices = []
+        self._edges = []
+        self._faces = []
         self.read()
 
     def is_valid(self):
@@ -157,23 +257,26 @@ class PLYReader(object):
 
     def read_header(self):
         # the header is always in ascii format
-        # read it as text
-        # otherwise file.tell() can't be used reliably
-        # to figure out where the header ends
-        with open(self.filepath) as file:
-            file.seek(0)
+        # read it in binary mode and decode the lines
+        # such that the binary data after the header is not decoded
+        # and any type of line ending can be used
+        with open(self.filepath, 'rb') as file:
+            data = self._read_header_data(file)
+            lines = iter(data.decode('ascii').splitlines())
 
-            line = file.readline().rstrip()
+            line = next(lines, '').rstrip()
 
             if line != 'ply':
                 raise Exception('not a valid ply file')
 
-            self.start_header = file.tell()
+            self.start_header = len(line) + len(re.match(b'ply(\r\n|\r|\n)', data).group(1))
 
             element_type = None
 
             while True:
-                line = file.readline()
+                line = next(lines, None)
+                if line is None:
+                    raise Exception('the header of the ply file is incomplete')
                 line = line.rstrip()
 
                 self.header.append(line)
@@ -233,9 +336,22 @@ class PLYReader(object):
 
                 if line == 'end_header':
                     element_type = None
-                    self.end_header = file.tell()
+                    self.end_header = len(data)
                     break
 
+    @staticmethod
+    def _read_header_data(file):
+        # the bytes of the header, including the line ending after "end_header"
+        data = b''
+        while True:
+            chunk = file.read(4096)
+            data += chunk
+            match = END_HEADER.search(data)
+            if match and (match.end() < len(data) or not chunk):
+                return data[:match.end()]
+            if not chunk:
+                raise Exception('the header of the ply file is incomplete')
+
     # ==========================================================================
     # read the data
     # ==========================================================================
@@ -243,7 +359,7 @@ class PLYReader(object):
     def read_data(self):
         if not self.end_header:
             raise Exception('header has not been read, or the file is not valid')
-        with open(self.filepath) as self.file:
+        with open(self.filepath, 'rb') as self.file:
             self.file.seek(self.end_header)
             for section in self.sections:
                 if section == 'vertex':
@@ -259,187 +375,555 @@ class PLYReader(object):
     def read_data_binary(self):
         if not self.end_header:
             raise Exception('header has not been read, or the file is not valid')
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            numpy = None
         with open(self.filepath, 'rb') as self.file:
             self.file.seek(self.end_header)
             for section in self.sections:
                 if section == 'vertex':
-                    self.read_vertices_binary_wo_numpy()
+                    if numpy is not None:
+                        self.read_vertices_binary()
+                    else:
+                        self.read_vertices_binary_wo_numpy()
                 elif section == 'edge':
-                    self.read_edges_binary_wo_numpy()
+                    if numpy is not None:
+                        self.read_edges_binary()
+                    else:
+                        self.read_edges_binary_wo_numpy()
                 elif section == 'face':
-                    self.read_faces_binary_wo_numpy()
+                    if numpy is not None:
+                        self.read_faces_binary()
+                    else:
+                        self.read_faces_binary_wo_numpy()
                 else:
                     print('user-defined elements are not supported: {0}'.format(section))
                     pass
 
+    # ==========================================================================
+    # the data of the elements
+    # ==========================================================================
+
+    @property
+    def vertices(self):
+        if self._vertices is None and self.vertex_data is not None:
+            self._vertices = self._records(self.vertex_data, self.vertex_properties)
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices):
+        self._vertices = vertices
+
+    @property
+    def edges(self):
+        if self._edges is None and self.edge_data is not None:
+            self._edges = self._records(self.edge_data, self.edge_properties)
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges):
+        self._edges = edges
+
+    @property
+    def faces(self):
+        if self._faces is None and self.face_data is not None:
+            self._faces = self._records(self.face_data, self.face_properties)
+        return self._faces
+
+    @faces.setter
+    def faces(self, faces):
+        self._faces = faces
+
+    @staticmethod
+    def _records(data, properties):
+        names = [prop[0] for prop in properties]
+        columns = [data[name].tolist() for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
     # ==========================================================================
     # read the individual section
     # ==========================================================================
 
-    def read_vertices(self):
-        count = 0
-        for line in self.file:
-            line = line.rstrip()
+    def _read_records(self, properties, count):
+        records = []
+        for line in islice(self.file, count):
             parts = line.split()
-            vertex = {}
-            for i, prop in enumerate(self.vertex_properties):
-                pname, ptype = prop
-                vertex[pname] = self.property_types[ptype](parts[i])
-            self.vertices.append(vertex)
-            count += 1
-            if count == self.number_of_vertices:
-                break
+            record = {}
+            i = 0
+            for prop in properties:
+                if len(prop) == 2:
+                    pname, ptype = prop
+                    record[pname] = self.property_types[ptype](parts[i])
+                    i += 1
+                else:
+                    pname, ptype, plen = prop
+                    n = int(parts[i])
+                    record[pname] = [self.property_types[ptype](part) for part in parts[i + 1:i + 1 + n]]
+                    i += 1 + n
+            records.append(record)
+        return records
+
+    def read_vertices(self):
+        self.vertices = self._read_records(self.vertex_properties, self.number_of_vertices)
 
     def read_edges(self):
-        pass
+        self.edges = self._read_records(self.edge_properties, self.number_of_edges)
 
     def read_faces(self):
-        count = 0
-        for line in self.file:
-            line = line.rstrip()
-            parts = line.split()
-            face = {}
-            for i, prop in enumerate(self.face_properties):
-                pname, ptype, plen = prop
-                face[pname] = [self.property_types[ptype](part) for part in parts[1:]]
-            self.faces.append(face)
-            count += 1
-            if count == self.number_of_faces:
-                break
+        self.faces = self._read_records(self.face_properties, self.number_of_faces)
 
     # ==========================================================================
     # binary read the individual section
     # ==========================================================================
 
-    # remove numpy dependency by reading the file in chuncks
-    # with each chunck equal to the size specified in the header?
-    # see: http://stackoverflow.com/questions/4566498/python-file-iterator-over-a-binary-file-with-newer-idiom
-    # see: http://stackoverflow.com/questions/27532738/python-iterate-through-binary-file-without-lines
-
-    def numpy_vertex_ptypes(self):
-        ext = self.binary_byte_order[self.format]
-        dt = []
-        for prop in self.vertex_properties:
-            pname, ptype = prop
-            dt.append((pname, ext + self.binary_property_types[ptype]))
-        return dt
-
-    def numpy_face_ptypes(self):
+    def _numpy_dtype(self, properties, size=None):
+        # the structured type of the elements with the given properties
+        # with lists of ``size`` items
         ext = self.binary_byte_order[self.format]
         dt = []
-        for prop in self.face_properties:
+        for prop in properties:
             if len(prop) == 2:
                 pname, ptype = prop
                 dt.append((pname, ext + self.binary_property_types[ptype]))
-            elif len(prop) == 3:
-                pname, ptype, plen = prop
-                dt.append(('size', ext + self.binary_property_types[plen]))
-                # this seems a nit of a hack
-                dt.append(('v1', ext + self.binary_property_types[ptype]))
-                dt.append(('v2', ext + self.binary_property_types[ptype]))
-                dt.append(('v3', ext + self.binary_property_types[ptype]))
             else:
-                pass
+                pname, ptype, plen = prop
+                dt.append((pname + '_count', ext + self.binary_property_types[plen]))
+                dt.append((pname, ext + self.binary_property_types[ptype], (size, )))
         return dt
 
-    def read_vertices_binary_wo_numpy(self):
+    def numpy_vertex_ptypes(self):
+        return self._numpy_dtype(self.vertex_properties)
+
+    def numpy_face_ptypes(self, size=3):
+        return self._numpy_dtype(self.face_properties, size)
+
+    def _read_binary_numpy(self, properties, count, size=None):
+        # read the elements all at once
+        # as a structured array
+        import numpy as np
+        dtype = np.dtype(self._numpy_dtype(properties, size))
+        data = self.file.read(count * dtype.itemsize)
+        if len(data) != count * dtype.itemsize:
+            raise ValueError('The file is truncated: expected {} elements.'.format(count))
+        return np.frombuffer(data, dtype=dtype)
+
+    def _read_binary_chunks(self, properties, count):
+        # read the elements with fixed-size records in chunks
         ext = self.binary_byte_order[self.format]
-        fmt = ext
-        chunk = 0
-        for prop in self.vertex_properties:
-            pname, ptype = prop
-            chunk += self.number_of_bytes_per_type[ptype]
-            fmt += self.struct_format_per_type[ptype]
-        for i in range(self.number_of_vertices):
-            data = self.file.read(chunk)
-            data = struct.unpack(fmt, data)
-            vertex = {}
-            for i, prop in enumerate(self.vertex_properties):
-                pname, ptype = prop
-                vertex[pname] = data[i]
-            self.vertices.append(vertex)
+        fmt = ''.join(self.struct_format_per_type[ptype] for pname, ptype in properties)
+        names = [pname for pname, ptype in properties]
+        record = struct.Struct(ext + fmt)
+        records = []
+        for i in range(0, count, CHUNK_SIZE):
+            n = min(CHUNK_SIZE, count - i)
+            data = self.file.read(n * record.size)
+            if len(data) != n * record.size:
+                raise ValueError('The file is truncated: expected {} elements.'.format(count))
+            values = struct.unpack(ext + fmt * n, data)
+            width = len(names)
+            for j in range(0, len(values), width):
+                records.append(dict(zip(names, values[j:j + width])))
+        return records
+
+    def read_vertices_binary_wo_numpy(self):
+        self.vertices = self._read_binary_chunks(self.vertex_properties, self.number_of_vertices)
 
     def read_vertices_binary(self):
-        # use pandas to read the data frames
-        import numpy as np
-        for line in np.fromfile(self.file, dtype=np.dtype(self.numpy_vertex_ptypes()), count=self.number_of_vertices):
-            vertex = {}
-            for i, prop in enumerate(self.vertex_properties):
-                pname, ptype = prop
-                vertex[pname] = line[i]
-            self.vertices.append(vertex)
+        self.vertex_data = self._read_binary_numpy(self.vertex_properties, self.number_of_vertices)
 
     def read_edges_binary_wo_numpy(self):
-        pass
+        self.edges = self._read_binary_chunks(self.edge_properties, self.number_of_edges)
 
     def read_edges_binary(self):
-        pass
+        self.edge_data = self._read_binary_numpy(self.edge_properties, self.number_of_edges)
 
     def read_faces_binary_wo_numpy(self):
-        ext = self.binary_byte_order[self.format]
-        fmt = ext
-        chunk = 0
-        for prop in self.face_properties:
-            if len(prop) == 2:
-                pname, ptype = prop
-                chunk += self.number_of_bytes_per_type[ptype]
-                fmt += self.struct_format_per_type[ptype]
-            elif len(prop) == 3:
-                pname, ptype, plen = prop
-                chunk += self.number_of_bytes_per_type[plen]
-                chunk += self.number_of_bytes_per_type[ptype] * 3
-                fmt += self.struct_format_per_type[plen]
-                fmt += self.struct_format_per_type[ptype] * 3
-            else:
-                pass
+        """Read the faces one by one, from chunks of the file."""
+        chunks = _Chunks(self.file, self.binary_byte_order[self.format])
+        faces = []
         for i in range(self.number_of_faces):
-            data = self.file.read(chunk)
-            data = struct.unpack(fmt, data)
             face = {}
-            for i, prop in enumerate(self.face_properties):
+            for prop in self.face_properties:
                 if len(prop) == 2:
                     pname, ptype = prop
-                    face[pname] = data[i]
-                elif len(prop) == 3:
+                    face[pname] = chunks.unpack(self.struct_format_per_type[ptype])[0]
+                else:
                     pname, ptype, plen = prop
-                    face[pname] = list(data[2:])
-            self.faces.append(face)
+                    n = chunks.unpack(self.struct_format_per_type[plen])[0]
+                    face[pname] = list(chunks.unpack(self.struct_format_per_type[ptype], n))
+            faces.append(face)
+        chunks.rewind()
+        self.faces = faces
 
     def read_faces_binary(self):
-        # use pandas to read the data frames
-        # how to deal with faces of variable length?
-        import numpy as np
-        for line in np.fromfile(self.file, dtype=np.dtype(self.numpy_face_ptypes()), count=self.number_of_faces):
-            face = {}
-            for i, prop in enumerate(self.face_properties):
-                if len(prop) == 2:
-                    pname, ptype = prop
-                    face[pname] = line[i]
-                elif len(prop) == 3:
-                    pname, ptype, plen = prop
-                    # type(line) => numpy.void
-                    # convert the line to a list
-                    line = list(line)
-                    face[pname] = line[2:]
-                else:
-                    pass
-            self.faces.append(face)
+        """Read the faces all at once if they have the same number of vertices,
+        or else one by one."""
+        lists = [prop for prop in self.face_properties if len(prop) == 3]
+        if len(lists) != 1 or not self.number_of_faces:
+            self.read_faces_binary_wo_numpy()
+            return
+        # the number of vertices of the first face
+        ext = self.binary_byte_order[self.format]
+        start = self.file.tell()
+        prefix = ''
+        for prop in self.face_properties:
+            if len(prop) == 3:
+                prefix += self.struct_format_per_type[prop[2]]
+                break
+            prefix += self.struct_format_per_type[prop[1]]
+        fmt = struct.Struct(ext + prefix)
+        data = self.file.read(fmt.size)
+        self.file.seek(start)
+        if len(data) < fmt.size:
+            raise ValueError('The file is truncated: expected {} faces.'.format(self.number_of_faces))
+        size = fmt.unpack(data)[-1]
+        name = lists[0][0]
+        try:
+            faces = self._read_binary_numpy(self.face_properties, self.number_of_faces, size)
+        except ValueError:
+            faces = None
+        if faces is not None and (faces[name + '_count'] == size).all():
+            self.face_data = faces
+            return
+        self.file.seek(start)
+        self.read_faces_binary_wo_numpy()
 
 
 class PLYParser(object):
-    """"""
+    """Parser of the elements read from a PLY file into vertices, edges, and faces.
+
+    Parameters
+    ----------
+    reader : :class:`PLYReader`
+        The reader of the file.
+    precision : str, optional
+        Not used.
+
+    Attributes
+    ----------
+    vertices : list
+        The XYZ coordinates of the vertices.
+    edges : list
+        The edges, as pairs of vertex indices.
+    faces : list
+        The faces, referencing the list of vertices.
+    vertices_array : array or None
+        The XYZ coordinates of the vertices as an array, if the file was read with NumPy.
+    faces_array : array or None
+        The faces as an array, if the file was read with NumPy and all faces have the same number of vertices.
+    vertex_attributes : dict
+        The values of the other properties of the vertices, per property.
+    edge_attributes : dict
+        The values of the other properties of the edges, per property.
+    face_attributes : dict
+        The values of the scalar properties of the faces, per property.
+
+    """
 
     def __init__(self, reader, precision=None):
         self.precision = precision
         self.reader = reader
-        self.vertices = None
+        self.vertices_array = None
+        self.faces_array = None
+        self.vertex_attributes = {}
+        self.edge_attributes = {}
+        self.face_attributes = {}
         self.edges = None
-        self.faces = None
+        self._vertices = None
+        self._faces = None
         self.parse()
 
+    @property
+    def vertices(self):
+        if self._vertices is None and self.vertices_array is not None:
+            self._vertices = self.vertices_array.tolist()
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices):
+        self._vertices = vertices
+
+    @property
+    def faces(self):
+        if self._faces is None and self.faces_array is not None:
+            self._faces = self.faces_array.tolist()
+        return self._faces
+
+    @faces.setter
+    def faces(self, faces):
+        self._faces = faces
+
     def parse(self):
-        self.vertices = [(vertex['x'], vertex['y'], vertex['z']) for vertex in self.reader.vertices]
-        self.faces = [face['vertex_indices'] for face in self.reader.faces]
+        reader = self.reader
+        if reader.vertex_data is not None:
+            import numpy as np
+            data = reader.vertex_data
+            self.vertices_array = np.column_stack([data[name] for name in 'xyz']).astype(float)
+            for pname, ptype in reader.vertex_properties:
+                if pname not in ('x', 'y', 'z'):
+                    self.vertex_attributes[pname] = data[pname]
+        else:
+            vertices = reader.vertices
+            self.vertices = [(vertex['x'], vertex['y'], vertex['z']) for vertex in vertices]
+            for pname, ptype in reader.vertex_properties:
+                if pname not in ('x', 'y', 'z'):
+                    self.vertex_attributes[pname] = [vertex[pname] for vertex in vertices]
+
+        if reader.edge_data is not None:
+            import numpy as np
+            data = reader.edge_data
+            self.edges = np.column_stack([data['vertex1'], data['vertex2']]).tolist()
+            for pname, ptype in reader.edge_properties:
+                if pname not in ('vertex1', 'vertex2'):
+                    self.edge_attributes[pname] = data[pname]
+        elif reader.edges:
+            edges = reader.edges
+            self.edges = [[edge['vertex1'], edge['vertex2']] for edge in edges]
+            for pname, ptype in reader.edge_properties:
+                if pname not in ('vertex1', 'vertex2'):
+                    self.edge_attributes[pname] = [edge[pname] for edge in edges]
+        else:
+            self.edges = []
+
+        name = 'vertex_indices'
+        if not any(prop[0] == name for prop in reader.face_properties):
+            name = 'vertex_index'
+        if reader.face_data is not None:
+            data = reader.face_data
+            self.faces_array = data[name].astype(int)
+            for prop in reader.face_properties:
+                if len(prop) == 2:
+                    self.face_attributes[prop[0]] = data[prop[0]]
+        else:
+            faces = reader.faces
+            self.faces = [face[name] for face in faces]
+            for prop in reader.face_properties:
+                if len(prop) == 2:
+                    self.face_attributes[prop[0]] = [face[prop[0]] for face in faces]
+
+
+class PLYWriter(object):
+    """Writer of elements with scalar and list properties to an ASCII or binary PLY file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    format : {'binary_little_endian', 'binary_big_endian', 'ascii'}, optional
+        The format of the file.
+        Default is ``'binary_little_endian'``.
+    comments : list of str, optional
+        Comments for the header of the file.
+
+    Notes
+    -----
+    The elements are written in the order in which they are added.
+    Binary elements with only scalar properties, or with one list property of which all lists have the same length,
+    are encoded all at once with NumPy, if available.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'triangle.ply')
+    >>> writer = PLYWriter(filepath)
+    >>> writer.add_element('vertex', [('x', 'float', [0.0, 1.0, 0.0]),
+    ...                               ('y', 'float', [0.0, 0.0, 1.0]),
+    ...                               ('z', 'float', [0.0, 0.0, 0.0])])
+    >>> writer.add_element('face', [('vertex_indices', 'list uchar int', [[0, 1, 2]])])
+    >>> writer.write()
+    >>> PLY(filepath).parser.faces
+    [[0, 1, 2]]
+
+    """
+
+    formats = ('binary_little_endian', 'binary_big_endian', 'ascii')
+
+    def __init__(self, filepath, format='binary_little_endian', comments=None):
+        if format not in self.formats:
+            raise ValueError('Unsupported format: {}'.format(format))
+        self.filepath = filepath
+        self.format = format
+        self.comments = comments or []
+        self.elements = []
+
+    @staticmethod
+    def property_type(values):
+        """The PLY type of a property with the given values.
+
+        Parameters
+        ----------
+        values : list
+            The values of the property.
+
+        Returns
+        -------
+        str or None
+            ``'uchar'`` for booleans, ``'int'`` for integers, ``'double'`` for real numbers,
+            or ``None`` if not all values are numbers.
+
+        """
+        if hasattr(values, 'dtype'):
+            kind = values.dtype.kind
+            if kind == 'b':
+                return 'uchar'
+            if kind in 'iu':
+                return 'int'
+            if kind == 'f':
+                return 'double'
+            return None
+        if not len(values):
+            return None
+        if all(isinstance(value, bool) for value in values):
+            return 'uchar'
+        if all(isinstance(value, Integral) and not isinstance(value, bool) for value in values):
+            return 'int'
+        if all(isinstance(value, Real) and not isinstance(value, bool) for value in values):
+            return 'double'
+        return None
+
+    def add_element(self, name, properties):
+        """Add an element.
+
+        Parameters
+        ----------
+        name : str
+            The name of the element, for example ``'vertex'`` or ``'face'``.
+        properties : list of tuple
+            The name, type, and values of every property.
+            The type is a PLY type, such as ``'float'`` or ``'int'``,
+            ``'list <count type> <item type>'`` for list properties, for example ``'list uchar int'``,
+            or ``None``, in which case it is derived from the values (see :meth:`property_type`).
+            The values are a list or array with a value per element,
+            or with a list of values per element for list properties.
+
+        Raises
+        ------
+        ValueError
+            If the properties do not have the same number of values,
+            or the type of a property cannot be derived from its values.
+
+        """
+        count = None
+        checked = []
+        for pname, ptype, values in properties:
+            if ptype is None:
+                ptype = self.property_type(values)
+                if ptype is None:
+                    raise ValueError('The type of property {} cannot be derived from its values.'.format(pname))
+            if count is None:
+                count = len(values)
+            elif len(values) != count:
+                raise ValueError('All properties of element {} should have the same number of values.'.format(name))
+            checked.append((pname, ptype.split(), values))
+        self.elements.append((name, count or 0, checked))
+
+    def write(self):
+        """Write the header and the elements to the file."""
+        with open(self.filepath, 'wb') as self.file:
+            self.write_header()
+            for name, count, properties in self.elements:
+                if self.format == 'ascii':
+                    self.write_element_ascii(count, properties)
+                else:
+                    self.write_element_binary(count, properties)
+
+    def write_header(self):
+        lines = ['ply', 'format {} 1.0'.format(self.format)]
+        for comment in self.comments:
+            lines.append('comment {}'.format(comment))
+        for name, count, properties in self.elements:
+            lines.append('element {} {}'.format(name, count))
+            for pname, ptype, values in properties:
+                lines.append('property {} {}'.format(' '.join(ptype), pname))
+        lines.append('end_header')
+        self.file.write(('\n'.join(lines) + '\n').encode('ascii'))
+
+    @staticmethod
+    def _column(values, ptype):
+        # the values as a list of Python numbers
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        if ptype[0] == 'list':
+            cast = PLYReader.property_types[ptype[2]]
+            return [[cast(item) for item in value] for value in values]
+        cast = PLYReader.property_types[ptype[0]]
+        return [cast(value) for value in values]
+
+    def write_element_ascii(self, count, properties):
+        columns = [self._column(values, ptype) for pname, ptype, values in properties]
+        lists = [ptype[0] == 'list' for pname, ptype, values in properties]
+        for i in range(0, count, CHUNK_SIZE):
+            lines = []
+            for row in zip(*[column[i:i + CHUNK_SIZE] for column in columns]):
+                parts = []
+                for is_list, value in zip(lists, row):
+                    if is_list:
+                        parts.append(str(len(value)))
+                        parts.extend(repr(item) for item in value)
+                    else:
+                        parts.append(repr(value))
+                lines.append(' '.join(parts))
+            self.file.write(('\n'.join(lines) + '\n').encode('ascii'))
+
+    def write_element_binary(self, count, properties):
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            data = self._structured_array(np, count, properties)
+            if data is not None:
+                self.file.write(data.tobytes())
+                return
+        ext = PLYReader.binary_byte_order[self.format]
+        columns = [self._column(values, ptype) for pname, ptype, values in properties]
+        formats = {}
+        for i in range(0, count, CHUNK_SIZE):
+            chunk = []
+            for row in zip(*[column[i:i + CHUNK_SIZE] for column in columns]):
+                fmt = ext
+                values = []
+                for (pname, ptype, _), value in zip(properties, row):
+                    if ptype[0] == 'list':
+                        fmt += PLYReader.struct_format_per_type[ptype[1]]
+                        fmt += PLYReader.struct_format_per_type[ptype[2]] * len(value)
+                        values.append(len(value))
+                        values.extend(value)
+                    else:
+                        fmt += PLYReader.struct_format_per_type[ptype[0]]
+                        values.append(value)
+                if fmt not in formats:
+                    formats[fmt] = struct.Struct(fmt)
+                chunk.append(formats[fmt].pack(*values))
+            self.file.write(b''.join(chunk))
+
+    def _structured_array(self, np, count, properties):
+        # all elements in one structured array
+        # or None if the lists of a list property do not all have the same length
+        ext = PLYReader.binary_byte_order[self.format]
+        dtype = []
+        columns = []
+        for pname, ptype, values in properties:
+            if ptype[0] == 'list':
+                try:
+                    values = np.asarray(values)
+                except ValueError:
+                    return None
+                if values.dtype == object or values.ndim != 2:
+                    return None
+                dtype.append((pname + '_count', ext + PLYReader.binary_property_types[ptype[1]]))
+                dtype.append((pname, ext + PLYReader.binary_property_types[ptype[2]], (values.shape[1], )))
+                columns.append((pname + '_count', values.shape[1]))
+                columns.append((pname, values))
+            else:
+                dtype.append((pname, ext + PLYReader.binary_property_types[ptype[0]]))
+                columns.append((pname, values))
+        data = np.empty(count, dtype=dtype)
+        for pname, values in columns:
+            data[pname] = values
+        return data
 
 
 # ==============================================================================
@@ -2,7 +2,12 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import os
 import struct
+
+from compas.geometry import cross_vectors
+from compas.geometry import length_vector
+from compas.geometry import subtract_vectors
 from compas.utilities import geometric_key
 
 
@@ -10,9 +15,76 @@ __all__ = [
     'STL',
     'STLReader',
     'STLParser',
+    'STLWriter',
 ]
 
 
+# the size of the header of a binary file
+HEADER = 80
+
+# a facet of a binary file
+# the normal vector, the three vertices, and the attribute byte count
+FACET = struct.Struct('<12fH')
+
+# the number of facets that are decoded or encoded at once without NumPy
+CHUNK = 10000
+
+
+def _facet_dtype():
+    from numpy import dtype
+    return dtype([('normal', '<f4', (3, )), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+
+
+def _decimals(precision):
+    # the number of decimals of a precision specification
+    # or None if the specification is not a float precision
+    if precision.endswith('f'):
+        try:
+            return int(precision[:-1])
+        except ValueError:
+            return None
+    return None
+
+
+def _weld_numpy(points, precision=None):
+    # weld points with identical or rounded coordinates
+    # returns the indices of the welded points in order of first occurrence,
+    # and the index of the welded point of every point
+    from numpy import arange
+    from numpy import argsort
+    from numpy import ascontiguousarray
+    from numpy import empty_like
+    from numpy import float64
+    from numpy import round
+    from numpy import trunc
+    from numpy import unique
+
+    if not precision:
+        keys = points + points.dtype.type(0.0)
+    elif precision == 'd':
+        keys = trunc(points.astype(float64)) + 0.0
+    else:
+        keys = round(points.astype(float64), _decimals(precision)) + 0.0
+    # adding zero turns negative zeros into positive zeros,
+    # such that the rows of coordinates can be compared as raw bytes
+    keys = ascontiguousarray(keys)
+    keys = keys.view('V{}'.format(keys.shape[1] * keys.itemsize)).ravel()
+
+    _, first, inverse = unique(keys, return_index=True, return_inverse=True)
+    order = argsort(first)
+    rank = empty_like(order)
+    rank[order] = arange(len(order))
+    return first[order], rank[inverse.ravel()]
+
+
+def _normal(a, b, c):
+    normal = cross_vectors(subtract_vectors(b, a), subtract_vectors(c, a))
+    length = length_vector(normal)
+    if not length:
+        return [0.0, 0.0, 0.0]
+    return [axis / length for axis in normal]
+
+
 class STL(object):
 
     def __init__(self, filepath, precision=None):
@@ -44,26 +116,67 @@ class STL(object):
 class STLReader(object):
     """Standard triangle library format.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    mmap : bool, optional
+        If ``True``, the facets of a binary file are memory-mapped instead of read into memory.
+        Only used if NumPy is available.
+        Default is ``True``.
+
+    Attributes
+    ----------
+    normals : array or list
+        The normal vectors of the facets of a binary file.
+    triangles : array or list
+        The vertex coordinates of the facets of a binary file.
+    facets : list of dict
+        The facets, each with a ``'normal'`` and ``'vertices'``.
+        The facets of binary files are only constructed when they are accessed.
+
+    Notes
+    -----
+    The facets of a binary file are decoded all at once as a structured NumPy array
+    of shape ``(n, )``, of which :attr:`normals` and :attr:`triangles` are views
+    of shape ``(n, 3)`` and ``(n, 3, 3)``.
+    Without NumPy, the facets are decoded in chunks into lists of tuples.
+
     See Also
     --------
     * http://paulbourke.net/dataformats/stl/
 
     """
 
-    def __init__(self, filepath):
+    def __init__(self, filepath, mmap=True):
         self.filepath = filepath
+        self.mmap = mmap
         self.file = None
         self.header = None
-        self.facets = []
+        self.normals = None
+        self.triangles = None
+        self._facets = []
         self.read()
 
+    @property
+    def facets(self):
+        if self._facets is None:
+            self._facets = self._facets_from_triangles(self.normals, self.triangles)
+        return self._facets
+
+    @facets.setter
+    def facets(self, facets):
+        self._facets = facets
+
     def read(self):
-        is_binary = False
         with open(self.filepath, 'rb') as file:
-            line = file.readline().strip()
-            if b'solid' in line:
-                is_binary = False
-            else:
+            start = file.read(HEADER + 4)
+        is_binary = b'solid' not in start.split(b'\n', 1)[0]
+        if len(start) == HEADER + 4:
+            # files of which the size matches the number of facets are binary
+            # even if the header starts with "solid"
+            n = struct.unpack('<I', start[HEADER:])[0]
+            if os.path.getsize(self.filepath) == HEADER + 4 + n * FACET.size:
                 is_binary = True
 
         try:
@@ -181,7 +294,9 @@ class STLReader(object):
             self.file = file
             self.file.seek(0)
             self.header = self.read_header_binary()
-            self.facets = self.read_facets_binary()
+            n = self.read_number_of_facets_binary()
+            self.normals, self.triangles = self.read_triangles_binary(n)
+            self._facets = None
 
     def read_header_binary(self):
         bytes_ = self.file.read(80)
@@ -198,32 +313,149 @@ class STLReader(object):
 
         normal = floats_[0:3]
         vertices = (floats_[3:6], floats_[6:9], floats_[9:12])
-        keys = (bytes_[12:24], bytes_[24:36], bytes_[36:48])
 
         # Skip two-byte attributes, it's not used anywhere (by anyone - on this planet)
         self.file.seek(2, 1)
 
-        return {'normal': normal, 'vertices': vertices, 'keys': keys}
+        return {'normal': normal, 'vertices': vertices}
 
     def read_facets_binary(self):
-        facets = []
         n = self.read_number_of_facets_binary()
-        for i in range(n):
-            facets.append(self.read_facet_binary())
-        return facets
+        return self._facets_from_triangles(*self.read_triangles_binary(n))
+
+    def read_triangles_binary(self, n):
+        """Read all facets of a binary file at once.
+
+        Parameters
+        ----------
+        n : int
+            The number of facets.
+
+        Returns
+        -------
+        tuple
+            The normals, an array of shape ``(n, 3)``,
+            and the vertex coordinates of the facets, an array of shape ``(n, 3, 3)``.
+            Without NumPy, lists of tuples.
+
+        Raises
+        ------
+        ValueError
+            If the file is shorter than the facets.
+
+        """
+        offset = self.file.tell()
+        self.file.seek(0, 2)
+        if self.file.tell() < offset + n * FACET.size:
+            raise ValueError('The file is too short for {} facets.'.format(n))
+        self.file.seek(offset)
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None:
+            if self.mmap and n:
+                facets = numpy.memmap(self.filepath, dtype=_facet_dtype(), mode='r', offset=offset, shape=(n, ))
+            else:
+                facets = numpy.frombuffer(self.file.read(n * FACET.size), dtype=_facet_dtype())
+            return facets['normal'], facets['vertices']
+
+        normals = []
+        triangles = []
+        for i in range(0, n, CHUNK):
+            data = self.file.read(min(CHUNK, n - i) * FACET.size)
+            try:
+                values = FACET.iter_unpack(data)
+            except AttributeError:
+                values = (FACET.unpack_from(data, j) for j in range(0, len(data), FACET.size))
+            for facet in values:
+                normals.append(facet[0:3])
+                triangles.append((facet[3:6], facet[6:9], facet[9:12]))
+        return normals, triangles
+
+    @staticmethod
+    def _facets_from_triangles(normals, triangles):
+        if hasattr(triangles, 'tolist'):
+            normals = normals.tolist()
+            triangles = triangles.tolist()
+        return [{'normal': normal, 'vertices': vertices} for normal, vertices in zip(normals, triangles)]
 
 
 class STLParser(object):
-    """"""
+    """Parser of the facets of an STL file into vertices and faces.
+
+    Parameters
+    ----------
+    reader : :class:`STLReader`
+        The reader of the file.
+    precision : str, optional
+        The precision with which the vertices of the facets are welded.
+        Default is ``None``, in which case the vertices of binary files are welded
+        if their coordinates are identical, and the vertices of ASCII files
+        with the global precision setting (``compas.PRECISION``).
+
+    Attributes
+    ----------
+    vertices : list
+        The welded vertices.
+    faces : list
+        The faces, referencing the list of vertices.
+    vertices_array : array or None
+        The welded vertices as an array, if the facets were welded with NumPy.
+    faces_array : array or None
+        The faces as an array, if the facets were welded with NumPy.
+
+    Notes
+    -----
+    If NumPy is available, the facets of binary files are welded all at once,
+    by sorting the (rounded) coordinates of all vertices.
+    The vertices are numbered in the order in which they first occur in the file,
+    as when the facets are welded one by one.
+
+    """
 
     def __init__(self, reader, precision=None):
         self.precision = precision
         self.reader = reader
-        self.vertices = None
-        self.faces = None
+        self.vertices_array = None
+        self.faces_array = None
+        self._vertices = None
+        self._faces = None
         self.parse()
 
+    @property
+    def vertices(self):
+        if self._vertices is None and self.vertices_array is not None:
+            self._vertices = self.vertices_array.tolist()
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices):
+        self._vertices = vertices
+
+    @property
+    def faces(self):
+        if self._faces is None and self.faces_array is not None:
+            self._faces = self.faces_array.tolist()
+        return self._faces
+
+    @faces.setter
+    def faces(self, faces):
+        self._faces = faces
+
     def parse(self):
+        triangles = self.reader.triangles
+        if triangles is None:
+            self.parse_facets()
+            return
+        if hasattr(triangles, 'dtype') and (not self.precision or self.precision == 'd' or _decimals(self.precision) is not None):
+            self.parse_triangles_numpy()
+            return
+        self.parse_facets()
+
+    def parse_facets(self):
+        # binary files without explicit precision are welded on identical coordinates
+        exact = self.reader.triangles is not None and not self.precision
         gkey_index = {}
         vertices = []
         faces = []
@@ -232,18 +464,175 @@ class STLParser(object):
             facet_vertices = facet['vertices']
             for i in range(3):
                 xyz = facet_vertices[i]
-                if 'keys' in facet:
-                    gkey = facet['keys'][i]
+                if exact:
+                    gkey = tuple(axis + 0.0 for axis in xyz)
                 else:
                     gkey = geometric_key(xyz, self.precision)
                 if gkey not in gkey_index:
                     gkey_index[gkey] = len(vertices)
-                    vertices.append(xyz)
+                    vertices.append(list(xyz))
                 face.append(gkey_index[gkey])
             faces.append(face)
         self.vertices = vertices
         self.faces = faces
 
+    def parse_triangles_numpy(self):
+        from numpy import ascontiguousarray
+        from numpy import float64
+
+        points = ascontiguousarray(self.reader.triangles).reshape((-1, 3))
+        first, inverse = _weld_numpy(points, self.precision)
+        self.vertices_array = points[first].astype(float64)
+        self.faces_array = inverse.reshape((-1, 3))
+        self.vertices = None
+        self.faces = None
+
+
+class STLWriter(object):
+    """Writer of triangles to an ASCII or binary STL file, in chunks.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    binary : bool, optional
+        If ``True``, the file is written in the binary format.
+        Default is ``True``.
+    solid : str, optional
+        The name of the solid.
+        Default is ``'compas'``.
+    precision : str, optional
+        The precision of the coordinates in an ASCII file.
+        Default is ``'6e'``.
+
+    Notes
+    -----
+    The triangles are written every time :meth:`write_triangles` is called,
+    such that large meshes can be written without holding all triangles in memory.
+    The number of facets of a binary file is written to its header when the writer is closed.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'triangle.stl')
+    >>> with STLWriter(filepath) as writer:
+    ...     writer.write_triangles([[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]])
+    >>> STL(filepath).parser.faces
+    [[0, 1, 2]]
+
+    """
+
+    def __init__(self, filepath, binary=True, solid='compas', precision=None):
+        self.filepath = filepath
+        self.binary = binary
+        self.solid = solid
+        self.precision = precision or '6e'
+        self.file = None
+        self.count = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open(self):
+        """Open the file, and write the header."""
+        self.count = 0
+        if self.binary:
+            self.file = open(self.filepath, 'wb')
+            header = 'COMPAS binary STL: {}'.format(self.solid).encode('utf-8')[:HEADER]
+            self.file.write(header.ljust(HEADER, b'\0'))
+            self.file.write(struct.pack('<I', 0))
+        else:
+            self.file = open(self.filepath, 'w')
+            self.file.write('solid {}\n'.format(self.solid))
+
+    def write_triangles(self, triangles, normals=None):
+        """Write a chunk of triangles.
+
+        Parameters
+        ----------
+        triangles : list or array
+            The vertex coordinates of the triangles, of shape ``(n, 3, 3)``.
+        normals : list or array, optional
+            The normal vectors of the triangles, of shape ``(n, 3)``.
+            Default is ``None``, in which case the normals are computed from the vertices.
+
+        Raises
+        ------
+        ValueError
+            If a binary file would contain more facets than the format supports.
+
+        """
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None:
+            triangles = numpy.asarray(triangles, dtype=numpy.float64).reshape((-1, 3, 3))
+            if normals is None:
+                normals = numpy.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+                lengths = numpy.linalg.norm(normals, axis=1)
+                lengths[lengths == 0] = 1.0
+                normals /= lengths[:, None]
+            normals = numpy.asarray(normals, dtype=numpy.float64).reshape((-1, 3))
+        elif normals is None:
+            normals = [_normal(*triangle) for triangle in triangles]
+        n = len(triangles)
+        if self.binary and self.count + n > 0xFFFFFFFF:
+            raise ValueError('A binary STL file cannot contain more than {} facets.'.format(0xFFFFFFFF))
+        if self.binary:
+            self._write_binary(triangles, normals)
+        else:
+            self._write_ascii(triangles, normals)
+        self.count += n
+
+    def _write_binary(self, triangles, normals):
+        if hasattr(triangles, 'dtype'):
+            from numpy import zeros
+            facets = zeros(len(triangles), dtype=_facet_dtype())
+            facets['normal'] = normals
+            facets['vertices'] = triangles
+            self.file.write(facets.tobytes())
+            return
+        for i in range(0, len(triangles), CHUNK):
+            self.file.write(b''.join(FACET.pack(*(list(normal) + list(a) + list(b) + list(c) + [0]))
+                                     for normal, (a, b, c) in zip(normals[i:i + CHUNK], triangles[i:i + CHUNK])))
+
+    def _write_ascii(self, triangles, normals):
+        number = '{{:.{}}}'.format(self.precision)
+        vector = ' '.join([number] * 3)
+        facet = ('facet normal ' + vector + '\n'
+                 '  outer loop\n'
+                 '    vertex ' + vector + '\n'
+                 '    vertex ' + vector + '\n'
+                 '    vertex ' + vector + '\n'
+                 '  endloop\n'
+                 'endfacet\n')
+        if hasattr(triangles, 'tolist'):
+            triangles = triangles.tolist()
+            normals = normals.tolist()
+        for i in range(0, len(triangles), CHUNK):
+            self.file.write(''.join(facet.format(*(list(normal) + list(a) + list(b) + list(c)))
+                                    for normal, (a, b, c) in zip(normals[i:i + CHUNK], triangles[i:i + CHUNK])))
+
+    def close(self):
+        """Complete the file, and close it."""
+        if self.file is None:
+            return
+        try:
+            if self.binary:
+                self.file.seek(HEADER)
+                self.file.write(struct.pack('<I', self.count))
+            else:
+                self.file.write('endsolid {}\n'.format(self.solid))
+        finally:
+            self.file.close()
+            self.file = None
+
 
 # ==============================================================================
 # Main
@@ -251,7 +640,6 @@ class STLParser(object):
 
 if __name__ == "__main__":
 
-    import os
     import compas
 
     from compas.datastructures import Mesh
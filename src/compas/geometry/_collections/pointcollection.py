@@ -2,6 +2,8 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from compas.geometry import transform_points
+
 from compas.geometry._collections import Collection
 
 __all__ = ['PointCollection']
@@ -30,8 +32,10 @@ class PointCollection(Collection):
         return PointCollection([point.copy() for point in self._items])
 
     def transform(self, X):
-        for item in self._items:
-            item.transform(X)
+        for item, (x, y, z) in zip(self._items, transform_points(self._items, X)):
+            item.x = x
+            item.y = y
+            item.z = z
 
     def transformed(self, X):
         collection = self.copy()
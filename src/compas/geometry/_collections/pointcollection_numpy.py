@@ -13,49 +13,104 @@ __all__ = ['PointCollectionNumpy']
 
 
 class PointCollectionNumpy(CollectionNumpy):
+    """A collection of points with the coordinates stored in a NumPy array.
+
+    Parameters
+    ----------
+    points : list of :class:`compas.geometry.Point`
+        The points of the collection.
+
+    Notes
+    -----
+    Transformations of the collection are concatenated into one pending matrix,
+    which is applied to all coordinates in a single vectorized call
+    only when the points or their coordinates are accessed.
+
+    Examples
+    --------
+    >>> from compas.geometry import Point
+    >>> from compas.geometry import Translation
+    >>> collection = PointCollectionNumpy([Point(1.0, 0.0, 0.0), Point(0.0, 1.0, 0.0)])
+    >>> collection.transform(Translation([1.0, 0.0, 0.0]))
+    >>> collection.transform(Translation([0.0, 0.0, 1.0]))
+    >>> collection[0]
+    Point(2.000, 0.000, 1.000)
+
+    """
 
     def __init__(self, points):
         self._data = []
         self._items = []
+        self._xform = None
+        self._synced = True
         self.points = points
 
+    @property
+    def data(self):
+        """array : The coordinates of the points, with shape ``(n, 3)``."""
+        if self._xform is not None:
+            self._data = transform_points_numpy(self._data, self._xform)
+            self._xform = None
+            self._synced = False
+        return self._data
+
     @property
     def points(self):
-        for item, data in zip(self._items, self._data):
-            item[:] = data[:]
-        return self.items
+        """list of :class:`compas.geometry.Point` : The points of the collection."""
+        data = self.data
+        if not self._synced:
+            for item, (x, y, z) in zip(self._items, data.tolist()):
+                item.x = x
+                item.y = y
+                item.z = z
+            self._synced = True
+        return self._items
 
     @points.setter
     def points(self, points):
         self._items = points
-        self._data = asarray(points)
+        self._data = asarray(points, dtype=float).reshape((-1, 3))
+        self._xform = None
+        self._synced = True
 
     def __getitem__(self, key):
         if isinstance(key, slice):
-            items = []
-            for i in range(*key.indices(len(self._items))):
-                item = self._items[i]
-                item[:] = self._data[i][:]
-                items.append(item)
-            return items
-        self._items[key][:] = self._data[key][:]
+            return self.points[key]
+        data = self.data
+        if not self._synced:
+            item = self._items[key]
+            item.x, item.y, item.z = data[key].tolist()
         return self._items[key]
 
     def __setitem__(self, key, point):
+        data = self.data
         self._items[key] = point
-        self._data[key] = point[:]
+        data[key] = point[:]
 
     def __iter__(self):
-        return iter(self._items)
+        return iter(self.points)
 
     def __len__(self):
         return len(self._items)
 
     def copy(self):
-        return PointCollectionNumpy([point.copy() for point in self._items])
+        return PointCollectionNumpy([point.copy() for point in self.points])
 
     def transform(self, X):
-        transform_points_numpy(self._data, X)
+        """Transform the points of the collection.
+
+        Parameters
+        ----------
+        X : :class:`compas.geometry.Transformation` or list of list of float
+            The transformation.
+
+        Notes
+        -----
+        The transformation is concatenated with the pending transformations of the collection.
+        The coordinates are updated the next time they are accessed.
+        """
+        X = asarray(X, dtype=float)
+        self._xform = X if self._xform is None else X.dot(self._xform)
 
     def transformed(self, X):
         collection = self.copy()
@@ -84,6 +139,7 @@ collection = PointCollectionNumpy([Point(*xyz) for xyz in pointcloud(10000, (0,
 
     code = """
 collection.transform(R)
+collection.data
 """
 
     number = 100
@@ -28,6 +28,12 @@ from compas.geometry._transformations import decompose_matrix
 __all__ = ['Transformation']
 
 
+def _multiply(A, B):
+    # product of two 4x4 matrices, without the checks and transposition of multiply_matrices
+    Bt = list(zip(*B))
+    return [[a0 * b0 + a1 * b1 + a2 * b2 + a3 * b3 for b0, b1, b2, b3 in Bt] for a0, a1, a2, a3 in A]
+
+
 class Transformation(object):
     """The ``Transformation`` represents a 4x4 transformation matrix.
 
@@ -398,7 +404,7 @@ class Transformation(object):
         -----
         Rz * Ry * Rx means that Rx is first transformation, Ry second, and Rz third.
         """
-        self.matrix = multiply_matrices(self.matrix, other.matrix)
+        self.matrix = _multiply(self.matrix, other.matrix)
 
     def concatenated(self, other):
         """Concatenate two transformations into one ``Transformation``.
@@ -422,8 +428,8 @@ class Transformation(object):
         # return T
         cls = type(self)
         if isinstance(other, cls):
-            return cls(multiply_matrices(self.matrix, other.matrix))
-        return Transformation(multiply_matrices(self.matrix, other.matrix))
+            return cls(_multiply(self.matrix, other.matrix))
+        return Transformation(_multiply(self.matrix, other.matrix))
 
 
 # ==============================================================================
@@ -16,8 +16,6 @@ from compas.geometry import cross_vectors
 from compas.geometry import vector_component
 from compas.geometry import vector_component_xy
 from compas.geometry import multiply_matrix_vector
-from compas.geometry import multiply_matrices
-from compas.geometry import transpose_matrix
 from compas.geometry import norm_vector
 from compas.geometry import angle_vectors
 from compas.geometry import closest_point_on_plane
@@ -222,6 +220,22 @@ def dehomogenize_and_unflatten_frames(points_and_vectors):
 # ==============================================================================
 
 
+def _transform(vectors, T, w):
+    # apply the affine part of the matrix directly to the XYZ components,
+    # instead of homogenizing, transposing and multiplying full matrices
+    (a, b, c, d), (e, f, g, h), (i, j, k, m), (n, o, p, q) = T
+    d, h, m, q = d * w, h * w, m * w, q * w
+    if n == 0.0 and o == 0.0 and p == 0.0 and q in (0.0, 1.0):
+        return [[a * x + b * y + c * z + d, e * x + f * y + g * z + h, i * x + j * y + k * z + m] for x, y, z in vectors]
+    result = []
+    for x, y, z in vectors:
+        r = n * x + o * y + p * z + q
+        if not r:
+            r = 1.0
+        result.append([(a * x + b * y + c * z + d) / r, (e * x + f * y + g * z + h) / r, (i * x + j * y + k * z + m) / r])
+    return result
+
+
 def transform_points(points, T):
     """Transform multiple points with one transformation matrix.
 
@@ -232,13 +246,18 @@ def transform_points(points, T):
     T : :class:`Transformation` or list of list of float
         The transformation to apply.
 
+    Returns
+    -------
+    list of list of float
+        The transformed points.
+
     Examples
     --------
     >>> points = [[1, 0, 0], [1, 2, 4], [4, 7, 1]]
     >>> T = matrix_from_axis_and_angle([0, 2, 0], math.radians(45), point=[4, 5, 6])
     >>> points_transformed = transform_points(points, T)
     """
-    return dehomogenize(multiply_matrices(homogenize(points, w=1.0), transpose_matrix(T)))
+    return _transform(points, T, 1.0)
 
 
 def transform_vectors(vectors, T):
@@ -251,13 +270,18 @@ def transform_vectors(vectors, T):
     T : :class:`Transformation` list of list of float
         The transformation to apply.
 
+    Returns
+    -------
+    list of list of float
+        The transformed vectors.
+
     Examples
     --------
     >>> vectors = [[1, 0, 0], [1, 2, 4], [4, 7, 1]]
     >>> T = matrix_from_axis_and_angle([0, 2, 0], math.radians(45), point=[4, 5, 6])
     >>> vectors_transformed = transform_vectors(vectors, T)
     """
-    return dehomogenize(multiply_matrices(homogenize(vectors, w=0.0), transpose_matrix(T)))
+    return _transform(vectors, T, 0.0)
 
 
 def transform_frames(frames, T):
@@ -270,14 +294,20 @@ def transform_frames(frames, T):
     T : :class:`Transformation`
         The transformation to apply on the frames.
 
+    Returns
+    -------
+    list of list of list of float
+        The points and axes of the transformed frames.
+
     Examples
     --------
     >>> frames = [Frame([1, 0, 0], [1, 2, 4], [4, 7, 1]), Frame([0, 2, 0], [5, 2, 1], [0, 2, 1])]
     >>> T = matrix_from_axis_and_angle([0, 2, 0], math.radians(45), point=[4, 5, 6])
     >>> transformed_frames = transform_frames(frames, T)
     """
-    points_and_vectors = homogenize_and_flatten_frames(frames)
-    return dehomogenize_and_unflatten_frames(multiply_matrices(points_and_vectors, transpose_matrix(T)))
+    points = _transform([frame[0] for frame in frames], T, 1.0)
+    axes = _transform([axis for frame in frames for axis in (frame[1], frame[2])], T, 0.0)
+    return [[point, axes[2 * index], axes[2 * index + 1]] for index, point in enumerate(points)]
 
 
 def world_to_local_coords(frame, xyz):
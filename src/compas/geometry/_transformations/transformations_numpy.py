@@ -3,10 +3,13 @@ from __future__ import absolute_import
 from __future__ import division
 
 from numpy import asarray
+from numpy import concatenate
 from numpy import hstack
+from numpy import matmul
 from numpy import ones
-from numpy import vectorize
+from numpy import swapaxes
 from numpy import tile
+from numpy import where
 
 from scipy.linalg import solve
 
@@ -16,6 +19,7 @@ from compas.geometry import cross_vectors
 __all__ = [
     'transform_points_numpy',
     'transform_vectors_numpy',
+    'transform_frames_numpy',
 
     'homogenize_numpy',
     'dehomogenize_numpy',
@@ -29,36 +33,75 @@ __all__ = [
 ]
 
 
+def _transform_numpy(xyz, T, w):
+    # apply the affine part of one matrix or a stack of matrices directly to the XYZ components,
+    # and divide by the homogeneous coordinate only for projective transformations
+    xyz = asarray(xyz, dtype=float)
+    T = asarray(T, dtype=float)
+    result = matmul(xyz, swapaxes(T[..., :3, :3], -1, -2))
+    if w:
+        result += T[..., None, :3, 3]
+    if not T[..., 3, :3].any() and (T[..., 3, 3] == 1.0).all():
+        return result
+    W = matmul(xyz, swapaxes(T[..., 3:, :3], -1, -2))
+    if w:
+        W += T[..., 3:, 3:]
+    return result / where(W == 0.0, 1.0, W)
+
+
 def transform_points_numpy(points, T):
-    """Transform multiple points with one Transformation using numpy.
+    """Transform multiple points with one or more transformations using numpy.
 
     Parameters
     ----------
-    points : list of :class:`Point` or list of list of float
+    points : list of :class:`Point` or list of list of float or array
         A list of points to be transformed.
-    T : :class:`Transformation` or list of list of float
-        The transformation to apply.
+    T : :class:`Transformation` or list of list of float or list of :class:`Transformation`
+        The transformation to apply,
+        or a stack of transformations that are all applied to the same points.
+
+    Returns
+    -------
+    array
+        The transformed points, with shape ``(n, 3)`` for one transformation,
+        and with shape ``(m, n, 3)`` for a stack of ``m`` transformations.
+
+    Notes
+    -----
+    The affine part of the transformation matrix is applied directly to the coordinates,
+    without homogenizing and transposing the points first.
+    The coordinates are divided by the homogeneous coordinate only for projective transformations.
 
     Examples
     --------
     >>> points = [[1, 0, 0], [1, 2, 4], [4, 7, 1]]
     >>> T = matrix_from_axis_and_angle([0, 2, 0], math.radians(45), point=[4, 5, 6])
     >>> points_transformed = transform_points_numpy(points, T)
+    >>> points_transformed.shape
+    (3, 3)
+    >>> R = [matrix_from_axis_and_angle([0, 0, 1], math.radians(i)) for i in range(10)]
+    >>> transform_points_numpy(points, R).shape
+    (10, 3, 3)
     """
-    T = asarray(T)
-    points = homogenize_numpy(points, w=1.0)
-    return dehomogenize_numpy(points.dot(T.T))
+    return _transform_numpy(points, T, 1.0)
 
 
 def transform_vectors_numpy(vectors, T):
-    """Transform multiple vectors with one Transformation using numpy.
+    """Transform multiple vectors with one or more transformations using numpy.
 
     Parameters
     ----------
-    vectors : list of :class:`Vector`
+    vectors : list of :class:`Vector` or list of list of float or array
         A list of vectors to be transformed.
-    T : :class:`Transformation`
-        The transformation to apply.
+    T : :class:`Transformation` or list of list of float or list of :class:`Transformation`
+        The transformation to apply,
+        or a stack of transformations that are all applied to the same vectors.
+
+    Returns
+    -------
+    array
+        The transformed vectors, with shape ``(n, 3)`` for one transformation,
+        and with shape ``(m, n, 3)`` for a stack of ``m`` transformations.
 
     Examples
     --------
@@ -66,20 +109,25 @@ def transform_vectors_numpy(vectors, T):
     >>> T = matrix_from_axis_and_angle([0, 2, 0], math.radians(45), point=[4, 5, 6])
     >>> vectors_transformed = transform_vectors_numpy(vectors, T)
     """
-    T = asarray(T)
-    vectors = homogenize_numpy(vectors, w=0.0)
-    return dehomogenize_numpy(vectors.dot(T.T))
+    return _transform_numpy(vectors, T, 0.0)
 
 
 def transform_frames_numpy(frames, T):
-    """Transform multiple frames with one Transformation usig numpy.
+    """Transform multiple frames with one or more transformations using numpy.
 
     Parameters
     ----------
     frames : list of :class:`Frame`
         A list of frames to be transformed.
-    T : :class:`Transformation`
-        The transformation to apply on the frames.
+    T : :class:`Transformation` or list of :class:`Transformation`
+        The transformation to apply on the frames,
+        or a stack of transformations that are all applied to the same frames.
+
+    Returns
+    -------
+    array
+        The points and axes of the transformed frames, with shape ``(n, 3, 3)`` for one transformation,
+        and with shape ``(m, n, 3, 3)`` for a stack of ``m`` transformations.
 
     Examples
     --------
@@ -87,9 +135,12 @@ def transform_frames_numpy(frames, T):
     >>> T =  matrix_from_axis_and_angle([0, 2, 0], math.radians(45), point=[4, 5, 6])
     >>> transformed_frames = transform_frames_numpy(frames, T)
     """
-    T = asarray(T)
-    points_and_vectors = homogenize_and_flatten_frames_numpy(frames)
-    return dehomogenize_and_unflatten_frames_numpy(points_and_vectors.dot(T.T))
+    frames = asarray(frames, dtype=float).reshape((-1, 3, 3))
+    n = frames.shape[0]
+    points = _transform_numpy(frames[:, 0], T, 1.0)
+    axes = _transform_numpy(frames[:, 1:].reshape((-1, 3)), T, 0.0)
+    axes = axes.reshape(axes.shape[:-2] + (n, 2, 3))
+    return concatenate((points[..., None, :], axes), axis=-2)
 
 
 def world_to_local_coords_numpy(frame, xyz):
@@ -206,12 +257,9 @@ def dehomogenize_numpy(points):
     >>> numpy.allclose(res, [[1.0, 1.0, 1.0], [0.0, 1.0, 0.0], [1.0, -0.0, 0.0]])
     True
     """
-    def func(a):
-        return a if a else 1.
-    func = vectorize(func)
-
     points = asarray(points)
-    return points[:, :-1] / func(points[:, -1]).reshape((-1, 1))
+    w = points[:, -1:]
+    return points[:, :-1] / where(w == 0, 1.0, w)
 
 
 def homogenize_and_flatten_frames_numpy(frames):
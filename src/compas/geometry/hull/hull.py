@@ -2,9 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.geometry import cross_vectors
 from compas.geometry import subtract_vectors
-from compas.geometry import dot_vectors
 from compas.geometry import cross_vectors_xy
 
 from compas.geometry import distance_point_point
@@ -16,6 +14,68 @@ __all__ = [
 ]
 
 
+def _plane(xs, ys, zs, a, b, c):
+    ux = xs[b] - xs[a]
+    uy = ys[b] - ys[a]
+    uz = zs[b] - zs[a]
+    vx = xs[c] - xs[a]
+    vy = ys[c] - ys[a]
+    vz = zs[c] - zs[a]
+    nx = uy * vz - uz * vy
+    ny = uz * vx - ux * vz
+    nz = ux * vy - uy * vx
+    length = (nx * nx + ny * ny + nz * nz) ** 0.5
+    if length:
+        nx /= length
+        ny /= length
+        nz /= length
+    return nx, ny, nz, nx * xs[a] + ny * ys[a] + nz * zs[a]
+
+
+def _convex_hull_planar(xs, ys, zs, indices, origin, normal):
+    # monotone chain in a local frame of the plane of the points
+    # the hull polygon is triangulated as a fan, on both sides of the plane
+    nx, ny, nz = normal
+    if abs(nx) < 0.9:
+        ux, uy, uz = 0.0, nz, -ny
+    else:
+        ux, uy, uz = -nz, 0.0, nx
+    vx = ny * uz - nz * uy
+    vy = nz * ux - nx * uz
+    vz = nx * uy - ny * ux
+    ox, oy, oz = origin
+    uv = {}
+    for i in indices:
+        x = xs[i] - ox
+        y = ys[i] - oy
+        z = zs[i] - oz
+        uv.setdefault((x * ux + y * uy + z * uz, x * vx + y * vy + z * vz), i)
+    coords = sorted(uv)
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower = []
+    for p in coords:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper = []
+    for p in reversed(coords):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    polygon = [uv[p] for p in lower[:-1] + upper[:-1]]
+    if len(polygon) < 3:
+        return []
+    # the frame (u, v) is oriented such that the polygon is counterclockwise around the normal
+    faces = []
+    for i in range(1, len(polygon) - 1):
+        faces.append([polygon[0], polygon[i], polygon[i + 1]])
+        faces.append([polygon[0], polygon[i + 1], polygon[i]])
+    return faces
+
+
 def convex_hull(points):
     """Construct convex hull for a set of points.
 
@@ -29,21 +89,43 @@ def convex_hull(points):
     list
         The triangular faces of the convex hull as lists of vertex indices
         referring to the original point coordinates.
+        The faces are oriented counterclockwise when seen from the outside.
+        If the points are coplanar, the hull is two-sided:
+        every face is returned once with each orientation.
 
     Notes
     -----
-    This algorithm is based on [1]_. Note that is not optimized and relatively
-    slow on large sets of points. For a more optimized version of this algorithm,
-    see [2]_.
+    This algorithm is an implementation of Quickhull [1]_.
+    Every point outside of the current hull is registered in the conflict list (*outside set*)
+    of one of the faces it can see.
+    The faces with points in their conflict list are processed one by one,
+    by adding the point farthest from the face to the hull,
+    and redistributing the points of the faces that are removed over the newly created faces.
+    Points that are no longer outside of the hull are discarded.
+    The faces of the hull are connected through a map of their halfedges,
+    such that the faces visible from a point and their horizon are found by local search.
+
+    Points that lie within a small tolerance of the plane of a face are considered to be inside the hull.
+    If all points lie in a plane, the faces of the (triangulated) convex polygon are returned
+    with both orientations.
+    If the points are colinear, or if there are less than three different points, the hull has no faces.
+
+    For a mesh data structure of the hull, see :meth:`compas.datastructures.Mesh.from_convex_hull`.
 
     References
     ----------
-    .. [1] GitHubGist. *Convex Hull*.
-           Available at: https://gist.github.com/anonymous/5184ba0bcab21d3dd19781efd3aae543
-    .. [2] http://thomasdiewald.com/blog/?p=1888
+    .. [1] Barber, C. B., Dobkin, D. P. and Huhdanpaa, H., 1996 *The Quickhull algorithm for convex hulls*.
+           ACM Transactions on Mathematical Software 22(4): 469-483.
 
     Examples
     --------
+    >>> points = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [0.1, 0.1, 0.1]]
+    >>> faces = convex_hull(points)
+    >>> len(faces)
+    4
+    >>> 4 in set(index for face in faces for index in face)
+    False
+
     .. warning::
 
         This examples only works in Rhino.
@@ -81,39 +163,137 @@ def convex_hull(points):
         artist.redraw()
 
     """
-    def _normal_face(face):
-        u = subtract_vectors(points[face[1]], points[face[0]])
-        v = subtract_vectors(points[face[-1]], points[face[0]])
-        return cross_vectors(u, v)
-
-    def _seen(face, p):
-        normal = _normal_face(face)
-        vec = subtract_vectors(points[p], points[face[0]])
-        return (dot_vectors(normal, vec) >= 0)
-
-    def _bdry(faces):
-        bdry_fw = set([(face[i - 1], face[i]) for face in faces for i in range(len(face))])
-        bdry_bk = set([(face[i], face[i - 1]) for face in faces for i in range(len(face))])
-        return bdry_fw - bdry_bk
-
-    def _add_point(hull, p):
-        seen_faces = [face for face in hull if _seen(face, p)]
-
-        if len(seen_faces) == len(hull):
-            # if can see all faces, unsee ones looking "down"
-            normal = _normal_face(seen_faces[0])
-            seen_faces = [face for face in seen_faces if dot_vectors(_normal_face(face), normal) > 0]
-
-        for face in seen_faces:
-            hull.remove(face)
-
-        for edge in _bdry(seen_faces):
-            hull.append([edge[0], edge[1], p])
-
-    hull = [[0, 1, 2], [0, 2, 1]]
-    for i in range(3, len(points)):
-        _add_point(hull, i)
-    return hull
+    n = len(points)
+    if n < 3:
+        return []
+
+    xs = [float(point[0]) for point in points]
+    ys = [float(point[1]) for point in points]
+    zs = [float(point[2]) for point in points]
+
+    scale = max(max(abs(x) for x in xs), max(abs(y) for y in ys), max(abs(z) for z in zs)) or 1.0
+    tol = 1e-10 * scale
+
+    # initial simplex
+    # the extreme points along the coordinate axes,
+    # the point farthest from the line through the two most distant ones,
+    # and the point farthest from the plane through these three
+    extremes = []
+    for coords in (xs, ys, zs):
+        extremes.append(min(range(n), key=coords.__getitem__))
+        extremes.append(max(range(n), key=coords.__getitem__))
+
+    def squared_distance(i, j):
+        return (xs[i] - xs[j]) ** 2 + (ys[i] - ys[j]) ** 2 + (zs[i] - zs[j]) ** 2
+
+    a, b = max(((i, j) for i in extremes for j in extremes), key=lambda ij: squared_distance(*ij))
+    if squared_distance(a, b) <= tol ** 2:
+        return []
+
+    abx = xs[b] - xs[a]
+    aby = ys[b] - ys[a]
+    abz = zs[b] - zs[a]
+
+    def squared_distance_line(i):
+        x = xs[i] - xs[a]
+        y = ys[i] - ys[a]
+        z = zs[i] - zs[a]
+        cx = aby * z - abz * y
+        cy = abz * x - abx * z
+        cz = abx * y - aby * x
+        return cx * cx + cy * cy + cz * cz
+
+    c = max(range(n), key=squared_distance_line)
+    if squared_distance_line(c) <= (tol ** 2) * (abx * abx + aby * aby + abz * abz):
+        return []
+
+    nx, ny, nz, offset = _plane(xs, ys, zs, a, b, c)
+    d = max(range(n), key=lambda i: abs(nx * xs[i] + ny * ys[i] + nz * zs[i] - offset))
+    height = nx * xs[d] + ny * ys[d] + nz * zs[d] - offset
+    if abs(height) <= tol:
+        return _convex_hull_planar(xs, ys, zs, range(n), (xs[a], ys[a], zs[a]), (nx, ny, nz))
+    if height > 0:
+        b, c = c, b
+
+    # faces are stored in flat lists
+    # the halfedges map every directed edge of a face to that face
+    vertices = []
+    planes = []
+    outside = []
+    alive = []
+    halfedges = {}
+
+    def add_face(u, v, w):
+        face = len(vertices)
+        vertices.append((u, v, w))
+        planes.append(_plane(xs, ys, zs, u, v, w))
+        outside.append([])
+        alive.append(True)
+        halfedges[u, v] = face
+        halfedges[v, w] = face
+        halfedges[w, u] = face
+        return face
+
+    def assign(indices, faces):
+        for i in indices:
+            x = xs[i]
+            y = ys[i]
+            z = zs[i]
+            for face in faces:
+                nx, ny, nz, offset = planes[face]
+                if nx * x + ny * y + nz * z - offset > tol:
+                    outside[face].append(i)
+                    break
+
+    faces = [add_face(a, b, c), add_face(a, d, b), add_face(b, d, c), add_face(c, d, a)]
+    assign((i for i in range(n) if i not in (a, b, c, d)), faces)
+
+    tovisit = [face for face in faces if outside[face]]
+    while tovisit:
+        face = tovisit.pop()
+        if not alive[face] or not outside[face]:
+            continue
+
+        # the point farthest from the face
+        nx, ny, nz, offset = planes[face]
+        p = max(outside[face], key=lambda i: nx * xs[i] + ny * ys[i] + nz * zs[i])
+        x = xs[p]
+        y = ys[p]
+        z = zs[p]
+
+        # visible faces and horizon
+        visible = [face]
+        alive[face] = False
+        horizon = []
+        i = 0
+        while i < len(visible):
+            u, v, w = vertices[visible[i]]
+            i += 1
+            for edge in ((u, v), (v, w), (w, u)):
+                nbr = halfedges[edge[1], edge[0]]
+                if not alive[nbr]:
+                    continue
+                nx, ny, nz, offset = planes[nbr]
+                if nx * x + ny * y + nz * z - offset > tol:
+                    alive[nbr] = False
+                    visible.append(nbr)
+                else:
+                    horizon.append(edge)
+
+        # replace the visible faces by a cone of faces from the horizon to the point
+        candidates = []
+        for face in visible:
+            candidates.extend(outside[face])
+            outside[face] = None
+            u, v, w = vertices[face]
+            for edge in ((u, v), (v, w), (w, u)):
+                if halfedges.get(edge) == face:
+                    del halfedges[edge]
+        faces = [add_face(u, v, p) for u, v in horizon]
+        assign((i for i in candidates if i != p), faces)
+        tovisit.extend(face for face in faces if outside[face])
+
+    return [list(vertices[face]) for face in range(len(vertices)) if alive[face]]
 
 
 def convex_hull_xy(points, strict=False):
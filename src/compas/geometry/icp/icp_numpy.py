@@ -4,14 +4,12 @@ from __future__ import division
 
 import numpy as np
 from numpy import asarray
-from numpy import argmin
 from numpy.linalg import det
-from scipy.spatial.distance import cdist
+from numpy.linalg import lstsq
+from scipy.spatial import cKDTree
 from scipy.linalg import svd
-from scipy.linalg import norm
 
 from compas.numerical import pca_numpy
-from compas.numerical import normrow
 from compas.geometry import Transformation
 from compas.geometry import Frame
 from compas.geometry import transform_points_numpy
@@ -43,7 +41,49 @@ def bestfit_transform(A, B):
     return X
 
 
-def icp_numpy(source, target, tol=1e-3):
+def bestfit_transform_plane(A, B, N):
+    # linearized point-to-plane alignment
+    # minimize sum(((R a + t - b) . n) ** 2) for small rotations R = I + [w]x
+    M = np.hstack((np.cross(A, N), N))
+    r = np.einsum('ij,ij->i', B - A, N)
+    x = lstsq(M, r, rcond=None)[0]
+    w, t = x[:3], x[3:]
+    angle = np.linalg.norm(w)
+    R = np.identity(3)
+    if angle > 0:
+        k = w / angle
+        K = np.array([[0, -k[2], k[1]], [k[2], 0, -k[0]], [-k[1], k[0], 0]])
+        R += np.sin(angle) * K + (1 - np.cos(angle)) * K.dot(K)
+    X = np.identity(4)
+    X[:3, :3] = R
+    X[:3, 3] = t
+    return X
+
+
+def normals_numpy(tree, B, indices, k=8):
+    """Estimate the normals of a subset of the points of a cloud
+    from the smallest principal direction of their nearest neighbors."""
+    _, nbrs = tree.query(B[indices], k=min(k, len(B)))
+    P = B[nbrs]
+    P = P - P.mean(axis=1)[:, None, :]
+    C = np.einsum('ijk,ijl->ikl', P, P)
+    _, vectors = np.linalg.eigh(C)
+    return vectors[:, :, 0]
+
+
+def subsample_numpy(A, number=None, voxel=None):
+    """Select the indices of a subsample of the points of a cloud."""
+    indices = np.arange(len(A))
+    if voxel:
+        keys = np.floor(A / voxel).astype(np.int64)
+        _, indices = np.unique(keys, axis=0, return_index=True)
+    if number and number < len(indices):
+        indices = np.random.choice(indices, number, replace=False)
+    return np.sort(indices)
+
+
+def icp_numpy(source, target, tol=1e-3, maxiter=20, subsample=None, voxel=None,
+              method='point', reject=None, target_normals=None, history=False):
     """Align two point clouds using the Iterative Closest Point (ICP) method.
 
     Parameters
@@ -55,11 +95,39 @@ def icp_numpy(source, target, tol=1e-3):
     tol : float, optional
         Tolerance for finding matches.
         Default is ``1e-3``.
+    maxiter : int, optional
+        The maximum number of iterations.
+        Default is ``20``.
+    subsample : int, optional
+        The number of randomly selected source points used for the alignment.
+        Default is ``None``, in which case all (remaining) points are used.
+    voxel : float, optional
+        The size of a grid of voxels in which only one source point is used for the alignment.
+        Default is ``None``.
+    method : {'point', 'plane'}, optional
+        Minimize the distances of the source points to the matching target points (``'point'``),
+        or to the tangent planes of the target points (``'plane'``).
+        Default is ``'point'``.
+    reject : float, optional
+        Reject matches with a distance larger than this multiple of the median distance.
+        Default is ``None``, in which case all matches are used.
+    target_normals : list of vector, optional
+        The normals of the target points for the ``'plane'`` method.
+        Default is ``None``, in which case the normals are estimated from the nearest neighbors
+        of the matched target points.
+    history : bool, optional
+        If ``True``, also return the error of every iteration.
+        Default is ``False``.
 
     Returns
     -------
-
-        The transformed points
+    array
+        The transformed points.
+    :class:`Transformation`
+        The transformation from the source to the target.
+    list
+        The root mean square distance of the matches in every iteration.
+        Only if ``history`` is ``True``.
 
     Notes
     -----
@@ -74,16 +142,19 @@ def icp_numpy(source, target, tol=1e-3):
     During this iterative process, we continuously update the correspondence
     between the point clouds by finding the closest point in the target to each
     of the source points.
+    The closest points are found with a kd-tree of the target that is constructed only once,
+    and only the points of the subsample of the source are matched.
 
-    The algorithm terminates when the alignment error is below a specified tolerance.
+    The algorithm terminates when the root mean square distance of the matches is below the tolerance,
+    when it improves less than the tolerance, or when the maximum number of iterations is reached.
 
     Examples
     --------
     >>>
 
     """
-    A = asarray(source)
-    B = asarray(target)
+    A = asarray(source, dtype=float)
+    B = asarray(target, dtype=float)
 
     origin, axes, _ = pca_numpy(A)
     A_frame = Frame(origin, axes[0], axes[1])
@@ -91,17 +162,53 @@ def icp_numpy(source, target, tol=1e-3):
     origin, axes, _ = pca_numpy(B)
     B_frame = Frame(origin, axes[0], axes[1])
 
-    X = Transformation.from_frame_to_frame(A_frame, B_frame)
-    A = transform_points_numpy(A, X)
-
-    for i in range(20):
-        D = cdist(A, B, 'euclidean')
-        closest = argmin(D, axis=1)
-        if norm(normrow(A - B[closest])) < tol:
+    X = asarray(Transformation.from_frame_to_frame(A_frame, B_frame).matrix)
+
+    tree = cKDTree(B)
+
+    if method == 'plane':
+        if target_normals is not None:
+            normals = asarray(target_normals, dtype=float)
+            known = np.ones(len(B), dtype=bool)
+        else:
+            normals = np.zeros(B.shape)
+            known = np.zeros(len(B), dtype=bool)
+    elif method != 'point':
+        raise ValueError("The method should be 'point' or 'plane': {}".format(method))
+
+    indices = subsample_numpy(A, subsample, voxel)
+    S = transform_points_numpy(A[indices], X)
+
+    errors = []
+    for i in range(maxiter):
+        distances, closest = tree.query(S)
+        if reject:
+            inliers = distances <= reject * np.median(distances)
+            distances = distances[inliers]
+            closest = closest[inliers]
+            P = S[inliers]
+        else:
+            P = S
+        error = np.sqrt(np.mean(distances ** 2))
+        errors.append(error)
+        if error < tol or (i and errors[-2] - error < tol):
             break
-        X = bestfit_transform(A, B[closest])
-        A = transform_points_numpy(A, X)
+        if method == 'plane':
+            unknown = np.unique(closest[~known[closest]])
+            if len(unknown):
+                normals[unknown] = normals_numpy(tree, B, unknown)
+                known[unknown] = True
+            Y = bestfit_transform_plane(P, B[closest], normals[closest])
+        else:
+            Y = bestfit_transform(P, B[closest])
+        S = transform_points_numpy(S, Y)
+        X = Y.dot(X)
+
+    A = transform_points_numpy(A, X)
+    X = Transformation(X.tolist())
 
+    if history:
+        return A, X, errors
     return A, X
 
 
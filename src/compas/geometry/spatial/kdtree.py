@@ -4,7 +4,8 @@ from __future__ import division
 
 import collections
 
-from compas.geometry import distance_point_point_sqrd
+from heapq import heappush
+from heapq import heapreplace
 
 
 __all__ = [
@@ -29,10 +30,19 @@ class KDTree(object):
     ----------
     root : Node
         The root node of the built tree.
-        This is the median with respect to the different dimensions of the tree.
+        This is the median with respect to the splitting axis of the tree.
 
     Notes
     -----
+    The tree is a balanced, implicit kd-tree stored in flat lists.
+    The node that splits a range of positions in the lists is located at the middle of the range,
+    and the objects are split along the axis with the largest spread of coordinates.
+    The tree is constructed in :math:`O(n \\log n)` from the objects presorted along every axis.
+
+    Batch queries (:meth:`query` and :meth:`query_radius`) are delegated to
+    ``scipy.spatial.cKDTree``, if SciPy is available.
+    Otherwise, all queries are answered by the tree itself.
+
     For more info, see [1]_ and [2]_.
 
     References
@@ -58,14 +68,7 @@ class KDTree(object):
 
         tree = KDTree(cloud)
 
-        n       = 50
-        nnbrs   = []
-        exclude = set()
-
-        for i in range(n):
-            nnbr = tree.nearest_neighbor(point, exclude)
-            nnbrs.append(nnbr)
-            exclude.add(nnbr[1])
+        nnbrs = tree.nearest_neighbors(point, 50)
 
         for nnbr in nnbrs:
             print(nnbr)
@@ -106,9 +109,35 @@ class KDTree(object):
 
     def __init__(self, objects=None):
         """Initialise a KDTree object."""
-        self.root = None
+        self._objects = []
+        self._labels = []
+        self._xyz = []
+        self._axes = []
+        self._ckdtree = None
+        self._root = None
         if objects:
-            self.root = self.build(list([(objects[i], i) for i in range(len(objects))]))
+            self._build([(objects[i], i) for i in range(len(objects))])
+
+    def __len__(self):
+        return len(self._xyz)
+
+    @property
+    def root(self):
+        """Node: The root node of the built tree."""
+        if self._root is None and self._xyz:
+            self._root = self._node(0, len(self._xyz))
+        return self._root
+
+    def _node(self, start, end):
+        if start == end:
+            return None
+        mid = (start + end) // 2
+        return Node(
+            self._objects[mid],
+            self._axes[mid],
+            self._labels[mid],
+            self._node(start, mid),
+            self._node(mid + 1, end))
 
     def build(self, objects, axis=0):
         """Populate a kd-tree with given objects.
@@ -116,9 +145,11 @@ class KDTree(object):
         Parameters
         ----------
         objects : list
-            The tree objects.
+            The tree objects, as pairs of XYZ coordinates and a label.
         axis : int, optional
-            The axis along which to build.
+            Not used.
+            The splitting axes are chosen by the tree.
+            The parameter is only kept for backward compatibility.
 
         Returns
         -------
@@ -126,20 +157,90 @@ class KDTree(object):
             The root node.
 
         """
-        if not objects:
-            return None
-
-        objects.sort(key=lambda o: o[0][axis])
-        median_idx = len(objects) // 2
-        median_point, median_label = objects[median_idx]
-        next_axis = (axis + 1) % 3
-
-        return Node(
-            median_point,
-            axis,
-            median_label,
-            self.build(objects[:median_idx], next_axis),
-            self.build(objects[median_idx + 1:], next_axis))
+        self._build(objects)
+        return self.root
+
+    def _build(self, objects):
+        xyz = [(float(point[0]), float(point[1]), float(point[2])) for point, _ in objects]
+        try:
+            position, axes = _build_numpy(xyz)
+        except ImportError:
+            position, axes = _build(xyz)
+        self._objects = [objects[i][0] for i in position]
+        self._labels = [objects[i][1] for i in position]
+        self._xyz = [xyz[i] for i in position]
+        self._axes = axes
+        self._ckdtree = None
+        self._root = None
+
+    # --------------------------------------------------------------------------
+    # search
+    # --------------------------------------------------------------------------
+
+    def _search(self, point, k, exclude=None):
+        # k nearest neighbours, as a heap of (-squared distance, position in the tree).
+        # a subtree is only visited if the distance between the point
+        # and the region of the subtree is smaller than the k-th best distance.
+        x, y, z = point[0], point[1], point[2]
+        xyz = self._xyz
+        axes = self._axes
+        labels = self._labels
+        best = []
+        stack = [(0, len(xyz), 0.0)]
+        while stack:
+            start, end, bound = stack.pop()
+            if start == end or (len(best) == k and bound >= -best[0][0]):
+                continue
+            mid = (start + end) // 2
+            a, b, c = xyz[mid]
+            d2 = (a - x) ** 2 + (b - y) ** 2 + (c - z) ** 2
+            if not exclude or labels[mid] not in exclude:
+                if len(best) < k:
+                    heappush(best, (-d2, mid))
+                elif d2 < -best[0][0]:
+                    heapreplace(best, (-d2, mid))
+            d = point[axes[mid]] - xyz[mid][axes[mid]]
+            if d <= 0:
+                stack.append((mid + 1, end, max(bound, d * d)))
+                stack.append((start, mid, bound))
+            else:
+                stack.append((start, mid, max(bound, d * d)))
+                stack.append((mid + 1, end, bound))
+        return sorted((-d2, mid) for d2, mid in best)
+
+    def _search_radius(self, point, radius):
+        x, y, z = point[0], point[1], point[2]
+        xyz = self._xyz
+        axes = self._axes
+        r2 = radius ** 2
+        found = []
+        stack = [(0, len(xyz))]
+        while stack:
+            start, end = stack.pop()
+            if start == end:
+                continue
+            mid = (start + end) // 2
+            a, b, c = xyz[mid]
+            d2 = (a - x) ** 2 + (b - y) ** 2 + (c - z) ** 2
+            if d2 <= r2:
+                found.append((d2, mid))
+            d = point[axes[mid]] - xyz[mid][axes[mid]]
+            if d <= 0 or d * d <= r2:
+                stack.append((start, mid))
+            if d >= 0 or d * d <= r2:
+                stack.append((mid + 1, end))
+        found.sort()
+        return found
+
+    def _scipy_tree(self):
+        if self._ckdtree is None:
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                self._ckdtree = False
+            else:
+                self._ckdtree = cKDTree(self._xyz) if self._xyz else False
+        return self._ckdtree or None
 
     def nearest_neighbor(self, point, exclude=None):
         """Find the nearest neighbor to a given point,
@@ -150,7 +251,7 @@ class KDTree(object):
         point : list
             XYZ coordinates of the base point.
         exclude : set, optional
-            A set of points to exclude from the search.
+            A set of labels to exclude from the search.
             Defaults to an empty set.
 
         Returns
@@ -161,30 +262,11 @@ class KDTree(object):
             Distance to the base point.
 
         """
-        def search(node):
-            if node is None:
-                return
-
-            d2 = distance_point_point_sqrd(point, node.point)
-            if d2 < best[2]:
-                if node.label not in exclude:
-                    best[:] = node.point, node.label, d2
-
-            d = point[node.axis] - node.point[node.axis]
-            if d <= 0:
-                close, far = node.left, node.right
-            else:
-                close, far = node.right, node.left
-
-            search(close)
-            if d ** 2 < best[2]:
-                search(far)
-
-        exclude = exclude or set()
-        best = [None, None, float('inf')]
-        search(self.root)
-        best[2] **= 0.5
-        return best
+        best = self._search(point, 1, exclude)
+        if not best:
+            return [None, None, float('inf')]
+        d2, mid = best[0]
+        return [self._objects[mid], self._labels[mid], d2 ** 0.5]
 
     def nearest_neighbors(self, point, number, distance_sort=False):
         """Find the N nearest neighbors to a given point.
@@ -203,17 +285,175 @@ class KDTree(object):
         -------
         list
             A list of N nearest neighbors.
+            Every neighbor is represented by its XYZ coordinates, its label, and its distance to the base point.
+
+        Notes
+        -----
+        The neighbors are always sorted by distance.
+        The parameter ``distance_sort`` is only kept for backward compatibility.
+
+        """
+        return [[self._objects[mid], self._labels[mid], d2 ** 0.5] for d2, mid in self._search(point, number)]
+
+    def query(self, points, k=1):
+        """Find the k nearest neighbors of a collection of points.
+
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the base points.
+        k : int, optional
+            The number of nearest neighbors.
+            Default is ``1``.
+
+        Returns
+        -------
+        tuple
+            For every base point, the list of distances to the nearest neighbors,
+            and the list of labels of the nearest neighbors, sorted by distance.
+            If the tree contains less than ``k`` objects, the lists have the length of the tree.
+
+        Examples
+        --------
+        >>> tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [3.0, 0.0, 0.0]])
+        >>> distances, labels = tree.query([[0.9, 0.0, 0.0], [2.5, 0.0, 0.0]], k=2)
+        >>> labels
+        [[1, 0], [2, 1]]
 
         """
-        nnbrs = []
-        exclude = set()
-        for i in range(number):
-            nnbr = self.nearest_neighbor(point, exclude)
-            nnbrs.append(nnbr)
-            exclude.add(nnbr[1])
-        if distance_sort:
-            return sorted(nnbrs, key=lambda nnbr: nnbr[2])
-        return nnbrs
+        k = min(k, len(self))
+        if not k:
+            return [[] for _ in points], [[] for _ in points]
+        tree = self._scipy_tree()
+        if tree is not None and len(points):
+            distances, positions = tree.query([point[:3] for point in points], k=k)
+            distances = distances.reshape((-1, k)).tolist()
+            positions = positions.reshape((-1, k)).tolist()
+        else:
+            distances = []
+            positions = []
+            for point in points:
+                best = self._search(point, k)
+                distances.append([d2 ** 0.5 for d2, _ in best])
+                positions.append([mid for _, mid in best])
+        labels = self._labels
+        return distances, [[labels[mid] for mid in nbrs] for nbrs in positions]
+
+    def query_radius(self, points, radius):
+        """Find the neighbors of a collection of points within a given distance.
+
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the base points.
+        radius : float
+            The search radius.
+
+        Returns
+        -------
+        list
+            For every base point, the labels of the neighbors within the search radius,
+            sorted by distance.
+
+        Examples
+        --------
+        >>> tree = KDTree([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [3.0, 0.0, 0.0]])
+        >>> tree.query_radius([[0.9, 0.0, 0.0], [5.0, 0.0, 0.0]], 1.0)
+        [[1, 0], []]
+
+        """
+        labels = self._labels
+        tree = self._scipy_tree()
+        if tree is None or not len(points):
+            return [[labels[mid] for _, mid in self._search_radius(point, radius)] for point in points]
+        xyz = self._xyz
+        neighbors = []
+        for point, positions in zip(points, tree.query_ball_point([point[:3] for point in points], radius)):
+            x, y, z = point[0], point[1], point[2]
+            found = sorted(((xyz[mid][0] - x) ** 2 + (xyz[mid][1] - y) ** 2 + (xyz[mid][2] - z) ** 2, mid) for mid in positions)
+            neighbors.append([labels[mid] for _, mid in found])
+        return neighbors
+
+
+# ==============================================================================
+# Construction
+# ==============================================================================
+
+
+def _build(xyz):
+    # the position of every point in the implicit tree, and the split axis of every node,
+    # from lists of the points presorted along every axis.
+    # the presorted lists of a node are split into the lists of its children in linear time.
+    n = len(xyz)
+    position = [None] * n
+    axes = [0] * n
+    left = [False] * n
+    lists = [sorted(range(n), key=lambda i: xyz[i][axis]) for axis in range(3)]
+    stack = [(0, n, lists)]
+    while stack:
+        start, end, lists = stack.pop()
+        if end - start < 2:
+            if start < end:
+                position[start] = lists[0][0]
+            continue
+        spreads = [xyz[indices[-1]][axis] - xyz[indices[0]][axis] for axis, indices in enumerate(lists)]
+        axis = spreads.index(max(spreads))
+        m = (end - start) // 2
+        mid = start + m
+        indices = lists[axis]
+        median = indices[m]
+        position[mid] = median
+        axes[mid] = axis
+        for i in indices[:m]:
+            left[i] = True
+        lower = []
+        upper = []
+        for a in range(3):
+            if a == axis:
+                lower.append(indices[:m])
+                upper.append(indices[m + 1:])
+            else:
+                lower.append([i for i in lists[a] if left[i]])
+                upper.append([i for i in lists[a] if not left[i] and i != median])
+        for i in indices[:m]:
+            left[i] = False
+        stack.append((start, mid, lower))
+        stack.append((mid + 1, end, upper))
+    return position, axes
+
+
+def _build_numpy(xyz):
+    # the same tree, constructed one level at a time for all nodes of the level.
+    # at every level, the points in the range of every node are sorted along the split axis of the node,
+    # and the range is split into the ranges of the children and the median.
+    from numpy import arange
+    from numpy import array
+    from numpy import concatenate
+    from numpy import diff
+    from numpy import lexsort
+    from numpy import maximum
+    from numpy import minimum
+    from numpy import repeat
+    from numpy import unique
+    from numpy import zeros
+    n = len(xyz)
+    xyz = array(xyz, dtype=float).reshape((-1, 3))
+    position = arange(n)
+    axes = zeros(n, dtype=int)
+    starts = arange(min(n, 1))
+    while len(starts) < n:
+        sizes = diff(concatenate((starts, [n])))
+        points = xyz[position]
+        spreads = maximum.reduceat(points, starts) - minimum.reduceat(points, starts)
+        axis = spreads.argmax(axis=1)
+        segment = repeat(arange(len(starts)), sizes)
+        position = position[lexsort((points[arange(n), axis[segment]], segment))]
+        split = sizes > 1
+        mids = starts[split] + sizes[split] // 2
+        axes[mids] = axis[split]
+        starts = unique(concatenate((starts, mids, mids + 1)))
+        starts = starts[starts < n]
+    return position.tolist(), axes.tolist()
 
 
 # ==============================================================================
@@ -232,14 +472,7 @@ if __name__ == '__main__':
 
     tree = KDTree(cloud)
 
-    n = 50
-    nnbrs = []
-    exclude = set()
-
-    for i in range(n):
-        nnbr = tree.nearest_neighbor(point, exclude)
-        nnbrs.append(nnbr)
-        exclude.add(nnbr[1])
+    nnbrs = tree.nearest_neighbors(point, 50)
 
     for nnbr in nnbrs:
         print(nnbr)
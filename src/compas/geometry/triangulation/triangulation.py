@@ -9,17 +9,196 @@ from compas.geometry import distance_point_point
 from compas.geometry import add_vectors
 from compas.geometry import bounding_box
 
-from compas.geometry import is_point_in_polygon_xy
-from compas.geometry import is_point_in_triangle_xy
-from compas.geometry import is_point_in_circle_xy
-from compas.geometry import circle_from_points_xy
-
 
 __all__ = [
     'delaunay_from_points',
 ]
 
 
+def _super_triangle(coords):
+    centpt = centroid_points(coords)
+    bbpts = bounding_box(coords)
+    dis = distance_point_point(bbpts[0], bbpts[2])
+    dis = dis * 300
+    v1 = (0 * dis, 2 * dis, 0)
+    v2 = (1.73205 * dis, -1.0000000000001 * dis, 0)  # due to numerical issues
+    v3 = (-1.73205 * dis, -1 * dis, 0)
+    pt1 = add_vectors(centpt, v1)
+    pt2 = add_vectors(centpt, v2)
+    pt3 = add_vectors(centpt, v3)
+    return pt1, pt2, pt3
+
+
+def _hilbert_order(xs, ys, order=16):
+    """Sort points along a Hilbert curve through their bounding box."""
+    xmin, xmax = min(xs), max(xs)
+    ymin, ymax = min(ys), max(ys)
+    n = 1 << order
+    scale = (n - 1) / (max(xmax - xmin, ymax - ymin) or 1.0)
+    keys = []
+    for x, y in zip(xs, ys):
+        x = int((x - xmin) * scale)
+        y = int((y - ymin) * scale)
+        d = 0
+        s = n >> 1
+        while s:
+            rx = 1 if x & s else 0
+            ry = 1 if y & s else 0
+            d += s * s * ((3 * rx) ^ ry)
+            if not ry:
+                if rx:
+                    x = s - 1 - x
+                    y = s - 1 - y
+                x, y = y, x
+            s >>= 1
+        keys.append(d)
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def _bowyer_watson(xs, ys, order):
+    """Incremental Delaunay triangulation of the points ``0 .. n - 1``
+    inside the super triangle formed by the points ``n, n + 1, n + 2``.
+
+    The triangles are stored in flat lists.
+    ``tv[3 * t + i]`` is vertex ``i`` of triangle ``t`` (counterclockwise),
+    and ``tn[3 * t + i]`` is the triangle on the other side of the edge opposite that vertex,
+    or ``-1``, if there is none.
+    """
+    n = len(xs) - 3
+    tv = [n, n + 2, n + 1]
+    tn = [-1, -1, -1]
+    last = 0
+
+    def orient(a, b, x, y):
+        return (xs[b] - xs[a]) * (y - ys[a]) - (ys[b] - ys[a]) * (x - xs[a])
+
+    def incircle(t, x, y):
+        a, b, c = tv[3 * t:3 * t + 3]
+        adx = xs[a] - x
+        ady = ys[a] - y
+        bdx = xs[b] - x
+        bdy = ys[b] - y
+        cdx = xs[c] - x
+        cdy = ys[c] - y
+        ad = adx * adx + ady * ady
+        bd = bdx * bdx + bdy * bdy
+        cd = cdx * cdx + cdy * cdy
+        return (adx * (bdy * cd - bd * cdy) - ady * (bdx * cd - bd * cdx) + ad * (bdx * cdy - bdy * cdx)) > 0
+
+    for step, p in enumerate(order):
+        x = xs[p]
+        y = ys[p]
+
+        # point location
+        # walk from the last created triangle towards the point,
+        # starting the edge tests at a different edge in every step to avoid cycles
+        t = last
+        start = step % 3
+        while True:
+            for k in range(3):
+                i = (start + k) % 3
+                a = tv[3 * t + (i + 1) % 3]
+                b = tv[3 * t + (i + 2) % 3]
+                if orient(a, b, x, y) < 0:
+                    nbr = tn[3 * t + i]
+                    if nbr != -1:
+                        t = nbr
+                        break
+            else:
+                break
+            start = (start + 1) % 3
+
+        # cavity
+        # the triangles with the point in their circumcircle, connected to the containing triangle
+        cavity = set([t])
+        tovisit = [t]
+        while True:
+            while tovisit:
+                t = tovisit.pop()
+                for i in range(3):
+                    nbr = tn[3 * t + i]
+                    if nbr != -1 and nbr not in cavity and incircle(nbr, x, y):
+                        cavity.add(nbr)
+                        tovisit.append(nbr)
+            boundary = []
+            for t in cavity:
+                for i in range(3):
+                    nbr = tn[3 * t + i]
+                    if nbr in cavity:
+                        continue
+                    a = tv[3 * t + (i + 1) % 3]
+                    b = tv[3 * t + (i + 2) % 3]
+                    # the cavity has to be star-shaped with respect to the point
+                    # which can be violated by round-off errors
+                    if nbr != -1 and orient(a, b, x, y) <= 0:
+                        cavity.add(nbr)
+                        tovisit.append(nbr)
+                    boundary.append((a, b, nbr))
+            if not tovisit:
+                break
+
+        # retriangulation
+        # the new triangles reuse the slots of the triangles of the cavity
+        slots = list(cavity)
+        while len(slots) < len(boundary):
+            slots.append(len(tv) // 3)
+            tv.extend((-1, -1, -1))
+            tn.extend((-1, -1, -1))
+        by_start = {}
+        by_end = {}
+        for t, (a, b, nbr) in zip(slots, boundary):
+            by_start[a] = t
+            by_end[b] = t
+        for t, (a, b, nbr) in zip(slots, boundary):
+            tv[3 * t:3 * t + 3] = a, b, p
+            tn[3 * t:3 * t + 3] = by_start[b], by_end[a], nbr
+            if nbr != -1:
+                for j in range(3):
+                    if tv[3 * nbr + j] != a and tv[3 * nbr + j] != b:
+                        tn[3 * nbr + j] = t
+                        break
+        last = slots[0]
+
+    return tv
+
+
+def _points_in_polygon_xy(points, polygon):
+    """Determine for a set of points if they are in the interior of a polygon in the XY plane.
+
+    This gives the same results as ``is_point_in_polygon_xy``,
+    but the polygon edges are first sorted into horizontal strips,
+    such that every point is only tested against the edges of its strip.
+    """
+    polygon = [(p[0], p[1]) for p in polygon]
+    ys = [y for x, y in polygon]
+    ymin, ymax = min(ys), max(ys)
+    count = len(polygon)
+    height = (ymax - ymin) / count or 1.0
+    strips = [[] for _ in range(count)]
+    for i in range(-1, count - 1):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[i + 1]
+        lo = min(int((min(y1, y2) - ymin) / height), count - 1)
+        hi = min(int((max(y1, y2) - ymin) / height), count - 1)
+        for strip in range(lo, hi + 1):
+            strips[strip].append((x1, y1, x2, y2))
+    result = []
+    for point in points:
+        x, y = point[0], point[1]
+        inside = False
+        if ymin <= y <= ymax:
+            for x1, y1, x2, y2 in strips[min(int((y - ymin) / height), count - 1)]:
+                if y > min(y1, y2):
+                    if y <= max(y1, y2):
+                        if x <= max(x1, x2):
+                            if y1 != y2:
+                                xinters = (y - y1) * (x2 - x1) / (y2 - y1) + x1
+                            if x1 == x2 or x <= xinters:
+                                inside = not inside
+        result.append(inside)
+    return result
+
+
 def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
     """Computes the delaunay triangulation for a list of points.
 
@@ -40,12 +219,20 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
 
     Notes
     -----
-    For more info, see [1]_.
+    The triangulation is constructed with the incremental algorithm of Bowyer and Watson [1]_ [2]_.
+    The points are inserted in the order of a Hilbert curve through their bounding box,
+    and the triangle containing the next point is found by walking from the last inserted triangle.
+    The triangles are stored in flat lists of vertex and neighbor indices,
+    which makes it possible to triangulate large point sets without NumPy.
+
+    Faces with their centroid outside of the boundary or inside one of the holes are removed.
 
     References
     ----------
-    .. [1] Sloan, S. W., 1987 *A fast algorithm for constructing Delaunay triangulations in the plane*
-           Advances in Engineering Software 9(1): 34-55, 1978.
+    .. [1] Bowyer, A., 1981 *Computing Dirichlet tessellations*.
+           The Computer Journal 24(2): 162-166.
+    .. [2] Watson, D. F., 1981 *Computing the n-dimensional Delaunay tessellation with application to Voronoi polytopes*.
+           The Computer Journal 24(2): 167-172.
 
     Example
     -------
@@ -68,115 +255,51 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
         plotter.show()
 
     """
-    from compas.datastructures import Mesh
-    from compas.datastructures import trimesh_swap_edge
-
-    def super_triangle(coords):
-        centpt = centroid_points(coords)
-        bbpts = bounding_box(coords)
-        dis = distance_point_point(bbpts[0], bbpts[2])
-        dis = dis * 300
-        v1 = (0 * dis, 2 * dis, 0)
-        v2 = (1.73205 * dis, -1.0000000000001 * dis, 0)  # due to numerical issues
-        v3 = (-1.73205 * dis, -1 * dis, 0)
-        pt1 = add_vectors(centpt, v1)
-        pt2 = add_vectors(centpt, v2)
-        pt3 = add_vectors(centpt, v3)
-        return pt1, pt2, pt3
-
-    mesh = Mesh()
+    if not points:
+        return []
 
     # to avoid numerical issues for perfectly structured point sets
     points = [(point[0] + random.uniform(-tiny, tiny), point[1] + random.uniform(-tiny, tiny), 0.0) for point in points]
 
-    # create super triangle
-    pt1, pt2, pt3 = super_triangle(points)
-
-    # add super triangle vertices to mesh
     n = len(points)
-    super_keys = n, n + 1, n + 2
-
-    mesh.add_vertex(super_keys[0], {'x': pt1[0], 'y': pt1[1], 'z': pt1[2]})
-    mesh.add_vertex(super_keys[1], {'x': pt2[0], 'y': pt2[1], 'z': pt2[2]})
-    mesh.add_vertex(super_keys[2], {'x': pt3[0], 'y': pt3[1], 'z': pt3[2]})
-
-    mesh.add_face(super_keys)
-
-    # iterate over points
-    for i, pt in enumerate(points):
-        key = i
-
-        # newtris should be intialised here
-
-        # check in which triangle this point falls
-        for fkey in list(mesh.faces()):
-            # abc = mesh.face_coordinates(fkey) #This is slower
-            # This is faster:
-            keya, keyb, keyc = mesh.face_vertices(fkey)
-
-            dicta = mesh.vertex[keya]
-            dictb = mesh.vertex[keyb]
-            dictc = mesh.vertex[keyc]
-
-            a = [dicta['x'], dicta['y']]
-            b = [dictb['x'], dictb['y']]
-            c = [dictc['x'], dictc['y']]
-
-            if is_point_in_triangle_xy(pt, [a, b, c], True):
-                # generate 3 new triangles (faces) and delete surrounding triangle
-                key, newtris = mesh.insert_vertex(fkey, key=key, xyz=pt, return_fkeys=True)
-                break
-
-        while newtris:
-            fkey = newtris.pop()
-
-            # get opposite_face
-            keys = mesh.face_vertices(fkey)
-            s = list(set(keys) - set([key]))
-            u, v = s[0], s[1]
-            fkey1 = mesh.halfedge[u][v]
-
-            if fkey1 != fkey:
-                fkey_op, u, v = fkey1, u, v
-            else:
-                fkey_op, u, v = mesh.halfedge[v][u], u, v
-
-            if fkey_op:
-                keya, keyb, keyc = mesh.face_vertices(fkey_op)
-                dicta = mesh.vertex[keya]
-                a = [dicta['x'], dicta['y']]
-                dictb = mesh.vertex[keyb]
-                b = [dictb['x'], dictb['y']]
-                dictc = mesh.vertex[keyc]
-                c = [dictc['x'], dictc['y']]
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    order = _hilbert_order(xs, ys)
 
-                circle = circle_from_points_xy(a, b, c)
+    for x, y, z in _super_triangle(points):
+        xs.append(x)
+        ys.append(y)
 
-                if is_point_in_circle_xy(pt, circle):
-                    fkey, fkey_op = trimesh_swap_edge(mesh, u, v)
-                    newtris.append(fkey)
-                    newtris.append(fkey_op)
+    tv = _bowyer_watson(xs, ys, order)
 
     # Delete faces adjacent to supertriangle
-    for key in super_keys:
-        mesh.delete_vertex(key)
-
-    # Delete faces outside of boundary
-    if boundary:
-        for fkey in list(mesh.faces()):
-            centroid = mesh.face_centroid(fkey)
-            if not is_point_in_polygon_xy(centroid, boundary):
-                mesh.delete_face(fkey)
-
-    # Delete faces inside of inside boundaries
-    if holes:
-        for polygon in holes:
-            for fkey in list(mesh.faces()):
-                centroid = mesh.face_centroid(fkey)
-                if is_point_in_polygon_xy(centroid, polygon):
-                    mesh.delete_face(fkey)
-
-    return [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+    # and return the faces with the same (clockwise) orientation as the super triangle
+    faces = []
+    for t in range(0, len(tv), 3):
+        a, b, c = tv[t:t + 3]
+        if a < n and b < n and c < n:
+            faces.append([a, c, b])
+
+    if boundary or holes:
+        centroids = [centroid_points([points[a], points[b], points[c]]) for a, b, c in faces]
+        keep = [True] * len(faces)
+
+        # Delete faces outside of boundary
+        if boundary:
+            for i, inside in enumerate(_points_in_polygon_xy(centroids, boundary)):
+                if not inside:
+                    keep[i] = False
+
+        # Delete faces inside of inside boundaries
+        if holes:
+            for polygon in holes:
+                for i, inside in enumerate(_points_in_polygon_xy(centroids, polygon)):
+                    if inside:
+                        keep[i] = False
+
+        faces = [face for face, k in zip(faces, keep) if k]
+
+    return faces
 
 
 # def voronoi_from_delaunay(delaunay):
@@ -21,6 +21,12 @@ Solvers
     pca_numpy
     topop_numpy
 
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    FitnessCache
+
 
 Linalg
 ======
@@ -3,6 +3,7 @@ from __future__ import division
 from __future__ import print_function
 
 
+from .fitness import *  # noqa: F401 F403
 from .ga import *  # noqa: F401 F403
 from .moga import *  # noqa: F401 F403
 
@@ -0,0 +1,193 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+
+from collections import OrderedDict
+
+
+__all__ = ['FitnessCache']
+
+
+class FitnessCache(object):
+    """A bounded cache of fitness values, keyed by chromosome.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of cached fitness values.
+        If the cache is full, the least recently used value is discarded.
+        Default is ``None``, in which case the size of the cache is not bounded.
+
+    Examples
+    --------
+    >>> cache = FitnessCache(maxsize=2)
+    >>> cache['0110'] = 1.0
+    >>> cache['1010'] = 2.0
+    >>> cache['0110']
+    1.0
+    >>> cache['1111'] = 3.0
+    >>> '1010' in cache
+    False
+    >>> len(cache)
+    2
+
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __getitem__(self, key):
+        value = self._data.pop(key)
+        self._data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            del self._data[key]
+        self._data[key] = value
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        if key in self._data:
+            return self[key]
+        return default
+
+    def clear(self):
+        self._data.clear()
+
+    def save(self, path):
+        """Save the cached fitness values to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+        """
+        with open(path, 'w') as fh:
+            json.dump(list(self._data.items()), fh)
+
+    def load(self, path):
+        """Add the fitness values of a JSON file to the cache.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+            If the file does not exist, the cache is not modified.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as fh:
+            items = json.load(fh)
+        for key, value in items:
+            self[key] = value
+
+
+# ==============================================================================
+# Evaluation
+# ==============================================================================
+
+
+class _Evaluation(object):
+    """Picklable evaluation of one or more fitness functions for one individual."""
+
+    def __init__(self, fit_functions, fargs, fkwargs):
+        self.fit_functions = fit_functions
+        self.fargs = fargs
+        self.fkwargs = fkwargs
+
+    def __call__(self, variables):
+        return [fit_function(variables, *self.fargs, **self.fkwargs) for fit_function in self.fit_functions]
+
+
+def fitness_executor(executor=None, num_workers=None):
+    """Construct the map function and the shutdown function of an evaluation executor.
+
+    Parameters
+    ----------
+    executor : {None, 'thread', 'process'} or object or callable, optional
+        ``None`` evaluates the individuals one after the other,
+        ``'thread'`` and ``'process'`` evaluate them in a pool of threads or processes.
+        An object with a ``map`` method, such as an executor of :mod:`concurrent.futures`
+        or a :class:`multiprocessing.pool.Pool`, or a callable with the signature of
+        the built-in ``map`` are used as is.
+    num_workers : int, optional
+        The number of workers of a thread or process pool.
+        Default is the default of the pool.
+
+    Returns
+    -------
+    tuple
+        The map function and the function that shuts down a pool created here.
+    """
+    if executor is None:
+        return (lambda func, items: list(map(func, items))), (lambda: None)
+    if executor in ('thread', 'process'):
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import ProcessPoolExecutor
+        cls = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        pool = cls(max_workers=num_workers)
+        return pool.map, (lambda: pool.shutdown(wait=True))
+    if hasattr(executor, 'map'):
+        return executor.map, (lambda: None)
+    if callable(executor):
+        return executor, (lambda: None)
+    raise ValueError('The executor should be None, "thread", "process", an object with a map method, or a map function.')
+
+
+def evaluate_fitness_batch(mapper, cache, fit_functions, fargs, fkwargs, chromosomes, variables):
+    """Evaluate the fitness of a batch of individuals, using and updating a cache.
+
+    Identical chromosomes are looked up in the cache and evaluated only once,
+    and all chromosomes that are not in the cache are evaluated with one call to ``mapper``.
+
+    Returns
+    -------
+    tuple
+        The list of fitness values per individual, with one value per fitness function,
+        the number of evaluated individuals,
+        and the number of individuals whose values were found in the cache.
+        Repeated chromosomes of the batch are not counted as evaluated nor as found in the cache.
+    """
+    known = {}
+    todo = OrderedDict()
+    num_cached = 0
+    for chromosome, x in zip(chromosomes, variables):
+        if chromosome in known or chromosome in todo:
+            continue
+        if chromosome in cache:
+            known[chromosome] = cache[chromosome]
+            num_cached += 1
+        else:
+            todo[chromosome] = x
+    if todo:
+        evaluation = _Evaluation(fit_functions, fargs, fkwargs)
+        for chromosome, values in zip(todo, mapper(evaluation, list(todo.values()))):
+            known[chromosome] = values
+            cache[chromosome] = values
+    return [known[chromosome] for chromosome in chromosomes], len(todo), num_cached
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -6,6 +6,11 @@ import re
 import random
 import json
 import copy
+import time
+
+from compas.numerical.ga.fitness import FitnessCache
+from compas.numerical.ga.fitness import evaluate_fitness_batch
+from compas.numerical.ga.fitness import fitness_executor
 
 
 __all__ = ['ga']
@@ -43,7 +48,10 @@ def ga(fit_function,
        fkwargs=None,
        output_path=None,
        input_path=None,
-       print_refresh=1):
+       print_refresh=1,
+       executor=None,
+       num_workers=None,
+       cache_size=None):
     """Genetic Algorithm optimisation.
 
     Parameters
@@ -98,6 +106,19 @@ def ga(fit_function,
         Path to the fitness function file.
     print_refresh : int
         Print current generation summary every ``print_refresh`` generations.
+    executor : {None, 'thread', 'process'} or object or callable, optional
+        The executor used to evaluate the individuals of a generation.
+        ``None`` evaluates them one after the other,
+        ``'thread'`` and ``'process'`` evaluate them in a pool of threads or processes.
+        An object with a ``map`` method, such as an executor of :mod:`concurrent.futures`
+        or a :class:`multiprocessing.pool.Pool`, or a callable with the signature of
+        the built-in ``map`` can also be provided.
+        With ``'process'``, the fitness function and its arguments must be picklable.
+    num_workers : int, optional
+        The number of workers of a ``'thread'`` or ``'process'`` pool.
+    cache_size : int, optional
+        The maximum number of fitness values kept in the cache of evaluated individuals.
+        Default is ``None``, in which case the size of the cache is not bounded.
 
     Returns
     -------
@@ -108,6 +129,11 @@ def ga(fit_function,
     -----
     For more info, see [1]_.
 
+    All individuals of a generation are evaluated in one batch,
+    in which every chromosome that is not yet in the cache is evaluated once.
+    The cache is saved to the output path after every generation,
+    and is loaded again from the input path when restarting with ``start_from_gen``.
+
     References
     ----------
     .. [1] Holland, J. H., *Adaptation in Natural and Artificial Systems*, 1st edn,
@@ -141,6 +167,9 @@ def ga(fit_function,
     ga_.output_path = output_path or ''
     ga_.input_path = input_path or ''
     ga_.print_refresh = print_refresh
+    ga_.executor = executor
+    ga_.num_workers = num_workers
+    ga_.ind_fit_dict = FitnessCache(cache_size)
     ga_.ga_optimize()
     return ga_
 
@@ -216,9 +245,16 @@ class GA(object):
     total_bin_dig : int
         The total number of binary digits. It is the sum of the ``GA.num_bin_dig`` of
         all variables.
-    ind_fit_dict : dict
-        This dictionary keeps track of already evaluated solutions to avoid dupplicate
+    ind_fit_dict : :class:`compas.numerical.FitnessCache`
+        This cache keeps track of already evaluated solutions to avoid dupplicate
         fitness function calls.
+    executor : {None, 'thread', 'process'} or object or callable
+        The executor used to evaluate the individuals of a generation.
+    num_workers : int
+        The number of workers of a ``'thread'`` or ``'process'`` pool.
+    timing : list of dict
+        The statistics of every generation, with the number of evaluated and cached individuals,
+        the time spent on the evaluation of the fitness function, and the total time.
 
     """
 
@@ -254,8 +290,11 @@ class GA(object):
         self.start_from_gen = False
         self.total_bin_dig = 0
         self.check_diversity = False
-        self.ind_fit_dict = {}
+        self.ind_fit_dict = FitnessCache()
         self.print_refresh = 1
+        self.executor = None
+        self.num_workers = None
+        self.timing = []
 
     def __str__(self):
         """Compile a summary of the GA."""
@@ -287,61 +326,106 @@ class GA(object):
 
         if self.start_from_gen:
             self.current_pop = self.get_pop_from_pop_file(self.start_from_gen)
+            self.ind_fit_dict.load(self.input_path + self.fit_name + '_fitness_cache.json')
             start_gen_number = self.start_from_gen + 1
         else:
             self.current_pop['binary'] = self.generate_random_bin_pop()
             start_gen_number = 0
 
-        for generation in range(start_gen_number, self.num_gen):
+        mapper, shutdown = fitness_executor(self.executor, self.num_workers)
+        try:
+            for generation in range(start_gen_number, self.num_gen):
+                t0 = time.time()
 
-            self.current_pop['decoded'] = self.decode_binary_pop(self.current_pop['binary'])
-            self.current_pop['scaled'] = self.scale_population(self.current_pop['decoded'])
+                self.current_pop['decoded'] = self.decode_binary_pop(self.current_pop['binary'])
+                self.current_pop['scaled'] = self.scale_population(self.current_pop['decoded'])
 
-            if generation == 0:
-                num = self.num_pop
-                self.current_pop['fit_value'] = [[]] * num
-            else:
-                num = self.num_pop - self.num_elite
+                if generation == 0:
+                    num = self.num_pop
+                    self.current_pop['fit_value'] = [[]] * num
+                else:
+                    num = self.num_pop - self.num_elite
 
-            for i in range(num):
-                self.current_pop['fit_value'][i] = self.evaluate_fitness(i)
+                t1 = time.time()
+                num_evaluated, num_cached = self.evaluate_population(num, mapper)
+                t2 = time.time()
+                self.ind_fit_dict.save(self.output_path + self.fit_name + '_fitness_cache.json')
 
-            if self.num_pop_init and generation >= self.num_gen_init_pop:
-                self.num_pop = self.num_pop_temp
-                self.current_pop = self.select_elite_pop(self.current_pop, num_elite=self.num_pop)
-            self.write_out_file(generation)
+                if self.num_pop_init and generation >= self.num_gen_init_pop:
+                    self.num_pop = self.num_pop_temp
+                    self.current_pop = self.select_elite_pop(self.current_pop, num_elite=self.num_pop)
+                self.write_out_file(generation)
 
-            if self.min_fit:
-                self.update_min_fit_flag()
-            else:
-                self.get_best_fit()
-            if generation % self.print_refresh == 0:
-                print('generation ', generation, ' best fit ', self.best_fit, 'min fit', self.min_fit)
-
-            if self.check_diversity:
-                print('num repeated individuals', self.check_pop_diversity())
-            if generation < self.num_gen - 1 and self.min_fit_flag is False:
-                self.elite_pop = self.select_elite_pop(self.current_pop)
-                self.tournament_selection()  # n-e
-                self.create_mating_pool()  # n-e
-                self.npoint_crossover()  # n-e
-                self.random_mutation()  # n-e
-                self.add_elite_to_current()  # n
+                if self.min_fit:
+                    self.update_min_fit_flag()
+                else:
+                    self.get_best_fit()
+                if generation % self.print_refresh == 0:
+                    print('generation ', generation, ' best fit ', self.best_fit, 'min fit', self.min_fit)
+
+                if self.check_diversity:
+                    print('num repeated individuals', self.check_pop_diversity())
+                if generation < self.num_gen - 1 and self.min_fit_flag is False:
+                    self.elite_pop = self.select_elite_pop(self.current_pop)
+                    self.tournament_selection()  # n-e
+                    self.create_mating_pool()  # n-e
+                    self.npoint_crossover()  # n-e
+                    self.random_mutation()  # n-e
+                    self.add_elite_to_current()  # n
+                    self.timing.append(self.make_timing_data(generation, num, num_evaluated, num_cached, t0, t1, t2))
 
-            else:
-                self.end_gen = generation
-                self.get_best_individual_index()
-                self.write_ga_json_file()
-                print(self)
-                break
+                else:
+                    self.timing.append(self.make_timing_data(generation, num, num_evaluated, num_cached, t0, t1, t2))
+                    self.end_gen = generation
+                    self.get_best_individual_index()
+                    self.write_ga_json_file()
+                    print(self)
+                    break
+        finally:
+            shutdown()
+
+    def chromosome(self, index):
+        """Returns the chromosome of an individual of the current population as a string of genes."""
+        return ''.join(str(y) for x in self.current_pop['binary'][index] for y in x)
+
+    def evaluate_population(self, num, mapper=map):
+        """Evaluates the fitness of the first ``num`` individuals of the current population
+        in one batch, and stores the values in the current population dictionary.
+
+        Parameters
+        ----------
+        num : int
+            The number of individuals to evaluate.
+        mapper : callable, optional
+            The map function used to evaluate the individuals that are not in the cache.
+
+        Returns
+        -------
+        tuple
+            The number of individuals for which the fitness function was evaluated,
+            and the number of individuals whose fitness value was found in the cache.
+        """
+        chromosomes = [self.chromosome(i) for i in range(num)]
+        variables = self.current_pop['scaled'][:num]
+        values, num_evaluated, num_cached = evaluate_fitness_batch(mapper, self.ind_fit_dict, [self.fit_function], self.fargs, self.fkwargs, chromosomes, variables)
+        for i in range(num):
+            self.current_pop['fit_value'][i] = values[i][0]
+        return num_evaluated, num_cached
+
+    def make_timing_data(self, generation, num, num_evaluated, num_cached, t0, t1, t2):
+        """Returns a dictionary with the statistics of a generation."""
+        return {'generation': generation,
+                'num_individuals': num,
+                'num_evaluated': num_evaluated,
+                'num_cached': num_cached,
+                'evaluation_time': t2 - t1,
+                'generation_time': time.time() - t0}
 
     def evaluate_fitness(self, index):
-        chromo = ''.join(str(y) for x in self.current_pop['binary'][index] for y in x)
-        fit = self.ind_fit_dict.setdefault(chromo, None)
-        if not fit:
-            fit = self.fit_function(self.current_pop['scaled'][index], *self.fargs, **self.fkwargs)
-            self.ind_fit_dict[chromo] = fit
-        return fit
+        chromo = self.chromosome(index)
+        if chromo not in self.ind_fit_dict:
+            self.ind_fit_dict[chromo] = [self.fit_function(self.current_pop['scaled'][index], *self.fargs, **self.fkwargs)]
+        return self.ind_fit_dict[chromo][0]
 
     def check_pop_diversity(self):
         seen = []
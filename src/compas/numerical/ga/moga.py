@@ -5,6 +5,11 @@ from __future__ import print_function
 import re
 import random
 import json
+import time
+
+from compas.numerical.ga.fitness import FitnessCache
+from compas.numerical.ga.fitness import evaluate_fitness_batch
+from compas.numerical.ga.fitness import fitness_executor
 
 
 __all__ = ['moga']
@@ -45,7 +50,10 @@ def moga(fit_functions,
          fit_names=None,
          fargs=None,
          fkwargs=None,
-         output_path=None):
+         output_path=None,
+         executor=None,
+         num_workers=None,
+         cache_size=None):
     """Multi-objective Genetic Algorithm optimisation.
 
     Parameters
@@ -85,6 +93,19 @@ def moga(fit_functions,
         Keyword arguments to be fed to the fitness function.
     output_path : str, optional [None]
         Path for the optimization result files.
+    executor : {None, 'thread', 'process'} or object or callable, optional
+        The executor used to evaluate the individuals of a generation.
+        ``None`` evaluates them one after the other,
+        ``'thread'`` and ``'process'`` evaluate them in a pool of threads or processes.
+        An object with a ``map`` method, such as an executor of :mod:`concurrent.futures`
+        or a :class:`multiprocessing.pool.Pool`, or a callable with the signature of
+        the built-in ``map`` can also be provided.
+        With ``'process'``, the fitness functions and their arguments must be picklable.
+    num_workers : int, optional
+        The number of workers of a ``'thread'`` or ``'process'`` pool.
+    cache_size : int, optional
+        The maximum number of fitness values kept in the cache of evaluated individuals.
+        Default is ``None``, in which case the size of the cache is not bounded.
 
     Returns
     -------
@@ -95,6 +116,11 @@ def moga(fit_functions,
     -----
     For more info, see [1]_.
 
+    All fitness functions of all individuals of a generation are evaluated in one batch,
+    in which every chromosome that is not yet in the cache is evaluated once.
+    The cache is saved to the output path after every generation,
+    and is loaded again when restarting with ``start_from_gen``.
+
     References
     ----------
     .. [1] Deb K., *Multi-Objective Optimization using Evolutionary Algorithms*,
@@ -185,6 +211,9 @@ def moga(fit_functions,
     moga.fit_functions = fit_functions
     moga.output_path = output_path or ''
     moga.num_fit_func = len(fit_functions)
+    moga.executor = executor
+    moga.num_workers = num_workers
+    moga.ind_fit_dict = FitnessCache(cache_size)
     moga.moga_optimize()
     return moga
 
@@ -255,9 +284,16 @@ class MOGA(object):
         Arguments fo be fed to the fitness function.
     fkwargs : dict, optional [None]
         Keyword arguments to be fed to the fitness function.
-    ind_fit_dict : dict
-        This dictionary keeps track of already evaluated solutions to avoid dupplicate
+    ind_fit_dict : :class:`compas.numerical.FitnessCache`
+        This cache keeps track of already evaluated solutions to avoid dupplicate
         fitness function calls.
+    executor : {None, 'thread', 'process'} or object or callable
+        The executor used to evaluate the individuals of a generation.
+    num_workers : int
+        The number of workers of a ``'thread'`` or ``'process'`` pool.
+    timing : list of dict
+        The statistics of every generation, with the number of evaluated and cached individuals,
+        the time spent on the evaluation of the fitness functions, and the total time.
     """
 
     def __init__(self):
@@ -293,7 +329,10 @@ class MOGA(object):
         self.fixed_start_pop = None
         self.fargs = {}
         self.fkwargs = {}
-        self.ind_fit_dict = {}
+        self.ind_fit_dict = FitnessCache()
+        self.executor = None
+        self.num_workers = None
+        self.timing = []
 
     def __str__(self):
         """Compile a summary of the MOGA."""
@@ -320,65 +359,106 @@ class MOGA(object):
         GA optimization, performing all genetic operators.
         """
         self.write_moga_json_file()
-        if self.start_from_gen:
-            self.parent_pop = self.get_pop_from_pf_file()
-            start_gen_number = self.start_from_gen + 1
-        else:
-            start_gen_number = 0
-            self.parent_pop['binary'] = self.generate_random_bin_pop()
-            self.parent_pop['decoded'] = self.decode_binary_pop(self.parent_pop['binary'])
-            self.parent_pop['scaled'] = self.scale_population(self.parent_pop['decoded'])
-
-            if self.fixed_start_pop:
-                for i in range(self.fixed_start_pop['num_pop']):
-                    self.parent_pop['binary'][i] = self.fixed_start_pop['binary'][i]
-                    self.parent_pop['decoded'][i] = self.fixed_start_pop['decoded'][i]
-                    self.parent_pop['scaled'][i] = self.fixed_start_pop['scaled'][i]
-            self.parent_pop['fit_values'] = [[[]] * self.num_fit_func for i in range(self.num_pop)]
-            for i in range(self.num_pop):
-                for j in range(self.num_fit_func):
-                    fit_func = self.fit_functions[j]
-                    self.parent_pop['fit_values'][i][j] = fit_func(self.parent_pop['scaled'][i], **self.fkwargs)
-
-        self.current_pop['binary'] = self.generate_random_bin_pop()
-
-        for generation in range(start_gen_number, self.num_gen):
-            print('generation ', generation)
-
-            self.current_pop['decoded'] = self.decode_binary_pop(self.current_pop['binary'])
-            self.current_pop['scaled'] = self.scale_population(self.current_pop['decoded'])
-            self.current_pop['fit_values'] = [[[]] * self.num_fit_func for i in range(self.num_pop)]
-            for i in range(self.num_pop):
-                for j in range(self.num_fit_func):
-                    fit_func = self.fit_functions[j]
-                    self.current_pop['fit_values'][i][j] = fit_func(self.current_pop['scaled'][i], **self.fkwargs)
-
-            self.combine_populations()
-            self.non_dom_sort()
-
-            for u in range(len(self.pareto_front_indices) - 1):
-                self.extract_pareto_front(u)
-                self.calculate_crowding_distance()
+        mapper, shutdown = fitness_executor(self.executor, self.num_workers)
+        try:
+            if self.start_from_gen:
+                self.parent_pop = self.get_pop_from_pf_file()
+                self.ind_fit_dict.load(self.cache_filename())
+                start_gen_number = self.start_from_gen + 1
+            else:
+                start_gen_number = 0
+                self.parent_pop['binary'] = self.generate_random_bin_pop()
+                self.parent_pop['decoded'] = self.decode_binary_pop(self.parent_pop['binary'])
+                self.parent_pop['scaled'] = self.scale_population(self.parent_pop['decoded'])
+
+                if self.fixed_start_pop:
+                    for i in range(self.fixed_start_pop['num_pop']):
+                        self.parent_pop['binary'][i] = self.fixed_start_pop['binary'][i]
+                        self.parent_pop['decoded'][i] = self.fixed_start_pop['decoded'][i]
+                        self.parent_pop['scaled'][i] = self.fixed_start_pop['scaled'][i]
+                self.evaluate_population(self.parent_pop, mapper)
+
+            self.current_pop['binary'] = self.generate_random_bin_pop()
+
+            for generation in range(start_gen_number, self.num_gen):
+                print('generation ', generation)
+                t0 = time.time()
+
+                self.current_pop['decoded'] = self.decode_binary_pop(self.current_pop['binary'])
+                self.current_pop['scaled'] = self.scale_population(self.current_pop['decoded'])
+
+                t1 = time.time()
+                num_evaluated, num_cached = self.evaluate_population(self.current_pop, mapper)
+                t2 = time.time()
+                self.ind_fit_dict.save(self.cache_filename())
+
+                self.combine_populations()
+                self.non_dom_sort()
+
+                for u in range(len(self.pareto_front_indices) - 1):
+                    self.extract_pareto_front(u)
+                    self.calculate_crowding_distance()
+
+                self.crowding_distance_sorting()
+                self.parent_reseting()
+                self.write_out_file(generation)
+
+                if generation < self.num_gen - 1:
+                    self.nsga_tournament()
+                    self.create_mating_pool()
+                    self.simple_crossover()
+                    self.random_mutation()
+                else:
+                    print(self)
+
+                self.timing.append({'generation': generation,
+                                    'num_individuals': self.num_pop,
+                                    'num_evaluated': num_evaluated,
+                                    'num_cached': num_cached,
+                                    'evaluation_time': t2 - t1,
+                                    'generation_time': time.time() - t0})
+        finally:
+            shutdown()
+
+    def chromosome(self, pop, index):
+        """Returns the chromosome of an individual of a population as a string of genes."""
+        binary = pop['binary'][index]
+        if isinstance(binary, dict):
+            binary = [binary[j] for j in range(self.num_var)]
+        return ''.join(str(y) for x in binary for y in x)
+
+    def cache_filename(self):
+        """Returns the path of the file of the cache of fitness values."""
+        return self.output_path + '-'.join(self.fit_names) + '_fitness_cache.json'
+
+    def evaluate_population(self, pop, mapper=map):
+        """Evaluates all fitness functions for all individuals of a population in one batch,
+        and stores the values in the population dictionary.
 
-            self.crowding_distance_sorting()
-            self.parent_reseting()
-            self.write_out_file(generation)
+        Parameters
+        ----------
+        pop : dict
+            The population dictionary.
+        mapper : callable, optional
+            The map function used to evaluate the individuals that are not in the cache.
 
-            if generation < self.num_gen - 1:
-                self.nsga_tournament()
-                self.create_mating_pool()
-                self.simple_crossover()
-                self.random_mutation()
-            else:
-                print(self)
+        Returns
+        -------
+        tuple
+            The number of individuals for which the fitness functions were evaluated,
+            and the number of individuals whose fitness values were found in the cache.
+        """
+        chromosomes = [self.chromosome(pop, i) for i in range(self.num_pop)]
+        variables = [pop['scaled'][i] for i in range(self.num_pop)]
+        values, num_evaluated, num_cached = evaluate_fitness_batch(mapper, self.ind_fit_dict, self.fit_functions, self.fargs, self.fkwargs, chromosomes, variables)
+        pop['fit_values'] = [list(fit_values) for fit_values in values]
+        return num_evaluated, num_cached
 
     def evaluate_fitness(self, index, fit_func):
-        chromo = ''.join(str(y) for x in self.current_pop['binary'][index] for y in x)
-        fit = self.ind_fit_dict.setdefault(chromo, None)
-        if not fit:
-            fit = fit_func(self.current_pop['scaled'][index], *self.fargs, **self.fkwargs)
-            self.ind_fit_dict[chromo] = fit
-        return fit
+        chromo = self.chromosome(self.current_pop, index)
+        if chromo not in self.ind_fit_dict:
+            self.ind_fit_dict[chromo] = [fit(self.current_pop['scaled'][index], *self.fargs, **self.fkwargs) for fit in self.fit_functions]
+        return self.ind_fit_dict[chromo][self.fit_functions.index(fit_func)]
 
     def write_out_file(self, generation):
         """This function writes a file containing all of the population data for
@@ -390,7 +470,7 @@ class MOGA(object):
             The generation to write the population data of.
         """
         filename = 'generation ' + "%03d" % generation + '_pareto_front' + ".pareto"
-        pf_file = open(self.output_path + (str(filename)), "wb")
+        pf_file = open(self.output_path + (str(filename)), "w")
         pf_file.write('Generation \n')
         pf_file.write(str(generation) + '\n')
         pf_file.write('\n')
@@ -978,7 +1058,7 @@ class MOGA(object):
         for name in self.fit_names:
             filename += name + '-'
         filename += '.json'
-        with open(self.output_path + filename, 'wb+') as fh:
+        with open(self.output_path + filename, 'w+') as fh:
             json.dump(data, fh)
 
     def write_gen_json_file(self, generation):
@@ -994,8 +1074,8 @@ class MOGA(object):
         """
         data = self.make_gen_data()
         filename = 'generation ' + "%03d" % generation + '_pareto_front' + ".json"
-        fh = open(self.output_path + filename, 'wb+')
-        json.dump(data, fh)
+        with open(self.output_path + filename, 'w+') as fh:
+            json.dump(data, fh)
 
     def create_fixed_start_pop(self, scaled=None, binary=None):
         """This function creates a population to start the MOGA from a given scaled
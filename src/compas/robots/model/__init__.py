@@ -4,6 +4,7 @@ from __future__ import print_function
 
 from .geometry import *  # noqa: F401 F403
 from .joint import *  # noqa: F401 F403
+from .kinematics import *  # noqa: F401 F403
 from .link import *  # noqa: F401 F403
 from .robot import *  # noqa: F401 F403
 
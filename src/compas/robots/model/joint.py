@@ -259,6 +259,8 @@ class Joint(object):
         self.attr = kwargs
         self.child_link = None
         self.position = 0
+        # incremented when the geometry of the joint is modified in place
+        self._version = 0
 
         switcher = {
             Joint.REVOLUTE: self.calculate_revolute_transformation,
@@ -295,6 +297,7 @@ class Joint(object):
             self.origin.transform(transformation)
         if self.axis:
             self.axis.transform(transformation)
+        self._version += 1
 
     def _create(self, transformation):
         """Internal method to initialize the transformation tree.
@@ -312,6 +315,7 @@ class Joint(object):
             self.origin.transform(transformation)
         if self.axis:
             self.axis.transform(self.current_transformation)
+        self._version += 1
 
     def calculate_revolute_transformation(self, position):
         """Returns a transformation of a revolute joint.
@@ -440,6 +444,7 @@ class Joint(object):
         self.origin.scale(factor)
         if self.is_scalable():
             self.limit.scale(factor)
+        self._version += 1
 
 
 URDFParser.install_parser(Joint, 'robot/joint')
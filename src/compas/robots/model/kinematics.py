@@ -0,0 +1,295 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from math import cos
+from math import sin
+
+from compas.robots.model.joint import Joint
+
+
+__all__ = ['KinematicChain']
+
+
+def _identity():
+    return [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def _limit(joint):
+    return (joint.limit.lower, joint.limit.upper) if joint.limit else None
+
+
+def _multiply(A, B):
+    # product of two affine 4x4 matrices
+    a0, a1, a2 = A[0], A[1], A[2]
+    b0, b1, b2 = B[0], B[1], B[2]
+    return [
+        [a0[0] * b0[j] + a0[1] * b1[j] + a0[2] * b2[j] + (a0[3] if j == 3 else 0.0) for j in range(4)],
+        [a1[0] * b0[j] + a1[1] * b1[j] + a1[2] * b2[j] + (a1[3] if j == 3 else 0.0) for j in range(4)],
+        [a2[0] * b0[j] + a2[1] * b1[j] + a2[2] * b2[j] + (a2[3] if j == 3 else 0.0) for j in range(4)],
+        [0.0, 0.0, 0.0, 1.0],
+    ]
+
+
+class KinematicChain(object):
+    """Compiled forward kinematics of the joint tree of a robot model.
+
+    Parameters
+    ----------
+    robot : :class:`compas.robots.RobotModel`
+        The robot model.
+
+    Attributes
+    ----------
+    joint_names : list of str
+        The names of the joints reachable from the root link, in depth-first order.
+    parents : list of int
+        For every joint, the index of the parent joint in ``joint_names``,
+        or ``-1`` for the joints of the root link.
+
+    Notes
+    -----
+    The joints of a robot model are stored in world coordinates for the zero configuration.
+    The transformation of a joint is the product of the motions of the joints along its chain
+    (a rotation about the joint axis, or a translation along it), with the motions of fixed joints
+    and of joints that are not in the joint state being the identity.
+    These products are evaluated over the flat list of joints in depth-first order,
+    such that the transformation of the parent joint is always available.
+
+    The transformations of the last joint state are cached, and only the joints
+    downstream of a joint with a different position are recomputed.
+
+    The chain is compiled from the current geometry of the joints.
+    It is out of date after the joints of the model are transformed or scaled (see :meth:`is_current`),
+    in which case :attr:`compas.robots.RobotModel.kinematic_chain` compiles a new chain.
+
+    Examples
+    --------
+    >>> from math import pi
+    >>> from compas.geometry import Frame
+    >>> from compas.robots import Joint
+    >>> from compas.robots import RobotModel
+    >>> robot = RobotModel('robot')
+    >>> link0 = robot.add_link('link0')
+    >>> link1 = robot.add_link('link1')
+    >>> link2 = robot.add_link('link2')
+    >>> origin = Frame([1, 0, 0], [1, 0, 0], [0, 1, 0])
+    >>> joint1 = robot.add_joint('joint1', Joint.CONTINUOUS, link0, link1, Frame.worldXY(), (0, 0, 1))
+    >>> joint2 = robot.add_joint('joint2', Joint.CONTINUOUS, link1, link2, origin, (0, 0, 1))
+    >>> chain = KinematicChain(robot)
+    >>> chain.joint_names
+    ['joint1', 'joint2']
+    >>> matrices = chain.matrices({'joint1': 0.0, 'joint2': 0.5 * pi})
+    >>> [round(row[3], 3) for row in matrices[1][:3]]
+    [1.0, -1.0, 0.0]
+    """
+
+    def __init__(self, robot):
+        self.joint_names = []
+        self.parents = []
+        self._types = []
+        self._axes = []
+        self._vectors = []
+        self._points = []
+        self._limits = []
+        self._positions = None
+        self._matrices = None
+        self._joints = []
+        self._versions = []
+
+        tovisit = [(joint, -1) for joint in reversed(robot.root.joints)] if robot.root else []
+        while tovisit:
+            joint, parent = tovisit.pop()
+            index = len(self.joint_names)
+            self.joint_names.append(joint.name)
+            self.parents.append(parent)
+            self._joints.append(joint)
+            self._versions.append(joint._version)
+            self._types.append(joint.type)
+            vector = [joint.axis.x, joint.axis.y, joint.axis.z] if joint.axis else [0.0, 0.0, 0.0]
+            length = (vector[0] ** 2 + vector[1] ** 2 + vector[2] ** 2) ** 0.5
+            self._vectors.append(vector)
+            self._axes.append([axis / length for axis in vector] if length else vector)
+            self._points.append(list(joint.origin.point) if joint.origin else [0.0, 0.0, 0.0])
+            self._limits.append(_limit(joint))
+            if joint.child_link:
+                tovisit.extend((child, index) for child in reversed(joint.child_link.joints))
+
+        self.index = {name: index for index, name in enumerate(self.joint_names)}
+
+    def __len__(self):
+        return len(self.joint_names)
+
+    def is_current(self):
+        """Verify that none of the joints of the chain was modified after the chain was compiled.
+
+        Returns
+        -------
+        bool
+            ``True`` if the chain matches the geometry and the limits of the joints, ``False`` otherwise.
+
+        Notes
+        -----
+        Modifications of the joints through :meth:`compas.robots.Joint.transform`
+        and :meth:`compas.robots.Joint.scale` are detected,
+        as well as changes of the lower and upper limits of the joints.
+        Modifications of the origin or axis of a joint in place are not.
+        """
+        for joint, version, limit in zip(self._joints, self._versions, self._limits):
+            if joint._version != version or _limit(joint) != limit:
+                return False
+        return True
+
+    def _position(self, index, position):
+        joint_type = self._types[index]
+        if joint_type in (Joint.REVOLUTE, Joint.PRISMATIC):
+            limit = self._limits[index]
+            if not limit:
+                raise ValueError('{} joints are required to define a limit'.format(Joint.SUPPORTED_TYPES[joint_type].capitalize()))
+            return max(min(position, limit[1]), limit[0])
+        if joint_type in (Joint.FLOATING, Joint.PLANAR):
+            raise NotImplementedError
+        return position
+
+    def _motion(self, index, position):
+        """The motion of a joint, or ``None`` if the motion is the identity."""
+        joint_type = self._types[index]
+        if joint_type == Joint.FIXED:
+            return None
+        position = self._position(index, position)
+        if joint_type == Joint.PRISMATIC:
+            x, y, z = self._vectors[index]
+            return [[1.0, 0.0, 0.0, x * position], [0.0, 1.0, 0.0, y * position], [0.0, 0.0, 1.0, z * position], [0.0, 0.0, 0.0, 1.0]]
+        # rotation about the axis through the origin of the joint
+        x, y, z = self._axes[index]
+        px, py, pz = self._points[index]
+        c = cos(position)
+        s = sin(position)
+        t = 1.0 - c
+        r00 = c + x * x * t
+        r01 = x * y * t - z * s
+        r02 = x * z * t + y * s
+        r10 = x * y * t + z * s
+        r11 = c + y * y * t
+        r12 = y * z * t - x * s
+        r20 = x * z * t - y * s
+        r21 = y * z * t + x * s
+        r22 = c + z * z * t
+        return [
+            [r00, r01, r02, px - (r00 * px + r01 * py + r02 * pz)],
+            [r10, r11, r12, py - (r10 * px + r11 * py + r12 * pz)],
+            [r20, r21, r22, pz - (r20 * px + r21 * py + r22 * pz)],
+            [0.0, 0.0, 0.0, 1.0],
+        ]
+
+    def matrices(self, joint_state):
+        """Compute the transformation matrices of all joints for a joint state.
+
+        Parameters
+        ----------
+        joint_state : dict
+            A dictionary with the joint names as keys and values in radians and
+            meters (depending on the joint type).
+
+        Returns
+        -------
+        list
+            The 4x4 transformation matrix of every joint, in the order of ``joint_names``.
+            The matrices are shared with the cache and should not be modified.
+        """
+        positions = [joint_state.get(name) for name in self.joint_names]
+        previous = self._positions
+        matrices = self._matrices
+        if previous is None:
+            matrices = [None] * len(positions)
+        else:
+            matrices = matrices[:]
+        dirty = [False] * len(positions)
+        for index, position in enumerate(positions):
+            parent = self.parents[index]
+            if previous is not None and position == previous[index] and (parent == -1 or not dirty[parent]):
+                continue
+            dirty[index] = True
+            transformation = _identity() if parent == -1 else matrices[parent]
+            if position is not None:
+                motion = self._motion(index, position)
+                if motion is not None:
+                    transformation = _multiply(transformation, motion)
+            matrices[index] = transformation
+        self._positions = positions
+        self._matrices = matrices
+        return matrices
+
+    def matrices_numpy(self, joint_values, joint_names):
+        """Compute the transformation matrices of all joints for a batch of joint states.
+
+        Parameters
+        ----------
+        joint_values : array-like
+            The joint positions, with one row per joint state
+            and one column for each of the joints in ``joint_names``.
+        joint_names : list of str
+            The names of the joints in the columns of ``joint_values``.
+
+        Returns
+        -------
+        array
+            The 4x4 transformation matrices, with shape ``(n, len(chain), 4, 4)``.
+        """
+        from numpy import asarray
+        from numpy import clip
+        from numpy import cos
+        from numpy import empty
+        from numpy import eye
+        from numpy import matmul
+        from numpy import newaxis
+        from numpy import sin
+        from numpy import zeros
+
+        Q = asarray(joint_values, dtype=float)
+        if Q.ndim != 2:
+            raise ValueError('The joint values should be a two-dimensional array.')
+        column = {name: i for i, name in enumerate(joint_names)}
+        n = Q.shape[0]
+        X = empty((n, len(self.joint_names), 4, 4))
+        identity = eye(4)
+
+        for index, name in enumerate(self.joint_names):
+            parent = self.parents[index]
+            P = identity if parent == -1 else X[:, parent]
+            joint_type = self._types[index]
+            if name not in column or joint_type == Joint.FIXED:
+                X[:, index] = P
+                continue
+            q = Q[:, column[name]]
+            if joint_type in (Joint.REVOLUTE, Joint.PRISMATIC):
+                limit = self._limits[index]
+                if not limit:
+                    raise ValueError('{} joints are required to define a limit'.format(Joint.SUPPORTED_TYPES[joint_type].capitalize()))
+                q = clip(q, limit[0], limit[1])
+            elif joint_type in (Joint.FLOATING, Joint.PLANAR):
+                raise NotImplementedError
+            M = zeros((n, 4, 4))
+            M[:, 3, 3] = 1.0
+            if joint_type == Joint.PRISMATIC:
+                M[:, 0, 0] = M[:, 1, 1] = M[:, 2, 2] = 1.0
+                M[:, :3, 3] = q[:, newaxis] * asarray(self._vectors[index])
+            else:
+                x, y, z = self._axes[index]
+                p = asarray(self._points[index])
+                c = cos(q)
+                s = sin(q)
+                t = 1.0 - c
+                M[:, 0, 0] = c + x * x * t
+                M[:, 0, 1] = x * y * t - z * s
+                M[:, 0, 2] = x * z * t + y * s
+                M[:, 1, 0] = x * y * t + z * s
+                M[:, 1, 1] = c + y * y * t
+                M[:, 1, 2] = y * z * t - x * s
+                M[:, 2, 0] = x * z * t - y * s
+                M[:, 2, 1] = y * z * t + x * s
+                M[:, 2, 2] = c + z * z * t
+                M[:, :3, 3] = p - matmul(M[:, :3, :3], p)
+            X[:, index] = matmul(P, M)
+
+        return X
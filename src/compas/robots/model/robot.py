@@ -6,6 +6,7 @@ import itertools
 
 from compas.files import URDF
 from compas.files import URDFParser
+from compas.geometry import Frame
 from compas.geometry import Transformation
 from compas.topology import shortest_path
 
@@ -18,6 +19,7 @@ from compas.robots.model.geometry import Origin
 from compas.robots.model.joint import Axis
 from compas.robots.model.joint import Joint
 from compas.robots.model.joint import Limit
+from compas.robots.model.kinematics import KinematicChain
 from compas.robots.model.link import Link
 from compas.robots.model.link import Visual
 from compas.robots.model.link import Collision
@@ -65,6 +67,7 @@ class RobotModel(object):
 
     def _rebuild_tree(self):
         """Store tree structure from link and joint lists."""
+        self._chain = None
         self._adjacency = dict()
         self._links = dict()
         self._joints = dict()
@@ -577,6 +580,18 @@ class RobotModel(object):
             self.scale(relative_factor, child_joint.child_link)
 
         self._scale_factor = factor
+        self._chain = None
+
+    @property
+    def kinematic_chain(self):
+        """:class:`KinematicChain` : The compiled kinematic chain of the robot.
+
+        The chain is compiled on first use, and again after the robot is scaled,
+        a joint is added, or a joint is transformed, scaled, or its limits are changed.
+        """
+        if self._chain is None or not self._chain.is_current():
+            self._chain = KinematicChain(self)
+        return self._chain
 
     def compute_transformations(self, joint_state, link=None, parent_transformation=None):
         """Recursive function to calculate the transformations of each joint.
@@ -602,7 +617,17 @@ class RobotModel(object):
         >>> values = [-2.238, -1.153, -2.174, 0.185, 0.667, 0.000]
         >>> joint_state = dict(zip(names, values))
         >>> transformations = robot.compute_transformations(joint_state)
+
+        Notes
+        -----
+        The transformations of all joints (i.e. without ``link`` and ``parent_transformation``)
+        are computed with the :attr:`kinematic_chain` of the robot.
         """
+        if link is None and parent_transformation is None:
+            chain = self.kinematic_chain
+            matrices = chain.matrices(joint_state)
+            return {name: Transformation([row[:] for row in matrix]) for name, matrix in zip(chain.joint_names, matrices)}
+
         if link is None:
             link = self.root
         if parent_transformation is None:
@@ -701,8 +726,71 @@ class RobotModel(object):
             ee_link = self.get_link_by_name(link_name)
         joint = ee_link.parent_joint
 
-        transformations = self.compute_transformations(joint_state)
-        return joint.origin.transformed(transformations[joint.name])
+        chain = self.kinematic_chain
+        matrix = chain.matrices(joint_state)[chain.index[joint.name]]
+        return _transformed_frame(joint.origin, matrix)
+
+    def forward_kinematics_batch(self, joint_values, joint_names=None, link_name=None):
+        """Calculate the robot's forward kinematic for a batch of joint states.
+
+        Parameters
+        ----------
+        joint_values : list of list of float
+            The joint positions, with one row per joint state
+            and one column for each of the joints in ``joint_names``.
+        joint_names : list of str, optional
+            The names of the joints in the columns of ``joint_values``.
+            Defaults to the names of the configurable joints.
+        link_name : str, optional
+            The name of the link we want to calculate the forward kinematics for.
+            Defaults to the end-effector link name.
+
+        Returns
+        -------
+        list of :class:`Frame`
+            The (ee) link's frame in the world coordinate system for every joint state.
+
+        Notes
+        -----
+        The transformations are computed with NumPy for all joint states at once, if available.
+        Otherwise, the joint states are evaluated one by one with the :attr:`kinematic_chain`,
+        which only recomputes the transformations of the joints downstream of
+        the joints that changed with respect to the previous state.
+
+        Examples
+        --------
+        >>> from math import pi
+        >>> from compas.geometry import Frame
+        >>> from compas.robots import Joint
+        >>> from compas.robots import RobotModel
+        >>> robot = RobotModel('robot')
+        >>> link0 = robot.add_link('link0')
+        >>> link1 = robot.add_link('link1')
+        >>> link2 = robot.add_link('link2')
+        >>> origin = Frame([1, 0, 0], [1, 0, 0], [0, 1, 0])
+        >>> joint1 = robot.add_joint('joint1', Joint.CONTINUOUS, link0, link1, Frame.worldXY(), (0, 0, 1))
+        >>> joint2 = robot.add_joint('joint2', Joint.CONTINUOUS, link1, link2, origin, (0, 0, 1))
+        >>> names = robot.get_configurable_joint_names()
+        >>> frames = robot.forward_kinematics_batch([[0.0, 0.0], [0.5 * pi, 0.0]], names)
+        >>> [round(value, 3) for value in frames[1].point]
+        [0.0, 1.0, 0.0]
+        """
+        if joint_names is None:
+            joint_names = self.get_configurable_joint_names()
+        if link_name is None:
+            ee_link = self.get_end_effector_link()
+        else:
+            ee_link = self.get_link_by_name(link_name)
+        joint = ee_link.parent_joint
+
+        chain = self.kinematic_chain
+        index = chain.index[joint.name]
+        try:
+            matrices = chain.matrices_numpy(joint_values, joint_names)[:, index].tolist()
+        except ImportError:
+            matrices = [chain.matrices(dict(zip(joint_names, values)))[index] for values in joint_values]
+
+        return [_transformed_frame(joint.origin, matrix) for matrix in matrices]
 
     def add_link(self, name, visual_mesh=None, visual_color=None, collision_mesh=None, **kwargs):
         """Adds a link to the robot model.
@@ -821,6 +909,7 @@ class RobotModel(object):
         joint = Joint(name, type_str, parent_link.name, child_link.name, origin=origin, axis=axis, limit=limit, **kwargs)
 
         self.joints.append(joint)
+        self._chain = None
 
         # Using only part of self._rebuild_tree()
         parent_link.joints.append(joint)
@@ -853,6 +942,17 @@ class RobotModel(object):
         return joint
 
 
+def _transformed_frame(frame, matrix):
+    # transform a frame with a rigid transformation matrix
+    point = frame.point
+    xaxis = frame.xaxis
+    yaxis = frame.yaxis
+    R = [row[:3] for row in matrix[:3]]
+    return Frame([R[i][0] * point[0] + R[i][1] * point[1] + R[i][2] * point[2] + matrix[i][3] for i in range(3)],
+                 [R[i][0] * xaxis[0] + R[i][1] * xaxis[1] + R[i][2] * xaxis[2] for i in range(3)],
+                 [R[i][0] * yaxis[0] + R[i][1] * yaxis[1] + R[i][2] * yaxis[2] for i in range(3)])
+
+
 URDFParser.install_parser(RobotModel, 'robot')
 URDFParser.install_parser(Material, 'robot/material')
 URDFParser.install_parser(Color, 'robot/material/color')
@@ -863,7 +963,6 @@ if __name__ == '__main__':
     import os
     import doctest
     from compas import HERE
-    from compas.geometry import Frame
     from compas.geometry import Sphere  # noqa: F401
     from compas.datastructures import Mesh  # noqa: F401
     from compas.robots import GithubPackageMeshLoader  # noqa: F401
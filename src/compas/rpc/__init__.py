@@ -34,6 +34,47 @@ of the proxied package are available as if they were directly present in our env
     :nosignatures:
 
     Proxy
+    Batch
+    BatchResult
+    Future
+    as_completed
+
+Servers
+=======
+
+A service registers a dispatcher with a server.
+The XML-RPC server sends all data as JSON text.
+The binary server sends NumPy arrays and data structures as raw buffers,
+and is used by proxies with ``transport='binary'``.
+Both servers execute the calls in a pool of threads or processes,
+with a configurable number of workers and timeout.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Dispatcher
+    Server
+    BinaryServer
+    WorkerPool
+    BinaryClient
+    send_message
+    recv_message
+
+Instrumentation
+===============
+
+Proxies created with ``instrument=True`` report the time it takes to encode, send, decode, and execute every call,
+and the size of the data, as ``proxy.timing``.
+With ``instrument='profile'``, the remote functions are also profiled.
+The servers keep rolling statistics of all calls per function,
+which are available as ``proxy.server_statistics()``.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    CallStatistics
 
 RPC Command-line utility
 ========================
@@ -47,6 +88,10 @@ To start a new RPC server use the following command (default port is ``1753``):
 
     $ compas_rpc start <port>
 
+To start a server with the binary transport, add ``--transport binary``.
+To execute up to four calls at the same time in separate processes,
+and stop calls that take longer than a minute, add ``--workers 4 --executor process --timeout 60``.
+
 Conversely, to stop an existing RPC server:
 
 ::
@@ -65,6 +110,10 @@ from __future__ import division
 from __future__ import print_function
 
 from .errors import *  # noqa: F401 F403
+from .futures import *  # noqa: F401 F403
+from .statistics import *  # noqa: F401 F403
+from .transport import *  # noqa: F401 F403
+from .workers import *  # noqa: F401 F403
 from .proxy import *  # noqa: F401 F403
 from .server import *  # noqa: F401 F403
 from .dispatcher import *  # noqa: F401 F403
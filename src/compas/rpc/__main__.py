@@ -1,6 +1,7 @@
 import time
 
 from compas.rpc.services.default import start_service
+from compas.rpc.transport import BinaryClient
 
 try:
     from xmlrpclib import ServerProxy
@@ -8,13 +9,16 @@ except ImportError:
     from xmlrpc.client import ServerProxy
 
 
-def start(port, **kwargs):
-    start_service(port)
+def start(port, transport='xmlrpc', workers=1, executor='thread', timeout=None, **kwargs):
+    start_service(port, transport, workers, executor, timeout)
 
 
-def stop(port, **kwargs):
+def stop(port, transport='xmlrpc', **kwargs):
     print('Trying to stop remote RPC proxy...')
-    server = ServerProxy('http://127.0.0.1:{}'.format(port))
+    if transport == 'binary':
+        server = BinaryClient('127.0.0.1', port)
+    else:
+        server = ServerProxy('http://127.0.0.1:{}'.format(port))
 
     success = False
     count = 5
@@ -48,6 +52,14 @@ def main():
     start_command = commands.add_parser('start', help='Start RPC server')
     start_command.add_argument(
         '--port', '-p', action='store', default=1753, type=int, help='RPC port number')
+    start_command.add_argument(
+        '--transport', '-t', action='store', default='xmlrpc', choices=['xmlrpc', 'binary'], help='RPC transport')
+    start_command.add_argument(
+        '--workers', '-w', action='store', default=1, type=int, help='Number of calls executed at the same time')
+    start_command.add_argument(
+        '--executor', '-e', action='store', default='thread', choices=['thread', 'process'], help='Execute calls in threads or processes')
+    start_command.add_argument(
+        '--timeout', action='store', default=None, type=float, help='Maximum execution time of a call in seconds')
     start_command.set_defaults(func=start)
 
     # Command: stop
@@ -55,6 +67,8 @@ def main():
         'stop', help='Try to stop a remote RPC server')
     stop_command.add_argument(
         '--port', '-p', action='store', default=1753, type=int, help='RPC port number')
+    stop_command.add_argument(
+        '--transport', '-t', action='store', default='xmlrpc', choices=['xmlrpc', 'binary'], help='RPC transport')
     stop_command.set_defaults(func=stop)
 
     # Invoke
@@ -4,6 +4,7 @@ from __future__ import division
 
 import json
 import importlib
+import time
 
 try:
     from cStringIO import StringIO
@@ -28,6 +29,10 @@ from compas.utilities import DataDecoder
 __all__ = ['Dispatcher']
 
 
+# the name of the API call that executes a sequence of calls
+BATCH = '__batch__'
+
+
 class Dispatcher(object):
     """Base class for remote services.
 
@@ -72,6 +77,73 @@ class Dispatcher(object):
             * `'error'`   : The error message of any error that may have been thrown in the processes of dispatching to or execution of the API function.
             * `'profile'` : A profile of the function execution.
 
+            If the name is ``'__batch__'``, the input dictionary contains a list of ``'calls'``,
+            and the data of the output dictionary is the list of the output dictionaries of the calls.
+
+        """
+        try:
+            idict = json.loads(args[0], cls=DataDecoder)
+        except (IndexError, TypeError):
+            odict = {
+                'data': None,
+                'error': (
+                    "API methods require a single JSON encoded dictionary as input.\n"
+                    "For example: input = json.dumps({'param_1': 1, 'param_2': [2, 3]})"),
+                'profile': None
+            }
+        else:
+            if name == BATCH:
+                odict = {
+                    'data': self._dispatch_batch(idict['calls']),
+                    'error': None,
+                    'profile': None
+                }
+                if not idict.get('instrument'):
+                    for item in odict['data']:
+                        item.pop('timing', None)
+            else:
+                odict = self._dispatch_call(name, idict)
+                if not idict.get('instrument'):
+                    odict.pop('timing', None)
+
+        return json.dumps(odict, cls=DataEncoder)
+
+    def _dispatch_batch(self, calls):
+        """Dispatch a sequence of API calls.
+
+        Parameters
+        ----------
+        calls : list of dict
+            The calls, each with the ``'name'`` of the function
+            and the positional and named arguments (``'args'``, ``'kwargs'``).
+
+        Returns
+        -------
+        list of dict
+            The output dictionary of every call.
+            An error in one of the calls does not affect the others.
+
+        """
+        return [self._dispatch_call(call['name'], call) for call in calls]
+
+    def _dispatch_call(self, name, idict):
+        """Dispatch one API call.
+
+        Parameters
+        ----------
+        name : str
+            Name of the function.
+        idict : dict
+            The input dictionary.
+
+        Returns
+        -------
+        dict
+            The output dictionary.
+            The execution time of the function is added as ``'timing'``.
+            If the ``'instrument'`` option of the input dictionary is ``'profile'``,
+            the function is profiled, and the profile is added as ``'profile'``.
+
         """
         odict = {
             'data': None,
@@ -79,37 +151,60 @@ class Dispatcher(object):
             'profile': None
         }
 
-        parts = name.split('.')
-
-        functionname = parts[-1]
-
         try:
-            if len(parts) > 1:
-                modulename = ".".join(parts[:-1])
-                module = importlib.import_module(modulename)
-            else:
-                module = self
+            function = self._resolve(name)
         except Exception:
             odict['error'] = traceback.format_exc()
-
         else:
-            try:
-                function = getattr(module, functionname)
-            except AttributeError:
-                odict['error'] = "This function is not part of the API: {0}".format(functionname)
-
+            if function is None:
+                odict['error'] = "This function is not part of the API: {0}".format(name.split('.')[-1])
             else:
-                try:
-                    idict = json.loads(args[0], cls=DataDecoder)
-                except (IndexError, TypeError):
-                    odict['error'] = (
-                        "API methods require a single JSON encoded dictionary as input.\n"
-                        "For example: input = json.dumps({'param_1': 1, 'param_2': [2, 3]})")
-
+                start = time.time()
+                if idict.get('instrument') == 'profile':
+                    self._call_wrapped(function, idict, odict)
                 else:
                     self._call(function, idict, odict)
+                odict['timing'] = {'execute': time.time() - start}
 
-        return json.dumps(odict, cls=DataEncoder)
+        return odict
+
+    def _resolve(self, name):
+        """Find the function corresponding to an API call.
+
+        Parameters
+        ----------
+        name : str
+            Name of the function.
+            Names with dots are resolved as functions of modules,
+            other names as methods of the dispatcher.
+
+        Returns
+        -------
+        callable
+            The function, or ``None`` if the module has no such function.
+
+        Notes
+        -----
+        Resolved functions are cached for the lifetime of the dispatcher,
+        such that modules are imported and searched only once.
+
+        """
+        functions = self.__dict__.setdefault('_functions', {})
+        try:
+            return functions[name]
+        except KeyError:
+            pass
+
+        parts = name.split('.')
+        if len(parts) > 1:
+            module = importlib.import_module(".".join(parts[:-1]))
+        else:
+            module = self
+
+        function = getattr(module, parts[-1], None)
+        if function is not None:
+            functions[name] = function
+        return function
 
     def _call(self, function, idict, odict):
         """Method that handles tha actual call to the function corresponding to the API call.
@@ -139,6 +234,23 @@ class Dispatcher(object):
             odict['data'] = data
 
     def _call_wrapped(self, function, idict, odict):
+        """Call the function corresponding to the API call, and profile it with cProfile.
+
+        Parameters
+        ----------
+        function : callable
+            The callable object corresponding to the requested API call.
+        idict : dict
+            The input dictionary.
+        odict : dict
+            The output dictionary.
+
+        Notes
+        -----
+        The output dictionary will be modified in place.
+        The 20 most expensive functions are added to it as ``'profile'``.
+
+        """
         args = idict['args']
         kwargs = idict['kwargs']
 
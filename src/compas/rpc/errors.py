@@ -3,7 +3,7 @@ from __future__ import absolute_import
 from __future__ import division
 
 
-__all__ = ['RPCServerError', 'RPCClientError']
+__all__ = ['RPCServerError', 'RPCClientError', 'RPCTimeoutError', 'RPCCancelledError']
 
 
 class RPCServerError(Exception):
@@ -14,6 +14,16 @@ class RPCClientError(Exception):
     pass
 
 
+class RPCTimeoutError(RPCServerError):
+    """Raised if a remote call exceeds its timeout."""
+    pass
+
+
+class RPCCancelledError(RPCServerError):
+    """Raised if a remote call was cancelled."""
+    pass
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
@@ -0,0 +1,198 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import threading
+import time
+
+try:
+    from Queue import Empty
+    from Queue import Queue
+except ImportError:
+    from queue import Empty
+    from queue import Queue
+
+from compas.rpc.errors import RPCClientError
+
+
+__all__ = ['Future', 'as_completed']
+
+
+class Future(object):
+    """The result of a remote call that is executed asynchronously.
+
+    The interface is a subset of the interface of :class:`concurrent.futures.Future`,
+    which is not available in IronPython.
+
+    Parameters
+    ----------
+    cancel : callable, optional
+        A function that requests the cancellation of the call.
+
+    Examples
+    --------
+    >>> future = Future()
+    >>> future.done()
+    False
+    >>> future.set_result(1)
+    >>> future.result()
+    1
+
+    """
+
+    def __init__(self, cancel=None):
+        self._condition = threading.Condition()
+        self._cancel = cancel
+        self._done = False
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+
+    def done(self):
+        """Whether the call was completed."""
+        return self._done
+
+    def cancel(self):
+        """Request the cancellation of the call.
+
+        Returns
+        -------
+        bool
+            ``False`` if the call was already completed, or cannot be cancelled.
+            ``True`` otherwise, in which case the result of the call
+            raises :class:`compas.rpc.RPCCancelledError`,
+            unless the call completes before the request reaches the server.
+        """
+        if self._done or self._cancel is None:
+            return False
+        self._cancel()
+        return True
+
+    def _wait(self, timeout):
+        with self._condition:
+            if timeout is None:
+                while not self._done:
+                    self._condition.wait()
+            else:
+                end = time.time() + timeout
+                while not self._done:
+                    remaining = end - time.time()
+                    if remaining <= 0:
+                        raise RPCClientError('The call did not complete within {} seconds.'.format(timeout))
+                    self._condition.wait(remaining)
+
+    def result(self, timeout=None):
+        """Wait for the result of the call.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time to wait, in seconds.
+            Default is ``None``, in which case there is no limit.
+
+        Returns
+        -------
+        object
+            The result returned by the remote function.
+
+        Raises
+        ------
+        RPCClientError
+            If the call does not complete in time.
+        RPCServerError
+            If the remote call failed.
+        """
+        self._wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """Wait for the call, and return the exception it raised, if any."""
+        self._wait(timeout)
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """Add a function that is called with the future when the call is completed.
+
+        If the call is already completed, the function is called immediately.
+        """
+        with self._condition:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _complete(self, result, exception):
+        with self._condition:
+            if self._done:
+                return
+            self._result = result
+            self._exception = exception
+            self._done = True
+            callbacks = self._callbacks
+            self._callbacks = []
+            self._condition.notify_all()
+        for callback in callbacks:
+            callback(self)
+
+    def set_result(self, result):
+        self._complete(result, None)
+
+    def set_exception(self, exception):
+        self._complete(None, exception)
+
+
+def as_completed(futures, timeout=None):
+    """Iterate over futures in the order in which they are completed.
+
+    Parameters
+    ----------
+    futures : iterable of :class:`Future`
+        The futures.
+    timeout : float, optional
+        The maximum time to wait for all futures, in seconds.
+        Default is ``None``, in which case there is no limit.
+
+    Yields
+    ------
+    :class:`Future`
+        The next completed future.
+
+    Raises
+    ------
+    RPCClientError
+        If not all futures complete in time.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        futures = [proxy.submit('fd_numpy', vertices, edges, fixed, q, loads) for q in qs]
+        for future in as_completed(futures):
+            xyz, q, f, l, r = future.result()
+
+    """
+    futures = list(futures)
+    queue = Queue()
+    for future in futures:
+        future.add_done_callback(queue.put)
+    end = None if timeout is None else time.time() + timeout
+    for count in range(len(futures)):
+        try:
+            if end is None:
+                yield queue.get()
+            else:
+                yield queue.get(timeout=max(0.0, end - time.time()))
+        except Empty:
+            raise RPCClientError('{} of {} calls did not complete within {} seconds.'.format(len(futures) - count, len(futures), timeout))
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
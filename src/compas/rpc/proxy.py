@@ -4,6 +4,7 @@ from __future__ import division
 
 import time
 import json
+import threading
 
 import compas
 
@@ -24,12 +25,49 @@ except ImportError:
 
 import compas._os
 
+from compas.utilities import DataDecoder
 from compas.utilities import DataEncoder
 
+from compas.rpc import RPCCancelledError
+from compas.rpc import RPCClientError
 from compas.rpc import RPCServerError
-
-
-__all__ = ['Proxy']
+from compas.rpc import RPCTimeoutError
+from compas.rpc.dispatcher import BATCH
+from compas.rpc.futures import Future
+from compas.rpc.transport import BinaryClient
+
+
+__all__ = ['Proxy', 'Batch', 'BatchResult']
+
+
+def _result(odict):
+    # the result of a call, or the exception corresponding to its error
+    if odict['error']:
+        status = odict.get('status')
+        if status == 'timeout':
+            raise RPCTimeoutError(odict['error'])
+        if status == 'cancelled':
+            raise RPCCancelledError(odict['error'])
+        raise RPCServerError(odict['error'])
+    return odict['data']
+
+
+def _timing(transfer, odicts):
+    # the breakdown of the time of a round trip
+    timing = {
+        'total': transfer['total'],
+        'client_encode': transfer['client_encode'],
+        'request_bytes': transfer['request_bytes'],
+        'server_decode': transfer['decode'],
+        'queue': sum(odict['timing']['queue'] for odict in odicts if 'timing' in odict),
+        'execute': sum(odict['timing']['execute'] for odict in odicts if 'timing' in odict),
+        'server_encode': transfer['encode'],
+        'response_bytes': transfer['response_bytes'],
+        'client_decode': transfer['client_decode'],
+    }
+    measured = sum(timing[key] for key in ('client_encode', 'server_decode', 'queue', 'execute', 'server_encode', 'client_decode'))
+    timing['transport'] = max(0.0, timing['total'] - measured)
+    return timing
 
 
 class Proxy(object):
@@ -55,6 +93,27 @@ class Proxy(object):
     port : int, optional
         The port number on the remote server.
         Default is ``1753``.
+    service : string, optional
+        The module of the service that is started if no server is running.
+        Default is ``'compas.rpc.services.default'``.
+    transport : {'xmlrpc', 'binary'}, optional
+        The protocol of the communication with the server.
+        With ``'xmlrpc'``, all data is sent as JSON text over XML-RPC.
+        With ``'binary'``, messages are sent as binary frames over a socket
+        that is kept open, and NumPy arrays and data structures are sent as raw buffers
+        (see :func:`compas.rpc.transport.send_message`).
+        Default is ``'xmlrpc'``.
+    timeout : float, optional
+        The maximum execution time of a call on the server, in seconds.
+        Calls that exceed the timeout raise :class:`compas.rpc.RPCTimeoutError`.
+        Only supported by the binary transport.
+        Default is ``None``, in which case the timeout of the server is used.
+    instrument : {False, True, 'profile'}, optional
+        If ``True``, the time it takes to encode, send, decode, and execute every call or batch of calls
+        is measured, and available as :attr:`timing`.
+        With ``'profile'``, the remote functions are also profiled with cProfile,
+        and the profile of the most recent call is available as :attr:`profile`.
+        Default is ``False``.
 
     Notes
     -----
@@ -69,6 +128,18 @@ class Proxy(object):
 
     If possible, the proxy will try to reconnect to an already existing service
 
+    The binary transport is much faster for large arrays and meshes.
+    A custom service that is used with the binary transport should start a
+    :class:`compas.rpc.BinaryServer` if the transport ``'binary'`` is passed as its second argument.
+
+    Remote functions are accessed as attributes of the proxy.
+    Therefore, functions with the name of an attribute or method of the proxy
+    (``address``, ``transport``, ``timeout``, ``instrument``, ``timing``, ``profile``,
+    ``package``, ``service``, ``python``, ``start_server``, ``stop_server``,
+    ``submit``, ``batch`` and ``server_statistics``) cannot be called directly.
+    Instead, pass their name to :meth:`submit`,
+    for example ``proxy.submit('batch', *args).result()``.
+
     Examples
     --------
     Minimal example showing connection to the proxy server, and ensuring the
@@ -81,13 +152,54 @@ class Proxy(object):
         with Proxy('compas.numerical') as numerical:
             pass
 
+    Sending several calls in one round trip:
+
+    .. code-block:: python
+
+        with Proxy('compas.numerical', transport='binary') as numerical:
+            with numerical.batch() as batch:
+                a = batch.fd_numpy(vertices, edges, fixed, q, loads)
+                b = batch.fd_numpy(vertices, edges, fixed, 2 * q, loads)
+            xyz, q, f, l, r = a.result()
+
+    Finding out whether a call is slow because of the computation or because of the transfer of the data:
+
+    .. code-block:: python
+
+        with Proxy('compas.numerical', instrument=True) as numerical:
+            xyz, q, f, l, r = numerical.fd_numpy(vertices, edges, fixed, q, loads)
+            print(numerical.timing['execute'], numerical.timing['server_decode'], numerical.timing['request_bytes'])
+            print(numerical.server_statistics()['compas.numerical.fd_numpy']['latency']['p90'])
+
+    Executing several calls at the same time on a server with several workers
+    (see :meth:`submit`):
+
+    .. code-block:: python
+
+        from compas.rpc import as_completed
+
+        with Proxy('compas.numerical', transport='binary', timeout=60) as numerical:
+            futures = [numerical.submit('fd_numpy', vertices, edges, fixed, q, loads) for q in qs]
+            for future in as_completed(futures):
+                xyz, q, f, l, r = future.result()
+
     """
 
-    def __init__(self, package=None, python=None, url='http://127.0.0.1', port=1753, service=None):
+    def __init__(self, package=None, python=None, url='http://127.0.0.1', port=1753, service=None, transport='xmlrpc', timeout=None, instrument=False):
+        if transport not in ('xmlrpc', 'binary'):
+            raise ValueError("The transport should be 'xmlrpc' or 'binary': {}".format(transport))
+        if timeout is not None and transport != 'binary':
+            raise ValueError('Timeouts are only supported by the binary transport.')
+        if instrument not in (False, True, 'profile'):
+            raise ValueError("The instrumentation should be False, True, or 'profile': {}".format(instrument))
         self._package = None
         self._python = compas._os.select_python(python)
         self._url = url
         self._port = port
+        self._transport = transport
+        self._timeout = timeout
+        self._instrument = instrument
+        self._timing = None
         self._service = None
         self._process = None
         self._function = None
@@ -110,6 +222,8 @@ class Proxy(object):
         # otherwise we just disconnect from it
         if self._implicitely_started_server:
             self.stop_server()
+        elif self._transport == 'binary':
+            self._server.close()
         else:
             self._server.__close()
 
@@ -117,6 +231,35 @@ class Proxy(object):
     def address(self):
         return "{}:{}".format(self._url, self._port)
 
+    @property
+    def transport(self):
+        """The protocol of the communication with the server."""
+        return self._transport
+
+    @property
+    def timeout(self):
+        """The maximum execution time of a call on the server, in seconds."""
+        return self._timeout
+
+    @property
+    def instrument(self):
+        """The instrumentation of the calls: ``False``, ``True``, or ``'profile'``."""
+        return self._instrument
+
+    @property
+    def timing(self):
+        """The timing of the most recent call or batch of calls, if the proxy is instrumented.
+
+        A dictionary with the total time of the round trip (``'total'``),
+        the time to encode the input on the client (``'client_encode'``) and to decode it on the server (``'server_decode'``),
+        the time the calls waited for a worker (``'queue'``) and the time they were executed (``'execute'``),
+        the time to encode the output on the server (``'server_encode'``) and to decode it on the client (``'client_decode'``),
+        the remaining time, spent sending the data (``'transport'``),
+        and the size of the input and output in bytes (``'request_bytes'``, ``'response_bytes'``).
+        All times are in seconds.
+        """
+        return self._timing
+
     @property
     def profile(self):
         """A profile of the executed code."""
@@ -162,7 +305,7 @@ class Proxy(object):
         ServerProxy
             Instance of the proxy if reconnection succeeded, otherwise ``None``.
         """
-        server = ServerProxy(self.address)
+        server = self._server_proxy()
         try:
             server.ping()
         except Exception:
@@ -212,15 +355,15 @@ class Proxy(object):
             self._process.StartInfo.RedirectStandardOutput = True
             self._process.StartInfo.RedirectStandardError = True
             self._process.StartInfo.FileName = self.python
-            self._process.StartInfo.Arguments = '-m {0} {1}'.format(self.service, str(self._port))
+            self._process.StartInfo.Arguments = ' '.join(self._service_arguments())
             self._process.Start()
         else:
-            args = [self.python, '-m', self.service, str(self._port)]
+            args = [self.python] + self._service_arguments()
             self._process = Popen(args, stdout=PIPE, stderr=PIPE, env=env)
         # this starts the client side
         # it creates a proxy for the server
         # and tries to connect the proxy to the actual server
-        server = ServerProxy(self.address)
+        server = self._server_proxy()
         print("Starting a new proxy server...")
         success = False
         count = 100
@@ -240,6 +383,18 @@ class Proxy(object):
             print("New proxy server started.")
         return server
 
+    def _service_arguments(self):
+        args = ['-m', self.service, str(self._port)]
+        if self._transport == 'binary':
+            args.append(self._transport)
+        return args
+
+    def _server_proxy(self):
+        if self._transport == 'binary':
+            host = self._url.split('://')[-1]
+            return BinaryClient(host, self._port)
+        return ServerProxy(self.address)
+
     def stop_server(self):
         """Stop the remote server and terminate/kill the python process that was used to start it.
 
@@ -276,10 +431,7 @@ class Proxy(object):
     def __getattr__(self, name):
         if self.package:
             name = "{}.{}".format(self.package, name)
-        try:
-            self._function = getattr(self._server, name)
-        except Exception:
-            raise RPCServerError()
+        self._function = name
         return self._proxy
 
     def _proxy(self, *args, **kwargs):
@@ -300,18 +452,113 @@ class Proxy(object):
         Warning
         -------
         The `args` and `kwargs` have to be JSON-serialisable.
-        This means that, currently, only native Python objects are supported.
-        The returned results will also always be in the form of built-in Python objects.
+        This means that only native Python objects, COMPAS data structures and
+        geometric primitives, and NumPy arrays are supported.
+        Data structures and primitives in the returned results are reconstructed
+        from their data, all other results are returned as built-in Python objects.
+        """
+        result = self._send([{'name': self._function, 'args': args, 'kwargs': kwargs}])[0]
+        data = _result(result)
+        self.profile = result['profile']
+        return data
+
+    def submit(self, function, *args, **kwargs):
+        """Call a remote function without waiting for the result.
+
+        Parameters
+        ----------
+        function : str
+            The name of the function, relative to the package of the proxy.
+        args : list
+            Positional arguments to be passed to the remote function.
+        kwargs : dict
+            Named arguments to be passed to the remote function.
+
+        Returns
+        -------
+        :class:`compas.rpc.Future`
+            The future result of the remote function.
+
+        Notes
+        -----
+        With the binary transport, all calls are sent over the connection of the proxy,
+        and can be cancelled with :meth:`compas.rpc.Future.cancel`.
+        With the XML-RPC transport, every call opens a connection in a separate thread,
+        and cannot be cancelled.
+
+        Whether the calls are executed at the same time depends on the number
+        of workers of the server (see :class:`compas.rpc.WorkerPool`).
+
+        """
+        if self.package:
+            function = "{}.{}".format(self.package, function)
+        calls = [{'name': function, 'args': args, 'kwargs': kwargs}]
+        if self._transport == 'binary':
+            return self._server.call_async(calls, self._timeout, lambda results: _result(results[0]))
+
+        future = Future()
+
+        def run():
+            try:
+                result = _result(self._send(calls, ServerProxy(self.address))[0])
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        return future
+
+    def _send(self, calls, server=None):
+        """Send a sequence of calls to the server in one round trip.
+
+        Parameters
+        ----------
+        calls : list of dict
+            The calls, each with the ``'name'`` of the function
+            and the positional and named arguments (``'args'``, ``'kwargs'``).
+        server : ServerProxy, optional
+            The XML-RPC connection to use.
+            Default is the connection of the proxy.
+
+        Returns
+        -------
+        list of dict
+            The output dictionary of every call.
         """
-        idict = {'args': args, 'kwargs': kwargs}
+        if self._instrument:
+            for call in calls:
+                call['instrument'] = self._instrument
+        if self._transport == 'binary':
+            if not self._instrument:
+                return self._server.call(calls, self._timeout)
+            message = {'command': 'call', 'calls': calls, 'instrument': True}
+            if self._timeout is not None:
+                message['timeout'] = self._timeout
+            reply = self._server.request(message)
+            self._timing = _timing(reply['transfer'], reply['results'])
+            return reply['results']
+        server = server or self._server
+        if len(calls) == 1:
+            name = calls[0]['name']
+            idict = {'args': calls[0]['args'], 'kwargs': calls[0]['kwargs']}
+        else:
+            name = BATCH
+            idict = {'calls': calls}
+        if self._instrument:
+            idict['instrument'] = self._instrument
+        start = time.time()
         istring = json.dumps(idict, cls=DataEncoder)
+        client_encode = time.time() - start
         # it makes sense that there is a broken pipe error
         # because the process is not the one receiving the feedback
         # when there is a print statement on the server side
         # this counts as output
         # it should be sent as part of RPC communication
         try:
-            ostring = self._function(istring)
+            ostring = getattr(server, name)(istring)
         except Exception:
             # not clear what the point of this is
             # self.stop_server()
@@ -320,12 +567,149 @@ class Proxy(object):
             raise
         if not ostring:
             raise RPCServerError("No output was generated.")
-        result = json.loads(ostring)
+        decode = time.time()
+        result = json.loads(ostring, cls=DataDecoder)
+        if 'transfer' in result:
+            transfer = result.pop('transfer')
+            transfer['client_encode'] = client_encode
+            transfer['client_decode'] = time.time() - decode
+            transfer['total'] = time.time() - start
+            self._timing = _timing(transfer, result['data'] if name == BATCH else [result])
+        if name != BATCH:
+            return [result]
         if result['error']:
             raise RPCServerError(result['error'])
-        self.profile = result['profile']
         return result['data']
 
+    def batch(self):
+        """Collect calls and send them to the server in one round trip.
+
+        Returns
+        -------
+        :class:`Batch`
+            A context manager on which functions are called like on the proxy.
+            The calls are sent when the context is exited.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            with proxy.batch() as batch:
+                results = [batch.fd_numpy(vertices, edges, fixed, q, loads) for q in qs]
+            xyz = [result.result()[0] for result in results]
+
+        """
+        return Batch(self)
+
+    def server_statistics(self):
+        """Statistics of the calls executed by the server.
+
+        Returns
+        -------
+        dict
+            Per function, the number of calls and failed calls, and the percentiles
+            of the latency and execution time of the most recent calls
+            (see :meth:`compas.rpc.CallStatistics.summary`).
+
+        """
+        if self._transport == 'binary':
+            return self._server.request({'command': 'statistics'})['data']
+        return self._server.statistics()
+
+
+class BatchResult(object):
+    """The result of a call in a batch.
+
+    The result is available after the batch is sent.
+    """
+
+    def __init__(self):
+        self._odict = None
+
+    def done(self):
+        """Whether the call was executed."""
+        return self._odict is not None
+
+    def result(self):
+        """The result returned by the remote function.
+
+        Raises
+        ------
+        RPCClientError
+            If the batch was not sent yet.
+        RPCServerError
+            If the remote call failed.
+        """
+        if self._odict is None:
+            raise RPCClientError('The batch of this call was not sent yet.')
+        return _result(self._odict)
+
+
+class Batch(object):
+    """A sequence of remote calls that is sent to the server in one round trip.
+
+    Functions are called on the batch like on the proxy,
+    but the calls return a :class:`BatchResult`.
+    The calls are sent when the batch is used as a context manager and the context is exited,
+    or when :meth:`send` is called.
+
+    Parameters
+    ----------
+    proxy : :class:`Proxy`
+        The proxy of the server.
+
+    Notes
+    -----
+    The calls are executed one after the other, in order.
+    An error in one of the calls is only raised when its result is requested.
+
+    """
+
+    def __init__(self, proxy):
+        self._proxy = proxy
+        self._calls = []
+        self._results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._proxy.package:
+            name = "{}.{}".format(self._proxy.package, name)
+
+        def call(*args, **kwargs):
+            result = BatchResult()
+            self._calls.append({'name': name, 'args': args, 'kwargs': kwargs})
+            self._results.append(result)
+            return result
+
+        return call
+
+    def send(self):
+        """Send the collected calls to the server.
+
+        Returns
+        -------
+        list of :class:`BatchResult`
+            The results of the calls.
+        """
+        calls, results = self._calls, self._results
+        self._calls = []
+        self._results = []
+        if calls:
+            for result, odict in zip(results, self._proxy._send(calls)):
+                result._odict = odict
+        return results
+
 
 # ==============================================================================
 # Main
@@ -2,20 +2,141 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import json
+import socket
 import threading
+import time
+import traceback
 
 try:
     from SimpleXMLRPCServer import SimpleXMLRPCServer
 except ImportError:
     from xmlrpc.server import SimpleXMLRPCServer
 
+try:
+    from SocketServer import StreamRequestHandler
+    from SocketServer import ThreadingMixIn
+    from SocketServer import ThreadingTCPServer
+except ImportError:
+    from socketserver import StreamRequestHandler
+    from socketserver import ThreadingMixIn
+    from socketserver import ThreadingTCPServer
+
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+
+from compas.rpc.dispatcher import BATCH
+from compas.rpc.errors import RPCCancelledError
+from compas.rpc.errors import RPCServerError
+from compas.rpc.errors import RPCTimeoutError
+from compas.rpc.statistics import CallStatistics
+from compas.rpc.transport import recv_message
+from compas.rpc.transport import send_message
+from compas.rpc.workers import WorkerPool
+
+
+__all__ = ['Server', 'BinaryServer']
+
+
+def _error(exception):
+    odict = {'data': None, 'error': str(exception), 'profile': None}
+    if isinstance(exception, RPCTimeoutError):
+        odict['status'] = 'timeout'
+    elif isinstance(exception, RPCCancelledError):
+        odict['status'] = 'cancelled'
+    return odict
+
+
+class _Executor(object):
+    """Execution of calls in a worker pool, with statistics, shared by the servers."""
+
+    def _init_executor(self, num_workers, executor, call_timeout):
+        self.num_workers = num_workers
+        self.executor = executor
+        self.call_timeout = call_timeout
+        self.pool = None
+        self.call_statistics = CallStatistics()
 
-__all__ = ['Server']
+    def _start_pool(self, instance):
+        if self.pool is not None:
+            self.pool.close()
+        self.pool = WorkerPool(instance, self.num_workers, self.executor)
 
+    def execute(self, calls, timeout=None, key=None):
+        """Execute a sequence of calls one after the other in the worker pool.
 
-class Server(SimpleXMLRPCServer):
+        Parameters
+        ----------
+        calls : list of dict
+            The calls, each with the ``'name'`` of the function,
+            the positional and named arguments (``'args'``, ``'kwargs'``),
+            and optionally the ``'instrument'`` option.
+        timeout : float, optional
+            The maximum execution time of every call, in seconds.
+            Default is the timeout of the server.
+        key : str, optional
+            An identifier with which the calls can be cancelled.
+
+        Returns
+        -------
+        list of dict
+            The output dictionary of every call.
+            The output of instrumented calls includes the ``'timing'`` of the call,
+            with the time it waited for a worker (``'queue'``) and the execution time (``'execute'``).
+
+        """
+        if timeout is None:
+            timeout = self.call_timeout
+        odicts = []
+        try:
+            for call in calls:
+                start = time.time()
+                try:
+                    odict = self.pool.run('_dispatch_call', (call['name'], call), timeout, key)
+                except RPCServerError as e:
+                    odict = _error(e)
+                latency = time.time() - start
+                execute = odict.pop('timing', {}).get('execute', 0.0)
+                self.call_statistics.record(call['name'], latency, execute, bool(odict['error']))
+                if call.get('instrument'):
+                    odict['timing'] = {'queue': latency - execute, 'execute': execute}
+                odicts.append(odict)
+        finally:
+            if key is not None:
+                self.pool.release(key)
+        return odicts
+
+    def statistics(self):
+        """Statistics of the calls executed by the server.
+
+        Returns
+        -------
+        dict
+            Per function, the number of calls and failed calls, and the percentiles
+            of the latency and execution time of the most recent calls
+            (see :meth:`compas.rpc.CallStatistics.summary`).
+
+        """
+        return self.call_statistics.summary()
+
+
+class Server(_Executor, ThreadingMixIn, SimpleXMLRPCServer):
     """Version of a `SimpleXMLRPCServer` that can be ceanly terminated from the client side.
 
+    Parameters
+    ----------
+    address : tuple
+        The host and port of the server.
+    num_workers : int, optional
+        The maximum number of calls that are executed at the same time.
+        Default is ``1``.
+    executor : {'thread', 'process'}, optional
+        Execute the calls in threads, or in worker processes.
+        Default is ``'thread'``.
+    call_timeout : float, optional
+        The maximum execution time of a call, in seconds.
+        Default is ``None``, in which case there is no limit.
+
     Examples
     --------
     .. code-block:: python
@@ -36,6 +157,7 @@ class Server(SimpleXMLRPCServer):
 
             server.register_function(server.ping)
             server.register_function(server.remote_shutdown)
+            server.register_function(server.statistics)
             server.register_instance(DefaultService())
             server.serve_forever()
 
@@ -44,8 +166,52 @@ class Server(SimpleXMLRPCServer):
     This class has to be used by a service to start the XMLRPC server in a way
     that can be pinged to check if the server is live, and can be cleanly terminated.
 
+    The input and output of the calls are decoded and encoded in the thread of the request,
+    and only the function is executed by the worker pool.
+    Calls with the ``'instrument'`` option return the time it takes to decode, wait, execute, and encode,
+    and the size of the input and output as ``'transfer'`` and ``'timing'``.
+
+    Every request is handled in a separate thread,
+    and the calls to the registered instance are executed by a :class:`compas.rpc.WorkerPool`.
+    Registered functions, such as :meth:`ping`, are executed immediately.
+
     """
 
+    daemon_threads = True
+
+    def __init__(self, address, *args, **kwargs):
+        self._init_executor(kwargs.pop('num_workers', 1), kwargs.pop('executor', 'thread'), kwargs.pop('call_timeout', None))
+        SimpleXMLRPCServer.__init__(self, address, *args, **kwargs)
+
+    def register_instance(self, instance, *args, **kwargs):
+        SimpleXMLRPCServer.register_instance(self, instance, *args, **kwargs)
+        self._start_pool(instance)
+
+    def _dispatch(self, method, params):
+        if method in self.funcs or self.pool is None:
+            return SimpleXMLRPCServer._dispatch(self, method, params)
+        start = time.time()
+        try:
+            idict = json.loads(params[0], cls=DataDecoder)
+        except (IndexError, TypeError):
+            # the dispatcher explains the required input
+            return self.instance._dispatch(method, params)
+        decode = time.time() - start
+        if method == BATCH:
+            odict = {'data': self.execute(idict['calls']), 'error': None, 'profile': None}
+        else:
+            idict['name'] = method
+            odict = self.execute([idict])[0]
+        start = time.time()
+        ostring = json.dumps(odict, cls=DataEncoder)
+        if idict.get('instrument'):
+            transfer = {'decode': decode,
+                        'encode': time.time() - start,
+                        'request_bytes': len(params[0]),
+                        'response_bytes': len(ostring)}
+            ostring = ostring[:-1] + ', "transfer": ' + json.dumps(transfer) + '}'
+        return ostring
+
     def ping(self):
         """Simple function used to check if a remote server can be reached.
 
@@ -63,6 +229,175 @@ class Server(SimpleXMLRPCServer):
     def _shutdown_thread(self):
         self.shutdown()
 
+    def server_close(self):
+        if self.pool is not None:
+            self.pool.close()
+        SimpleXMLRPCServer.server_close(self)
+
+
+class _BinaryRequestHandler(StreamRequestHandler):
+    """Handler of the messages of one client connection.
+
+    Calls are executed in separate threads, such that a client can have several calls in progress,
+    and the replies are sent in the order in which the calls are completed.
+    """
+
+    def handle(self):
+        self.lock = threading.Lock()
+        while True:
+            stats = {}
+            try:
+                message = recv_message(self.rfile, stats)
+            except (EOFError, socket.error):
+                break
+            if message.get('command') == 'call':
+                thread = threading.Thread(target=self.reply, args=(message, stats))
+                thread.daemon = True
+                thread.start()
+            else:
+                self.reply(message, stats)
+
+    def reply(self, message, stats):
+        try:
+            reply = self.server.handle_message(message)
+        except Exception:
+            reply = {'error': traceback.format_exc()}
+        reply['id'] = message.get('id')
+
+        def transfer(response):
+            return {'transfer': {'decode': stats['decode'],
+                                 'encode': response['encode'],
+                                 'request_bytes': stats['nbytes'],
+                                 'response_bytes': response['nbytes']}}
+
+        with self.lock:
+            try:
+                try:
+                    send_message(self.wfile, reply, {}, transfer if message.get('instrument') else None)
+                except (TypeError, ValueError):
+                    send_message(self.wfile, {'id': reply['id'], 'error': traceback.format_exc()})
+            except socket.error:
+                pass
+
+
+class BinaryServer(_Executor, ThreadingTCPServer):
+    """Server for remote calls with binary messages over a socket.
+
+    The messages are length-prefixed frames with a JSON header and raw buffers
+    for NumPy arrays and data structures (see :func:`compas.rpc.transport.send_message`).
+    Every client keeps its connection open between calls,
+    and can send several calls in one message.
+
+    Parameters
+    ----------
+    address : tuple
+        The host and port of the server.
+    num_workers : int, optional
+        The maximum number of calls that are executed at the same time.
+        Default is ``1``.
+    executor : {'thread', 'process'}, optional
+        Execute the calls in threads, or in worker processes.
+        Default is ``'thread'``.
+    call_timeout : float, optional
+        The default maximum execution time of a call, in seconds.
+        Clients can set the timeout of their calls.
+        Default is ``None``, in which case there is no limit.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from compas.rpc import BinaryServer
+        from compas.rpc import Dispatcher
+
+
+        class DefaultService(Dispatcher):
+            pass
+
+
+        if __name__ == '__main__':
+
+            server = BinaryServer(("localhost", 8888), num_workers=4, executor='process')
+            server.register_instance(DefaultService())
+            server.serve_forever()
+
+    Notes
+    -----
+    Every connection is handled in a separate thread,
+    and the calls are executed by a :class:`compas.rpc.WorkerPool`.
+
+    Messages with the ``'instrument'`` option return the time it takes to decode, wait, execute, and encode,
+    and the size of the frames as ``'transfer'`` and ``'timing'``.
+
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, num_workers=1, executor='thread', call_timeout=None):
+        ThreadingTCPServer.__init__(self, address, _BinaryRequestHandler)
+        self._init_executor(num_workers, executor, call_timeout)
+        self.instance = None
+
+    def register_instance(self, instance):
+        """Register the dispatcher that executes the calls.
+
+        Parameters
+        ----------
+        instance : :class:`compas.rpc.Dispatcher`
+            The dispatcher.
+
+        """
+        self.instance = instance
+        self._start_pool(instance)
+
+    def handle_message(self, message):
+        """Handle a message of a client.
+
+        Parameters
+        ----------
+        message : dict
+            The message, with a ``'command'``, which is one of
+
+            * ``'ping'``,
+            * ``'shutdown'``,
+            * ``'statistics'``,
+            * ``'call'``, with the ``'calls'`` to execute one after the other,
+              and optionally the ``'timeout'`` of every call,
+            * ``'cancel'``, with the identifier of the ``'call'`` message to cancel.
+
+        Returns
+        -------
+        dict
+            The reply.
+
+        """
+        command = message.get('command')
+        if command == 'ping':
+            return {'data': self.ping()}
+        if command == 'shutdown':
+            return {'data': self.remote_shutdown()}
+        if command == 'statistics':
+            return {'data': self.statistics()}
+        if command == 'cancel':
+            return {'data': self.pool.cancel(message['call'])}
+        if command == 'call':
+            return {'results': self.execute(message['calls'], message.get('timeout'), message.get('id'))}
+        return {'error': 'Unknown command: {}'.format(command)}
+
+    def ping(self):
+        """Simple function used to check if a remote server can be reached."""
+        return 1
+
+    def remote_shutdown(self):
+        threading.Thread(target=self.shutdown).start()
+        return 1
+
+    def server_close(self):
+        if self.pool is not None:
+            self.pool.close()
+        ThreadingTCPServer.server_close(self)
+
 
 # ==============================================================================
 # Main
@@ -3,8 +3,14 @@
 The server binds to all network interfaces (i.e. ``0.0.0.0``) and
 it listens to requests on port ``1753``.
 
+The port, the transport, the number of workers, the executor of the workers,
+and the timeout of the calls can be passed as arguments of the script,
+for example ``python -m compas.rpc.services.default 1753 binary 4 process 60``
+starts a :class:`compas.rpc.BinaryServer` with four worker processes instead.
+
 """
 
+from compas.rpc import BinaryServer
 from compas.rpc import Dispatcher
 from compas.rpc import Server
 
@@ -15,16 +21,20 @@ class DefaultService(Dispatcher):
         super(DefaultService, self).__init__()
 
 
-def start_service(port):
+def start_service(port, transport='xmlrpc', num_workers=1, executor='thread', call_timeout=None):
     print('Starting default RPC service on port {0}...'.format(port))
 
     # start the server on *localhost*
     # and listen to requests on port *1753*
-    server = Server(("0.0.0.0", port))
+    if transport == 'binary':
+        server = BinaryServer(("0.0.0.0", port), num_workers=num_workers, executor=executor, call_timeout=call_timeout)
+    else:
+        server = Server(("0.0.0.0", port), num_workers=num_workers, executor=executor, call_timeout=call_timeout)
 
-    # register a few utility functions
-    server.register_function(server.ping)
-    server.register_function(server.remote_shutdown)
+        # register a few utility functions
+        server.register_function(server.ping)
+        server.register_function(server.remote_shutdown)
+        server.register_function(server.statistics)
 
     # register an instance of the default service
     # the default service extends the base service
@@ -35,7 +45,10 @@ def start_service(port):
     server.register_instance(DefaultService())
 
     print('Listening, press CTRL+C to abort...')
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
 
 
 # ==============================================================================
@@ -46,8 +59,14 @@ if __name__ == '__main__':
     import sys
 
     try:
-        port = int(sys.argv[3])
+        port = int(sys.argv[1])
     except Exception:
         port = 1753
 
-    start_service(port)
+    args = sys.argv[2:]
+    transport = args[0] if len(args) > 0 else 'xmlrpc'
+    num_workers = int(args[1]) if len(args) > 1 else 1
+    executor = args[2] if len(args) > 2 else 'thread'
+    call_timeout = float(args[3]) if len(args) > 3 else None
+
+    start_service(port, transport, num_workers, executor, call_timeout)
@@ -0,0 +1,120 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import threading
+
+from collections import deque
+
+
+__all__ = ['CallStatistics']
+
+
+def _percentile(values, q):
+    # nearest rank percentile of sorted values
+    index = int(round(q / 100.0 * (len(values) - 1)))
+    return values[index]
+
+
+def _summary(values):
+    values = sorted(values)
+    return {
+        'mean': sum(values) / len(values),
+        'p50': _percentile(values, 50),
+        'p90': _percentile(values, 90),
+        'p99': _percentile(values, 99),
+        'max': values[-1],
+    }
+
+
+class CallStatistics(object):
+    """Rolling statistics of the calls executed by a server, per function.
+
+    Parameters
+    ----------
+    window : int, optional
+        The number of most recent calls per function from which the percentiles are computed.
+        Default is ``1000``.
+
+    Examples
+    --------
+    >>> stats = CallStatistics()
+    >>> for i in range(1, 11):
+    ...     stats.record('compas.geometry.add_vectors', 0.01 * i, 0.001 * i)
+    >>> stats.record('compas.geometry.add_vectors', 0.5, 0.0, error=True)
+    >>> summary = stats.summary()['compas.geometry.add_vectors']
+    >>> summary['count'], summary['errors']
+    (11, 1)
+    >>> summary['latency']['p50']
+    0.06
+
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._functions = {}
+
+    def record(self, name, latency, execute, error=False):
+        """Record a call.
+
+        Parameters
+        ----------
+        name : str
+            The name of the function.
+        latency : float
+            The time between the arrival of the call at the server and its completion, in seconds.
+        execute : float
+            The execution time of the function, in seconds.
+        error : bool, optional
+            Whether the call failed.
+
+        """
+        with self._lock:
+            try:
+                item = self._functions[name]
+            except KeyError:
+                item = self._functions[name] = {'count': 0, 'errors': 0, 'latency': deque(maxlen=self.window), 'execute': deque(maxlen=self.window)}
+            item['count'] += 1
+            if error:
+                item['errors'] += 1
+            item['latency'].append(latency)
+            item['execute'].append(execute)
+
+    def summary(self):
+        """Summarise the statistics.
+
+        Returns
+        -------
+        dict
+            Per function, the total number of calls (``'count'``) and of failed calls (``'errors'``),
+            and the mean, median (``'p50'``), 90th and 99th percentiles, and maximum
+            of the ``'latency'`` and the ``'execute'`` time of the most recent calls, in seconds.
+
+        """
+        with self._lock:
+            items = [(name, item['count'], item['errors'], list(item['latency']), list(item['execute'])) for name, item in self._functions.items()]
+        summary = {}
+        for name, count, errors, latency, execute in items:
+            summary[name] = {
+                'count': count,
+                'errors': errors,
+                'latency': _summary(latency),
+                'execute': _summary(execute),
+            }
+        return summary
+
+    def clear(self):
+        """Remove all recorded calls."""
+        with self._lock:
+            self._functions = {}
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod(globs=globals())
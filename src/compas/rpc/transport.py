@@ -0,0 +1,429 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import io
+import itertools
+import json
+import socket
+import struct
+import threading
+import time
+
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+
+from compas.rpc.errors import RPCServerError
+from compas.rpc.futures import Future
+
+
+__all__ = ['send_message', 'recv_message', 'BinaryClient']
+
+
+# the header of a frame
+# the length of the JSON part of the message and the number of buffers
+# followed by the length of every buffer
+FRAME = '<II'
+LENGTH = '<Q'
+
+# the struct format characters of the array types that are transported as raw buffers
+TYPECODES = {
+    'b1': '?',
+    'i1': 'b', 'i2': 'h', 'i4': 'i', 'i8': 'q',
+    'u1': 'B', 'u2': 'H', 'u4': 'I', 'u8': 'Q',
+    'f4': 'f', 'f8': 'd',
+}
+
+
+class _BinaryEncoder(DataEncoder):
+    """Encoder that moves NumPy arrays and binary serialisable data structures out of the JSON text."""
+
+    def __init__(self, buffers, *args, **kwargs):
+        super(_BinaryEncoder, self).__init__(*args, **kwargs)
+        self.buffers = buffers
+
+    def default(self, o):
+        if hasattr(o, 'to_binary') and hasattr(type(o), 'from_binary'):
+            self.buffers.append(_to_cbf(o))
+            return {'__cbf__': len(self.buffers) - 1,
+                    'dtype': '{}/{}'.format(o.__class__.__module__, o.__class__.__name__)}
+        if hasattr(o, 'dtype') and hasattr(o, 'shape') and hasattr(o, 'tobytes'):
+            dtype = o.dtype.str
+            if dtype[1:] in TYPECODES:
+                from numpy import ascontiguousarray
+                self.buffers.append(ascontiguousarray(o).tobytes())
+                return {'__ndarray__': len(self.buffers) - 1, 'dtype': dtype, 'shape': list(o.shape)}
+        return super(_BinaryEncoder, self).default(o)
+
+
+class _BinaryDecoder(DataDecoder):
+    """Decoder that reconstructs the NumPy arrays and data structures of the buffers of a message."""
+
+    def __init__(self, buffers, *args, **kwargs):
+        super(_BinaryDecoder, self).__init__(*args, **kwargs)
+        self.buffers = buffers
+
+    def object_hook(self, o):
+        if '__ndarray__' in o:
+            return _from_buffer(self.buffers[o['__ndarray__']], o['dtype'], o['shape'])
+        if '__cbf__' in o:
+            module, attr = o['dtype'].split('/')
+            cls = getattr(__import__(module, fromlist=[attr]), attr)
+            return _from_cbf(cls, self.buffers[o['__cbf__']])
+        return super(_BinaryDecoder, self).object_hook(o)
+
+
+def _to_cbf(o):
+    stream = io.BytesIO()
+    o.to_binary(stream)
+    return stream.getvalue()
+
+
+def _from_cbf(cls, data):
+    return cls.from_binary(io.BytesIO(data))
+
+
+def _from_buffer(data, dtype, shape):
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        return numpy.frombuffer(data, dtype=dtype).reshape(shape)
+    # without NumPy arrays are reconstructed as nested lists
+    byteorder = '<' if dtype[0] == '|' else dtype[0]
+    typecode = TYPECODES[dtype[1:]]
+    count = len(data) // struct.calcsize(typecode)
+    values = list(struct.unpack('{}{}{}'.format(byteorder, count, typecode), bytes(data)))
+    for n in reversed(shape[1:]):
+        values = [values[i:i + n] for i in range(0, len(values), n)]
+    if not shape:
+        return values[0]
+    return values
+
+
+def _read(f, n):
+    data = bytearray(n)
+    view = memoryview(data)
+    i = 0
+    while i < n:
+        read = f.readinto(view[i:]) if hasattr(f, 'readinto') else None
+        if read is None:
+            chunk = f.read(n - i)
+            read = len(chunk)
+            view[i:i + read] = chunk
+        if not read:
+            raise EOFError('The connection was closed.')
+        i += read
+    return data
+
+
+def send_message(f, message, stats=None, extra=None):
+    """Write a message as a length-prefixed binary frame.
+
+    Parameters
+    ----------
+    f : file
+        A file-like object opened for writing in binary mode,
+        for example the output stream of a socket.
+    message : object
+        The message.
+        The message is encoded as JSON with :class:`compas.utilities.DataEncoder`,
+        except for NumPy arrays of booleans, integers or floats,
+        and for data structures that can be serialised with ``to_binary``,
+        which are sent as raw buffers after the JSON text.
+    stats : dict, optional
+        If provided, the time it takes to encode the message (``'encode'``)
+        and the size of the frame in bytes (``'nbytes'``) are added to it.
+    extra : callable, optional
+        A function that is called with ``stats`` after the message is encoded,
+        and returns a dictionary of items that are added to the message.
+        The message should be a dictionary.
+        This makes it possible to include the encoding time in the message itself.
+
+    Notes
+    -----
+    A frame consists of
+
+    * 4 bytes: the length of the JSON text (unsigned little endian integer).
+    * 4 bytes: the number of buffers (unsigned little endian integer).
+    * 8 bytes per buffer: the length of the buffer (unsigned little endian integer).
+    * The JSON text, UTF-8 encoded.
+    * The buffers.
+
+    Arrays are replaced in the JSON text by an object with the index of their buffer,
+    their type, and their shape.
+    Data structures are sent in COMPAS Binary Format (see :class:`compas.files.CBFWriter`).
+
+    """
+    start = time.time()
+    buffers = []
+    text = json.dumps(message, cls=_BinaryEncoder, buffers=buffers).encode('utf-8')
+    if stats is not None:
+        stats['encode'] = time.time() - start
+        stats['nbytes'] = struct.calcsize(FRAME) + len(buffers) * struct.calcsize(LENGTH) + len(text) + sum(len(buffer) for buffer in buffers)
+    if extra is not None:
+        # the items are added to the end of the encoded JSON object
+        items = json.dumps(extra(stats)).encode('utf-8')
+        text = items if text == b'{}' else text[:-1] + b', ' + items[1:]
+    header = struct.pack(FRAME, len(text), len(buffers))
+    lengths = b''.join(struct.pack(LENGTH, len(buffer)) for buffer in buffers)
+    f.write(header + lengths + text)
+    for buffer in buffers:
+        f.write(buffer)
+    f.flush()
+
+
+def recv_message(f, stats=None):
+    """Read a message sent with :func:`send_message`.
+
+    Parameters
+    ----------
+    f : file
+        A file-like object opened for reading in binary mode,
+        for example the input stream of a socket.
+    stats : dict, optional
+        If provided, the time it takes to decode the message once it is received (``'decode'``)
+        and the size of the frame in bytes (``'nbytes'``) are added to it.
+
+    Returns
+    -------
+    object
+        The message.
+        Arrays are reconstructed as NumPy arrays,
+        or as nested lists if NumPy is not available.
+
+    Raises
+    ------
+    EOFError
+        If the stream ends before the message is complete.
+
+    """
+    n, count = struct.unpack(FRAME, bytes(_read(f, struct.calcsize(FRAME))))
+    lengths = struct.unpack('<{}Q'.format(count), bytes(_read(f, count * struct.calcsize(LENGTH)))) if count else []
+    text = bytes(_read(f, n)).decode('utf-8')
+    buffers = [_read(f, length) for length in lengths]
+    start = time.time()
+    message = json.loads(text, cls=_BinaryDecoder, buffers=buffers)
+    if stats is not None:
+        stats['decode'] = time.time() - start
+        stats['nbytes'] = struct.calcsize(FRAME) + count * struct.calcsize(LENGTH) + n + sum(lengths)
+    return message
+
+
+class BinaryClient(object):
+    """Client of a :class:`compas.rpc.BinaryServer`.
+
+    Parameters
+    ----------
+    host : str
+        The address of the server.
+    port : int
+        The port number of the server.
+
+    Notes
+    -----
+    The connection is opened when the first message is sent,
+    and kept open for all following messages.
+
+    Messages are sent asynchronously. Every message has an identifier,
+    and the replies, which arrive in the order in which the server completes them,
+    are matched to the messages by a thread that reads from the connection.
+
+    The replies to messages with the ``'instrument'`` option contain the ``'transfer'`` statistics of the server,
+    to which the client adds the time it takes to encode the message and decode the reply
+    (``'client_encode'``, ``'client_decode'``) and the time of the complete round trip (``'total'``).
+
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._socket = None
+        self._rfile = None
+        self._wfile = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._pending = {}
+
+    def _connect(self):
+        # called with the lock acquired
+        if self._socket is None:
+            self._socket = socket.create_connection((self.host, self.port))
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._rfile = self._socket.makefile('rb')
+            self._wfile = self._socket.makefile('wb')
+            thread = threading.Thread(target=self._read, args=(self._socket, self._rfile))
+            thread.daemon = True
+            thread.start()
+
+    def _read(self, connection, rfile):
+        while True:
+            stats = {}
+            try:
+                reply = recv_message(rfile, stats)
+            except Exception:
+                break
+            with self._lock:
+                item = self._pending.pop(reply.get('id'), None)
+            if item is not None:
+                future, transform, start, sent = item
+                if 'transfer' in reply:
+                    reply['transfer']['client_encode'] = sent['encode']
+                    reply['transfer']['client_decode'] = stats['decode']
+                    reply['transfer']['total'] = time.time() - start
+                if reply.get('error'):
+                    future.set_exception(RPCServerError(reply['error']))
+                    continue
+                try:
+                    result = transform(reply) if transform else reply
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        with self._lock:
+            if self._socket is connection:
+                self._close('The connection to the server was lost.')
+
+    def submit(self, message, transform=None):
+        """Send a message to the server without waiting for the reply.
+
+        Parameters
+        ----------
+        message : dict
+            The message.
+        transform : callable, optional
+            A function that computes the result of the future from the reply.
+
+        Returns
+        -------
+        :class:`compas.rpc.Future`
+            The future reply, or its transformation.
+            Cancelling the future sends a request to cancel the message to the server.
+
+        """
+        key = str(next(self._ids))
+        message['id'] = key
+        future = Future(cancel=lambda: self.submit({'command': 'cancel', 'call': key}))
+        sent = {}
+        with self._lock:
+            self._connect()
+            self._pending[key] = future, transform, time.time(), sent
+            try:
+                send_message(self._wfile, message, sent)
+            except socket.error:
+                self._close('The connection to the server was lost.')
+        return future
+
+    def request(self, message):
+        """Send a message to the server and wait for the reply.
+
+        Parameters
+        ----------
+        message : dict
+            The message.
+
+        Returns
+        -------
+        dict
+            The reply.
+
+        """
+        return self.submit(message).result()
+
+    def call_async(self, calls, timeout=None, transform=None, instrument=False):
+        """Send a sequence of calls in one message, without waiting for the results.
+
+        Parameters
+        ----------
+        calls : list of dict
+            The calls, each a dictionary with the ``'name'`` of the function
+            and the positional and named arguments (``'args'``, ``'kwargs'``).
+        timeout : float, optional
+            The maximum execution time of every call on the server, in seconds.
+            Default is the timeout of the server.
+        transform : callable, optional
+            A function that computes the result of the future from the output dictionaries.
+        instrument : bool, optional
+            If ``True``, the output dictionaries include the ``'timing'`` of the calls on the server.
+            Default is ``False``.
+
+        Returns
+        -------
+        :class:`compas.rpc.Future`
+            The future output dictionary of every call.
+
+        """
+        message = {'command': 'call', 'calls': calls}
+        if timeout is not None:
+            message['timeout'] = timeout
+        if instrument:
+            message['instrument'] = True
+            for call in calls:
+                call.setdefault('instrument', True)
+        if transform is None:
+            return self.submit(message, lambda reply: reply['results'])
+        return self.submit(message, lambda reply: transform(reply['results']))
+
+    def call(self, calls, timeout=None):
+        """Execute a sequence of calls in one round trip.
+
+        Parameters
+        ----------
+        calls : list of dict
+            The calls, each a dictionary with the ``'name'`` of the function
+            and the positional and named arguments (``'args'``, ``'kwargs'``).
+        timeout : float, optional
+            The maximum execution time of every call on the server, in seconds.
+            Default is the timeout of the server.
+
+        Returns
+        -------
+        list of dict
+            The output dictionary of every call.
+
+        """
+        return self.call_async(calls, timeout).result()
+
+    def ping(self):
+        return self.request({'command': 'ping'})['data']
+
+    def remote_shutdown(self):
+        return self.request({'command': 'shutdown'})['data']
+
+    def _close(self, reason):
+        # called with the lock acquired
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+        for item in (self._rfile, self._wfile, self._socket):
+            if item is not None:
+                try:
+                    item.close()
+                except Exception:
+                    pass
+        self._socket = None
+        self._rfile = None
+        self._wfile = None
+        pending = self._pending
+        self._pending = {}
+        for future, _, _, _ in pending.values():
+            future.set_exception(RPCServerError(reason))
+
+    def close(self):
+        """Close the connection.
+
+        Calls that are still in progress fail with :class:`compas.rpc.RPCServerError`.
+        """
+        with self._lock:
+            self._close('The connection was closed.')
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,306 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import threading
+import time
+import traceback
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+from compas.rpc.errors import RPCCancelledError
+from compas.rpc.errors import RPCServerError
+from compas.rpc.errors import RPCTimeoutError
+
+
+__all__ = ['WorkerPool']
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+TIMEOUT = 'timeout'
+CANCELLED = 'cancelled'
+
+
+class _Job(object):
+
+    def __init__(self, method, args, key):
+        self.method = method
+        self.args = args
+        self.key = key
+        self.state = QUEUED
+        self.started = None
+        self.result = None
+        self.error = None
+        self.worker = None
+
+
+def _work(connection, instance):
+    # the loop of a worker process
+    while True:
+        try:
+            method, args = connection.recv()
+        except (EOFError, IOError, OSError):
+            break
+        try:
+            result = getattr(instance, method)(*args), None
+        except Exception:
+            result = None, traceback.format_exc()
+        try:
+            connection.send(result)
+        except Exception:
+            connection.send((None, traceback.format_exc()))
+
+
+class _ProcessWorker(object):
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.process = None
+        self.connection = None
+        self.start()
+
+    def start(self):
+        import multiprocessing
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_work, args=(child, self.instance))
+        self.process.daemon = True
+        self.process.start()
+        child.close()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def run(self, method, args):
+        self.connection.send((method, args))
+        return self.connection.recv()
+
+    def terminate(self):
+        self.process.terminate()
+
+    def stop(self):
+        self.terminate()
+        self.process.join()
+        self.connection.close()
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+
+class WorkerPool(object):
+    """A pool of workers that execute the methods of a dispatcher concurrently.
+
+    Parameters
+    ----------
+    instance : :class:`compas.rpc.Dispatcher`
+        The dispatcher.
+    num_workers : int, optional
+        The maximum number of calls that are executed at the same time.
+        Default is ``1``.
+    executor : {'thread', 'process'}, optional
+        Execute the calls in threads of the server process,
+        or in worker processes with their own copy of the dispatcher.
+        Default is ``'thread'``.
+
+    Notes
+    -----
+    Calls wait for a free worker in the order in which they arrive.
+
+    A call that exceeds its timeout, or that is cancelled, returns immediately.
+    A worker process that executes such a call is terminated and replaced by a new process.
+    A thread cannot be stopped, and keeps its worker until the function returns,
+    but the result is discarded.
+
+    Worker processes only share the state of the dispatcher at the time they are started.
+    The arguments and results of the calls are sent to and from them with ``pickle``.
+
+    """
+
+    def __init__(self, instance, num_workers=1, executor='thread'):
+        if executor not in ('thread', 'process'):
+            raise ValueError("The executor should be 'thread' or 'process': {}".format(executor))
+        self.instance = instance
+        self.num_workers = num_workers
+        self.executor = executor
+        self._condition = threading.Condition()
+        self._jobs = {}
+        self._keys = set()
+        self._cancelled = set()
+        if executor == 'thread':
+            self._slots = threading.Semaphore(num_workers)
+        else:
+            self._idle = Queue()
+            for _ in range(num_workers):
+                self._idle.put(_ProcessWorker(instance))
+
+    def run(self, method, args, timeout=None, key=None):
+        """Execute a method of the dispatcher in a worker and wait for the result.
+
+        Parameters
+        ----------
+        method : str
+            The name of the method.
+        args : tuple
+            The arguments of the method.
+        timeout : float, optional
+            The maximum execution time of the method, in seconds.
+            The time a call waits for a free worker does not count.
+            Default is ``None``, in which case there is no limit.
+        key : str, optional
+            An identifier with which the call can be cancelled.
+
+        Returns
+        -------
+        object
+            The result of the method.
+
+        Raises
+        ------
+        RPCTimeoutError
+            If the execution exceeds the timeout.
+        RPCCancelledError
+            If the call was cancelled.
+        RPCServerError
+            If the method raised an exception, or the worker process died.
+
+        """
+        job = _Job(method, args, key)
+        with self._condition:
+            if key is not None:
+                if key in self._cancelled:
+                    raise RPCCancelledError('The call was cancelled.')
+                self._keys.add(key)
+                self._jobs[key] = job
+        thread = threading.Thread(target=self._execute_thread if self.executor == 'thread' else self._execute_process, args=(job, ))
+        thread.daemon = True
+        thread.start()
+        with self._condition:
+            try:
+                while job.state in (QUEUED, RUNNING):
+                    if job.state == RUNNING and timeout is not None:
+                        remaining = job.started + timeout - time.time()
+                        if remaining <= 0:
+                            job.state = TIMEOUT
+                            self._interrupt(job)
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+            finally:
+                if key is not None and self._jobs.get(key) is job:
+                    del self._jobs[key]
+        if job.state == TIMEOUT:
+            raise RPCTimeoutError('The call exceeded the timeout of {} seconds.'.format(timeout))
+        if job.state == CANCELLED:
+            raise RPCCancelledError('The call was cancelled.')
+        if job.error is not None:
+            raise RPCServerError(job.error)
+        return job.result
+
+    def cancel(self, key):
+        """Cancel the calls with an identifier.
+
+        The call that is waiting or running is stopped,
+        and later calls with the same identifier are not executed,
+        until the identifier is released with :meth:`release`.
+
+        Parameters
+        ----------
+        key : str
+            The identifier of the calls.
+
+        Returns
+        -------
+        bool
+            ``True`` if there are calls with this identifier.
+
+        """
+        with self._condition:
+            if key not in self._keys:
+                return False
+            self._cancelled.add(key)
+            job = self._jobs.get(key)
+            if job is not None and job.state in (QUEUED, RUNNING):
+                if job.state == RUNNING:
+                    self._interrupt(job)
+                job.state = CANCELLED
+                self._condition.notify_all()
+            return True
+
+    def release(self, key):
+        """Release the identifier of calls that are finished."""
+        with self._condition:
+            self._keys.discard(key)
+            self._cancelled.discard(key)
+
+    def close(self):
+        """Stop the worker processes."""
+        if self.executor == 'process':
+            while not self._idle.empty():
+                self._idle.get().stop()
+
+    def _interrupt(self, job):
+        # called with the condition acquired
+        if job.worker is not None:
+            job.worker.terminate()
+
+    def _start(self, job, worker=None):
+        with self._condition:
+            if job.state != QUEUED:
+                return False
+            job.state = RUNNING
+            job.started = time.time()
+            job.worker = worker
+            self._condition.notify_all()
+            return True
+
+    def _finish(self, job, result, error):
+        with self._condition:
+            if job.state == RUNNING:
+                job.result = result
+                job.error = error
+                job.state = DONE
+            self._condition.notify_all()
+
+    def _execute_thread(self, job):
+        self._slots.acquire()
+        try:
+            if not self._start(job):
+                return
+            try:
+                result, error = getattr(self.instance, job.method)(*job.args), None
+            except Exception:
+                result, error = None, traceback.format_exc()
+            self._finish(job, result, error)
+        finally:
+            self._slots.release()
+
+    def _execute_process(self, job):
+        worker = self._idle.get()
+        failed = False
+        try:
+            if not self._start(job, worker):
+                return
+            try:
+                result, error = worker.run(job.method, job.args)
+            except (EOFError, IOError, OSError):
+                failed = True
+                result, error = None, 'The worker process of the call stopped unexpectedly.'
+            self._finish(job, result, error)
+        finally:
+            if failed or not worker.is_alive():
+                worker.restart()
+            self._idle.put(worker)
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+    pass
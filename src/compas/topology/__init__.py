@@ -44,11 +44,14 @@ traversal
     :nosignatures:
 
     astar_shortest_path
+    astar_bidirectional_shortest_path
     breadth_first_ordering
     breadth_first_traverse
     breadth_first_paths
     depth_first_ordering
     dijkstra_distances
+    dijkstra_multisource_distances
+    dijkstra_all_pairs_distances
     dijkstra_path
     shortest_path
 
@@ -115,8 +115,7 @@ def face_adjacency(xyz, faces):
 def _face_adjacency(xyz, faces, nmax=10, radius=2.0):
     points = [centroid_points([xyz[index] for index in face]) for face in faces]
     tree = KDTree(points)
-    closest = [tree.nearest_neighbors(point, nmax) for point in points]
-    closest = [[index for _, index, _ in nnbrs] for nnbrs in closest]
+    _, closest = tree.query(points, nmax)
     adjacency = {}
     for face, vertices in enumerate(faces):
         nbrs = []
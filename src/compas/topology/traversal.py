@@ -2,12 +2,10 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-try:
-    from queue import PriorityQueue
-except ImportError:
-    from Queue import PriorityQueue
-
 from collections import deque
+from heapq import heappop
+from heapq import heappush
+from itertools import count
 
 from compas.geometry import distance_point_point
 
@@ -19,7 +17,10 @@ __all__ = [
     'breadth_first_paths',
     'shortest_path',
     'astar_shortest_path',
+    'astar_bidirectional_shortest_path',
     'dijkstra_distances',
+    'dijkstra_multisource_distances',
+    'dijkstra_all_pairs_distances',
     'dijkstra_path'
 ]
 
@@ -309,12 +310,21 @@ def reconstruct_path(came_from, current):
     return total_path
 
 
+def _node_coordinates(network):
+    # networks have nodes, meshes have vertices
+    try:
+        return network.node_coordinates
+    except AttributeError:
+        return network.vertex_coordinates
+
+
 def astar_shortest_path(network, root, goal):
     """Find the shortest path between two vertices of a network using the A* search algorithm.
 
     Parameters
     ----------
-    network : instance of the Network class
+    network : :class:`compas.datastructures.Network` or :class:`compas.datastructures.Mesh`
+        The network or mesh. The length of an edge is the distance between its end points.
     root : hashable
         The identifier of the starting node.
     goal : hashable
@@ -325,6 +335,13 @@ def astar_shortest_path(network, root, goal):
     list, None
         The path from root to goal, or None, if no path exists between the vertices.
 
+    Notes
+    -----
+    The straight-line distance to the goal is used as heuristic.
+    Scores are only stored for the nodes that are actually discovered by the search,
+    and the candidates are kept on a binary heap.
+    Outdated heap entries are skipped when they are popped.
+
     Examples
     --------
     >>>
@@ -333,68 +350,187 @@ def astar_shortest_path(network, root, goal):
     ----------
     https://en.wikipedia.org/wiki/A*_search_algorithm
     """
-    root_coords = network.vertex_coordinates(root)
-    goal_coords = network.vertex_coordinates(goal)
+    adjacency = network.adjacency
+    coordinates = _node_coordinates(network)
+    goal_coords = coordinates(goal)
 
-    # The set of nodes already evaluated
-    visited_set = set()
-
-    # The set of currently discovered nodes that are not evaluated yet.
-    # Initially, only the start node is known.
-    candidates_set = {root}
-    best_candidate_heap = PriorityQueue()
-    best_candidate_heap.put((0, root))
+    xyz = {root: coordinates(root)}
+    tiebreak = count()
 
     # For each node, which node it can most efficiently be reached from.
-    # If a node can be reached from many nodes, came_from will eventually contain the
-    # most efficient previous step.
-    came_from = dict()
-
-    # g_score is a dict mapping node index to the cost of getting from the root node to that node.
-    # The default value is Infinity.
-    # The cost of going from start to start is zero.
-    g_score = dict()
+    came_from = {}
 
-    for v in network.vertices():
-        g_score[v] = float("inf")
+    # The cost of getting from the root node to every discovered node.
+    g_score = {root: 0}
 
-    g_score[root] = 0
-
-    # For each node, the total cost of getting from the start node to the goal
-    # by passing by that node. That value is partly known, partly heuristic.
-    # The default value of f_score is Infinity
-    f_score = dict()
-
-    for v in network.vertices():
-        f_score[v] = float("inf")
+    # The nodes already evaluated.
+    visited_set = set()
 
-    # For the first node, that value is completely heuristic.
-    f_score[root] = distance_point_point(root_coords, goal_coords)
+    best_candidate_heap = [(distance_point_point(xyz[root], goal_coords), next(tiebreak), root)]
 
-    while not best_candidate_heap.empty():
-        _, current = best_candidate_heap.get()
+    while best_candidate_heap:
+        _, _, current = heappop(best_candidate_heap)
         if current == goal:
             return reconstruct_path(came_from, current)
+        if current in visited_set:
+            continue
         visited_set.add(current)
-        current_coords = network.vertex_coordinates(current)
-        for neighbor in network.vertex_neighbors(current):
+        current_coords = xyz[current]
+        current_score = g_score[current]
+        for neighbor in adjacency[current]:
             if neighbor in visited_set:
-                continue  # Ignore the neighbor which is already evaluated.
-
-            # The distance from start to a neighbor
-            neighbor_coords = network.vertex_coordinates(neighbor)
-            tentative_gScore = g_score[current] + distance_point_point(current_coords, neighbor_coords)
-            if neighbor not in candidates_set:  # Discover a new node
-                candidates_set.add(neighbor)
-            elif tentative_gScore >= g_score[neighbor]:
                 continue
-
+            if neighbor not in xyz:
+                xyz[neighbor] = coordinates(neighbor)
+            neighbor_coords = xyz[neighbor]
+            tentative_gScore = current_score + distance_point_point(current_coords, neighbor_coords)
+            if tentative_gScore >= g_score.get(neighbor, float('inf')):
+                continue
             # This path is the best until now. Record it!
             came_from[neighbor] = current
             g_score[neighbor] = tentative_gScore
-            new_fscore = g_score[neighbor] + distance_point_point(neighbor_coords, goal_coords)
-            f_score[neighbor] = new_fscore
-            best_candidate_heap.put((new_fscore, neighbor))
+            new_fscore = tentative_gScore + distance_point_point(neighbor_coords, goal_coords)
+            heappush(best_candidate_heap, (new_fscore, next(tiebreak), neighbor))
+
+
+def astar_bidirectional_shortest_path(network, root, goal):
+    """Find the shortest path between two vertices of a network using a bidirectional A* search.
+
+    Parameters
+    ----------
+    network : :class:`compas.datastructures.Network` or :class:`compas.datastructures.Mesh`
+        The network or mesh. The length of an edge is the distance between its end points.
+    root : hashable
+        The identifier of the starting node.
+    goal : hashable
+        The identifier of the ending node.
+
+    Returns
+    -------
+    list, None
+        The path from root to goal, or None, if no path exists between the vertices.
+
+    Notes
+    -----
+    A forward search from ``root`` and a backward search from ``goal`` are grown
+    alternately, always expanding the side with the smaller candidate score.
+    Both searches use the average of the straight-line distances to ``goal`` and to ``root``
+    as (balanced) heuristic, which makes the reduced edge lengths the same in both directions.
+    The search stops as soon as the sum of the best candidate scores of both sides
+    is not smaller than the length of the best path found so far.
+
+    The edges of the network are assumed to be undirected.
+
+    Examples
+    --------
+    >>>
+
+    References
+    ----------
+    Goldberg, A.V., Harrelson, C. (2005). *Computing the shortest path: A* search meets graph theory*.
+    In Proceedings of the 16th Annual ACM-SIAM Symposium on Discrete Algorithms, pp. 156-165.
+    """
+    if root == goal:
+        return [root]
+
+    adjacency = network.adjacency
+    coordinates = _node_coordinates(network)
+    root_coords = coordinates(root)
+    goal_coords = coordinates(goal)
+
+    xyz = {}
+    potential = {}
+
+    def node_potential(key):
+        if key not in potential:
+            xyz[key] = coordinates(key)
+            potential[key] = 0.5 * (distance_point_point(xyz[key], goal_coords) - distance_point_point(xyz[key], root_coords))
+        return potential[key]
+
+    tiebreak = count()
+    # forward search (index 0) and backward search (index 1)
+    heaps = ([(0, next(tiebreak), root)], [(0, next(tiebreak), goal)])
+    scores = ({root: 0}, {goal: 0})
+    came_from = ({}, {})
+    visited = (set(), set())
+    # the potentials of the backward search have the opposite sign
+    signs = (1, -1)
+
+    best = float('inf')
+    meeting = None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        heap = heaps[side]
+        score = scores[side]
+        other = scores[1 - side]
+        sign = signs[side]
+
+        d, _, current = heappop(heap)
+        if current in visited[side]:
+            continue
+        visited[side].add(current)
+        current_potential = node_potential(current)
+        current_coords = xyz[current]
+        for neighbor in adjacency[current]:
+            if neighbor in visited[side]:
+                continue
+            neighbor_potential = node_potential(neighbor)
+            length = distance_point_point(current_coords, xyz[neighbor])
+            tentative = d + length + sign * (neighbor_potential - current_potential)
+            if tentative < score.get(neighbor, float('inf')):
+                score[neighbor] = tentative
+                came_from[side][neighbor] = current
+                heappush(heap, (tentative, next(tiebreak), neighbor))
+            if neighbor in other:
+                total = score[neighbor] + other[neighbor]
+                if total < best:
+                    best = total
+                    meeting = neighbor
+
+    if meeting is None:
+        return None
+
+    path = reconstruct_path(came_from[0], meeting)
+    node = meeting
+    while node in came_from[1]:
+        node = came_from[1][node]
+        path.append(node)
+    return path
+
+
+# ==============================================================================
+# Dijkstra
+# ==============================================================================
+
+
+def _dijkstra(adjacency, weight, sources, cutoff=None):
+    # heap-based Dijkstra with lazy deletion of outdated heap entries
+    # the tie breaker avoids comparing the (possibly unorderable) node keys
+    tiebreak = count()
+    distance = {}
+    tentative = {}
+    heap = []
+    for source in sources:
+        tentative[source] = 0
+        heappush(heap, (0, next(tiebreak), source))
+    while heap:
+        d, _, u = heappop(heap)
+        if u in distance:
+            continue
+        distance[u] = d
+        for v in adjacency[u]:
+            if v in distance:
+                continue
+            dv = d + weight[(u, v)]
+            if cutoff is not None and dv > cutoff:
+                continue
+            if dv < tentative.get(v, float('inf')):
+                tentative[v] = dv
+                heappush(heap, (dv, next(tiebreak), v))
+    return distance
 
 
 def dijkstra_distances(adjacency, weight, target):
@@ -414,30 +550,93 @@ def dijkstra_distances(adjacency, weight, target):
     -------
     dict
         A dictionary of distances to the target.
+        Vertices that cannot be reached have a distance of ``1e+17``.
 
-    Notes:
-        ...
+    Notes
+    -----
+    The vertices to visit are kept on a binary heap,
+    which makes the search run in O((V + E) log V) time.
 
     Examples
     --------
     >>>
     """
-    adjacency = {key: set(nbrs) for key, nbrs in adjacency.items()}
-    distance = {key: (0 if key == target else 1e+17) for key in adjacency}
-    tovisit = set(adjacency.keys())
-    visited = set()
-
-    while tovisit:
-        u = min(tovisit, key=lambda k: distance[k])
-        tovisit.remove(u)
-        visited.add(u)
-        for v in adjacency[u] - visited:
-            d = distance[u] + weight[(u, v)]
-            if d < distance[v]:
-                distance[v] = d
+    distance = {key: 1e+17 for key in adjacency}
+    distance.update(_dijkstra(adjacency, weight, [target]))
     return distance
 
 
+def dijkstra_multisource_distances(adjacency, weight, sources, cutoff=None):
+    """Compute Dijkstra distances from a set of source vertices to all vertices reachable from them.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    weight : dict
+        A dictionary of edge weights.
+    sources : list
+        The keys of the source vertices.
+    cutoff : float, optional
+        Only compute distances up to this value.
+        Default is ``None``, in which case the search is unbounded.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping every reached vertex to the distance to the nearest source.
+        Vertices that cannot be reached, or that are farther away than ``cutoff``, are not included.
+
+    Notes
+    -----
+    Edge ``(u, v)`` is traversed from ``u`` to ``v`` with weight ``weight[(u, v)]``.
+    The edge weights should all be positive.
+
+    Examples
+    --------
+    >>> adjacency = {0: [1], 1: [0, 2], 2: [1, 3], 3: [2]}
+    >>> weight = {(u, v): 1.0 for u in adjacency for v in adjacency[u]}
+    >>> dijkstra_multisource_distances(adjacency, weight, [0, 3]) == {0: 0, 1: 1.0, 2: 1.0, 3: 0}
+    True
+    >>> dijkstra_multisource_distances(adjacency, weight, [0], cutoff=1.0) == {0: 0, 1: 1.0}
+    True
+    """
+    return _dijkstra(adjacency, weight, sources, cutoff)
+
+
+def dijkstra_all_pairs_distances(adjacency, weight, cutoff=None):
+    """Compute Dijkstra distances between all pairs of vertices.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    weight : dict
+        A dictionary of edge weights.
+    cutoff : float, optional
+        Only compute distances up to this value.
+        Default is ``None``, in which case the searches are unbounded.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping every vertex to a dictionary of distances
+        to the vertices that can be reached from it.
+
+    Notes
+    -----
+    The distances are computed with a heap-based search from every vertex,
+    which is efficient for sparse graphs, i.e. O(V (V + E) log V).
+
+    Examples
+    --------
+    >>>
+    """
+    return {key: _dijkstra(adjacency, weight, [key], cutoff) for key in adjacency}
+
+
 def dijkstra_path(adjacency, weight, source, target, dist=None):
     """Find the shortest path between two vertices if the edge weights are not
     all the same.
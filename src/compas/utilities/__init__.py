@@ -45,6 +45,19 @@ datetime
     now
 
 
+encoders
+========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    DataEncoder
+    DataDecoder
+    literal_keys
+    json_load_stream
+
+
 itertools
 =========
 
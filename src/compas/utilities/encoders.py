@@ -3,9 +3,11 @@ from __future__ import absolute_import
 from __future__ import division
 
 import json
+import re
+from ast import literal_eval
 
 
-__all__ = ['DataDecoder', 'DataEncoder']
+__all__ = ['DataDecoder', 'DataEncoder', 'literal_keys', 'json_load_stream']
 
 
 class DataEncoder(json.JSONEncoder):
@@ -62,6 +64,190 @@ class DataDecoder(json.JSONDecoder):
         return cls.from_data(o['value'])
 
 
+def literal_keys(keys):
+    """Convert the string representations of a collection of dict keys back to keys.
+
+    Parameters
+    ----------
+    keys : iterable of str
+        The representations of the keys (``repr(key)``).
+
+    Returns
+    -------
+    list
+        The keys.
+
+    Notes
+    -----
+    JSON only supports strings as object keys, which is why the data structures
+    serialise their keys using ``repr``.
+    If all keys are integers, or tuples of integers, they are converted directly.
+    Otherwise, every key is evaluated with ``ast.literal_eval``.
+
+    Examples
+    --------
+    >>> literal_keys(['0', '1', '2'])
+    [0, 1, 2]
+    >>> literal_keys(['(0, 1)', '(1, 2)'])
+    [(0, 1), (1, 2)]
+    >>> literal_keys(["'a'", '(0, 1)'])
+    ['a', (0, 1)]
+
+    """
+    keys = list(keys)
+    try:
+        return list(map(int, keys))
+    except ValueError:
+        pass
+    if all(key[:1] == '(' and key[-1:] == ')' for key in keys):
+        try:
+            return [tuple(map(int, key[1:-1].split(','))) for key in keys]
+        except ValueError:
+            pass
+    return [literal_eval(key) for key in keys]
+
+
+class _JSONStream(object):
+
+    whitespace = ' \t\n\r'
+    number = re.compile(r'[-+0-9.eE]*')
+
+    def __init__(self, fp, decoder, chunksize):
+        self.fp = fp
+        self.decoder = decoder
+        self.chunksize = chunksize
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunksize)
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            text = self.text
+            pos = self.pos
+            n = len(text)
+            while pos < n and text[pos] in self.whitespace:
+                pos += 1
+            self.pos = pos
+            if pos < n:
+                return text[pos]
+            if not self.fill():
+                return ''
+
+    def next(self):
+        char = self.peek()
+        if not char:
+            raise ValueError('Unexpected end of JSON data.')
+        self.pos += 1
+        return char
+
+    def value(self):
+        if self.peek() in '-0123456789':
+            # make sure the number is not truncated at the end of the buffer
+            while self.number.match(self.text, self.pos).end() == len(self.text) and self.fill():
+                pass
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                if not self.fill():
+                    raise
+            else:
+                # a value that ends with the buffer may be truncated, such as a number
+                if end < len(self.text) or not self.fill():
+                    self.pos = end
+                    return value
+
+    def load(self, depth):
+        char = self.peek()
+        if depth <= 0 or char not in '{[':
+            return self.value()
+        self.pos += 1
+        if char == '{':
+            result = {}
+            if self.peek() == '}':
+                self.pos += 1
+            else:
+                while True:
+                    if self.peek() != '"':
+                        raise ValueError('Expecting property name enclosed in double quotes.')
+                    key = self.value()
+                    if self.next() != ':':
+                        raise ValueError("Expecting ':' delimiter.")
+                    result[key] = self.load(depth - 1)
+                    char = self.next()
+                    if char == '}':
+                        break
+                    if char != ',':
+                        raise ValueError("Expecting ',' delimiter.")
+            hook = getattr(self.decoder, 'object_hook', None)
+            return hook(result) if hook else result
+        result = []
+        if self.peek() == ']':
+            self.pos += 1
+            return result
+        while True:
+            result.append(self.load(depth - 1))
+            char = self.next()
+            if char == ']':
+                return result
+            if char != ',':
+                raise ValueError("Expecting ',' delimiter.")
+
+
+def json_load_stream(fp, cls=None, depth=2, chunksize=1048576):
+    """Load JSON data from a file without reading the entire text into memory.
+
+    Parameters
+    ----------
+    fp : file
+        A file object opened for reading.
+    cls : json.JSONDecoder, optional
+        The decoder class, for example :class:`DataDecoder`.
+        Default is ``json.JSONDecoder``.
+    depth : int, optional
+        The nesting depth up to which objects and arrays are decoded member by member.
+        Default is ``2``.
+    chunksize : int, optional
+        The number of characters that are read at a time.
+        Default is ``1048576``.
+
+    Returns
+    -------
+    object
+        The decoded data, identical to the result of ``json.load(fp, cls=cls)``.
+
+    Notes
+    -----
+    Objects and arrays up to the specified depth are decoded member by member,
+    such that at any time only one member at the deepest level has to be kept in memory as text.
+    For the data of a mesh, for example, this is the data of one vertex, or face.
+
+    Examples
+    --------
+    >>> import compas
+    >>> with open(compas.get('faces.json'), 'r') as fp:  # doctest: +SKIP
+    ...     data = json_load_stream(fp)
+
+    """
+    decoder = (cls or json.JSONDecoder)()
+    stream = _JSONStream(fp, decoder, chunksize)
+    result = stream.load(depth)
+    if stream.peek():
+        raise ValueError('Extra data after JSON document.')
+    return result
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
@@ -4,7 +4,9 @@ from __future__ import division
 
 import os
 import json
+import base64
 import tempfile
+import threading
 
 import compas
 import compas._os
@@ -17,6 +19,11 @@ try:
 except ImportError:
     import pickle
 
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
 try:
     from subprocess import Popen
     from subprocess import PIPE
@@ -118,6 +125,188 @@ else:
 """
 
 
+WORKER = """
+import sys
+import importlib
+import base64
+
+import json
+
+try:
+    import cPickle as pickle
+except Exception:
+    import pickle
+
+try:
+    from cStringIO import StringIO
+except Exception:
+    from io import StringIO
+
+import cProfile
+import pstats
+import traceback
+
+from compas.utilities import DataEncoder
+from compas.utilities import DataDecoder
+
+basedir    = sys.argv[1]
+serializer = sys.argv[2]
+
+sys.path.insert(0, basedir)
+
+stdin     = sys.stdin
+stdout    = sys.stdout
+functions = {}
+
+while True:
+    line = stdin.readline()
+    if not line.strip():
+        break
+
+    if serializer == 'json':
+        idict = json.loads(line, cls=DataDecoder)
+    else:
+        idict = pickle.loads(base64.b64decode(line.strip().encode('ascii')))
+
+    output = StringIO()
+    sys.stdout = output
+
+    try:
+        funcname = idict['funcname']
+        args     = idict['args']
+        kwargs   = idict['kwargs']
+
+        f = functions.get(funcname)
+        if f is None:
+            parts = funcname.split('.')
+            if len(parts) > 1:
+                m = importlib.import_module('.'.join(parts[:-1]))
+                f = functions[funcname] = getattr(m, parts[-1])
+            else:
+                raise Exception('Cannot import the function because no module name is specified.')
+
+        profile = cProfile.Profile()
+        profile.enable()
+
+        r = f(*args, **kwargs)
+
+        profile.disable()
+
+        stream = StringIO()
+        stats  = pstats.Stats(profile, stream=stream)
+        stats.sort_stats(1)
+        stats.print_stats(20)
+
+    except Exception:
+        odict = {}
+        odict['error']      = traceback.format_exc()
+        odict['data']       = None
+        odict['profile']    = None
+
+    else:
+        odict = {}
+        odict['error']      = None
+        odict['data']       = r
+        odict['profile']    = stream.getvalue()
+
+    sys.stdout = stdout
+    odict['output'] = output.getvalue()
+
+    try:
+        if serializer == 'json':
+            line = json.dumps(odict, cls=DataEncoder)
+        else:
+            line = base64.b64encode(pickle.dumps(odict, protocol=2)).decode('ascii')
+    except Exception:
+        odict = {'error': traceback.format_exc(), 'data': None, 'profile': None, 'output': odict['output']}
+        line = json.dumps(odict) if serializer == 'json' else base64.b64encode(pickle.dumps(odict, protocol=2)).decode('ascii')
+
+    stdout.write(line + '\\n')
+    stdout.flush()
+
+"""
+
+
+class _Worker(object):
+    """A persistent Python process that evaluates the calls of an :class:`XFunc`.
+
+    The requests and responses are exchanged one per line over the standard input
+    and output of the process.
+    """
+
+    def __init__(self, python, basedir, serializer):
+        self.python = python
+        self.basedir = basedir
+        self.serializer = serializer
+        self.process = None
+
+    def start(self):
+        env = compas._os.prepare_environment()
+        args = [WORKER, self.basedir, self.serializer]
+        try:
+            Popen
+
+        except NameError:
+            process = Process()
+            for name in env:
+                if process.StartInfo.EnvironmentVariables.ContainsKey(name):
+                    process.StartInfo.EnvironmentVariables[name] = env[name]
+                else:
+                    process.StartInfo.EnvironmentVariables.Add(name, env[name])
+            process.StartInfo.UseShellExecute = False
+            process.StartInfo.RedirectStandardInput = True
+            process.StartInfo.RedirectStandardOutput = True
+            process.StartInfo.FileName = self.python
+            process.StartInfo.Arguments = '-u -c "{0}" {1} {2}'.format(*args)
+            process.Start()
+
+        else:
+            process = Popen([self.python, '-u', '-c'] + args, stdin=PIPE, stdout=PIPE, env=env, universal_newlines=True)
+
+        self.process = process
+
+    def is_alive(self):
+        if self.process is None:
+            return False
+        try:
+            return self.process.poll() is None
+        except AttributeError:
+            return not self.process.HasExited
+
+    def request(self, line):
+        """Send a request to the process and return the response,
+        or ``None`` if the process stopped."""
+        try:
+            try:
+                self.process.stdin.write(line + '\n')
+                self.process.stdin.flush()
+                return self.process.stdout.readline() or None
+            except AttributeError:
+                self.process.StandardInput.WriteLine(line)
+                self.process.StandardInput.Flush()
+                return self.process.StandardOutput.ReadLine()
+        except (IOError, OSError):
+            return None
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            try:
+                self.process.stdin.close()
+                self.process.wait()
+            except AttributeError:
+                self.process.StandardInput.Close()
+                self.process.WaitForExit()
+        except (IOError, OSError):
+            pass
+        self.process = None
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+
 class XFunc(object):
     """Wrapper for functions that turns them into externally run processes.
 
@@ -156,6 +345,13 @@ class XFunc(object):
     serializer : {'json', 'pickle'}, optional
         The serialisation mechnanism to be used to pass data between the caller and the subprocess.
         Default is ``'json'``.
+    persistent : bool, optional
+        Set to ``True`` to evaluate the calls in worker processes that are kept alive between calls,
+        instead of starting a new process for every call.
+        Default is ``False``.
+    num_workers : int, optional
+        The number of worker processes of a persistent function.
+        Default is ``1``.
 
     Attributes
     ----------
@@ -174,6 +370,10 @@ class XFunc(object):
     __call__(*args, **kwargs)
         Call the wrapped function with the apropriate/related arguments and keyword
         arguments.
+    map(*iterables)
+        Call the wrapped function for every set of arguments.
+    close()
+        Stop the worker processes of a persistent function.
 
     Notes
     -----
@@ -184,6 +384,24 @@ class XFunc(object):
 
         fd_numpy = XFunc('compas.numerical.fd_numpy', python='/Users/brg/environments/py2/python')
 
+    By default, every call starts a new Python process,
+    which imports the function and its dependencies before the function is evaluated.
+    If the function is called often, it is more efficient to use a persistent function.
+    The worker processes of a persistent function are started at the first call,
+    and exchange the data of the calls over their standard input and output, without IO files.
+    The modules of the function are imported only once per worker.
+    Calls from different threads, and the calls of :meth:`map`,
+    are evaluated concurrently by the available workers.
+    If a worker process stops unexpectedly, it is restarted, and an exception is raised for the interrupted call.
+
+    .. code-block:: python
+
+        fd_numpy = XFunc('compas.numerical.fd_numpy', persistent=True, num_workers=4)
+
+        results = fd_numpy.map(vertices, edges, fixed, q, loads)
+
+        fd_numpy.close()
+
     Examples
     --------
     `compas.numerical` provides an implementation of the Force Density Method that
@@ -236,7 +454,8 @@ class XFunc(object):
     def __init__(self, funcname, basedir='.', tmpdir=None, delete_files=True,
                  verbose=True, callback=None, callback_args=None, python=None,
                  paths=None, serializer='json',
-                 argtypes=None, kwargtypes=None, restypes=None):
+                 argtypes=None, kwargtypes=None, restypes=None,
+                 persistent=False, num_workers=1):
         self._basedir = None
         self._tmpdir = None
         self._callback = None
@@ -255,9 +474,26 @@ class XFunc(object):
         self.argtypes = argtypes
         self.kwargtypes = kwargtypes
         self.restypes = restypes
+        self.persistent = persistent
+        self.num_workers = num_workers
         self.data = None
         self.profile = None
         self.error = None
+        self._workers = []
+        self._idle = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     @property
     def basedir(self):
@@ -354,6 +590,30 @@ class XFunc(object):
             # 'restypes': self.restypes
         }
 
+        if self.persistent:
+            odict = self._call_worker(idict)
+            self._output(odict['output'])
+        else:
+            odict = self._call_process(idict)
+
+        data = odict['data']
+        error = odict['error']
+
+        # the attributes are only set for backward compatibility,
+        # the result of the call should not be read back from them,
+        # since concurrent calls to a persistent function overwrite them
+        self.data = data
+        self.profile = odict['profile']
+        self.error = error
+
+        if error:
+            raise Exception(error)
+
+        return data
+
+    def _call_process(self, idict):
+        # evaluate the call in a new process,
+        # with the data exchanged through IO files
         if self.serializer == 'json':
             with open(self.ipath, 'w+') as fo:
                 json.dump(idict, fo, cls=DataEncoder)
@@ -416,10 +676,6 @@ class XFunc(object):
             with open(self.opath, 'rb') as fo:
                 odict = pickle.load(fo)
 
-        self.data = odict['data']
-        self.profile = odict['profile']
-        self.error = odict['error']
-
         if self.delete_files:
             try:
                 os.remove(self.ipath)
@@ -430,10 +686,140 @@ class XFunc(object):
             except OSError:
                 pass
 
-        if self.error:
-            raise Exception(self.error)
+        return odict
+
+    def _output(self, output):
+        for line in output.splitlines():
+            line = line.strip()
+            if self.callback:
+                self.callback(line, self.callback_args)
+            if self.verbose:
+                print(line)
+
+    def _start_workers(self):
+        with self._lock:
+            if self._idle is not None:
+                return
+            idle = Queue()
+            workers = []
+            try:
+                for i in range(max(1, self.num_workers)):
+                    worker = _Worker(self.python, self.basedir, self.serializer)
+                    worker.start()
+                    workers.append(worker)
+                    idle.put(worker)
+            except Exception:
+                for worker in workers:
+                    worker.stop()
+                raise
+            self._workers.extend(workers)
+            self._idle = idle
+
+    def _call_worker(self, idict):
+        # evaluate the call in an idle worker process,
+        # with the data exchanged over the standard input and output of the worker
+        self._start_workers()
+        idict = dict(idict, funcname=self.funcname)
+        if self.serializer == 'json':
+            line = json.dumps(idict, cls=DataEncoder)
+        else:
+            line = base64.b64encode(pickle.dumps(idict, protocol=2)).decode('ascii')
+
+        worker = self._idle.get()
+        try:
+            if not worker.is_alive():
+                worker.restart()
+            line = worker.request(line)
+            if not line:
+                worker.restart()
+                raise Exception('The worker process of {} stopped unexpectedly and has been restarted.'.format(self.funcname))
+        finally:
+            self._idle.put(worker)
 
-        return self.data
+        if self.serializer == 'json':
+            return json.loads(line, cls=DataDecoder)
+        return pickle.loads(base64.b64decode(line.strip().encode('ascii')))
+
+    def map(self, *iterables):
+        """Call the wrapped function for every set of arguments.
+
+        Parameters
+        ----------
+        iterables : list
+            One sequence of values per positional argument of the wrapped function,
+            as for the built-in ``map``.
+
+        Returns
+        -------
+        list
+            The data returned by the wrapped calls.
+
+        Notes
+        -----
+        The calls of a persistent function are dispatched concurrently to the available workers.
+        Otherwise, the calls are evaluated one after the other.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            add_vectors = XFunc('compas.geometry.add_vectors', persistent=True, num_workers=2)
+            add_vectors.map([[1, 0, 0], [0, 1, 0]], [[0, 0, 1], [0, 0, 1]])
+            # [[1, 0, 1], [0, 1, 1]]
+
+        """
+        calls = list(zip(*iterables))
+        if not self.persistent:
+            return [self(*args) for args in calls]
+
+        self._start_workers()
+        odicts = [None] * len(calls)
+        errors = []
+        jobs = Queue()
+        for index in range(len(calls)):
+            jobs.put(index)
+
+        def work():
+            while True:
+                try:
+                    index = jobs.get(False)
+                except Exception:
+                    return
+                try:
+                    odicts[index] = self._call_worker({'args': calls[index], 'kwargs': {}})
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=work) for i in range(min(len(self._workers), len(calls)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        for odict in odicts:
+            self._output(odict['output'])
+            error = odict['error']
+            if error:
+                self.data, self.profile, self.error = None, None, error
+                raise Exception(error)
+
+        data = [odict['data'] for odict in odicts]
+        self.data, self.profile, self.error = data, None, None
+        return data
+
+    def close(self):
+        """Stop the worker processes of a persistent function.
+
+        The workers are started again at the next call.
+        """
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle = None
 
 
 # ==============================================================================
@@ -1,4 +1,4 @@
-# import pytest
+import pytest
 import compas
 import json
 
@@ -60,6 +60,35 @@ def test_from_stl():
     assert mesh.number_of_edges() == 18
 
 
+@pytest.mark.parametrize('binary', [True, False])
+def test_to_stl(tmpdir, binary):
+    filepath = str(tmpdir.join('faces.stl'))
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh.to_stl(filepath, binary=binary, chunk_size=10)
+    other = Mesh.from_stl(filepath)
+    assert other.number_of_faces() == 2 * mesh.number_of_faces()
+    assert other.number_of_vertices() == mesh.number_of_vertices()
+
+
+@pytest.mark.parametrize('format', ['binary_little_endian', 'binary_big_endian', 'ascii'])
+def test_to_ply(tmpdir, format):
+    filepath = str(tmpdir.join('faces.ply'))
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh.update_default_vertex_attributes(is_fixed=False, name='')
+    mesh.update_default_face_attributes(weight=1.0)
+    mesh.vertex_attribute(0, 'is_fixed', True)
+    mesh.face_attribute(0, 'weight', 2.0)
+    mesh.to_ply(filepath, format=format)
+    other = Mesh.from_ply(filepath)
+    assert other.vertices_attributes('xyz') == mesh.vertices_attributes('xyz')
+    assert [other.face_vertices(fkey) for fkey in other.faces()] == [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+    assert other.vertices_attribute('is_fixed') == [1] + [0] * 35
+    assert other.faces_attribute('weight') == [2.0] + [1.0] * 24
+    assert other.vertex_attribute(0, 'name') is None
+    with pytest.raises(ValueError):
+        mesh.to_ply(filepath, vertex_attributes=['name'])
+
+
 def test_from_off():
     mesh = Mesh.from_off(compas.get('cube.off'))
     assert mesh.number_of_faces() == 6
@@ -77,8 +106,39 @@ def test_from_lines():
 
 
 def test_from_vertices_and_faces():
-    # tested through other functions
-    pass
+    vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0], [2.0, 0.0, 0.0]]
+    faces = [[0, 1, 2, 3], [1, 4, 2, 1], [4, 2]]
+    mesh = Mesh.from_vertices_and_faces(vertices, faces)
+    assert mesh.number_of_faces() == 2
+    assert mesh.number_of_vertices() == 5
+    assert mesh.number_of_edges() == 6
+    assert mesh.face_vertices(1) == [1, 4, 2]
+    other = Mesh.from_vertices_and_faces(vertices, [0, 1, 2, 3, 1, 4, 2, 1, 4, 2], offsets=[0, 4, 8])
+    assert other.data == mesh.data
+
+
+@pytest.mark.parametrize('storage', ['dict', 'array'])
+def test_from_vertices_and_faces_bulk(storage):
+    numpy = pytest.importorskip('numpy')
+    vertices, faces = Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces()
+    faces[0] = faces[0] + faces[0][:1]
+    faces[1] = faces[1][:3]
+    faces[2] = faces[2][:2]
+    mesh = Mesh(storage=storage)
+    for x, y, z in vertices:
+        mesh.add_vertex(x=x, y=y, z=z)
+    for face in faces:
+        mesh.add_face(face)
+    flat = [key for face in faces for key in face]
+    offsets = numpy.cumsum([0] + [len(face) for face in faces])
+    other = Mesh.from_vertices_and_faces(numpy.array(vertices), flat, offsets=offsets, storage=storage)
+    assert other.data == mesh.data
+    for key in mesh.vertices():
+        assert list(other.halfedge[key].items()) == list(mesh.halfedge[key].items())
+    assert list(other.edges()) == list(mesh.edges())
+    other = Mesh.from_vertices_and_faces(numpy.array(vertices), numpy.array(faces[3:]), storage=storage)
+    assert other.number_of_faces() == len(faces) - 3
+    assert other.face_vertices(0) == faces[3]
 
 
 def test_from_polyhedron():
@@ -125,6 +185,44 @@ def test_to_vertices_and_faces():
     assert len(faces) == 25
 
 
+@pytest.mark.parametrize('stream', [False, True])
+def test_to_json(tmpdir, stream):
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh.vertex_attribute(0, 'is_fixed', True)
+    mesh.face_attribute(2, 'weight', 1.5)
+    mesh.edge_attribute((0, 1), 'q', 2)
+    filepath = str(tmpdir.join('mesh.json'))
+    mesh.to_json(filepath)
+    other = Mesh.from_json(filepath, stream=stream)
+    assert other.data == mesh.data
+    assert list(other.edges()) == list(mesh.edges())
+    mesh.delete_vertex(3)
+    mesh.to_json(filepath)
+    assert Mesh.from_json(filepath, stream=stream).data == mesh.data
+
+
+@pytest.mark.parametrize('storage', ['dict', 'array'])
+def test_to_binary(tmpdir, storage):
+    vertices, faces = Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces()
+    mesh = Mesh.from_vertices_and_faces(vertices, faces, storage=storage)
+    mesh.update_default_vertex_attributes(is_fixed=False)
+    mesh.vertex_attribute(0, 'is_fixed', True)
+    mesh.vertex_attribute(1, 'label', {'a': [1, 2]})
+    mesh.face_attribute(2, 'weight', 1.5)
+    mesh.edge_attribute((0, 1), 'q', 2)
+    filepath = str(tmpdir.join('mesh.cbf'))
+    mesh.to_binary(filepath)
+    assert Mesh.from_binary(filepath, storage=storage).data == mesh.data
+    assert Mesh.from_binary(filepath, mmap=True).data == mesh.data
+    other = Mesh.from_binary(filepath, attributes=['weight'])
+    assert other.vertex_attribute(0, 'is_fixed') is False
+    assert other.vertex_attribute(1, 'label') is None
+    assert other.face_attribute(2, 'weight') == 1.5
+    mesh.delete_face(3)
+    mesh.to_binary(filepath)
+    assert Mesh.from_binary(filepath).data == mesh.data
+
+
 # --------------------------------------------------------------------------
 # helpers
 # --------------------------------------------------------------------------
@@ -341,7 +439,98 @@ def test_vertex_faces():
 # --------------------------------------------------------------------------
 
 def test_has_edge():
-    pass
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    for u, v in mesh.edges():
+        assert mesh.has_edge((u, v))
+        assert not mesh.has_edge((v, u))
+        assert mesh.has_edge((v, u), directed=False)
+    assert not mesh.has_edge((0, 35), directed=False)
+    assert not mesh.has_edge((0, 1000), directed=False)
+
+
+def test_edge_index():
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    edges = list(mesh.edges())
+    assert mesh.number_of_edges() == len(edges)
+    assert mesh.edge_index() == {key: index for index, key in enumerate(edges)}
+    assert mesh.index_edge() == dict(enumerate(edges))
+    for index, (u, v) in enumerate(edges):
+        assert mesh.edge_index((u, v)) == index
+        assert mesh.edge_index((v, u)) == index
+
+
+def test_edges_direction():
+    for storage in ('dict', 'array'):
+        mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0]], [[0, 1, 2]], storage=storage)
+        assert list(mesh.edges()) == [(0, 1), (0, 2), (1, 2)]
+        assert mesh.has_edge((0, 2))
+        assert not mesh.has_edge((2, 0))
+        mesh = Mesh.from_obj(compas.get('faces.obj'))
+        edges = list(mesh.edges())
+        assert len(edges) == len(set(edges)) == mesh.number_of_edges()
+        for u, v in edges:
+            assert (v, u) not in edges
+
+
+def test_edge_index_modified():
+    for storage in ('dict', 'array'):
+        mesh = Mesh.from_vertices_and_faces(*Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces(), storage=storage)
+        u, v = [(u, v) for u, v in mesh.edges() if not mesh.is_edge_on_boundary(u, v)][0]
+        fkey = mesh.halfedge[v][u]
+        assert mesh.edge_index((u, v)) == list(mesh.edges()).index((u, v))
+        w = mesh.split_edge(u, v)
+        assert not mesh.has_edge((u, v), directed=False)
+        assert mesh.has_edge((u, w)) and mesh.has_edge((w, v), directed=False)
+        mesh.delete_face(fkey)
+        edges = list(mesh.edges())
+        index = mesh.edge_index()
+        assert set(frozenset(key) for key in index) == set(frozenset(key) for key in edges)
+        assert len(set(index.values())) == len(index)
+        assert mesh.index_edge() == {i: key for key, i in index.items()}
+        assert mesh.number_of_edges() == len(edges)
+        for u, v in edges:
+            assert mesh.has_edge((u, v))
+            assert not mesh.has_edge((v, u))
+
+
+def test_edge_index_remeshing():
+    from compas.datastructures import mesh_collapse_edge
+    from compas.datastructures import mesh_split_edge
+    from compas.datastructures import trimesh_swap_edge
+    from compas.datastructures import trimesh_collapse_edge
+    from compas.datastructures import trimesh_split_edge
+    for storage in ('dict', 'array'):
+        vertices, faces = Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces()
+        triangles = [triangle for a, b, c, d in faces for triangle in ([a, b, c], [a, c, d])]
+        mesh = Mesh.from_vertices_and_faces(vertices, triangles, storage=storage)
+        index = mesh.edge_index()
+        for i, (u, v) in enumerate(list(mesh.edges())[::7]):
+            if not mesh.has_edge((u, v), directed=False):
+                continue
+            operation = [trimesh_split_edge, trimesh_collapse_edge, trimesh_swap_edge, mesh_split_edge, mesh_collapse_edge][i % 5]
+            if operation is trimesh_swap_edge:
+                u, v = [(u, v) for u, v in mesh.edges() if not mesh.is_edge_on_boundary(u, v)][i]
+                operation(mesh, u, v)
+            else:
+                operation(mesh, u, v, allow_boundary=True)
+            new = mesh.edge_index()
+            # the remaining edges keep their index
+            assert all(new[key] == index[key] for key in new if key in index)
+            assert set(frozenset(key) for key in new) == set(frozenset(key) for key in mesh.edges())
+            assert len(set(new.values())) == len(new) == mesh.number_of_edges()
+            index = new
+        mesh.delete_vertex(next(iter(mesh.vertices())))
+        assert set(frozenset(key) for key in mesh.edge_index()) == set(frozenset(key) for key in mesh.edges())
+
+
+def test_edge_index_direct_modification():
+    mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+    del mesh.halfedge[0][1]
+    del mesh.halfedge[1][0]
+    mesh.halfedge[0][2] = None
+    mesh.halfedge[2][0] = None
+    assert list(mesh.edges()) == [(0, 3), (0, 2), (1, 2), (2, 3)]
+    assert mesh.edge_index((2, 0)) == 1
 
 
 def test_edge_faces():
@@ -589,3 +778,121 @@ def test_edges_on_boundary():
 # --------------------------------------------------------------------------
 # attributes
 # --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# storage
+# --------------------------------------------------------------------------
+
+def test_array_storage():
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh2 = Mesh(storage='array')
+    for key, attr in mesh1.vertices(True):
+        mesh2.add_vertex(key, attr_dict=dict(attr))
+    for fkey in mesh1.faces():
+        mesh2.add_face(mesh1.face_vertices(fkey), fkey=fkey)
+    assert mesh2.storage == 'array'
+    assert mesh2.number_of_vertices() == 36
+    assert mesh2.number_of_faces() == 25
+    assert mesh2.number_of_edges() == 60
+    assert mesh2.is_valid()
+    for key in mesh1.vertices():
+        assert mesh2.vertex_coordinates(key) == mesh1.vertex_coordinates(key)
+        assert sorted(mesh2.vertex_neighbors(key)) == sorted(mesh1.vertex_neighbors(key))
+        assert mesh2.vertex_neighbors(key, ordered=True) == mesh1.vertex_neighbors(key, ordered=True)
+    for fkey in mesh1.faces():
+        assert mesh2.face_vertices(fkey) == mesh1.face_vertices(fkey)
+        assert mesh2.face_neighbors(fkey) == mesh1.face_neighbors(fkey)
+
+
+def test_array_storage_attributes():
+    mesh = Mesh(storage='array')
+    mesh.update_default_vertex_attributes({'is_fixed': False})
+    key = mesh.add_vertex(x=1, y=2)
+    assert mesh.vertex_attributes(key, 'xyz') == [1.0, 2.0, 0.0]
+    mesh.vertex_attribute(key, 'is_fixed', True)
+    assert mesh.vertex_attribute(key, 'is_fixed')
+    mesh.unset_vertex_attribute(key, 'x')
+    assert mesh.vertex_attribute(key, 'x') == 0.0
+    assert dict(mesh.vertex[key]) == {'y': 2.0, 'is_fixed': True}
+
+
+def test_array_storage_modifiers():
+    mesh = Mesh.from_polyhedron(6)
+    other = Mesh(storage='array')
+    other.data = mesh.data
+    other.delete_vertex(0)
+    other.cull_vertices()
+    mesh.delete_vertex(0)
+    mesh.cull_vertices()
+    assert other.is_valid()
+    assert other.number_of_vertices() == mesh.number_of_vertices()
+    assert other.number_of_faces() == mesh.number_of_faces()
+    assert other.number_of_edges() == mesh.number_of_edges()
+    u, v = next(iter(other.edges_on_boundary()))
+    w = other.split_edge(u, v, allow_boundary=True)
+    assert w in other.face_vertices(other.halfedge[u][w] or other.halfedge[w][u])
+    copy = other.copy()
+    assert copy.storage == 'array'
+    assert copy.number_of_vertices() == other.number_of_vertices()
+    assert copy.number_of_edges() == other.number_of_edges()
+
+
+def test_array_storage_split_and_subdivide():
+    from compas.datastructures import mesh_split_edge
+    from compas.datastructures import mesh_subdivide_quad
+    vertices, faces = Mesh.from_obj(compas.get('faces.obj')).to_vertices_and_faces()
+    meshes = [Mesh.from_vertices_and_faces(vertices, faces, storage=storage) for storage in ('dict', 'array')]
+    # enough relocations of growing rows to trigger the compaction of the block arrays
+    for mesh in meshes:
+        for _ in range(3):
+            for u, v in list(mesh.edges()):
+                mesh_split_edge(mesh, u, v, allow_boundary=True)
+    dict_mesh, array_mesh = meshes
+    assert array_mesh.is_valid()
+    assert {fkey: array_mesh.face_vertices(fkey) for fkey in array_mesh.faces()} == {fkey: dict_mesh.face_vertices(fkey) for fkey in dict_mesh.faces()}
+    dict_mesh, array_mesh = [mesh_subdivide_quad(mesh, k=2) for mesh in meshes]
+    assert array_mesh.is_valid()
+    assert array_mesh.number_of_faces() == dict_mesh.number_of_faces()
+    assert sorted(array_mesh.edges()) == sorted(dict_mesh.edges())
+
+
+def test_vertices_array():
+    for storage in ('dict', 'array'):
+        mesh = Mesh(storage=storage)
+        mesh.update_default_vertex_attributes({'q': 1.0, 'is_fixed': False})
+        for x in range(4):
+            mesh.add_vertex(x=x, y=0.0, z=0.0)
+        xyz = mesh.vertices_array('xyz')
+        assert xyz.shape == (4, 3)
+        assert xyz[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0]
+        assert mesh.vertices_array(['q']).ravel().tolist() == [1.0, 1.0, 1.0, 1.0]
+        mesh.vertices_array(['q', 'is_fixed'], [[2.0, True], [3.0, False], [4.0, False], [5.0, True]])
+        assert mesh.vertices_attribute('q') == [2.0, 3.0, 4.0, 5.0]
+        assert mesh.vertices_attribute('is_fixed') == [True, False, False, True]
+        mesh.vertices_array('z', [1.0], keys=[1, 2])
+        assert mesh.vertices_attribute('z') == [0.0, 1.0, 1.0, 0.0]
+        mesh.vertex_attribute(0, 'q', 'free')
+        assert mesh.vertices_attribute('q') == ['free', 3.0, 4.0, 5.0]
+
+
+def test_vertices_array_copy():
+    mesh = Mesh(storage='array')
+    for x in range(3):
+        mesh.add_vertex(x=x, y=0.0, z=0.0)
+    xyz = mesh.vertices_array('xyz')
+    q = mesh.vertices_array(['x'])
+    xyz[:, 1] = 1.0
+    assert mesh.vertices_attribute('y') == [0.0, 0.0, 0.0]
+    mesh.add_vertex(x=0.0, y=0.0)
+    assert mesh.vertices_array('xyz').tolist()[-1] == [0.0, 0.0, 0.0]
+    assert q.ravel().tolist() == [0.0, 1.0, 2.0]
+
+
+def test_faces_array():
+    for storage in ('dict', 'array'):
+        mesh = Mesh(storage=storage)
+        mesh.update_default_face_attributes({'t': 0.1})
+        mesh.data = Mesh.from_polyhedron(6).data
+        assert mesh.faces_array(['t']).ravel().tolist() == [0.1] * 6
+        mesh.faces_array(['t'], [[0.2]] * 6)
+        assert mesh.faces_attribute('t') == [0.2] * 6
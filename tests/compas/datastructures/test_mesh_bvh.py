@@ -0,0 +1,91 @@
+import random
+import sys
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import MeshBVH
+from compas.datastructures import mesh_pull_points_numpy
+from compas.datastructures import mesh_subdivide
+from compas.geometry import distance_point_point
+from compas.geometry import intersection_segment_plane
+
+bvh_module = sys.modules['compas.datastructures.mesh.bvh']
+
+
+@pytest.fixture
+def mesh():
+    return mesh_subdivide(Mesh.from_polyhedron(20), k=2, scheme='tri')
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def bvh(request, mesh, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(bvh_module, '_build_numpy', bvh_module._build)
+    return MeshBVH(mesh, leafsize=2)
+
+
+@pytest.fixture
+def points():
+    random.seed(0)
+    return [[random.uniform(-2.0, 2.0) for _ in range(3)] for _ in range(50)]
+
+
+def brute_force_closest(mesh, point):
+    distances = []
+    for fkey in mesh.faces():
+        a, b, c = mesh.face_coordinates(fkey)
+        xyz = bvh_module._closest_point_triangle(point[0], point[1], point[2], (a, b, c))
+        distances.append(distance_point_point(point, xyz))
+    return min(distances)
+
+
+def brute_force_first_hit(mesh, start, end):
+    hits = []
+    for fkey in mesh.faces():
+        a, b, c = mesh.face_coordinates(fkey)
+        direction = [end[i] - start[i] for i in range(3)]
+        t = bvh_module._ray_triangle(start[0], start[1], start[2], direction[0], direction[1], direction[2], (a, b, c))
+        if t is not None and 0.0 <= t <= 1.0:
+            hits.append(t)
+    return min(hits) if hits else None
+
+
+def test_closest_points(bvh, mesh, points):
+    for point, (xyz, fkey, distance) in zip(points, bvh.closest_points(points)):
+        assert distance == pytest.approx(brute_force_closest(mesh, point))
+        assert distance_point_point(point, xyz) == pytest.approx(distance)
+        assert intersection_segment_plane((point, xyz), (xyz, mesh.face_normal(fkey))) is not None
+
+
+def test_intersect_segments(bvh, mesh, points):
+    segments = list(zip(points, points[1:] + points[:1]))
+    for (start, end), hit in zip(segments, bvh.intersect_segments(segments)):
+        t = brute_force_first_hit(mesh, start, end)
+        if t is None:
+            assert hit is None
+        else:
+            assert hit[2] == pytest.approx(t)
+
+
+def test_intersect_rays(bvh):
+    hits = bvh.intersect_rays([([0.0, 0.0, 0.0], [0.0, 0.0, 1.0]), ([0.0, 0.0, 5.0], [0.0, 0.0, 1.0])])
+    assert hits[0] is not None
+    assert hits[0][0][2] == pytest.approx(hits[0][2])
+    assert hits[1] is None
+
+
+def test_contains_points(bvh, mesh, points):
+    radius = min(distance_point_point([0.0, 0.0, 0.0], mesh.face_centroid(fkey)) for fkey in mesh.faces())
+    inside = bvh.contains_points(points)
+    for point, result in zip(points, inside):
+        distance = distance_point_point([0.0, 0.0, 0.0], point)
+        if distance < radius:
+            assert result
+        elif distance > 1.0:
+            assert not result
+
+
+def test_pull_points(mesh, points):
+    for point, xyz in zip(points, mesh_pull_points_numpy(mesh, points)):
+        assert distance_point_point(point, xyz) == pytest.approx(brute_force_closest(mesh, point))
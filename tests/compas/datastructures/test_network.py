@@ -1,6 +1,11 @@
+import json
+
 import pytest
 
 from compas.datastructures import Network
+from compas.datastructures import network_count_crossings
+from compas.datastructures import network_find_crossings
+from compas.datastructures import network_is_crossed
 from compas.datastructures import network_is_planar
 
 
@@ -39,3 +44,66 @@ def test_non_planar(k5_network):
 def test_planar(k5_network):
     k5_network.delete_edge('a', 'b')  # Delete (a, b) edge to make K5 planar
     assert network_is_planar(k5_network) is True
+
+
+def test_crossings():
+    lines = [
+        ([0.0, 0.0, 0.0], [4.0, 4.0, 0.0]),
+        ([0.0, 4.0, 0.0], [4.0, 0.0, 0.0]),
+        ([4.0, 0.0, 0.0], [4.0, 4.0, 0.0]),
+        ([3.0, 2.0, 0.0], [5.0, 2.0, 0.0]),
+        ([10.0, 0.0, 0.0], [11.0, 0.0, 0.0]),
+    ]
+    network = Network.from_lines(lines)
+    crossings, points = network_find_crossings(network, points=True)
+    assert network_is_crossed(network)
+    assert network_count_crossings(network) == 2
+    assert len(crossings) == len(points) == 2
+    assert sorted(points) == [[2.0, 2.0, 0.0], [4.0, 2.0, 0.0]]
+    for (u1, v1), (u2, v2) in crossings:
+        assert len(set((u1, v1, u2, v2))) == 4
+
+
+def test_crossings_grid():
+    network = Network()
+    n = 10
+    for i in range(n):
+        for j in range(n):
+            network.add_node(i * n + j, x=float(i), y=float(j), z=0.0)
+    for i in range(n - 1):
+        for j in range(n - 1):
+            network.add_edge(i * n + j, (i + 1) * n + j + 1)
+            network.add_edge(i * n + j + 1, (i + 1) * n + j)
+    assert network_count_crossings(network) == (n - 1) ** 2
+
+
+def test_data(k5_network):
+    k5_network.update_default_node_attributes(x=0.0, y=0.0, z=0.0)
+    k5_network.edge_attribute(('a', 'b'), 'force', -2.5)
+    network = Network.from_data(json.loads(json.dumps(k5_network.data)))
+    assert network.data == k5_network.data
+    assert network.default_node_attributes == {'x': 0.0, 'y': 0.0, 'z': 0.0}
+    assert network.edge_attribute(('a', 'b'), 'force') == -2.5
+
+
+def test_to_binary(tmpdir, k5_network):
+    k5_network.update_default_node_attributes(x=0.0, y=0.0, z=0.0)
+    k5_network.node_attribute('a', 'x', 1.0)
+    k5_network.edge_attribute(('a', 'b'), 'force', -2.5)
+    filepath = str(tmpdir.join('network.cbf'))
+    k5_network.to_binary(filepath)
+    network = Network.from_binary(filepath)
+    assert network.data == k5_network.data
+    assert network.node_attribute('a', 'x') == 1.0
+    assert network.edge_attribute(('a', 'b'), 'force') == -2.5
+
+
+def test_to_ply(tmpdir, k5_network):
+    filepath = str(tmpdir.join('k5.ply'))
+    k5_network.update_default_edge_attributes(weight=1.0)
+    k5_network.edge_attribute(('a', 'b'), 'weight', 2.0)
+    k5_network.to_ply(filepath, format='ascii')
+    network = Network.from_ply(filepath)
+    assert network.number_of_nodes() == 5
+    assert network.number_of_edges() == 10
+    assert sorted(network.edges_attribute('weight')) == [1.0] * 9 + [2.0]
@@ -0,0 +1,65 @@
+import io
+
+import pytest
+
+from compas.files import CBFReader
+from compas.files import CBFWriter
+
+
+@pytest.fixture
+def cbf(tmpdir):
+    filepath = str(tmpdir.join('data.cbf'))
+    writer = CBFWriter(filepath, 'test', {'name': 'data'})
+    writer.add_array('points', [0.0, 0.0, 0.0, 1.0, 0.0, 0.0], '<f8', shape=(2, 3))
+    writer.add_table('point', [0, 1], [{'weight': 1.0, 'data': [1]}, {'weight': 2.0, 'fixed': True}])
+    writer.add_table('pair', [('a', 0), ('b', 1)], [{}, {}])
+    writer.write()
+    return filepath
+
+
+def test_header(cbf):
+    reader = CBFReader(cbf)
+    assert reader.version == 1
+    assert reader.schema == 'test'
+    assert reader.meta == {'name': 'data'}
+    assert reader.arrays['points']['shape'] == [2, 3]
+    assert all(array['offset'] % 64 == 0 for array in reader.arrays.values())
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_read_array(cbf, mmap):
+    reader = CBFReader(cbf, mmap=mmap)
+    points = reader.read_array('points')
+    assert points.shape == (2, 3)
+    assert points.tolist() == [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+
+
+def test_read_table(cbf):
+    reader = CBFReader(cbf)
+    keys, attrs = reader.read_table('point')
+    assert keys == [0, 1]
+    assert attrs == [{'weight': 1.0, 'data': [1]}, {'weight': 2.0, 'fixed': True}]
+    keys, attrs = reader.read_table('point', attributes=['fixed'])
+    assert attrs == [{}, {'fixed': True}]
+    keys, attrs = reader.read_table('pair')
+    assert keys == [('a', 0), ('b', 1)]
+
+
+def test_not_cbf(tmpdir):
+    filepath = str(tmpdir.join('data.txt'))
+    with open(filepath, 'w') as f:
+        f.write('not a cbf file')
+    with pytest.raises(ValueError):
+        CBFReader(filepath)
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_file_object(mmap):
+    stream = io.BytesIO()
+    writer = CBFWriter(stream, 'test')
+    writer.add_array('points', [0.0, 0.0, 0.0, 1.0, 0.0, 0.0], '<f8', shape=(2, 3))
+    writer.add_table('point', [0, 1], [{'weight': 1.0}, {}])
+    writer.write()
+    reader = CBFReader(io.BytesIO(stream.getvalue()), mmap=mmap)
+    assert reader.read_array('points').tolist() == [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+    assert reader.read_table('point') == ([0, 1], [{'weight': 1.0}, {}])
@@ -1,9 +1,13 @@
 import os
 
+import numpy as np
 import pytest
 
 import compas
+from compas.datastructures import Mesh
 from compas.files import GLTF
+from compas.files import GLTFExporter
+from compas.geometry import matrix_from_translation
 
 compas.PRECISION = '12f'
 
@@ -59,3 +63,38 @@ def test_from_gltf_edges_loaded(simple_gltf, embedded_gltf, interleaved_glb, ind
 
     gltf = GLTF(sparse_gltf)
     assert (5.0, 4.0, 0.0) in gltf.parser.scenes[0].nodes[0].mesh_data.vertices
+
+
+@pytest.mark.parametrize('name', ['SimpleMeshes.gltf', 'SimpleMeshesEmbedded.gltf', 'BoxInterleaved.glb',
+                                  'TriangleWithoutIndices.gltf', 'SimpleMorph.gltf', 'SimpleSparseAccessor.gltf'])
+def test_arrays(name):
+    filepath = os.path.join(BASE_FOLDER, 'fixtures', name)
+    gltf = GLTF(filepath)
+    gltf_arrays = GLTF(filepath, arrays=True)
+    for data, array in zip(gltf.reader.data, gltf_arrays.reader.data):
+        assert np.array_equal(array, data)
+    nodes = gltf.parser.scenes[0].nodes
+    for key, node in gltf_arrays.parser.scenes[0].nodes.items():
+        if node.mesh_data is not None:
+            assert np.array_equal(node.mesh_data.vertices, nodes[key].mesh_data.vertices)
+            assert np.array_equal(node.mesh_data.faces, nodes[key].mesh_data.faces)
+
+
+@pytest.mark.parametrize('extension', ['.glb', '.gltf'])
+def test_exporter(tmpdir, extension):
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    mesh.update_default_vertex_attributes(color=(255, 0, 0))
+    filepath = str(tmpdir.join('faces' + extension))
+    exporter = GLTFExporter(filepath)
+    exporter.add_mesh(mesh, name='faces', colors='color', matrix=matrix_from_translation([1.0, 2.0, 3.0]))
+    exporter.export()
+
+    gltf = GLTF(filepath, arrays=True)
+    node = gltf.parser.scenes[0].nodes[0]
+    assert node.name == 'faces'
+    assert node.position == [1.0, 2.0, 3.0]
+    assert len(node.mesh_data.faces) == 2 * mesh.number_of_faces()
+    assert np.allclose(node.mesh_data.vertices, mesh.vertices_attributes('xyz'))
+    attributes = gltf.reader.json['meshes'][0]['primitives'][0]['attributes']
+    assert np.allclose(gltf.reader.data[attributes['NORMAL']], [mesh.vertex_normal(key) for key in mesh.vertices()])
+    assert np.allclose(gltf.reader.data[attributes['COLOR_0']], [[1.0, 0.0, 0.0]] * mesh.number_of_vertices())
@@ -0,0 +1,105 @@
+import struct
+
+import numpy as np
+import pytest
+
+from compas.files import LAS
+from compas.files import LASReader
+from compas.files.las import HEADER_12
+from compas.files.las import HEADER_14
+from compas.files.las import _point_dtype
+
+RECORD_LENGTH = {0: 20, 3: 34, 6: 30, 7: 36}
+
+
+def write_las(filepath, xyz, classes, version=(1, 2), point_format=0, extra=0, point_format_bits=0):
+    fields = HEADER_14 if version >= (1, 4) else HEADER_12
+    header_size = struct.calcsize('<' + ''.join(fmt for _, fmt in fields))
+    description = b'test'.ljust(32, b'\0')
+    vlr = struct.pack('<H16sHH32s', 0, b'compas', 1, 3, description) + b'abc'
+    dtype = _point_dtype(point_format, RECORD_LENGTH[point_format] + extra)
+    records = np.zeros(len(xyz), dtype=dtype)
+    scale = [0.01, 0.01, 0.001]
+    offset = [100.0, 200.0, 0.0]
+    for i, name in enumerate('XYZ'):
+        records[name] = np.round((xyz[:, i] - offset[i]) / scale[i])
+    if point_format < 6:
+        records['classification_bits'] = classes
+        records['return_bits'] = 1 | (2 << 3)
+    else:
+        records['classification'] = classes
+        records['return_bits'] = 1 | (2 << 4)
+    records['intensity'] = np.arange(len(xyz))
+    if 'red' in dtype.names:
+        records['red'] = 65535
+    values = {
+        'file_signature': b'LASF', 'version_major': version[0], 'version_minor': version[1],
+        'header_size': header_size, 'offset_to_points': header_size + len(vlr), 'number_of_vlrs': 1,
+        'point_format': point_format | point_format_bits, 'point_record_length': dtype.itemsize,
+        'legacy_point_count': len(xyz) if point_format < 6 else 0, 'point_count': len(xyz),
+        'scale': scale, 'offset': offset,
+        'min_x': xyz[:, 0].min(), 'max_x': xyz[:, 0].max(), 'min_y': xyz[:, 1].min(),
+        'max_y': xyz[:, 1].max(), 'min_z': xyz[:, 2].min(), 'max_z': xyz[:, 2].max(),
+    }
+    args = []
+    for name, fmt in fields:
+        value = values.get(name, b'' if fmt[-1] == 's' else 0)
+        count = int(fmt[:-1] or 1)
+        if fmt[-1] != 's' and count > 1:
+            args.extend(value if isinstance(value, list) else [0] * count)
+        else:
+            args.append(value)
+    with open(filepath, 'wb') as f:
+        f.write(struct.pack('<' + ''.join(fmt for _, fmt in fields), *args))
+        f.write(vlr)
+        f.write(records.tobytes())
+
+
+@pytest.fixture
+def cloud():
+    xyz = np.random.RandomState(0).uniform([100, 200, 0], [110, 220, 5], (1000, 3)).round(2)
+    classes = np.arange(1000) % 4
+    return xyz, classes
+
+
+@pytest.mark.parametrize('version, point_format, extra', [((1, 2), 0, 0), ((1, 2), 3, 4), ((1, 4), 7, 0), ((1, 4), 6, 2)])
+@pytest.mark.parametrize('mmap', [True, False])
+def test_read(tmpdir, cloud, version, point_format, extra, mmap):
+    xyz, classes = cloud
+    filepath = str(tmpdir.join('cloud.las'))
+    write_las(filepath, xyz, classes, version, point_format, extra)
+    reader = LASReader(filepath, mmap=mmap)
+    assert reader.point_count == 1000
+    assert reader.version == version
+    assert reader.vlrs[0]['user_id'] == 'compas' and reader.vlrs[0]['data'] == b'abc'
+    assert np.allclose(reader.bounds, [xyz.min(axis=0), xyz.max(axis=0)])
+    parser = LAS(filepath).parser
+    assert np.allclose(parser.points, xyz)
+    assert np.array_equal(parser.classification, classes)
+    assert (parser.colors is not None) == (point_format in (3, 7))
+    records = reader.records(10, 20)
+    assert reader.attribute(records, 'return_number').tolist() == [1] * 10
+    assert reader.attribute(records, 'number_of_returns').tolist() == [2] * 10
+
+    bbox = [[102, 205, 1], [108, 215, 4]]
+    chunks = list(reader.iter_points(chunk_size=300, bbox=bbox, classification=[1, 3], attributes=['intensity']))
+    points = np.vstack([points for points, _ in chunks])
+    intensity = np.concatenate([attributes['intensity'] for _, attributes in chunks])
+    mask = ((xyz >= bbox[0]) & (xyz <= bbox[1])).all(axis=1) & (classes % 2 == 1)
+    assert np.allclose(points, xyz[mask])
+    assert np.array_equal(intensity, np.nonzero(mask)[0])
+
+
+def test_read_invalid(tmpdir, cloud):
+    xyz, classes = cloud
+    filepath = str(tmpdir.join('cloud.las'))
+    write_las(filepath, xyz, classes, point_format_bits=0x80)
+    with pytest.raises(NotImplementedError):
+        LASReader(filepath)
+    write_las(filepath, xyz, classes)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    with open(filepath, 'wb') as f:
+        f.write(data[:-10])
+    with pytest.raises(ValueError):
+        LASReader(filepath)
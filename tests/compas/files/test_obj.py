@@ -0,0 +1,90 @@
+import sys
+
+import pytest
+
+import compas
+from compas.datastructures import Mesh
+from compas.files import OBJ
+from compas.files import OBJReader
+
+
+CONTENT = """# comment
+o first
+v 0.0 0.0 0.0
+v 1.0 0.0 0.0
+v 1.0 1.0 0.0
+v 0.0 1.0 0.0
+v 1.0 0.0 0.0 2.0
+f 1/1/1 2/2/2 3/3/3 \\
+ 4/4/4
+l 1 3
+o second
+v 2.0 0.0 0.0
+v 2.0\t1.0 0.0
+f 2 6 7
+f 5 6 7 3
+f 1  2 4
+"""
+
+
+@pytest.fixture
+def obj(tmpdir):
+    filepath = str(tmpdir.join('test.obj'))
+    with open(filepath, 'w') as f:
+        f.write(CONTENT)
+    return filepath
+
+
+def read(filepath, **kwargs):
+    obj = OBJ(filepath, **kwargs)
+    obj.read()
+    vertices = [list(xyz) for xyz in obj.vertices]
+    faces = obj.faces
+    if obj.parser.face_offsets is not None:
+        offsets = obj.parser.face_offsets.tolist()
+        faces = [faces[i:j].tolist() for i, j in zip(offsets[:-1], offsets[1:])]
+    return vertices, [list(face) for face in faces], obj.lines
+
+
+@pytest.mark.parametrize('name', ['faces.obj', 'quadmesh.obj'])
+def test_low_memory(name):
+    assert read(compas.get(name)) == read(compas.get(name), low_memory=True)
+
+
+def test_read(obj, monkeypatch):
+    vertices, faces, lines = read(obj)
+    assert len(vertices) == 6
+    assert faces == [[0, 1, 2, 3], [1, 4, 5], [1, 4, 5, 2], [0, 1, 3]]
+    assert lines == [[0, 2]]
+    assert read(obj, low_memory=True) == (vertices, faces, lines)
+    vertices, faces, lines = read(obj, weld=False)
+    assert len(vertices) == 7
+    assert faces[1:3] == [[1, 5, 6], [4, 5, 6, 2]]
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    assert read(obj, weld=False) == (vertices, faces, lines)
+
+
+def test_reader_chunks(obj):
+    reader = OBJReader(obj, chunk_size=2)
+    reader.open()
+    reader.pre()
+    reader.read()
+    assert reader.faces[0] == [0, 1, 2, 3]
+    assert reader.weights[4] == 2.0
+    assert len(reader.vertices) == 7
+
+
+@pytest.mark.parametrize('low_memory', [False, True])
+def test_iter_groups(obj, low_memory):
+    groups = list(OBJ(obj, low_memory=low_memory).iter_groups())
+    assert [name for name, _, _ in groups] == ['first', 'second']
+    assert len(groups[0][1]) == 4
+    name, vertices, faces = groups[1]
+    assert len(vertices) == 7
+    assert [list(face) for face in faces] == [[1, 5, 6], [4, 5, 6, 2], [0, 1, 3]]
+
+
+def test_mesh_from_obj():
+    mesh = Mesh.from_obj(compas.get('faces.obj'), low_memory=True)
+    assert mesh.number_of_vertices() == 36
+    assert mesh.number_of_faces() == 25
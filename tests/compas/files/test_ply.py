@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+from compas.files import PLY
+from compas.files import PLYWriter
+
+BASE_FOLDER = os.path.dirname(__file__)
+
+
+def read(filepath):
+    parser = PLY(filepath).parser
+    vertices = [list(xyz) for xyz in parser.vertices]
+    faces = [list(face) for face in parser.faces]
+    attributes = {name: list(values) for name, values in parser.face_attributes.items()}
+    return vertices, faces, attributes
+
+
+@pytest.mark.parametrize('name', ['bigX_sphere.ply', 'triangle_binary.ply'])
+def test_read_without_numpy(name, monkeypatch):
+    filepath = os.path.join(BASE_FOLDER, 'fixtures', name)
+    vertices, faces, attributes = read(filepath)
+    assert len(faces) > 0
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    assert read(filepath) == (vertices, faces, attributes)
+
+
+@pytest.mark.parametrize('format', PLYWriter.formats)
+@pytest.mark.parametrize('faces', [[[0, 1, 2], [1, 3, 2]], [[0, 1, 3, 2], [1, 4, 3]]])
+def test_write(tmpdir, format, faces):
+    filepath = str(tmpdir.join('test.ply'))
+    vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.5], [2.0, 0.0, 0.25]]
+    writer = PLYWriter(filepath, format=format, comments=['test'])
+    writer.add_element('vertex', [(name, 'float', [xyz[i] for xyz in vertices]) for i, name in enumerate('xyz')])
+    writer.add_element('face', [('weight', None, [0.5, 1.5]),
+                                ('vertex_indices', 'list uchar int', faces),
+                                ('is_fixed', None, [True, False])])
+    writer.write()
+    assert read(filepath) == (vertices, faces, {'weight': [0.5, 1.5], 'is_fixed': [1, 0]})
+    assert PLY(filepath).reader.comments == ['test']
+    with pytest.raises(ValueError):
+        writer.add_element('edge', [('vertex1', 'int', [0]), ('vertex2', 'int', [1, 2])])
+
+
+def test_read_truncated(tmpdir):
+    filepath = str(tmpdir.join('test.ply'))
+    writer = PLYWriter(filepath)
+    writer.add_element('vertex', [(name, 'double', [0.0, 1.0, 0.0]) for name in 'xyz'])
+    writer.write()
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    with open(filepath, 'wb') as f:
+        f.write(data[:-4])
+    with pytest.raises(ValueError):
+        PLY(filepath).read()
@@ -1,9 +1,12 @@
 import os
+import sys
 
 import pytest
 
 import compas
 from compas.files import STL
+from compas.files import STLReader
+from compas.files import STLWriter
 
 compas.PRECISION = '12f'
 
@@ -34,3 +37,50 @@ def test_binary_detection(ascii_stl, binary_stl, binary_stl_with_ascii_header):
 
     stl = STL(binary_stl_with_ascii_header)
     assert len(stl.parser.vertices) > 0
+
+
+def test_binary_vectorized(binary_stl, monkeypatch):
+    stl = STL(binary_stl)
+    assert stl.reader.triangles.shape == (len(stl.parser.faces), 3, 3)
+    assert stl.reader.facets[0]['vertices'] == stl.reader.triangles[0].tolist()
+    vertices, faces = stl.parser.vertices, stl.parser.faces
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    stl = STL(binary_stl)
+    assert isinstance(stl.reader.triangles, list)
+    assert stl.parser.vertices == vertices
+    assert stl.parser.faces == faces
+
+
+def test_binary_precision(binary_stl):
+    exact = STL(binary_stl).parser
+    welded = STL(binary_stl, precision='1f').parser
+    assert len(welded.vertices) < len(exact.vertices)
+    assert len(welded.faces) == len(exact.faces)
+
+
+def test_binary_truncated(binary_stl, tmpdir):
+    filepath = str(tmpdir.join('truncated.stl'))
+    with open(binary_stl, 'rb') as f:
+        data = f.read()
+    with open(filepath, 'wb') as f:
+        f.write(data[:-10])
+    with pytest.raises(ValueError):
+        STLReader(filepath)
+
+
+@pytest.mark.parametrize('binary', [True, False])
+@pytest.mark.parametrize('numpy', [True, False])
+def test_writer(binary_stl, tmpdir, monkeypatch, binary, numpy):
+    source = STL(binary_stl)
+    triangles = source.reader.triangles.tolist()
+    if not numpy:
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+    filepath = str(tmpdir.join('triangles.stl'))
+    with STLWriter(filepath, binary=binary, precision='9e') as writer:
+        writer.write_triangles(triangles[:1000])
+        writer.write_triangles(triangles[1000:])
+    stl = STL(filepath)
+    assert [list(xyz) for xyz in stl.reader.facets[0]['vertices']] == [pytest.approx(xyz) for xyz in triangles[0]]
+    assert len(stl.parser.faces) == len(source.parser.faces)
+    if binary:
+        assert stl.parser.faces == source.parser.faces
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.geometry import convex_hull
+from compas.geometry import cross_vectors
+from compas.geometry import dot_vectors
+from compas.geometry import subtract_vectors
+
+
+def sphere(n):
+    random.seed(0)
+    points = []
+    for _ in range(n):
+        x, y, z = [random.gauss(0, 1) for _ in range(3)]
+        length = (x ** 2 + y ** 2 + z ** 2) ** 0.5
+        points.append([x / length, y / length, z / length])
+    return points
+
+
+def is_convex_hull(points, faces):
+    halfedges = set()
+    for face in faces:
+        for i in range(3):
+            halfedges.add((face[i - 1], face[i]))
+    if len(halfedges) != 3 * len(faces):
+        return False
+    if any((v, u) not in halfedges for u, v in halfedges):
+        return False
+    for a, b, c in faces:
+        normal = cross_vectors(subtract_vectors(points[b], points[a]), subtract_vectors(points[c], points[a]))
+        if any(dot_vectors(normal, subtract_vectors(point, points[a])) > 1e-9 for point in points):
+            return False
+    return True
+
+
+def test_convex_hull_sphere():
+    points = sphere(500)
+    faces = convex_hull(points)
+    assert is_convex_hull(points, faces)
+    assert len(set(key for face in faces for key in face)) == len(points)
+    assert len(faces) == 2 * len(points) - 4
+
+
+def test_convex_hull_interior_points():
+    points = sphere(100) + [[0.1 * random.random() for _ in range(3)] for _ in range(100)]
+    faces = convex_hull(points)
+    assert is_convex_hull(points, faces)
+    assert max(key for face in faces for key in face) < 100
+
+
+def test_convex_hull_grid():
+    points = [[float(i), float(j), float(k)] for i in range(5) for j in range(5) for k in range(5)]
+    faces = convex_hull(points)
+    assert is_convex_hull(points, faces)
+
+
+@pytest.mark.parametrize('points', [
+    [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [2.0, 2.0, 2.0]],
+    [[1.0, 2.0, 3.0]] * 4,
+    [],
+])
+def test_convex_hull_degenerate(points):
+    assert convex_hull(points) == []
+
+
+def test_convex_hull_planar():
+    points = [[float(i), float(j), 0.0] for i in range(4) for j in range(4)]
+    faces = convex_hull(points)
+    assert set(key for face in faces for key in face) == set([0, 3, 12, 15])
+    assert len(faces) == 4
+
+
+def test_mesh_from_convex_hull():
+    points = sphere(100) + [[0.0, 0.0, 0.0]]
+    mesh = Mesh.from_convex_hull(points)
+    assert mesh.number_of_vertices() == 100
+    assert mesh.number_of_faces() == 196
+    assert not any(mesh.is_vertex_on_boundary(key) for key in mesh.vertices())
+    assert mesh.vertex_coordinates(5) == points[5]
+
+
+def test_mesh_from_convex_hull_planar():
+    points = [[float(i), float(j), 0.0] for i in range(4) for j in range(4)]
+    mesh = Mesh.from_convex_hull(points)
+    assert mesh.is_valid()
+    assert mesh.number_of_faces() == 2
+    assert sorted(mesh.vertices_on_boundary()) == [0, 3, 12, 15]
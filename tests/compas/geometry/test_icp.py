@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from compas.geometry import Transformation
+from compas.geometry import icp_numpy
+from compas.geometry import matrix_from_axis_and_angle
+from compas.geometry import transform_points_numpy
+
+
+def surface(n):
+    x = np.random.rand(n) * 4 - 1
+    y = np.random.rand(n) * 2 - 1
+    return np.column_stack((x, y, 0.3 * x ** 2 + 0.2 * y ** 3 + 0.1 * x * y))
+
+
+@pytest.fixture
+def clouds():
+    np.random.seed(0)
+    T = np.asarray(matrix_from_axis_and_angle([1, 1, 0], 0.1))
+    T[:3, 3] = [0.5, -0.2, 0.1]
+    return surface(2000), transform_points_numpy(surface(20000), T), T
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(),
+    dict(subsample=1000, reject=3.0),
+    dict(method='plane'),
+    dict(voxel=0.1, method='plane'),
+])
+def test_icp_numpy(clouds, kwargs):
+    source, target, T = clouds
+    points, X, errors = icp_numpy(source, target, tol=1e-6, maxiter=50, history=True, **kwargs)
+    assert isinstance(X, Transformation)
+    assert len(points) == len(source)
+    assert errors[-1] <= errors[0]
+    assert np.allclose(points, transform_points_numpy(source, X))
+    assert np.abs(np.asarray(X.matrix) - T).max() < 0.05
+
+
+def test_icp_numpy_method(clouds):
+    source, target, T = clouds
+    with pytest.raises(ValueError):
+        icp_numpy(source, target, method='line')
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from compas.geometry import KDTree
+from compas.geometry import distance_point_point
+from compas.geometry.spatial import kdtree
+
+
+@pytest.fixture
+def cloud():
+    random.seed(0)
+    points = [[random.random(), random.random(), random.random()] for _ in range(200)]
+    points += [[random.choice([0.0, 0.5, 1.0]) for _ in range(3)] for _ in range(50)]
+    return points
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def tree(request, cloud, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(kdtree, '_build_numpy', kdtree._build)
+        monkeypatch.setattr(KDTree, '_scipy_tree', lambda self: None)
+    return KDTree(cloud)
+
+
+def brute_force(cloud, point):
+    return sorted(distance_point_point(point, xyz) for xyz in cloud)
+
+
+def test_nearest_neighbor(tree, cloud):
+    point = [0.3, 0.4, 0.5]
+    xyz, label, distance = tree.nearest_neighbor(point)
+    assert distance == pytest.approx(brute_force(cloud, point)[0])
+    assert cloud[label] == xyz
+    _, _, distance = tree.nearest_neighbor(point, exclude={label})
+    assert distance == pytest.approx(brute_force(cloud, point)[1])
+
+
+def test_nearest_neighbors(tree, cloud):
+    point = [0.5, 0.5, 0.5]
+    nnbrs = tree.nearest_neighbors(point, 10)
+    assert [distance for _, _, distance in nnbrs] == pytest.approx(brute_force(cloud, point)[:10])
+
+
+@pytest.mark.parametrize('k', [1, 5, 300])
+def test_query(tree, cloud, k):
+    points = cloud[:10] + [[0.25, 0.75, 0.5], [2.0, 2.0, 2.0]]
+    distances, labels = tree.query(points, k)
+    for point, dists, nbrs in zip(points, distances, labels):
+        assert dists == pytest.approx(brute_force(cloud, point)[:k])
+        assert [distance_point_point(point, cloud[nbr]) for nbr in nbrs] == pytest.approx(dists)
+
+
+@pytest.mark.parametrize('radius', [0.0, 0.1, 0.5])
+def test_query_radius(tree, cloud, radius):
+    points = cloud[:10] + [[0.25, 0.75, 0.5], [2.0, 2.0, 2.0]]
+    for point, nbrs in zip(points, tree.query_radius(points, radius)):
+        expected = [index for index, xyz in enumerate(cloud) if distance_point_point(point, xyz) <= radius]
+        assert sorted(nbrs) == expected
+
+
+def test_empty():
+    tree = KDTree()
+    assert tree.nearest_neighbor([0.0, 0.0, 0.0])[1] is None
+    assert tree.query([[0.0, 0.0, 0.0]], 3) == ([[]], [[]])
+
+
+def test_root(tree, cloud):
+    def nodes(node):
+        if node is None:
+            return []
+        left = nodes(node.left)
+        right = nodes(node.right)
+        assert all(cloud[label][node.axis] <= node.point[node.axis] for label in left)
+        assert all(cloud[label][node.axis] >= node.point[node.axis] for label in right)
+        return left + [node.label] + right
+
+    assert sorted(nodes(tree.root)) == list(range(len(cloud)))
+    root = KDTree().build([(xyz, index) for index, xyz in enumerate(cloud)])
+    assert root.label == tree.root.label
+    assert KDTree().root is None
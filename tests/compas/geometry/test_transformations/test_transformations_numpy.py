@@ -1 +1,75 @@
-# numpy helper will be created separated first
+import math
+
+import numpy as np
+
+from compas.geometry import Frame
+from compas.geometry import Point
+from compas.geometry import PointCollection
+from compas.geometry import PointCollectionNumpy
+from compas.geometry import Rotation
+from compas.geometry import Scale
+from compas.geometry import Translation
+from compas.geometry import matrix_from_perspective_projection
+from compas.geometry import transform_frames
+from compas.geometry import transform_frames_numpy
+from compas.geometry import transform_points
+from compas.geometry import transform_points_numpy
+from compas.geometry import transform_vectors
+from compas.geometry import transform_vectors_numpy
+
+
+def homogeneous(points, T, w):
+    X = np.hstack((np.asarray(points, dtype=float), w * np.ones((len(points), 1)))).dot(np.asarray(T).T)
+    W = X[:, 3:]
+    return X[:, :3] / np.where(W == 0, 1.0, W)
+
+
+def test_transform_points_numpy():
+    points = np.random.rand(100, 3)
+    T = Translation([1, 2, 3]) * Rotation.from_axis_and_angle([1, 1, 0], math.radians(30)) * Scale([1, 2, 3])
+    assert np.allclose(transform_points_numpy(points, T), homogeneous(points, T, 1.0))
+    assert np.allclose(transform_vectors_numpy(points, T), homogeneous(points, T, 0.0))
+    assert np.allclose(transform_points(points.tolist(), T), homogeneous(points, T, 1.0))
+    assert np.allclose(transform_vectors(points.tolist(), T), homogeneous(points, T, 0.0))
+
+
+def test_transform_points_numpy_perspective():
+    points = np.random.rand(100, 3)
+    P = matrix_from_perspective_projection([0, 0, 0], [0, 0, 1], [1, 1, 10])
+    assert np.allclose(transform_points_numpy(points, P), homogeneous(points, P, 1.0))
+    assert np.allclose(transform_points(points.tolist(), P), homogeneous(points, P, 1.0))
+
+
+def test_transform_points_numpy_stack():
+    points = np.random.rand(10, 3)
+    transformations = [Rotation.from_axis_and_angle([0, 0, 1], math.radians(i)) * Translation([i, 0, 0]) for i in range(5)]
+    result = transform_points_numpy(points, transformations)
+    assert result.shape == (5, 10, 3)
+    for T, xyz in zip(transformations, result):
+        assert np.allclose(xyz, transform_points_numpy(points, T))
+
+
+def test_transform_frames_numpy():
+    frames = [Frame([1, 0, 0], [1, 2, 4], [4, 7, 1]), Frame([0, 2, 0], [5, 2, 1], [0, 2, 1])]
+    T = Translation([1, 2, 3]) * Rotation.from_axis_and_angle([0, 2, 0], math.radians(45))
+    assert np.allclose(transform_frames_numpy(frames, T), transform_frames(frames, T))
+    for frame, result in zip(frames, transform_frames_numpy(frames, T)):
+        frame.transform(T)
+        assert np.allclose(result, [frame.point, frame.xaxis, frame.yaxis])
+    assert transform_frames_numpy(frames, [T, T, T]).shape == (3, 2, 3, 3)
+
+
+def test_pointcollection():
+    xyz = np.random.rand(100, 3).tolist()
+    T = Translation([1, 2, 3])
+    R = Rotation.from_axis_and_angle([0, 0, 1], math.radians(30))
+    collection = PointCollectionNumpy([Point(*point) for point in xyz])
+    collection.transform(T)
+    collection.transform(R)
+    expected = transform_points(xyz, R * T)
+    assert np.allclose(collection.data, expected)
+    assert np.allclose([list(point) for point in collection], expected)
+    assert np.allclose(list(collection[3]), expected[3])
+    other = PointCollection([Point(*point) for point in xyz])
+    other.transform(R * T)
+    assert np.allclose([list(point) for point in other], expected)
@@ -0,0 +1,40 @@
+import random
+
+from compas.geometry import delaunay_from_points
+from compas.geometry import is_ccw_xy
+from compas.geometry import is_point_in_circle_xy
+from compas.geometry import circle_from_points_xy
+from compas.geometry import centroid_points
+from compas.geometry import is_point_in_polygon_xy
+
+
+def test_delaunay_from_points():
+    random.seed(0)
+    points = [[random.uniform(0, 10), random.uniform(0, 10), 0.0] for _ in range(200)]
+    faces = delaunay_from_points(points)
+    used = set(key for face in faces for key in face)
+    assert len(used) == len(points)
+    for a, b, c in faces:
+        assert not is_ccw_xy(points[a], points[b], points[c])
+        circle = circle_from_points_xy(points[a], points[b], points[c])
+        for i, point in enumerate(points):
+            if i not in (a, b, c):
+                assert not is_point_in_circle_xy(point, circle)
+
+
+def test_delaunay_from_points_grid():
+    points = [[float(i), float(j), 0.0] for i in range(10) for j in range(10)]
+    faces = delaunay_from_points(points)
+    assert len(faces) == 2 * 9 * 9
+
+
+def test_delaunay_from_points_boundary_holes():
+    points = [[float(i), float(j), 0.0] for i in range(11) for j in range(11)]
+    boundary = [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]]
+    hole = [[4.0, 4.0], [6.0, 4.0], [6.0, 6.0], [4.0, 6.0]]
+    faces = delaunay_from_points(points, boundary=boundary, holes=[hole])
+    assert len(faces) == 2 * 10 * 10 - 2 * 2 * 2
+    for face in faces:
+        centroid = centroid_points([points[key] for key in face])
+        assert is_point_in_polygon_xy(centroid, boundary)
+        assert not is_point_in_polygon_xy(centroid, hole)
@@ -0,0 +1,85 @@
+import os
+import random
+
+from compas.numerical import FitnessCache
+from compas.numerical import ga
+from compas.numerical import moga
+from compas.numerical.ga.fitness import evaluate_fitness_batch
+
+
+def sphere(X):
+    return sum(x ** 2 for x in X)
+
+
+def shifted(X):
+    return sum((x - 1) ** 2 for x in X)
+
+
+def optimize(tmp_path, **kwargs):
+    random.seed(0)
+    return ga(sphere, 'min', 3, [(-5, 5)] * 3, num_gen=15, num_pop=20, num_elite=4,
+              output_path=str(tmp_path) + os.sep, print_refresh=100, **kwargs)
+
+
+def test_fitness_cache(tmp_path):
+    cache = FitnessCache(maxsize=2)
+    cache['a'] = [1.0]
+    cache['b'] = [2.0]
+    assert cache['a'] == [1.0]
+    cache['c'] = [3.0]
+    assert 'b' not in cache
+    assert len(cache) == 2
+    path = str(tmp_path / 'cache.json')
+    cache.save(path)
+    other = FitnessCache()
+    other.load(path)
+    assert list(other) == ['a', 'c']
+    assert other['c'] == [3.0]
+
+
+def test_evaluate_fitness_batch_counts():
+    cache = FitnessCache()
+    cache['a'] = [1.0]
+    chromosomes = ['a', 'a', 'b', 'b', 'c']
+    variables = [[1], [1], [2], [2], [3]]
+    values, num_evaluated, num_cached = evaluate_fitness_batch(map, cache, [sphere], (), {}, chromosomes, variables)
+    assert values == [[1.0], [1.0], [4], [4], [9]]
+    assert num_evaluated == 2
+    assert num_cached == 1
+    assert len(cache) == 3
+
+
+def test_ga_executors(tmp_path):
+    serial = optimize(tmp_path)
+    threads = optimize(tmp_path, executor='thread', num_workers=4)
+    mapped = optimize(tmp_path, executor=lambda func, items: [func(item) for item in items])
+    assert serial.best_fit == threads.best_fit == mapped.best_fit
+    assert serial.current_pop['fit_value'] == threads.current_pop['fit_value']
+    assert len(serial.timing) == serial.end_gen + 1
+    assert sum(t['num_evaluated'] for t in serial.timing) == len(serial.ind_fit_dict)
+    assert all(t['num_evaluated'] + t['num_cached'] <= t['num_individuals'] for t in serial.timing)
+    assert os.path.exists(str(tmp_path / 'sphere_fitness_cache.json'))
+
+
+def test_ga_cache_size(tmp_path):
+    calls = []
+
+    def counted(X):
+        calls.append(X)
+        return sphere(X)
+
+    random.seed(0)
+    result = ga(counted, 'min', 3, [(-5, 5)] * 3, num_gen=10, num_pop=20, num_elite=4,
+                output_path=str(tmp_path) + os.sep, print_refresh=100, cache_size=10)
+    assert len(result.ind_fit_dict) <= 10
+    assert len(calls) == sum(t['num_evaluated'] for t in result.timing)
+
+
+def test_moga(tmp_path):
+    random.seed(0)
+    result = moga([sphere, shifted], ['min', 'min'], 2, [(-2, 2)] * 2, num_gen=5, num_pop=20,
+                  output_path=str(tmp_path) + os.sep, executor='thread')
+    assert len(result.timing) == 5
+    for X, (f1, f2) in zip(result.parent_pop['scaled'], result.parent_pop['fit_values']):
+        assert f1 == sphere(X)
+        assert f2 == shifted(X)
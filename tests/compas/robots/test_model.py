@@ -2,6 +2,8 @@ import os
 
 import pytest
 
+from compas.geometry import Transformation
+from compas.geometry import Translation
 from compas.robots import Box
 from compas.robots import Cylinder
 from compas.robots import Joint
@@ -312,6 +314,71 @@ def test_unknown_axis_attribute(urdf_with_unknown_attr):
     assert r.joints[0].axis.attr['rpy'] == '0 0 0'
 
 
+def test_compute_transformations(ur5_file):
+    r = RobotModel.from_urdf_file(ur5_file)
+    names = r.get_configurable_joint_names()
+    states = [
+        dict(zip(names, [-2.238, -1.153, -2.174, 0.185, 0.667, 0.000])),
+        dict(zip(names, [-2.238, -1.153, 1.0, 0.185, 0.667, 0.000])),
+        dict(zip(names[:3], [0.5, 0.5, 0.5])),
+    ]
+    for joint_state in states:
+        transformations = r.compute_transformations(joint_state)
+        expected = r.compute_transformations(joint_state, r.root, Transformation())
+        assert set(transformations) == set(expected)
+        for name in expected:
+            assert transformations[name] == expected[name]
+
+
+def test_forward_kinematics_batch(ur5_file, monkeypatch):
+    r = RobotModel.from_urdf_file(ur5_file)
+    names = r.get_configurable_joint_names()
+    values = [[0.1 * i, -0.2 * i, 0.3, 0.1 * i, 0.0, 0.5] for i in range(5)]
+    expected = [r.forward_kinematics(dict(zip(names, v))) for v in values]
+
+    frames = r.forward_kinematics_batch(values, names)
+    for frame, other in zip(frames, expected):
+        assert frame == other
+
+    def no_numpy(*args, **kwargs):
+        raise ImportError
+
+    monkeypatch.setattr(r.kinematic_chain, 'matrices_numpy', no_numpy)
+    frames = r.forward_kinematics_batch(values, names)
+    for frame, other in zip(frames, expected):
+        assert frame == other
+
+
+def test_kinematic_chain_recompiled(ur5_file):
+    r = RobotModel.from_urdf_file(ur5_file)
+    chain = r.kinematic_chain
+    assert chain is r.kinematic_chain
+    r.scale(100)
+    assert chain is not r.kinematic_chain
+    chain = r.kinematic_chain
+    r.get_joint_by_name('shoulder_lift_joint').transform(Translation([0.0, 0.0, 1.0]))
+    assert chain is not r.kinematic_chain
+    names = r.get_configurable_joint_names()
+    joint_state = dict(zip(names, [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]))
+    transformations = r.compute_transformations(joint_state)
+    expected = r.compute_transformations(joint_state, r.root, Transformation())
+    for name in expected:
+        assert transformations[name] == expected[name]
+
+
+def test_kinematic_chain_limits(ur5_file):
+    r = RobotModel.from_urdf_file(ur5_file)
+    names = r.get_configurable_joint_names()
+    joint_state = dict(zip(names, [0.6, 0.2, 0.3, 0.4, 0.5, 0.6]))
+    before = r.compute_transformations(joint_state)
+    r.get_joint_by_name(names[0]).limit.upper = 0.1
+    transformations = r.compute_transformations(joint_state)
+    expected = r.compute_transformations(joint_state, r.root, Transformation())
+    assert transformations[names[0]] != before[names[0]]
+    for name in expected:
+        assert transformations[name] == expected[name]
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
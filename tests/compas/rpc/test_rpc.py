@@ -0,0 +1,248 @@
+import io
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from compas.datastructures import Mesh
+from compas.rpc import BinaryClient
+from compas.rpc import BinaryServer
+from compas.rpc import Batch
+from compas.rpc import Dispatcher
+from compas.rpc import Future
+from compas.rpc import Proxy
+from compas.rpc import RPCCancelledError
+from compas.rpc import RPCClientError
+from compas.rpc import RPCServerError
+from compas.rpc import RPCTimeoutError
+from compas.rpc import Server
+from compas.rpc import WorkerPool
+from compas.rpc import as_completed
+from compas.rpc import recv_message
+from compas.rpc import send_message
+from compas.rpc import transport
+
+
+class Service(Dispatcher):
+
+    def add(self, a, b):
+        return a + b
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+
+@pytest.fixture
+def server():
+    server = BinaryServer(('127.0.0.1', 0), num_workers=2)
+    server.register_instance(Service())
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_message_roundtrip():
+    mesh = Mesh.from_polyhedron(6)
+    mesh.vertex_attribute(0, 'is_fixed', True)
+    message = {'a': np.arange(12, dtype=np.int32).reshape(3, 4), 'b': [1.0, 'x'], 'mesh': mesh}
+    stream = io.BytesIO()
+    send_message(stream, message)
+    stream.seek(0)
+    result = recv_message(stream)
+    assert result['a'].dtype == np.int32
+    assert np.array_equal(result['a'], message['a'])
+    assert result['b'] == [1.0, 'x']
+    assert result['mesh'].number_of_faces() == 6
+    assert result['mesh'].vertex_attribute(0, 'is_fixed') is True
+
+
+def test_message_without_numpy(monkeypatch):
+    stream = io.BytesIO()
+    send_message(stream, {'a': np.arange(6, dtype=float).reshape(2, 3)})
+    stream.seek(0)
+    monkeypatch.setitem(__import__('sys').modules, 'numpy', None)
+    assert recv_message(stream) == {'a': [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]}
+    assert transport._from_buffer(bytearray(b'\x01\x00'), '<i2', []) == 1
+
+
+def test_message_truncated():
+    stream = io.BytesIO()
+    send_message(stream, {'a': np.zeros(10)})
+    stream = io.BytesIO(stream.getvalue()[:-8])
+    with pytest.raises(EOFError):
+        recv_message(stream)
+
+
+def test_dispatcher_cache_and_batch():
+    service = Service()
+    odict = json.loads(service._dispatch('compas.geometry.add_vectors', [json.dumps({'args': [[1, 2, 3], [1, 1, 1]], 'kwargs': {}})]))
+    assert odict['data'] == [2, 3, 4]
+    assert 'compas.geometry.add_vectors' in service._functions
+    calls = [{'name': 'add', 'args': [1, 2], 'kwargs': {}}, {'name': 'nothing', 'args': [], 'kwargs': {}}]
+    odict = json.loads(service._dispatch('__batch__', [json.dumps({'calls': calls})]))
+    assert odict['data'][0]['data'] == 3
+    assert 'not part of the API' in odict['data'][1]['error']
+    assert 'nothing' not in service._functions
+
+
+def test_binary_server(server):
+    client = BinaryClient('127.0.0.1', server.server_address[1])
+    assert client.ping() == 1
+    results = client.call([{'name': 'add', 'args': [np.ones(3), np.ones(3)], 'kwargs': {}},
+                           {'name': 'compas.geometry.add_vectors', 'args': [[1, 2, 3], [1, 1, 1]], 'kwargs': {}}])
+    assert np.array_equal(results[0]['data'], [2.0, 2.0, 2.0])
+    assert results[1]['data'] == [2, 3, 4]
+    with pytest.raises(RPCServerError):
+        client.request({'command': 'unknown'})
+    client.close()
+
+
+def test_batch(server):
+    class P(object):
+        package = None
+
+        def __init__(self):
+            self.client = BinaryClient('127.0.0.1', server.server_address[1])
+
+        def _send(self, calls):
+            return self.client.call(calls)
+
+    proxy = P()
+    with Batch(proxy) as batch:
+        results = [batch.add(i, 1) for i in range(5)]
+        error = batch.add(1)
+        assert not results[0].done()
+        with pytest.raises(RPCClientError):
+            results[0].result()
+    assert [result.result() for result in results] == [1, 2, 3, 4, 5]
+    with pytest.raises(RPCServerError):
+        error.result()
+    proxy.client.close()
+
+
+def test_future():
+    future = Future()
+    done = []
+    future.add_done_callback(done.append)
+    with pytest.raises(RPCClientError):
+        future.result(timeout=0.01)
+    future.set_exception(RPCServerError('error'))
+    assert done == [future]
+    assert isinstance(future.exception(), RPCServerError)
+    futures = [Future() for _ in range(3)]
+    futures[2].set_result(2)
+    futures[0].set_result(0)
+    iterator = as_completed(futures, timeout=0.05)
+    assert sorted([next(iterator).result(), next(iterator).result()]) == [0, 2]
+    with pytest.raises(RPCClientError):
+        next(iterator)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_worker_pool(executor):
+    pool = WorkerPool(Service(), num_workers=2, executor=executor)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.run('sleep', (0.3, )))) for _ in range(2)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [0.3, 0.3]
+    assert time.time() - start < 0.55
+    with pytest.raises(RPCTimeoutError):
+        pool.run('sleep', (2, ), timeout=0.1)
+    with pytest.raises(RPCServerError):
+        pool.run('add', (1, ))
+    errors = []
+
+    def run():
+        try:
+            pool.run('sleep', (2, ), key='a')
+        except RPCCancelledError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.1)
+    assert pool.cancel('a')
+    thread.join()
+    assert errors
+    with pytest.raises(RPCCancelledError):
+        pool.run('add', (1, 2), key='a')
+    pool.release('a')
+    assert pool.run('add', (1, 2), key='a') == 3
+    pool.close()
+
+
+def test_binary_server_concurrent(server):
+    client = BinaryClient('127.0.0.1', server.server_address[1])
+    start = time.time()
+    slow = client.call_async([{'name': 'sleep', 'args': [0.5], 'kwargs': {}}])
+    fast = client.call_async([{'name': 'add', 'args': [1, 2], 'kwargs': {}}])
+    assert fast.result()[0]['data'] == 3
+    assert not slow.done()
+    assert slow.result()[0]['data'] == 0.5
+    assert time.time() - start < 0.9
+    results = client.call([{'name': 'sleep', 'args': [1], 'kwargs': {}}], timeout=0.1)
+    assert results[0]['status'] == 'timeout'
+    future = client.call_async([{'name': 'sleep', 'args': [1], 'kwargs': {}}, {'name': 'add', 'args': [1, 2], 'kwargs': {}}])
+    time.sleep(0.1)
+    assert future.cancel()
+    assert [odict['status'] for odict in future.result()] == ['cancelled', 'cancelled']
+    pending = client.call_async([{'name': 'sleep', 'args': [0.5], 'kwargs': {}}])
+    client.close()
+    with pytest.raises(RPCServerError):
+        pending.result()
+    assert client.ping() == 1
+    client.close()
+
+
+def test_binary_server_instrument(server):
+    client = BinaryClient('127.0.0.1', server.server_address[1])
+    future = client.submit({'command': 'call', 'instrument': True,
+                            'calls': [{'name': 'add', 'args': [np.ones(1000), np.ones(1000)], 'kwargs': {}, 'instrument': 'profile'},
+                                      {'name': 'sleep', 'args': [0.1], 'kwargs': {}}]})
+    reply = future.result()
+    transfer = reply['transfer']
+    assert transfer['request_bytes'] > 8000 and transfer['response_bytes'] > 8000
+    assert transfer['total'] >= 0.1
+    assert set(transfer) == {'decode', 'encode', 'request_bytes', 'response_bytes', 'client_encode', 'client_decode', 'total'}
+    assert set(reply['results'][0]['timing']) == {'queue', 'execute'}
+    assert 'function calls' in reply['results'][0]['profile']
+    assert 'timing' not in reply['results'][1]
+    assert 'transfer' not in client.call([{'name': 'add', 'args': [1, 2], 'kwargs': {}}])
+    statistics = client.request({'command': 'statistics'})['data']
+    assert statistics['add']['count'] == 2
+    assert statistics['sleep']['execute']['max'] >= 0.1
+    client.close()
+
+
+def test_xmlrpc_server_instrument():
+    server = Server(('127.0.0.1', 0), logRequests=False)
+    server.register_function(server.ping)
+    server.register_function(server.statistics)
+    server.register_instance(Service())
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        proxy = Proxy(port=server.server_address[1], instrument='profile')
+        assert proxy.add([1, 2], [3]) == [1, 2, 3]
+        assert 'function calls' in proxy.profile
+        assert proxy.timing['request_bytes'] > 0
+        assert proxy.timing['total'] >= proxy.timing['execute']
+        with proxy.batch() as batch:
+            batch.sleep(0.1)
+            batch.sleep(0.1)
+        assert proxy.timing['execute'] >= 0.2
+        assert proxy.server_statistics()['sleep']['count'] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
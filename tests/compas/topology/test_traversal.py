@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.datastructures import Network
+from compas.topology import astar_bidirectional_shortest_path
+from compas.topology import astar_shortest_path
+from compas.topology import dijkstra_all_pairs_distances
+from compas.topology import dijkstra_distances
+from compas.topology import dijkstra_multisource_distances
+from compas.topology import dijkstra_path
+
+
+@pytest.fixture
+def network():
+    random.seed(0)
+    n = 12
+    network = Network()
+    for i in range(n):
+        for j in range(n):
+            network.add_node(i * n + j, x=i + 0.3 * random.random(), y=j + 0.3 * random.random(), z=0.0)
+    for i in range(n):
+        for j in range(n):
+            if i + 1 < n:
+                network.add_edge(i * n + j, (i + 1) * n + j)
+            if j + 1 < n and random.random() < 0.7:
+                network.add_edge(i * n + j, i * n + j + 1)
+    return network
+
+
+@pytest.fixture
+def weight(network):
+    weight = {}
+    for u, v in network.edges():
+        weight[(u, v)] = weight[(v, u)] = network.edge_length(u, v)
+    return weight
+
+
+def reference_distances(adjacency, weight, source):
+    # quadratic version of Dijkstra
+    distance = {key: 1e+17 for key in adjacency}
+    distance[source] = 0
+    tovisit = set(adjacency)
+    while tovisit:
+        u = min(tovisit, key=lambda k: distance[k])
+        tovisit.remove(u)
+        for v in adjacency[u]:
+            if v in tovisit:
+                distance[v] = min(distance[v], distance[u] + weight[(u, v)])
+    return distance
+
+
+def path_length(network, path):
+    return sum(network.edge_length(u, v) for u, v in zip(path[:-1], path[1:]))
+
+
+def test_dijkstra_distances(network, weight):
+    distance = dijkstra_distances(network.adjacency, weight, 0)
+    expected = reference_distances(network.adjacency, weight, 0)
+    for key in network.nodes():
+        assert distance[key] == pytest.approx(expected[key])
+
+
+def test_dijkstra_distances_disconnected():
+    adjacency = {0: [1], 1: [0], 2: []}
+    weight = {(0, 1): 1.0, (1, 0): 1.0}
+    assert dijkstra_distances(adjacency, weight, 0) == {0: 0, 1: 1.0, 2: 1e+17}
+
+
+def test_dijkstra_path(network, weight):
+    path = dijkstra_path(network.adjacency, weight, 0, 143)
+    distance = dijkstra_distances(network.adjacency, weight, 143)
+    assert path[0] == 0 and path[-1] == 143
+    assert path_length(network, path) == pytest.approx(distance[0])
+
+
+def test_dijkstra_multisource_distances(network, weight):
+    sources = [0, 77, 143]
+    distance = dijkstra_multisource_distances(network.adjacency, weight, sources)
+    expected = [reference_distances(network.adjacency, weight, source) for source in sources]
+    for key in network.nodes():
+        assert distance[key] == pytest.approx(min(d[key] for d in expected))
+
+
+def test_dijkstra_multisource_distances_cutoff(network, weight):
+    distance = dijkstra_multisource_distances(network.adjacency, weight, [77], cutoff=2.5)
+    expected = reference_distances(network.adjacency, weight, 77)
+    assert set(distance) == set(key for key in expected if expected[key] <= 2.5)
+    for key in distance:
+        assert distance[key] == pytest.approx(expected[key])
+
+
+def test_dijkstra_all_pairs_distances(network, weight):
+    distances = dijkstra_all_pairs_distances(network.adjacency, weight)
+    for source in (0, 50, 100):
+        expected = reference_distances(network.adjacency, weight, source)
+        for key in network.nodes():
+            assert distances[source][key] == pytest.approx(expected[key])
+
+
+@pytest.mark.parametrize('search', [astar_shortest_path, astar_bidirectional_shortest_path])
+def test_astar_network(search, network, weight):
+    for root, goal in [(0, 143), (5, 130), (70, 71), (30, 30)]:
+        path = search(network, root, goal)
+        expected = reference_distances(network.adjacency, weight, root)[goal]
+        assert path[0] == root and path[-1] == goal
+        assert path_length(network, path) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('search', [astar_shortest_path, astar_bidirectional_shortest_path])
+def test_astar_no_path(search):
+    network = Network()
+    network.add_node(0, x=0.0, y=0.0, z=0.0)
+    network.add_node(1, x=1.0, y=0.0, z=0.0)
+    network.add_node(2, x=2.0, y=0.0, z=0.0)
+    network.add_edge(0, 1)
+    assert search(network, 0, 2) is None
+
+
+@pytest.mark.parametrize('search', [astar_shortest_path, astar_bidirectional_shortest_path])
+def test_astar_mesh(search):
+    mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0]], [[0, 1, 4, 3], [1, 2, 5, 4]])
+    path = search(mesh, 0, 5)
+    assert path[0] == 0 and path[-1] == 5
+    assert len(path) == 4
@@ -0,0 +1,40 @@
+import io
+import json
+
+import pytest
+
+from compas.geometry import Point
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+from compas.utilities import json_load_stream
+from compas.utilities import literal_keys
+
+
+@pytest.mark.parametrize(("keys", "expected"), [
+    (['0', '1', '-2'], [0, 1, -2]),
+    (['(0, 1)', '(1, -2)'], [(0, 1), (1, -2)]),
+    (["'a'", '(0, 1)', '1.5', 'None'], ['a', (0, 1), 1.5, None]),
+    ([], []),
+])
+def test_literal_keys(keys, expected):
+    assert literal_keys(keys) == expected
+
+
+@pytest.mark.parametrize('data', [
+    {'vertex': {'0': {'x': 1.5, 'y': -2e10}, '1': [1, 2, 'x"y]']}, 'face': {}, 'edge': [], 'max': 12345678901, 'name': None},
+    [1, [2, [3, [4]]], {'key': True}],
+    {'point': Point(1.0, 2.0, 3.0)},
+    3.5,
+])
+@pytest.mark.parametrize('chunksize', [1, 7, 1024])
+def test_json_load_stream(data, chunksize):
+    text = json.dumps(data, cls=DataEncoder, indent=2)
+    expected = json.loads(text, cls=DataDecoder)
+    for depth in range(4):
+        assert json_load_stream(io.StringIO(text), cls=DataDecoder, depth=depth, chunksize=chunksize) == expected
+
+
+@pytest.mark.parametrize('text', ['{"a": 1,}', '{"a" 1}', '[1 2]', '{"a": 1} x', '{'])
+def test_json_load_stream_invalid(text):
+    with pytest.raises(ValueError):
+        json_load_stream(io.StringIO(text), chunksize=2)
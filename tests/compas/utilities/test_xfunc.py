@@ -0,0 +1,67 @@
+import sys
+import threading
+
+import pytest
+
+from compas.utilities import XFunc
+from compas.utilities import xfunc as xfunc_module
+
+
+@pytest.fixture
+def add_vectors():
+    xfunc = XFunc('compas.geometry.add_vectors', python=sys.executable, verbose=False, persistent=True, num_workers=2)
+    yield xfunc
+    xfunc.close()
+
+
+def test_xfunc():
+    xfunc = XFunc('compas.geometry.add_vectors', python=sys.executable, verbose=False)
+    assert xfunc([1, 2, 3], [1, 1, 1]) == [2, 3, 4]
+
+
+def test_xfunc_persistent(add_vectors):
+    assert add_vectors([1, 2, 3], [1, 1, 1]) == [2, 3, 4]
+    assert add_vectors.map([[1, 0, 0], [0, 1, 0], [0, 0, 1]], [[1, 1, 1]] * 3) == [[2, 1, 1], [1, 2, 1], [1, 1, 2]]
+    with pytest.raises(Exception):
+        add_vectors([1, 2, 3])
+    assert add_vectors.error is not None
+    assert add_vectors([0, 0, 0], [1, 1, 1]) == [1, 1, 1]
+
+
+def test_xfunc_persistent_restart():
+    with XFunc('os._exit', python=sys.executable, verbose=False, persistent=True) as xfunc:
+        with pytest.raises(Exception):
+            xfunc(1)
+        assert xfunc._workers[0].is_alive()
+
+
+def test_xfunc_persistent_concurrent(add_vectors):
+    results = [None] * 8
+
+    def call(index):
+        results[index] = add_vectors([index, 0, 0], [0, index, 0])
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [[index, index, 0] for index in range(8)]
+
+
+def test_xfunc_start_workers_failure(monkeypatch):
+    started = []
+    start = xfunc_module._Worker.start
+
+    def start_once(worker):
+        if started:
+            raise OSError
+        start(worker)
+        started.append(worker)
+
+    monkeypatch.setattr(xfunc_module._Worker, 'start', start_once)
+    xfunc = XFunc('compas.geometry.add_vectors', python=sys.executable, verbose=False, persistent=True, num_workers=2)
+    with pytest.raises(OSError):
+        xfunc([1, 2, 3], [1, 1, 1])
+    assert not started[0].is_alive()
+    assert xfunc._workers == []